@@ -0,0 +1,147 @@
+"""
+Scheduled rotating database snapshots.
+
+Takes an online backup every interval, verifies it, and keeps only the
+newest N verified snapshots. Snapshots are written under a temporary
+name and renamed once verified, so a half-written or corrupt copy is
+never mistaken for a good one.
+"""
+
+import logging
+import shutil
+import threading
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Optional
+
+
+SNAPSHOT_PREFIX = "syncopaid-"
+SNAPSHOT_TIME_FORMAT = "%Y%m%d-%H%M%S"
+
+
+class BackupScheduler:
+    """Takes rotating, verified snapshots of the database in the background."""
+
+    def __init__(
+        self,
+        database,
+        backup_dir: Path,
+        interval_hours: float = 1.0,
+        keep: int = 24,
+        pages_per_step: int = 256,
+        sleep: float = 0.005
+    ):
+        """
+        Initialize the scheduler.
+
+        Args:
+            database: Database instance providing backup() and verify_backup()
+            backup_dir: Directory holding the snapshots
+            interval_hours: Hours between snapshots
+            keep: Number of snapshots kept
+            pages_per_step: Pages copied per backup step
+            sleep: Seconds to sleep between backup steps
+        """
+        self.database = database
+        self.backup_dir = Path(backup_dir)
+        self.interval_hours = interval_hours
+        self.keep = keep
+        self.pages_per_step = pages_per_step
+        self.sleep = sleep
+
+        self._thread: Optional[threading.Thread] = None
+        self._stop = threading.Event()
+        self.last_result: Optional[Dict] = None
+
+    def start(self):
+        """Start taking snapshots in a background thread."""
+        if self._thread is not None:
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name='backup_scheduler', daemon=True)
+        self._thread.start()
+        logging.info(
+            f"Backup scheduler started: every {self.interval_hours}h, keeping {self.keep} "
+            f"snapshots in {self.backup_dir}"
+        )
+
+    def stop(self, timeout: float = 10.0):
+        """Stop the scheduler (an in-progress snapshot finishes first)."""
+        if self._thread is None:
+            return
+        self._stop.set()
+        self._thread.join(timeout=timeout)
+        self._thread = None
+        logging.info("Backup scheduler stopped")
+
+    def _run(self):
+        """Snapshot on every interval until stopped."""
+        while not self._stop.is_set():
+            if self._snapshot_due():
+                try:
+                    self.run_once()
+                except Exception as e:
+                    logging.error(f"Scheduled backup failed: {e}", exc_info=True)
+            self._stop.wait(timeout=60)
+
+    def _snapshot_due(self) -> bool:
+        """Whether the newest snapshot is older than the interval."""
+        snapshots = self.list_snapshots()
+        if not snapshots:
+            return True
+        age = datetime.now() - _snapshot_time(snapshots[-1])
+        return age.total_seconds() >= self.interval_hours * 3600
+
+    def run_once(self) -> Dict:
+        """
+        Take, verify and rotate one snapshot.
+
+        Returns:
+            verify_backup() result plus the snapshot path (None if the
+            snapshot failed verification and was discarded)
+        """
+        self.backup_dir.mkdir(parents=True, exist_ok=True)
+        name = f"{SNAPSHOT_PREFIX}{datetime.now().strftime(SNAPSHOT_TIME_FORMAT)}"
+        # Shards land in '<name>-shards/', which the final '<name>.db' shares
+        partial = self.backup_dir / f"{name}.partial"
+
+        self.database.backup(partial, pages_per_step=self.pages_per_step, sleep=self.sleep)
+        result = self.database.verify_backup(partial)
+
+        if result['ok']:
+            final = self.backup_dir / f"{name}.db"
+            partial.replace(final)
+            result['path'] = str(final)
+            logging.info(f"Snapshot {final.name} verified ({result['event_count']} events)")
+            self._rotate()
+        else:
+            logging.error(f"Snapshot {partial.name} failed verification: {result['integrity']}")
+            _remove_snapshot(partial)
+            result['path'] = None
+
+        self.last_result = result
+        return result
+
+    def list_snapshots(self) -> List[Path]:
+        """Verified snapshots, oldest first."""
+        if not self.backup_dir.is_dir():
+            return []
+        return sorted(self.backup_dir.glob(f"{SNAPSHOT_PREFIX}*.db"))
+
+    def _rotate(self):
+        """Delete the oldest snapshots beyond the keep limit."""
+        snapshots = self.list_snapshots()
+        for old in snapshots[:max(0, len(snapshots) - self.keep)]:
+            _remove_snapshot(old)
+            logging.info(f"Removed old snapshot {old.name}")
+
+
+def _snapshot_time(path: Path) -> datetime:
+    """Parse the creation time from a snapshot file name."""
+    return datetime.strptime(path.stem[len(SNAPSHOT_PREFIX):], SNAPSHOT_TIME_FORMAT)
+
+
+def _remove_snapshot(path: Path):
+    """Delete a snapshot file and its shard directory."""
+    path.unlink(missing_ok=True)
+    shutil.rmtree(path.parent / f"{path.stem}-shards", ignore_errors=True)
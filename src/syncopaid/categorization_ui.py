@@ -10,6 +10,8 @@ from PIL import Image
 import os
 import importlib.util
 
+from .database_time import to_epoch_ms
+
 # Check if tkinter is available
 HAS_TKINTER = importlib.util.find_spec('tkinter') is not None
 
@@ -26,9 +28,9 @@ def query_screenshots_for_activity(db, start_time: str, end_time: str) -> List[D
         cursor.execute("""
             SELECT id, captured_at, file_path, window_app, window_title
             FROM screenshots
-            WHERE captured_at >= ? AND captured_at <= ?
-            ORDER BY captured_at ASC
-        """, (start_time, end_time))
+            WHERE captured_ms >= ? AND captured_ms <= ?
+            ORDER BY captured_ms ASC
+        """, (to_epoch_ms(start_time), to_epoch_ms(end_time)))
         return [dict(row) for row in cursor.fetchall()]
 
 
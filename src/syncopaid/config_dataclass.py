@@ -101,6 +101,30 @@ class Config:
         night_processing_batch_size: Number of activities to process per batch (default: 50)
         vision_engine_enabled: Enable local vision LLM for screenshot analysis (default: False)
         vision_engine: Default vision engine to use (default: moondream2)
+        event_writer_flush_interval_seconds: Max seconds tracked events wait before being written (default: 5.0)
+        event_writer_batch_size: Buffered events that trigger an immediate write (default: 50)
+        event_writer_max_queue_size: Event queue capacity before writes fall back to synchronous (default: 1000)
+        database_month_shards: Move closed months out of the main database into per-month shard files (default: False)
+        database_query_cache_size: Repeated-read results kept in memory; 0 disables the cache (default: 0)
+        secure_delete_workers: Threads shredding screenshot files during secure deletion (default: 2)
+        secure_delete_max_mb_per_second: Secure deletion overwrite rate limit in MB/s, 0 = unlimited (default: 20.0)
+        secure_delete_chunk_size: Rows deleted per transaction by secure deletion (default: 500)
+        event_compaction_enabled: Merge adjacent identical events during the night processing window (default: False)
+        event_compaction_gap_seconds: Largest gap between events merged by compaction (default: 5.0)
+        event_compaction_flicker_seconds: Shorter events (window flickers, idle blips) are absorbed into the run around them (default: 5.0)
+        event_compaction_days: Completed days compacted each night (default: 7)
+        matter_keyword_refresh_enabled: Re-extract keywords for matters whose events changed during the night processing window (default: False)
+        backup_enabled: Take scheduled online snapshots of the database (default: False)
+        backup_interval_hours: Hours between database snapshots (default: 1.0)
+        backup_keep: Number of verified snapshots kept (default: 24)
+        backup_directory: Snapshot directory, None for 'backups' next to the database (default: None)
+        database_maintenance_enabled: Run advised ANALYZE/optimize/vacuum during the night processing window (default: False)
+        database_maintenance_allow_vacuum: Let night maintenance run a full VACUUM when advised (default: False)
+        tracker_profiling_enabled: Record per-stage tracking loop timings and flag ticks that overrun the poll interval (default: False)
+        tracker_profile_log_minutes: Minutes between tracking loop profile log lines, 0 = never (default: 5.0)
+        adaptive_polling_enabled: Poll less often while locked, idle or unchanged, returning to poll_interval_seconds on input (default: False)
+        adaptive_poll_max_seconds: Longest adaptive poll interval while locked or idle (default: 15.0)
+        adaptive_poll_backoff: Factor the adaptive poll interval grows by on each quiet poll (default: 2.0)
     """
     poll_interval_seconds: float = 1.0
     idle_threshold_seconds: float = 180.0
@@ -158,6 +182,40 @@ class Config:
     # Vision engine settings (local LLM for screenshot analysis)
     vision_engine_enabled: bool = False
     vision_engine: str = "moondream2"
+    # Write-behind event writer settings
+    event_writer_flush_interval_seconds: float = 5.0
+    event_writer_batch_size: int = 50
+    event_writer_max_queue_size: int = 1000
+    # Month shard settings
+    database_month_shards: bool = False
+    # Read-through query cache
+    database_query_cache_size: int = 0
+    # Background secure deletion
+    secure_delete_workers: int = 2
+    secure_delete_max_mb_per_second: float = 20.0
+    secure_delete_chunk_size: int = 500
+    # Overnight event compaction
+    event_compaction_enabled: bool = False
+    event_compaction_gap_seconds: float = 5.0
+    event_compaction_flicker_seconds: float = 5.0
+    event_compaction_days: int = 7
+    # Overnight matter keyword refresh
+    matter_keyword_refresh_enabled: bool = False
+    # Scheduled database snapshots
+    backup_enabled: bool = False
+    backup_interval_hours: float = 1.0
+    backup_keep: int = 24
+    backup_directory: Optional[str] = None
+    # Overnight database maintenance
+    database_maintenance_enabled: bool = False
+    database_maintenance_allow_vacuum: bool = False
+    # Tracking loop profiling
+    tracker_profiling_enabled: bool = False
+    tracker_profile_log_minutes: float = 5.0
+    # Adaptive polling
+    adaptive_polling_enabled: bool = False
+    adaptive_poll_max_seconds: float = 15.0
+    adaptive_poll_backoff: float = 2.0
 
     def to_dict(self) -> Dict[str, Any]:
         """Convert config to dictionary."""
@@ -63,4 +63,38 @@ DEFAULT_CONFIG = {
     # Vision engine settings (local LLM for screenshot analysis)
     "vision_engine_enabled": False,  # Disabled until model downloaded
     "vision_engine": "moondream2",   # Default engine (when available)
+    # Write-behind event writer settings
+    "event_writer_flush_interval_seconds": 5.0,
+    "event_writer_batch_size": 50,
+    "event_writer_max_queue_size": 1000,
+    # Month shard settings
+    "database_month_shards": False,  # Move closed months into per-month shard files
+    # Read-through query cache
+    "database_query_cache_size": 0,  # Cached results kept; 0 disables the cache
+    # Background secure deletion
+    "secure_delete_workers": 2,
+    "secure_delete_max_mb_per_second": 20.0,  # Overwrite rate limit; 0 = unlimited
+    "secure_delete_chunk_size": 500,          # Rows deleted per transaction
+    # Overnight event compaction (runs in the night processing window)
+    "event_compaction_enabled": False,
+    "event_compaction_gap_seconds": 5.0,  # Largest gap between merged events
+    "event_compaction_flicker_seconds": 5.0,  # Shorter events are absorbed into the run around them
+    "event_compaction_days": 7,           # Completed days compacted each night
+    # Overnight matter keyword refresh (change feed consumer)
+    "matter_keyword_refresh_enabled": False,
+    # Scheduled database snapshots
+    "backup_enabled": False,
+    "backup_interval_hours": 1.0,
+    "backup_keep": 24,                # Verified snapshots kept
+    "backup_directory": None,         # None = 'backups' next to the database
+    # Overnight database maintenance (ANALYZE/optimize/vacuum as advised)
+    "database_maintenance_enabled": False,
+    "database_maintenance_allow_vacuum": False,  # Permit full VACUUM rewrites
+    # Tracking loop profiling (per-stage tick timings)
+    "tracker_profiling_enabled": False,
+    "tracker_profile_log_minutes": 5.0,  # Minutes between profile log lines; 0 = never
+    # Adaptive polling (back off while locked, idle or unchanged)
+    "adaptive_polling_enabled": False,
+    "adaptive_poll_max_seconds": 15.0,  # Longest poll interval; bounds how late a return is noticed
+    "adaptive_poll_backoff": 2.0,       # Interval growth per quiet poll
 }
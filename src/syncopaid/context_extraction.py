@@ -1,9 +1,57 @@
 """Extract contextual information from window titles."""
 import logging
-from .context_extraction_browser import extract_url_from_browser
+from functools import lru_cache
+from typing import Dict
+
+from .context_extraction_browser import BROWSER_APPS, extract_url_from_browser
 from .context_extraction_outlook import extract_subject_from_outlook
-from .context_extraction_office import extract_filepath_from_office
-from .context_extraction_legal import extract_legal_context
+from .context_extraction_office import OFFICE_APPS, extract_filepath_from_office
+from .context_extraction_legal import (
+    LEGAL_RESEARCH_APPS,
+    _extract_legal_context,
+    extract_legal_context,
+)
+
+# (app, title) pairs remembered; the same window is polled for minutes
+EXTRACTION_CACHE_SIZE = 512
+
+
+def _build_extractor_table() -> Dict[str, tuple]:
+    """
+    Map lowercase app names to the extractors that apply to them, in order.
+
+    Every extractor returns None for apps outside its own list, so trying
+    only these gives the same result as trying every extractor in turn.
+    """
+    table = {}
+    for app in BROWSER_APPS:
+        # Legal research sites first (highest value), then the URL
+        table[app] = (_extract_legal_context, extract_url_from_browser)
+    for app in LEGAL_RESEARCH_APPS:
+        table[app] = (_extract_legal_context,)
+    table['outlook.exe'] = (extract_subject_from_outlook,)
+    for app in OFFICE_APPS:
+        table[app.lower()] = (extract_filepath_from_office,)
+    return table
+
+
+_EXTRACTORS = _build_extractor_table()
+
+
+@lru_cache(maxsize=EXTRACTION_CACHE_SIZE)
+def _extract_context_cached(app: str, title: str) -> str:
+    """Run the app's extractors; memoized per (app, title)."""
+    try:
+        for extractor in _EXTRACTORS.get(app.lower(), ()):
+            context = extractor(app, title)
+            if context:
+                return context
+        return None
+
+    except Exception as e:
+        logging.debug(f"Context extraction failed for {app}: {e}")
+        return None
+
 
 def extract_context(app: str, title: str) -> str:
     """
@@ -15,6 +63,8 @@ def extract_context(app: str, title: str) -> str:
     - Outlook → Email subject extraction
     - Office apps → File path extraction
 
+    Results are memoized per (app, title); see get_extraction_cache_stats().
+
     Args:
         app: Application executable name
         title: Window title text
@@ -24,30 +74,38 @@ def extract_context(app: str, title: str) -> str:
     """
     if not app or not title:
         return None
+    return _extract_context_cached(app, title)
 
-    try:
-        # Try legal research extraction first (highest value)
-        legal = extract_legal_context(app, title)
-        if legal:
-            return legal
-
-        # Try browser URL extraction
-        url = extract_url_from_browser(app, title)
-        if url:
-            return url
-
-        # Try Outlook subject extraction
-        subject = extract_subject_from_outlook(app, title)
-        if subject:
-            return subject
-
-        # Try Office filepath extraction
-        filepath = extract_filepath_from_office(app, title)
-        if filepath:
-            return filepath
 
-        return None
+def _cache_stats(cached_function) -> Dict[str, float]:
+    """Summarize an lru_cache's counters."""
+    info = cached_function.cache_info()
+    lookups = info.hits + info.misses
+    return {
+        'hits': info.hits,
+        'misses': info.misses,
+        'entries': info.currsize,
+        'max_entries': info.maxsize,
+        'hit_rate': round(info.hits / lookups, 4) if lookups else 0.0,
+    }
 
-    except Exception as e:
-        logging.debug(f"Context extraction failed for {app}: {e}")
-        return None
+
+def get_extraction_cache_stats() -> Dict[str, Dict[str, float]]:
+    """
+    Get hit/miss counters of the extraction memos.
+
+    Returns:
+        Dictionary with 'context' (extract_context) and 'legal'
+        (extract_legal_context), each holding hits, misses, entries,
+        max_entries and hit_rate
+    """
+    return {
+        'context': _cache_stats(_extract_context_cached),
+        'legal': _cache_stats(extract_legal_context),
+    }
+
+
+def clear_extraction_cache() -> None:
+    """Drop memoized extraction results and reset their counters."""
+    _extract_context_cached.cache_clear()
+    extract_legal_context.cache_clear()
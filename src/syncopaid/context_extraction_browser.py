@@ -4,6 +4,10 @@ import re
 # Browser executable names (case-insensitive matching)
 BROWSER_APPS = {'chrome.exe', 'msedge.exe', 'firefox.exe', 'brave.exe', 'opera.exe'}
 
+# Pattern matches http:// or https:// URLs
+# Looks for protocol + domain + optional path
+URL_PATTERN = re.compile(r'https?://[^\s<>"\'\[\]{}|\\^`]+')
+
 def extract_url_from_browser(app: str, title: str) -> str:
     """
     Extract URL from browser window title.
@@ -22,11 +26,7 @@ def extract_url_from_browser(app: str, title: str) -> str:
     if app.lower() not in BROWSER_APPS:
         return None
 
-    # Pattern matches http:// or https:// URLs
-    # Looks for protocol + domain + optional path
-    url_pattern = r'https?://[^\s<>"\'\[\]{}|\\^`]+'
-
-    match = re.search(url_pattern, title)
+    match = URL_PATTERN.search(title)
     if match:
         return match.group(0)
 
@@ -1,5 +1,6 @@
 """Legal research context extraction from window titles."""
 import re
+from functools import lru_cache
 from .context_extraction_browser import BROWSER_APPS
 
 # Legal research platforms (desktop apps and browser patterns)
@@ -41,6 +42,18 @@ DOCKET_PATTERN = re.compile(
     re.IGNORECASE
 )
 
+# "Re: Matter of X" prefix, reported without the "Re:"
+RE_MATTER_PATTERN = re.compile(
+    r'Re:\s*(Matter\s+of\s+[A-Z][a-zA-Z\'\-]+(?:\s+(?:of\s+)?[A-Z][a-zA-Z\'\-]+)*)'
+)
+
+TRAILING_SEPARATOR_PATTERN = re.compile(r'[\s\-]+$')
+
+DIGIT_PATTERN = re.compile(r'\d')
+
+# (app, title) pairs remembered by extract_legal_context()
+LEGAL_CONTEXT_CACHE_SIZE = 512
+
 def is_legal_research_app(app: str, title: str = None) -> bool:
     """
     Detect if window is a legal research application.
@@ -104,7 +117,7 @@ def extract_case_name(title: str) -> str:
         return None
 
     # Handle "Re:" prefix separately (strip it from result)
-    re_prefix_match = re.search(r'Re:\s*(Matter\s+of\s+[A-Z][a-zA-Z\'\-]+(?:\s+(?:of\s+)?[A-Z][a-zA-Z\'\-]+)*)', title)
+    re_prefix_match = RE_MATTER_PATTERN.search(title)
     if re_prefix_match:
         return re_prefix_match.group(1).strip()
 
@@ -112,7 +125,7 @@ def extract_case_name(title: str) -> str:
     if match:
         case_name = match.group(1).strip()
         # Clean up trailing punctuation
-        case_name = re.sub(r'[\s\-]+$', '', case_name)
+        case_name = TRAILING_SEPARATOR_PATTERN.sub('', case_name)
         return case_name if len(case_name) > 5 else None
 
     return None
@@ -136,11 +149,12 @@ def extract_docket_number(title: str) -> str:
     if match:
         docket = match.group(1).strip()
         # Must have at least one digit to be a valid docket
-        if re.search(r'\d', docket):
+        if DIGIT_PATTERN.search(docket):
             return docket
 
     return None
 
+@lru_cache(maxsize=LEGAL_CONTEXT_CACHE_SIZE)
 def extract_legal_context(app: str, title: str) -> str:
     """
     Extract legal research context from window title.
@@ -150,6 +164,8 @@ def extract_legal_context(app: str, title: str) -> str:
     2. US case names (Smith v. Jones)
     3. Docket/file numbers (2024-CV-12345)
 
+    Results are memoized per (app, title).
+
     Args:
         app: Application executable name
         title: Window title text
@@ -157,6 +173,10 @@ def extract_legal_context(app: str, title: str) -> str:
     Returns:
         Extracted legal context or None
     """
+    return _extract_legal_context(app, title)
+
+def _extract_legal_context(app: str, title: str) -> str:
+    """Uncached extract_legal_context()."""
     if not is_legal_research_app(app, title):
         return None
 
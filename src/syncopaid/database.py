@@ -13,12 +13,20 @@ import logging
 from pathlib import Path
 
 from .database_connection import ConnectionMixin
+from .database_cache import QueryCacheMixin
 from .database_schema import SchemaMixin
 from .database_operations import OperationsMixin
 from .database_screenshots import ScreenshotDatabaseMixin
 from .database_statistics import StatisticsDatabaseMixin, format_duration
 from .database_keywords import KeywordsDatabaseMixin
 from .database_patterns import PatternsDatabaseMixin
+from .database_search import SearchDatabaseMixin
+from .database_shards import ShardDatabaseMixin
+from .database_deletion_jobs import DeletionJobsDatabaseMixin
+from .database_backup import BackupDatabaseMixin
+from .database_changes import ChangeFeedDatabaseMixin
+from .database_diagnostics import DiagnosticsDatabaseMixin
+from .database_merge import MergeDatabaseMixin
 
 
 class Database(
@@ -28,7 +36,15 @@ class Database(
     ScreenshotDatabaseMixin,
     StatisticsDatabaseMixin,
     KeywordsDatabaseMixin,
-    PatternsDatabaseMixin
+    PatternsDatabaseMixin,
+    SearchDatabaseMixin,
+    ShardDatabaseMixin,
+    DeletionJobsDatabaseMixin,
+    BackupDatabaseMixin,
+    ChangeFeedDatabaseMixin,
+    DiagnosticsDatabaseMixin,
+    MergeDatabaseMixin,
+    QueryCacheMixin
 ):
     """
     SQLite database manager for activity events.
@@ -40,17 +56,33 @@ class Database(
     - Deleting events by date range
     - Database statistics
     - Screenshot management
+    - Full-text search
+    - Per-month shard files for closed months
+    - Optional read-through cache for repeated reads
+    - Chunked, resumable secure deletion jobs
+    - Online backups and snapshot verification
+    - Change feed for incremental consumers
+    - Storage profiling and maintenance advice
+    - Merging other machines' databases
     """
 
-    def __init__(self, db_path: str):
+    def __init__(self, db_path: str, persistent_connections: bool = True,
+                 query_cache_size: int = 0):
         """
         Initialize database connection.
 
         Args:
             db_path: Path to SQLite database file. Parent directory will
                     be created if it doesn't exist.
+            persistent_connections: Keep one WAL-mode connection per thread
+                    (default). False opens a fresh connection per call.
+            query_cache_size: Maximum results kept by the read-through
+                    query cache (default 0 = disabled)
         """
         self.db_path = Path(db_path)
+        self._init_connections(persistent_connections)
+        self._init_query_cache(query_cache_size)
+        self._init_shards()
 
         # Ensure parent directory exists
         self._ensure_db_directory()
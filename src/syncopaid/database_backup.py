@@ -0,0 +1,146 @@
+"""
+Online backups of the live database using the SQLite backup API.
+
+Provides:
+- Incremental backup of the main database (and its month shards) while
+  the tracker keeps writing
+- Verification of a finished snapshot
+
+The source database runs in WAL mode, so each backup step only holds a
+read snapshot and never blocks the tracker's writes. Steps are small and
+separated by a short sleep. If another connection writes while a
+backup is in progress, SQLite restarts the copy from the first page; a
+backup that keeps being restarted falls back to copying everything in a
+single step (one read snapshot, still without blocking writers).
+"""
+
+import logging
+import sqlite3
+from pathlib import Path
+from typing import Callable, Dict, Optional
+
+
+class _BackupRestarted(Exception):
+    """Raised from the progress callback to abandon a restarting backup."""
+
+
+class BackupDatabaseMixin:
+    """
+    Mixin providing online backup and snapshot verification.
+
+    Must be mixed with a class that provides:
+    - self.db_path: Path to the main SQLite database
+    - self.BUSY_TIMEOUT_SECONDS: From ConnectionMixin
+    - self.list_shards(), self.shard_path(): From ShardDatabaseMixin
+    """
+
+    # Restarts tolerated before falling back to a single-step copy
+    BACKUP_MAX_RESTARTS = 3
+
+    def backup(
+        self,
+        dest,
+        pages_per_step: int = 256,
+        sleep: float = 0.005,
+        progress: Optional[Callable[[int, int], None]] = None
+    ) -> Path:
+        """
+        Copy the live database to dest without pausing tracking.
+
+        Shard files are copied to '<dest stem>-shards/' next to dest, so the
+        snapshot opens like the original. The copy is a self-contained
+        rollback-journal database (no -wal file needed).
+
+        Args:
+            dest: Destination file path (overwritten if it exists)
+            pages_per_step: Pages copied per step
+            sleep: Seconds to sleep between steps
+            progress: Optional callback(remaining_pages, total_pages)
+
+        Returns:
+            Path of the snapshot
+        """
+        dest = Path(dest)
+        dest.parent.mkdir(parents=True, exist_ok=True)
+
+        self._backup_file(self.db_path, dest, pages_per_step, sleep, progress)
+
+        shards = self.list_shards()
+        if shards:
+            shard_dir = dest.parent / f"{dest.stem}-shards"
+            shard_dir.mkdir(exist_ok=True)
+            for month in shards:
+                self._backup_file(
+                    self.shard_path(month), shard_dir / f"{month}.db", pages_per_step, sleep
+                )
+
+        logging.info(f"Database backed up to {dest}")
+        return dest
+
+    def _backup_file(
+        self,
+        source_path: Path,
+        dest: Path,
+        pages_per_step: int,
+        sleep: float,
+        progress: Optional[Callable[[int, int], None]] = None
+    ):
+        """Back up one database file, falling back to a single step if it keeps restarting."""
+        restarts = 0
+        last_remaining = None
+
+        def on_progress(status, remaining, total):
+            nonlocal restarts, last_remaining
+            if last_remaining is not None and remaining > last_remaining:
+                restarts += 1
+                if restarts > self.BACKUP_MAX_RESTARTS:
+                    raise _BackupRestarted()
+            last_remaining = remaining
+            if progress is not None:
+                progress(remaining, total)
+
+        source = sqlite3.connect(source_path, timeout=self.BUSY_TIMEOUT_SECONDS)
+        target = sqlite3.connect(dest)
+        try:
+            try:
+                source.backup(target, pages=pages_per_step, progress=on_progress, sleep=sleep)
+            except _BackupRestarted:
+                logging.info(f"Backup of {source_path.name} kept restarting; copying in one step")
+                source.backup(target, pages=-1)
+            # Keep the snapshot self-contained in one file
+            target.execute("PRAGMA journal_mode = DELETE")
+        finally:
+            target.close()
+            source.close()
+
+    @staticmethod
+    def verify_backup(path) -> Dict:
+        """
+        Check that a snapshot opens and is internally consistent.
+
+        Args:
+            path: Snapshot file path
+
+        Returns:
+            Dictionary with ok, integrity (integrity_check result),
+            schema_version and event_count
+        """
+        result = {'ok': False, 'integrity': None, 'schema_version': None, 'event_count': None}
+        try:
+            conn = sqlite3.connect(f"file:{Path(path).as_posix()}?mode=ro", uri=True)
+        except sqlite3.Error as e:
+            result['integrity'] = str(e)
+            return result
+
+        try:
+            rows = conn.execute("PRAGMA integrity_check").fetchall()
+            result['integrity'] = "; ".join(row[0] for row in rows)
+            result['schema_version'] = conn.execute("PRAGMA user_version").fetchone()[0]
+            result['event_count'] = conn.execute("SELECT COUNT(*) FROM events").fetchone()[0]
+            result['ok'] = result['integrity'] == "ok"
+        except sqlite3.Error as e:
+            result['integrity'] = str(e)
+        finally:
+            conn.close()
+
+        return result
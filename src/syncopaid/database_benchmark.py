@@ -0,0 +1,451 @@
+"""
+Standalone benchmarks for database operations.
+
+Measures per-operation latency of the hot database paths so changes to
+connection handling, schema, or queries can be compared before and after.
+
+Run with: python -m syncopaid.database_benchmark
+"""
+
+import json
+import logging
+import os
+import random
+import sqlite3
+import tempfile
+import time
+from datetime import datetime, timedelta
+from typing import Callable, Dict, List
+
+from .database import Database
+from .database_operations_events_conversion import _event_decoder
+from .exporter_analysis import calculate_app_breakdown, calculate_duration_stats
+from .tracker_state import ActivityEvent
+
+
+def _time_operation(operation: Callable[[int], None], iterations: int) -> float:
+    """
+    Run an operation repeatedly and return mean latency.
+
+    Args:
+        operation: Callable receiving the iteration index
+        iterations: Number of times to run the operation
+
+    Returns:
+        Mean latency per call in milliseconds
+    """
+    start = time.perf_counter()
+    for i in range(iterations):
+        operation(i)
+    elapsed = time.perf_counter() - start
+    return elapsed / iterations * 1000
+
+
+def _sample_event(i: int) -> ActivityEvent:
+    """Build a representative event for iteration i."""
+    start = datetime(2025, 12, 9, 9, 0, 0) + timedelta(seconds=i * 30)
+    return ActivityEvent(
+        timestamp=start.isoformat(),
+        duration_seconds=30.0,
+        app="WINWORD.EXE",
+        title=f"Smith-Contract-v{i % 7}.docx - Word",
+        end_time=(start + timedelta(seconds=30)).isoformat(),
+        cmdline=["WINWORD.EXE", "[PATH]\\Smith-Contract.docx"],
+        interaction_level="typing"
+    )
+
+
+def benchmark_connection_modes(iterations: int = 500) -> Dict[str, Dict[str, float]]:
+    """
+    Compare per-call connections against persistent per-thread connections.
+
+    Args:
+        iterations: Number of calls per operation
+
+    Returns:
+        {'per_call': {...}, 'persistent': {...}} mapping operation name to
+        mean latency in milliseconds
+    """
+    results = {}
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        for label, persistent in (('per_call', False), ('persistent', True)):
+            db = Database(os.path.join(tmpdir, f"{label}.db"), persistent_connections=persistent)
+
+            timings = {}
+            timings['insert_event'] = _time_operation(
+                lambda i: db.insert_event(_sample_event(i)), iterations
+            )
+            timings['get_events'] = _time_operation(
+                lambda i: db.get_events(start_date="2025-12-09", end_date="2025-12-09", limit=50),
+                iterations
+            )
+            timings['insert_screenshot'] = _time_operation(
+                lambda i: db.insert_screenshot(
+                    captured_at=_sample_event(i).timestamp,
+                    file_path=f"C:\\screenshots\\{i:06d}.jpg",
+                    window_app="WINWORD.EXE",
+                    window_title="Smith-Contract.docx - Word",
+                    dhash="0f0f0f0f0f0f0f0f"
+                ),
+                iterations
+            )
+
+            db.close()
+            results[label] = timings
+
+    return results
+
+
+def _legacy_rows_to_dicts(rows) -> List[Dict]:
+    """Row conversion as it was before the schema-aware decoder (baseline)."""
+    events = []
+    for row in rows:
+        if 'state' in row.keys() and row['state']:
+            state = row['state']
+        else:
+            state = 'Inactive' if row['is_idle'] else 'Active'
+        metadata = None
+        if 'metadata' in row.keys() and row['metadata']:
+            metadata = json.loads(row['metadata'])
+        if 'interaction_level' in row.keys() and row['interaction_level']:
+            interaction_level = row['interaction_level']
+        else:
+            interaction_level = 'passive'
+        events.append({
+            'id': row['id'],
+            'timestamp': row['timestamp'],
+            'duration_seconds': row['duration_seconds'],
+            'end_time': row['end_time'] if 'end_time' in row.keys() else None,
+            'app': row['app'],
+            'title': row['title'],
+            'url': row['url'],
+            'cmdline': row['cmdline'] if 'cmdline' in row.keys() else None,
+            'is_idle': bool(row['is_idle']),
+            'state': state,
+            'metadata': metadata,
+            'interaction_level': interaction_level,
+            'matter_id': row['matter_id'] if 'matter_id' in row.keys() else None,
+            'confidence': row['confidence'] if 'confidence' in row.keys() else 0,
+            'flagged_for_review': bool(row['flagged_for_review']) if 'flagged_for_review' in row.keys() else False
+        })
+    return events
+
+
+def benchmark_row_decoding(row_count: int = 100_000) -> Dict[str, float]:
+    """
+    Compare event row decoders on a fetched result set.
+
+    Args:
+        row_count: Number of event rows to decode
+
+    Returns:
+        Mapping of decoder name to total decode time in milliseconds
+    """
+    results = {}
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        db = Database(os.path.join(tmpdir, "decode.db"))
+        events = [_sample_event(i) for i in range(row_count)]
+        for i, event in enumerate(events):
+            if i % 10 == 0:
+                event.metadata = {'ui_element': 'Document', 'control_type': 'Edit'}
+        db.insert_events_batch(events)
+
+        with db._get_connection() as conn:
+            rows = conn.execute("SELECT * FROM events ORDER BY start_ms").fetchall()
+        column_names = tuple(rows[0].keys())
+        db.close()
+
+    def timed(decode: Callable) -> float:
+        start = time.perf_counter()
+        decode()
+        return (time.perf_counter() - start) * 1000
+
+    results['legacy_dicts'] = timed(lambda: _legacy_rows_to_dicts(rows))
+
+    decode_dict = _event_decoder(column_names, False)
+    results['decoder_dicts'] = timed(lambda: [decode_dict(row) for row in rows])
+
+    decode_record = _event_decoder(column_names, True)
+    results['event_records'] = timed(lambda: [decode_record(row) for row in rows])
+
+    return results
+
+
+def benchmark_event_paging(event_count: int = 50_000, page_size: int = 200) -> Dict[str, float]:
+    """
+    Compare opening an event list by loading everything vs. the first keyset page.
+
+    Args:
+        event_count: Number of events in the browsed range
+        page_size: Events per page
+
+    Returns:
+        Mapping of strategy name to latency in milliseconds
+    """
+    results = {}
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        db = Database(os.path.join(tmpdir, "paging.db"))
+        db.insert_events_batch([_sample_event(i) for i in range(event_count)])
+
+        def timed(operation: Callable) -> float:
+            start = time.perf_counter()
+            operation()
+            return (time.perf_counter() - start) * 1000
+
+        results['load_all'] = timed(
+            lambda: db.get_events(include_idle=False)
+        )
+        results['first_page'] = timed(
+            lambda: (db.page_events(limit=page_size, include_idle=False, descending=True),
+                     db.count_events(include_idle=False))
+        )
+
+        # Deep pages cost the same as the first with a keyset cursor
+        _, key = db.page_events(limit=event_count - page_size, include_idle=False, descending=True,
+                                columns=('id',))
+        results['deep_page'] = timed(
+            lambda: db.page_events(after_key=key, limit=page_size, include_idle=False, descending=True)
+        )
+
+        db.close()
+
+    return results
+
+
+def _synthetic_year(days: int = 365, events_per_day: int = 400) -> List[ActivityEvent]:
+    """
+    Build a deterministic year of events shaped like a lawyer's workday.
+
+    Each day draws a few hundred events from a handful of apps and a pool
+    of recurring window titles (matters revisited across weeks).
+    """
+    rng = random.Random(0)
+    apps = {
+        'WINWORD.EXE': ["WINWORD.EXE", "/n", "[PATH]\\{matter}.docx"],
+        'OUTLOOK.EXE': ["OUTLOOK.EXE", "/recycle"],
+        'chrome.exe': ["chrome.exe", "--profile-directory=Default"],
+        'AcroRd32.exe': ["AcroRd32.exe", "[PATH]\\{matter}.pdf"],
+        'EXCEL.EXE': ["EXCEL.EXE", "[PATH]\\{matter}-billing.xlsx"],
+    }
+    matters = [f"{name}-{n:03d}" for n in range(120) for name in ("Smith", "Jones")]
+    templates = {
+        'WINWORD.EXE': "{matter} Statement of Claim v{v}.docx - Word",
+        'OUTLOOK.EXE': "RE: {matter} - settlement discussions - Outlook",
+        'chrome.exe': "CanLII - {matter} research - Google Chrome",
+        'AcroRd32.exe': "{matter} Affidavit #{v}.pdf - Adobe Acrobat Reader",
+        'EXCEL.EXE': "{matter}-billing.xlsx - Excel",
+    }
+
+    events = []
+    start = datetime(2025, 1, 1, 9, 0, 0)
+    for day in range(days):
+        day_start = start + timedelta(days=day)
+        active = rng.sample(matters, 12)
+        for i in range(events_per_day):
+            app = rng.choice(list(apps))
+            matter = rng.choice(active)
+            timestamp = day_start + timedelta(seconds=i * 60)
+            events.append(ActivityEvent(
+                timestamp=timestamp.isoformat(),
+                duration_seconds=60.0,
+                app=app,
+                title=templates[app].format(matter=matter, v=rng.randint(1, 3)),
+                url="https://www.canlii.org/en/" if app == 'chrome.exe' else None,
+                end_time=(timestamp + timedelta(seconds=60)).isoformat(),
+                cmdline=[part.format(matter=matter) for part in apps[app]],
+                is_idle=rng.random() < 0.05
+            ))
+    return events
+
+
+def benchmark_interned_storage(days: int = 365, events_per_day: int = 400) -> Dict[str, Dict[str, float]]:
+    """
+    Compare plain-text events storage with dictionary-encoded event_rows.
+
+    The plain layout stores every app, title, cmdline and ISO timestamp as
+    text; event_rows references the dictionaries and keeps times as epoch
+    ms only. Both are copied into standalone files, vacuumed and measured
+    for the size of the rows alone, the size with their indices, and a
+    GROUP BY app, title report.
+
+    Args:
+        days: Days of synthetic history
+        events_per_day: Events per day
+
+    Returns:
+        {'plain': {...}, 'interned': {...}} with rows_mb, size_mb and group_by_ms
+    """
+    results = {}
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        source = os.path.join(tmpdir, "source.db")
+        db = Database(source)
+        db.insert_events_batch(_synthetic_year(days, events_per_day))
+        db.close()
+
+        tables = {
+            'plain': [
+                "CREATE TABLE events AS SELECT * FROM src.events",
+            ],
+            'interned': [
+                "CREATE TABLE event_rows AS SELECT * FROM src.event_rows",
+                "CREATE TABLE apps AS SELECT * FROM src.apps",
+                "CREATE TABLE titles AS SELECT * FROM src.titles",
+                "CREATE TABLE cmdlines AS SELECT * FROM src.cmdlines",
+            ],
+        }
+        indices = {
+            'plain': [
+                "CREATE INDEX idx_timestamp ON events(timestamp)",
+                "CREATE INDEX idx_app ON events(app)",
+                "CREATE INDEX idx_events_start_state ON events(start_ms, state)",
+                "CREATE INDEX idx_events_matter_start ON events(matter_id, start_ms)",
+            ],
+            'interned': [
+                "CREATE UNIQUE INDEX idx_apps_value ON apps(value)",
+                "CREATE UNIQUE INDEX idx_titles_value ON titles(value)",
+                "CREATE UNIQUE INDEX idx_cmdlines_value ON cmdlines(value)",
+                "CREATE INDEX idx_app ON event_rows(app_id)",
+                "CREATE INDEX idx_events_title ON event_rows(title_id)",
+                "CREATE INDEX idx_events_cmdline ON event_rows(cmdline_id)",
+                "CREATE INDEX idx_events_start_state ON event_rows(start_ms, state)",
+                "CREATE INDEX idx_events_matter_start ON event_rows(matter_id, start_ms)",
+            ],
+        }
+        reports = {
+            'plain': """
+                SELECT app, title, COUNT(*), SUM(duration_seconds)
+                FROM events GROUP BY app, title
+            """,
+            'interned': """
+                SELECT apps.value, titles.value, g.n, g.total
+                FROM (
+                    SELECT app_id, title_id, COUNT(*) AS n, SUM(duration_seconds) AS total
+                    FROM event_rows GROUP BY app_id, title_id
+                ) g
+                LEFT JOIN apps ON apps.id = g.app_id
+                LEFT JOIN titles ON titles.id = g.title_id
+            """,
+        }
+
+        for label, statements in tables.items():
+            path = os.path.join(tmpdir, f"{label}.db")
+            conn = sqlite3.connect(path)
+            conn.execute("ATTACH DATABASE ? AS src", (source,))
+            for statement in statements:
+                conn.execute(statement)
+            conn.commit()
+            conn.execute("DETACH DATABASE src")
+            conn.execute("VACUUM")
+            rows_mb = os.path.getsize(path) / (1024 * 1024)
+
+            for statement in indices[label]:
+                conn.execute(statement)
+            conn.commit()
+            conn.execute("VACUUM")
+
+            start = time.perf_counter()
+            conn.execute(reports[label]).fetchall()
+            group_by_ms = (time.perf_counter() - start) * 1000
+            conn.close()
+
+            results[label] = {
+                'rows_mb': rows_mb,
+                'size_mb': os.path.getsize(path) / (1024 * 1024),
+                'group_by_ms': group_by_ms,
+            }
+
+    return results
+
+
+def benchmark_range_summary(days: int = 90, events_per_day: int = 400) -> Dict[str, float]:
+    """
+    Compare a per-day, per-app report built day by day from events with get_range_summary().
+
+    Args:
+        days: Days in the reported range
+        events_per_day: Events per day
+
+    Returns:
+        Mapping of strategy name to latency in milliseconds
+    """
+    results = {}
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        db = Database(os.path.join(tmpdir, "summary.db"))
+        db.insert_events_batch(_synthetic_year(days, events_per_day))
+        first = datetime(2025, 1, 1)
+        start_date = first.date().isoformat()
+        end_date = (first + timedelta(days=days - 1)).date().isoformat()
+
+        def per_day_events():
+            for day in range(days):
+                date = (first + timedelta(days=day)).date().isoformat()
+                events = db.get_events(start_date=date, end_date=date)
+                calculate_app_breakdown(events)
+                calculate_duration_stats(events)
+
+        def timed(operation: Callable) -> float:
+            start = time.perf_counter()
+            operation()
+            return (time.perf_counter() - start) * 1000
+
+        results['per_day_events'] = timed(per_day_events)
+        results['range_summary'] = timed(
+            lambda: db.get_range_summary(start_date, end_date, group_by=('day', 'app'))
+        )
+        db.close()
+
+    return results
+
+
+def run_database_benchmarks(iterations: int = 500, row_count: int = 100_000):
+    """Run all database benchmarks and print comparison tables."""
+    logging.basicConfig(level=logging.WARNING)
+
+    print(f"Database connection benchmark ({iterations} calls per operation)\n")
+    results = benchmark_connection_modes(iterations)
+
+    print(f"{'Operation':<20} {'Per-call (ms)':>14} {'Persistent (ms)':>16} {'Speedup':>9}")
+    print("-" * 62)
+    for operation in results['per_call']:
+        before = results['per_call'][operation]
+        after = results['persistent'][operation]
+        speedup = before / after if after > 0 else float('inf')
+        print(f"{operation:<20} {before:>14.3f} {after:>16.3f} {speedup:>8.1f}x")
+
+    print(f"\nEvent row decoding ({row_count} rows)\n")
+    decoding = benchmark_row_decoding(row_count)
+    baseline = decoding['legacy_dicts']
+
+    print(f"{'Decoder':<20} {'Total (ms)':>14} {'Speedup':>9}")
+    print("-" * 45)
+    for decoder, elapsed in decoding.items():
+        speedup = baseline / elapsed if elapsed > 0 else float('inf')
+        print(f"{decoder:<20} {elapsed:>14.1f} {speedup:>8.1f}x")
+
+    print("\nEvent list opening (50000 events)\n")
+    for strategy, elapsed in benchmark_event_paging().items():
+        print(f"{strategy:<20} {elapsed:>14.1f} ms")
+
+    print("\nEvents storage, synthetic year (365 days x 400 events)\n")
+    storage = benchmark_interned_storage()
+    print(f"{'Layout':<20} {'Rows (MB)':>14} {'+ indices (MB)':>15} {'GROUP BY (ms)':>14}")
+    print("-" * 66)
+    for layout, measured in storage.items():
+        print(f"{layout:<20} {measured['rows_mb']:>14.1f} {measured['size_mb']:>15.1f} "
+              f"{measured['group_by_ms']:>14.1f}")
+    plain, interned = storage['plain'], storage['interned']
+    print(f"{'Reduction':<20} {plain['rows_mb'] / interned['rows_mb']:>13.1f}x "
+          f"{plain['size_mb'] / interned['size_mb']:>14.1f}x")
+
+    print("\nPer-day, per-app summary over 90 days (400 events/day)\n")
+    for strategy, elapsed in benchmark_range_summary().items():
+        print(f"{strategy:<20} {elapsed:>14.1f} ms")
+
+
+if __name__ == "__main__":
+    run_database_benchmarks()
@@ -0,0 +1,193 @@
+"""
+Read-through result cache for frequently repeated database reads.
+
+Provides:
+- An LRU cache of query results (opt-in; disabled by default)
+- Per-table write counters bumped by the write paths
+- Detection of writes from other connections through PRAGMA data_version
+- Hit/miss counters for tuning
+
+Each cached result records the write counters of the tables it was read
+from. A write through this Database bumps the counters of the tables it
+declared with _touch_tables(); a write that changed rows without
+declaring its tables (raw SQL, schema maintenance) invalidates every
+entry. Commits from other processes are detected by a dedicated probe
+connection whose PRAGMA data_version changes whenever anyone but itself
+commits; each in-process commit re-reads it, so a change seen at lookup
+time came from outside and invalidates every entry. (An outside commit
+landing between one of our commits and that re-read goes unnoticed until
+the next invalidation; SyncoPaid runs as a single instance, so outside
+writers are rare.)
+"""
+
+import copy
+import functools
+import sqlite3
+import threading
+from collections import OrderedDict
+from typing import Callable, Dict, Hashable, Iterable
+
+
+def cached_query(*tables: str):
+    """
+    Decorate a read method so its results go through the query cache.
+
+    Results are keyed on the method name and arguments. Without
+    QueryCacheMixin (or with caching disabled) the method runs directly.
+
+    Args:
+        tables: Tables the method reads from
+    """
+    def decorator(method):
+        @functools.wraps(method)
+        def wrapper(self, *args, **kwargs):
+            if not getattr(self, 'query_cache_size', 0):
+                return method(self, *args, **kwargs)
+            key = (method.__name__, args, tuple(sorted(kwargs.items())))
+            return self._cached(key, tables, lambda: method(self, *args, **kwargs))
+        return wrapper
+    return decorator
+
+
+class QueryCacheMixin:
+    """
+    Mixin providing an opt-in LRU cache for read methods.
+
+    Must be mixed with a class that provides:
+    - self.db_path: Path to SQLite database
+    - self.BUSY_TIMEOUT_SECONDS: From ConnectionMixin
+    """
+
+    def _init_query_cache(self, max_entries: int = 0):
+        """
+        Initialize the result cache.
+
+        Args:
+            max_entries: Maximum cached results; 0 disables caching
+        """
+        self.query_cache_size = max_entries
+        self._cache = OrderedDict()  # key -> (stamp, result)
+        self._cache_lock = threading.Lock()
+        self._cache_local = threading.local()
+        self._table_versions = {}
+        self._cache_generation = 0
+        self._cache_hits = 0
+        self._cache_misses = 0
+        self._cache_probe = None
+        self._cache_data_version = None
+
+    def _touch_tables(self, *tables: str):
+        """
+        Declare the tables the current write transaction modifies.
+
+        Call inside the _get_connection() block doing the write; the tables'
+        counters are bumped when the outermost block ends.
+        """
+        touched = getattr(self._cache_local, 'touched', None)
+        if touched is None:
+            touched = self._cache_local.touched = set()
+        touched.update(tables)
+
+    def _end_transaction(self, changed: bool):
+        """
+        Invalidate cached results after a transaction ends.
+
+        Called by ConnectionMixin when an outermost connection block exits.
+
+        Args:
+            changed: Whether the transaction changed any rows
+        """
+        touched = getattr(self._cache_local, 'touched', None)
+        self._cache_local.touched = None
+        if not changed or not self.query_cache_size:
+            return
+
+        with self._cache_lock:
+            if touched:
+                for table in touched:
+                    self._table_versions[table] = self._table_versions.get(table, 0) + 1
+            else:
+                self._cache_generation += 1
+            # Our own commit moved data_version; only later moves are external
+            self._cache_data_version = self._read_data_version()
+
+    def _read_data_version(self) -> int:
+        """Read PRAGMA data_version on the probe connection. Caller holds the lock."""
+        if self._cache_probe is None:
+            self._cache_probe = sqlite3.connect(
+                self.db_path,
+                timeout=self.BUSY_TIMEOUT_SECONDS,
+                check_same_thread=False
+            )
+        return self._cache_probe.execute("PRAGMA data_version").fetchone()[0]
+
+    def _cached(self, key: Hashable, tables: Iterable[str], compute: Callable):
+        """
+        Return a cached result, computing and storing it on a miss.
+
+        Args:
+            key: Hashable key identifying the query and its arguments
+            tables: Tables the result is read from
+            compute: Zero-argument callable running the query
+
+        Returns:
+            A copy of the cached (or freshly computed) result
+        """
+        if not self.query_cache_size:
+            return compute()
+
+        with self._cache_lock:
+            data_version = self._read_data_version()
+            if data_version != self._cache_data_version:
+                self._cache_data_version = data_version
+                self._cache_generation += 1
+
+            stamp = (self._cache_generation,) + tuple(
+                self._table_versions.get(table, 0) for table in tables
+            )
+            entry = self._cache.get(key)
+            if entry is not None and entry[0] == stamp:
+                self._cache.move_to_end(key)
+                self._cache_hits += 1
+                return copy.deepcopy(entry[1])
+            self._cache_misses += 1
+
+        # Stamped before reading, so a write racing the query leaves the entry stale
+        result = compute()
+
+        with self._cache_lock:
+            self._cache[key] = (stamp, result)
+            self._cache.move_to_end(key)
+            while len(self._cache) > self.query_cache_size:
+                self._cache.popitem(last=False)
+
+        return copy.deepcopy(result)
+
+    def get_query_cache_stats(self) -> Dict:
+        """
+        Get result cache counters.
+
+        Returns:
+            Dictionary with enabled, entries, max_entries, hits and misses
+        """
+        with self._cache_lock:
+            return {
+                'enabled': bool(self.query_cache_size),
+                'entries': len(self._cache),
+                'max_entries': self.query_cache_size,
+                'hits': self._cache_hits,
+                'misses': self._cache_misses,
+            }
+
+    def clear_query_cache(self):
+        """Drop every cached result (counters are kept)."""
+        with self._cache_lock:
+            self._cache.clear()
+            self._cache_generation += 1
+
+    def _close_query_cache(self):
+        """Close the data_version probe connection."""
+        with self._cache_lock:
+            if self._cache_probe is not None:
+                self._cache_probe.close()
+                self._cache_probe = None
@@ -0,0 +1,231 @@
+"""
+Change-data-capture feed for incremental downstream consumers.
+
+Provides:
+- Reading the change log after a sequence number
+- Named consumer checkpoints
+- Truncating log entries every registered consumer has processed
+- Event deltas (current rows plus deleted ids) for a consumer
+
+A consumer registers once, then repeatedly reads changes after its
+checkpoint, processes them and advances the checkpoint. A new consumer
+starts at the current end of the log, so it reads the existing data in
+full once before switching to deltas. Nothing is logged while no
+consumer is registered.
+
+Archiving a month into a shard moves rows rather than deleting them, so
+archive_month() removes the delete entries it generates, and event
+deltas look up rows missing from the main database in the shards.
+"""
+
+import logging
+from typing import Dict, List, Optional, Sequence
+
+
+class ChangeFeedDatabaseMixin:
+    """
+    Mixin providing the change feed API.
+
+    Must be mixed with a class that provides:
+    - self._get_connection(): Context manager for database connections
+    - self._cursor_decoder(): From EventConversionMixin
+    - self.list_shards() and self._attached_shard(): From ShardDatabaseMixin
+    """
+
+    def get_latest_change_seq(self) -> int:
+        """Get the sequence number of the newest change (0 if none)."""
+        with self._get_connection() as conn:
+            row = conn.execute("SELECT seq FROM sqlite_sequence WHERE name = 'changes'").fetchone()
+        return row[0] if row else 0
+
+    def changes_since(
+        self,
+        seq: int = 0,
+        limit: int = 1000,
+        tables: Optional[Sequence[str]] = None
+    ) -> List[Dict]:
+        """
+        Get logged changes after a sequence number.
+
+        Args:
+            seq: Return changes with a greater sequence number
+            limit: Maximum number of changes to return
+            tables: Only changes to these tables (events, screenshots,
+                    matters, clients); None for all
+
+        Returns:
+            List of change dictionaries (seq, table_name, row_id, operation,
+            old_matter_id), oldest first. old_matter_id is the matter an
+            updated or deleted event belonged to before the write.
+        """
+        query = "SELECT seq, table_name, row_id, operation, old_matter_id FROM changes WHERE seq > ?"
+        params = [seq]
+        if tables:
+            query += f" AND table_name IN ({','.join('?' * len(tables))})"
+            params.extend(tables)
+        query += " ORDER BY seq LIMIT ?"
+        params.append(limit)
+
+        with self._get_connection() as conn:
+            return [dict(row) for row in conn.execute(query, params)]
+
+    def register_change_consumer(self, name: str) -> int:
+        """
+        Register a consumer (no-op if already registered).
+
+        Args:
+            name: Consumer name
+
+        Returns:
+            The consumer's checkpoint
+        """
+        with self._get_connection() as conn:
+            conn.execute("""
+                INSERT OR IGNORE INTO change_consumers (name, last_seq)
+                VALUES (?, COALESCE((SELECT seq FROM sqlite_sequence WHERE name = 'changes'), 0))
+            """, (name,))
+            return conn.execute(
+                "SELECT last_seq FROM change_consumers WHERE name = ?", (name,)
+            ).fetchone()[0]
+
+    def get_change_checkpoint(self, name: str) -> Optional[int]:
+        """Get a consumer's checkpoint, or None if it is not registered."""
+        with self._get_connection() as conn:
+            row = conn.execute(
+                "SELECT last_seq FROM change_consumers WHERE name = ?", (name,)
+            ).fetchone()
+        return row[0] if row else None
+
+    def advance_change_consumer(self, name: str, seq: int) -> int:
+        """
+        Record that a consumer has processed every change up to seq.
+
+        Checkpoints never move backwards. Log entries all consumers have
+        processed are truncated.
+
+        Args:
+            name: Registered consumer name
+            seq: Sequence number of the last processed change
+
+        Returns:
+            Number of log entries truncated
+        """
+        with self._get_connection() as conn:
+            cursor = conn.execute("""
+                UPDATE change_consumers
+                SET last_seq = MAX(last_seq, ?), updated_at = CURRENT_TIMESTAMP
+                WHERE name = ?
+            """, (seq, name))
+            if cursor.rowcount == 0:
+                raise ValueError(f"Change consumer not registered: {name}")
+        return self.truncate_changes()
+
+    def unregister_change_consumer(self, name: str) -> bool:
+        """
+        Remove a consumer so it no longer holds back truncation.
+
+        Args:
+            name: Consumer name
+
+        Returns:
+            True if the consumer was registered
+        """
+        with self._get_connection() as conn:
+            cursor = conn.execute("DELETE FROM change_consumers WHERE name = ?", (name,))
+            removed = cursor.rowcount > 0
+        if removed:
+            self.truncate_changes()
+        return removed
+
+    def truncate_changes(self) -> int:
+        """
+        Delete log entries every registered consumer has processed.
+
+        With no registered consumers the whole log is truncated.
+
+        Returns:
+            Number of log entries deleted
+        """
+        with self._get_connection() as conn:
+            cursor = conn.execute("""
+                DELETE FROM changes
+                WHERE seq <= COALESCE(
+                    (SELECT MIN(last_seq) FROM change_consumers),
+                    (SELECT MAX(seq) FROM changes)
+                )
+            """)
+            deleted = cursor.rowcount
+
+        if deleted:
+            logging.debug(f"Truncated {deleted} change log entries")
+        return deleted
+
+    def get_event_changes(self, seq: int = 0, limit: int = 1000) -> Dict:
+        """
+        Get events changed after a sequence number, coalesced per event.
+
+        Reads up to limit log entries (of any table) so last_seq always
+        moves past entries for other tables.
+
+        Args:
+            seq: Checkpoint to read after
+            limit: Maximum number of log entries to read
+
+        Returns:
+            Dictionary with events (current rows of inserted or updated
+            events, in id order), deleted_ids, old_matter_ids (matters
+            updated or deleted events belonged to before the change) and
+            last_seq (the checkpoint to advance to once processed)
+        """
+        changes = self.changes_since(seq, limit)
+        last_seq = changes[-1]['seq'] if changes else seq
+
+        latest = {}
+        old_matter_ids = set()
+        for change in changes:
+            if change['table_name'] == 'events':
+                latest[change['row_id']] = change['operation']
+                if change['old_matter_id'] is not None:
+                    old_matter_ids.add(change['old_matter_id'])
+
+        live_ids = sorted(row_id for row_id, operation in latest.items() if operation != 'delete')
+        with self._get_connection() as conn:
+            events = self._events_by_ids(conn, 'events', live_ids)
+
+        # Rows archived to a month shard since their change was logged still exist
+        missing = [row_id for row_id in live_ids if row_id not in {event['id'] for event in events}]
+        for month in self.list_shards():
+            if not missing:
+                break
+            with self._get_connection() as conn:
+                with self._attached_shard(conn, month) as alias:
+                    archived = self._events_by_ids(conn, f"{alias}.events", missing)
+            events.extend(archived)
+            found = {event['id'] for event in archived}
+            missing = [row_id for row_id in missing if row_id not in found]
+        events.sort(key=lambda event: event['id'])
+
+        # Rows deleted after their change was logged count as deleted
+        found = {event['id'] for event in events}
+        deleted_ids = sorted(row_id for row_id in latest if row_id not in found)
+
+        return {
+            'events': events,
+            'deleted_ids': deleted_ids,
+            'old_matter_ids': sorted(old_matter_ids),
+            'last_seq': last_seq
+        }
+
+    def _events_by_ids(self, conn, source: str, event_ids: List[int]) -> List[Dict]:
+        """Get the rows of a source (events view or a shard's events table) with the given ids."""
+        events = []
+        # Stay under SQLite's bound-parameter limit
+        for offset in range(0, len(event_ids), 500):
+            chunk = event_ids[offset:offset + 500]
+            cursor = conn.execute(
+                f"SELECT * FROM {source} WHERE id IN ({','.join('?' * len(chunk))}) ORDER BY id",
+                chunk
+            )
+            decode = self._cursor_decoder(cursor)
+            events.extend(decode(row) for row in cursor)
+        return events
@@ -4,10 +4,12 @@ Database connection management for SQLite operations.
 Provides:
 - Connection context manager with automatic commit/rollback
 - Row factory configuration for column access by name
+- One long-lived connection per thread (WAL mode, cached prepared statements)
 """
 
 import sqlite3
 import logging
+import threading
 from contextlib import contextmanager
 from pathlib import Path
 
@@ -17,8 +19,92 @@ class ConnectionMixin:
     Mixin providing database connection management.
 
     Requires self.db_path to be set by the using class.
+
+    Each thread that touches the database gets its own persistent connection,
+    opened on first use and reused for every later call on that thread. The
+    database runs in WAL mode so readers (UI threads, exporter) never block the
+    tracker's writes, and sqlite3's per-connection statement cache keeps
+    prepared statements alive between calls.
     """
 
+    # Journal mode applied to the database file (persistent once set)
+    JOURNAL_MODE = "WAL"
+
+    # fsync only at checkpoints; safe against corruption in WAL mode
+    SYNCHRONOUS = "NORMAL"
+
+    # Seconds to wait for a competing writer before raising "database is locked"
+    BUSY_TIMEOUT_SECONDS = 5.0
+
+    # Prepared statements cached per connection by the sqlite3 module
+    STATEMENT_CACHE_SIZE = 256
+
+    def _init_connections(self, persistent: bool = True):
+        """
+        Initialize per-thread connection tracking.
+
+        Args:
+            persistent: Keep one long-lived connection per thread. When False,
+                        every call opens and closes its own connection in the
+                        default rollback-journal mode (legacy behaviour).
+        """
+        self.persistent_connections = persistent
+        self._thread_local = threading.local()
+        self._connections = {}  # id(conn) -> (thread, conn)
+        self._connections_lock = threading.Lock()
+
+    def _open_connection(self) -> sqlite3.Connection:
+        """
+        Open and configure a new SQLite connection.
+
+        Returns:
+            sqlite3.Connection: Connection with row factory and pragmas applied
+        """
+        conn = sqlite3.connect(
+            self.db_path,
+            timeout=self.BUSY_TIMEOUT_SECONDS,
+            check_same_thread=False,
+            cached_statements=self.STATEMENT_CACHE_SIZE
+        )
+        conn.row_factory = sqlite3.Row  # Enable column access by name
+        conn.execute("PRAGMA secure_delete = ON")
+        if getattr(self, 'persistent_connections', False):
+            conn.execute(f"PRAGMA journal_mode = {self.JOURNAL_MODE}")
+            conn.execute(f"PRAGMA synchronous = {self.SYNCHRONOUS}")
+        return conn
+
+    def _thread_connection(self) -> sqlite3.Connection:
+        """
+        Get the calling thread's persistent connection, opening it if needed.
+
+        Returns:
+            sqlite3.Connection: Connection owned by the current thread
+        """
+        local = self._thread_local
+        conn = getattr(local, 'conn', None)
+        if conn is not None:
+            return conn
+
+        conn = self._open_connection()
+        local.conn = conn
+        local.depth = 0
+
+        with self._connections_lock:
+            self._prune_dead_connections()
+            self._connections[id(conn)] = (threading.current_thread(), conn)
+
+        logging.debug(
+            f"Opened database connection for thread {threading.current_thread().name}"
+        )
+        return conn
+
+    def _prune_dead_connections(self):
+        """Close connections whose owning thread has exited. Caller holds the lock."""
+        for key, (thread, conn) in list(self._connections.items()):
+            if not thread.is_alive():
+                conn.close()
+                del self._connections[key]
+
     @contextmanager
     def _get_connection(self):
         """
@@ -28,14 +114,72 @@ class ConnectionMixin:
         - Automatic commit on success
         - Automatic rollback on exception
         - Row factory for column access by name
-        - Proper connection cleanup
+        - Nested use on the same thread shares one transaction; only the
+          outermost block commits or rolls back
 
         Yields:
             sqlite3.Connection: Database connection with row factory
         """
-        conn = sqlite3.connect(self.db_path)
-        conn.row_factory = sqlite3.Row  # Enable column access by name
-        conn.execute("PRAGMA secure_delete = ON")
+        if not getattr(self, 'persistent_connections', False):
+            with self._get_transient_connection() as conn:
+                yield conn
+            return
+
+        conn = self._thread_connection()
+        local = self._thread_local
+        outermost = local.depth == 0
+        if outermost:
+            # Callers may swap in their own row factory; restore the default
+            conn.row_factory = sqlite3.Row
+            changes = conn.total_changes
+        local.depth += 1
+        try:
+            yield conn
+            if outermost:
+                conn.commit()
+        except Exception as e:
+            if outermost:
+                conn.rollback()
+                logging.error(f"Database error: {e}")
+            raise
+        finally:
+            local.depth -= 1
+            if outermost:
+                self._notify_transaction_end(conn.total_changes != changes)
+
+    def _check_not_nested(self, conn, operation: str):
+        """
+        Refuse to run an operation that must commit its own work.
+
+        ATTACH/DETACH cannot happen inside a transaction, so shard and merge
+        operations commit before detaching. Doing that inside someone else's
+        transaction would commit (or roll back) the caller's pending writes,
+        so such operations must run in their own outermost block.
+
+        Args:
+            conn: Connection the operation will use
+            operation: Description for the error message
+
+        Raises:
+            RuntimeError: If conn has pending writes or the calling thread's
+                          connection block is nested in an outer one
+        """
+        nested = getattr(self._thread_local, 'depth', 0) > 1
+        if conn.in_transaction or nested:
+            raise RuntimeError(
+                f"Cannot {operation} inside an open transaction; "
+                f"run it outside the enclosing _get_connection() block"
+            )
+
+    @contextmanager
+    def _get_transient_connection(self):
+        """
+        Context manager for a one-off connection closed on exit.
+
+        Yields:
+            sqlite3.Connection: Database connection with row factory
+        """
+        conn = self._open_connection()
         try:
             yield conn
             conn.commit()
@@ -44,7 +188,44 @@ class ConnectionMixin:
             logging.error(f"Database error: {e}")
             raise
         finally:
+            changed = conn.total_changes > 0
             conn.close()
+            self._notify_transaction_end(changed)
+
+    def _notify_transaction_end(self, changed: bool):
+        """
+        Tell the query cache (if mixed in) that an outermost block ended.
+
+        Args:
+            changed: Whether the block changed any rows
+        """
+        end_transaction = getattr(self, '_end_transaction', None)
+        if end_transaction is not None and hasattr(self, '_cache_local'):
+            end_transaction(changed)
+
+    def close(self):
+        """
+        Close the calling thread's persistent connection.
+
+        Connections owned by other live threads (event writer, deletion
+        engine, backfill) are left alone, since they may be mid-transaction;
+        they are closed once their thread has exited. The calling thread
+        transparently reopens a connection on its next call.
+        """
+        if hasattr(self, '_cache_probe'):
+            self._close_query_cache()
+        if not hasattr(self, '_connections'):
+            return
+        local = self._thread_local
+        conn = getattr(local, 'conn', None)
+        if conn is not None and local.depth > 0:
+            raise RuntimeError("close() called inside an open transaction")
+        with self._connections_lock:
+            if conn is not None:
+                self._connections.pop(id(conn), None)
+                conn.close()
+                local.conn = None
+            self._prune_dead_connections()
 
     def _ensure_db_directory(self):
         """
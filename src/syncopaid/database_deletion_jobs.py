@@ -0,0 +1,417 @@
+"""
+Chunked, resumable secure deletion jobs.
+
+Provides:
+- Creating deletion jobs for a date range or a list of screenshots
+- Deleting a job's rows one bounded chunk per short transaction
+- The queue of screenshot files waiting to be shredded
+- Job progress for the UI
+
+A job first removes its rows (events with their linked screenshots, then
+the remaining screenshots captured in the range, then rows in month
+shards) chunk by chunk, queueing each deleted screenshot's file in the
+same transaction. Once no rows remain the job is 'shredding' until
+the file queue drains, then 'completed'. A file that cannot be shredded
+stays queued and is retried; after MAX_SHRED_ATTEMPTS its job is marked
+'failed'. Everything is persisted, so a job interrupted by a crash
+resumes where it stopped.
+"""
+
+import logging
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from .database_schema_interning import interned_ids, prune_interned_values
+from .database_shards import ms_range_sql
+from .database_time import date_range_to_ms
+
+# Statuses of jobs that still have work to do
+ACTIVE_JOB_STATUSES = ('pending', 'shredding')
+
+# Failed shredding attempts of one file before its job is marked failed
+MAX_SHRED_ATTEMPTS = 10
+
+
+class DeletionJobsDatabaseMixin:
+    """
+    Mixin providing secure deletion job operations.
+
+    Must be mixed with a class that provides:
+    - self._get_connection(): Context manager for database connections
+    - self._shards_in_range(), self._attached_shard(), self._delete_from_shards()
+      and self.list_shards(): From ShardDatabaseMixin
+    - self.get_screenshots_for_events(): From ScreenshotDatabaseMixin
+    """
+
+    def create_deletion_job(
+        self,
+        start_date: Optional[str] = None,
+        end_date: Optional[str] = None
+    ) -> int:
+        """
+        Create a job deleting events and screenshots within a date range.
+
+        Args:
+            start_date: ISO date string (YYYY-MM-DD) for range start (inclusive)
+            end_date: ISO date string (YYYY-MM-DD) for range end (inclusive)
+
+        Returns:
+            ID of the new job
+        """
+        if not start_date and not end_date:
+            raise ValueError("Must specify at least start_date or end_date")
+
+        start_ms, end_ms = date_range_to_ms(start_date, end_date)
+        with self._get_connection() as conn:
+            cursor = conn.execute(
+                "INSERT INTO deletion_jobs (kind, start_ms, end_ms) VALUES ('range', ?, ?)",
+                (start_ms, end_ms)
+            )
+            return cursor.lastrowid
+
+    def queue_screenshot_deletion(self, screenshot_ids: List[int], chunk_size: int = 500) -> int:
+        """
+        Delete screenshot rows by ID and queue their files for shredding.
+
+        Rows are deleted chunk_size ids per transaction; the files are left
+        for shred_job_files() or the background deletion engine.
+
+        Args:
+            screenshot_ids: IDs of screenshots to delete
+            chunk_size: IDs deleted per transaction
+
+        Returns:
+            ID of the new job
+        """
+        ids = list(dict.fromkeys(screenshot_ids))
+
+        with self._get_connection() as conn:
+            job_id = conn.execute(
+                "INSERT INTO deletion_jobs (kind, status) VALUES ('screenshots', 'shredding')"
+            ).lastrowid
+
+        remaining = set(ids)
+        for i in range(0, len(ids), chunk_size):
+            chunk = ids[i:i + chunk_size]
+            placeholders = ','.join('?' * len(chunk))
+            with self._get_connection() as conn:
+                self._touch_tables('screenshots')
+                rows = conn.execute(
+                    f"SELECT id, file_path FROM screenshots WHERE id IN ({placeholders})", chunk
+                ).fetchall()
+                self._queue_screenshot_rows(conn, job_id, rows)
+            remaining -= {row['id'] for row in rows}
+
+        # Ids not found in the main database may have been archived to a shard
+        for month in self.list_shards():
+            if not remaining:
+                break
+            chunk = list(remaining)
+            placeholders = ','.join('?' * len(chunk))
+            rows = self._queue_shard_screenshots(
+                job_id, month, f"id IN ({placeholders})", chunk
+            )
+            remaining -= {row['id'] for row in rows}
+
+        with self._get_connection() as conn:
+            self._finish_if_drained(conn, job_id)
+        return job_id
+
+    def _queue_screenshot_rows(self, conn, job_id: int, rows, schema: str = 'main'):
+        """
+        Queue screenshot files for shredding and delete their rows.
+
+        Args:
+            conn: Database connection within the chunk's transaction
+            job_id: Owning deletion job
+            rows: Rows with id and file_path
+            schema: Schema holding the screenshots rows
+        """
+        if not rows:
+            return
+        queued = conn.executemany(
+            "INSERT OR IGNORE INTO main.deletion_job_files (job_id, file_path) VALUES (?, ?)",
+            [(job_id, row['file_path']) for row in rows]
+        ).rowcount
+        if schema != 'main':
+            # Separate files do not commit atomically; queue first
+            conn.commit()
+
+        ids = [row['id'] for row in rows]
+        placeholders = ','.join('?' * len(ids))
+        deleted = conn.execute(
+            f"DELETE FROM {schema}.screenshots WHERE id IN ({placeholders})", ids
+        ).rowcount
+        conn.execute("""
+            UPDATE deletion_jobs
+            SET screenshots_deleted = screenshots_deleted + ?, files_queued = files_queued + ?
+            WHERE id = ?
+        """, (deleted, queued, job_id))
+
+    def _queue_shard_screenshots(
+        self,
+        job_id: int,
+        month: str,
+        where: str,
+        params: List,
+        limit: Optional[int] = None
+    ) -> List:
+        """
+        Queue and delete matching screenshots from one month shard.
+
+        Returns:
+            The rows queued
+        """
+        with self._get_connection() as conn:
+            self._touch_tables('screenshots')
+            with self._attached_shard(conn, month) as alias:
+                query = f"SELECT id, file_path FROM {alias}.screenshots WHERE {where} ORDER BY id"
+                if limit:
+                    query += f" LIMIT {limit}"
+                rows = conn.execute(query, params).fetchall()
+                self._queue_screenshot_rows(conn, job_id, rows, alias)
+        return rows
+
+    def delete_next_chunk(self, job_id: int, chunk_size: int = 500) -> int:
+        """
+        Delete the next chunk of a range job's rows in one short transaction.
+
+        Args:
+            job_id: Deletion job ID
+            chunk_size: Maximum rows deleted
+
+        Returns:
+            Rows deleted; 0 once the job has no rows left (the job then
+            moves on to shredding its queued files)
+        """
+        job = self.get_deletion_job(job_id)
+        if job is None or job['status'] != 'pending':
+            return 0
+
+        start_ms, end_ms = job['start_ms'], job['end_ms']
+
+        with self._get_connection() as conn:
+            self._touch_tables('events')
+            range_sql, params = ms_range_sql('start_ms', start_ms, end_ms)
+            ids = [row[0] for row in conn.execute(
+                f"SELECT id FROM event_rows WHERE 1=1{range_sql} LIMIT ?",
+                params + [chunk_size]
+            )]
+            deleted = 0
+            if ids:
+                # Linked screenshots are an indexed lookup by event_id
+                screenshots = self.get_screenshots_for_events(ids)
+                self._queue_screenshot_rows(conn, job_id, screenshots)
+                where = f"id IN ({','.join('?' * len(ids))})"
+                referenced = interned_ids(conn, where, ids)
+                deleted = conn.execute(f"DELETE FROM event_rows WHERE {where}", ids).rowcount
+                prune_interned_values(conn, referenced)
+                self._count_deleted_events(conn, job_id, deleted)
+        if deleted:
+            return deleted + len(screenshots)
+
+        # Screenshots captured in the range without a deleted event
+        with self._get_connection() as conn:
+            self._touch_tables('screenshots')
+            range_sql, params = ms_range_sql('captured_ms', start_ms, end_ms)
+            rows = conn.execute(
+                f"SELECT id, file_path FROM screenshots WHERE 1=1{range_sql} LIMIT ?",
+                params + [chunk_size]
+            ).fetchall()
+            self._queue_screenshot_rows(conn, job_id, rows)
+        if rows:
+            return len(rows)
+
+        # Archived months: screenshots first, so fully covered shards can be dropped
+        for month in self._shards_in_range(start_ms, end_ms):
+            range_sql, params = ms_range_sql('captured_ms', start_ms, end_ms)
+            rows = self._queue_shard_screenshots(job_id, month, f"1=1{range_sql}", params, chunk_size)
+            if rows:
+                return len(rows)
+
+        deleted = self._delete_from_shards('events', "1", [], start_ms, end_ms, chunk_size)
+        with self._get_connection() as conn:
+            if deleted:
+                self._count_deleted_events(conn, job_id, deleted)
+            else:
+                conn.execute(
+                    "UPDATE deletion_jobs SET status = 'shredding' WHERE id = ? AND status = 'pending'",
+                    (job_id,)
+                )
+                self._finish_if_drained(conn, job_id)
+        return deleted
+
+    @staticmethod
+    def _count_deleted_events(conn, job_id: int, deleted: int):
+        """Add deleted events to a job's progress."""
+        conn.execute(
+            "UPDATE deletion_jobs SET events_deleted = events_deleted + ? WHERE id = ?",
+            (deleted, job_id)
+        )
+
+    @staticmethod
+    def _finish_if_drained(conn, job_id: int):
+        """Mark a shredding job completed once its file queue is empty."""
+        conn.execute("""
+            UPDATE deletion_jobs SET status = 'completed', completed_at = ?
+            WHERE id = ? AND status = 'shredding'
+              AND NOT EXISTS (SELECT 1 FROM deletion_job_files WHERE job_id = ?)
+        """, (datetime.now().isoformat(), job_id, job_id))
+
+    def get_queued_files(self, job_id: int, limit: int = 50, after_id: int = 0) -> List[Tuple[int, str]]:
+        """
+        Get files a job still has to shred.
+
+        Args:
+            job_id: Deletion job ID
+            limit: Maximum files returned
+            after_id: Only queue ids greater than this (one pass over the
+                      queue skips files that just failed)
+
+        Returns:
+            List of (queue id, file path)
+        """
+        with self._get_connection() as conn:
+            rows = conn.execute(
+                "SELECT id, file_path FROM deletion_job_files WHERE job_id = ? AND id > ? ORDER BY id LIMIT ?",
+                (job_id, after_id, limit)
+            ).fetchall()
+        return [(row['id'], row['file_path']) for row in rows]
+
+    def complete_queued_files(self, job_id: int, queue_ids: List[int], bytes_shredded: int = 0):
+        """
+        Remove shredded files from a job's queue and record progress.
+
+        Args:
+            job_id: Deletion job ID
+            queue_ids: Queue ids from get_queued_files() that were shredded
+            bytes_shredded: Bytes overwritten for those files
+        """
+        if not queue_ids:
+            return
+        placeholders = ','.join('?' * len(queue_ids))
+        with self._get_connection() as conn:
+            removed = conn.execute(
+                f"DELETE FROM deletion_job_files WHERE job_id = ? AND id IN ({placeholders})",
+                [job_id] + list(queue_ids)
+            ).rowcount
+            conn.execute("""
+                UPDATE deletion_jobs
+                SET files_shredded = files_shredded + ?, bytes_shredded = bytes_shredded + ?
+                WHERE id = ?
+            """, (removed, bytes_shredded, job_id))
+            self._finish_if_drained(conn, job_id)
+
+    def fail_queued_files(self, job_id: int, queue_ids: List[int], max_attempts: int = MAX_SHRED_ATTEMPTS):
+        """
+        Record failed shredding attempts; the files stay queued for a retry.
+
+        A job with a file that has failed max_attempts times is marked failed.
+
+        Args:
+            job_id: Deletion job ID
+            queue_ids: Queue ids from get_queued_files() that could not be shredded
+            max_attempts: Failed attempts of one file that fail the job
+        """
+        if not queue_ids:
+            return
+        placeholders = ','.join('?' * len(queue_ids))
+        with self._get_connection() as conn:
+            conn.execute(
+                f"UPDATE deletion_job_files SET attempts = attempts + 1 "
+                f"WHERE job_id = ? AND id IN ({placeholders})",
+                [job_id] + list(queue_ids)
+            )
+            exhausted = conn.execute(
+                "SELECT COUNT(*) FROM deletion_job_files WHERE job_id = ? AND attempts >= ?",
+                (job_id, max_attempts)
+            ).fetchone()[0]
+        logging.warning(f"Deletion job {job_id}: {len(queue_ids)} files could not be shredded")
+        if exhausted:
+            self.fail_deletion_job(
+                job_id, f"{exhausted} files could not be shredded after {max_attempts} attempts"
+            )
+
+    def shred_job_files(self, job_id: int, batch_size: int = 50) -> int:
+        """
+        Shred a job's queued files on the calling thread, one pass over the queue.
+
+        Files that cannot be shredded stay queued (see fail_queued_files()).
+
+        Args:
+            job_id: Deletion job ID
+            batch_size: Files recorded per transaction
+
+        Returns:
+            Number of files shredded
+        """
+        from .secure_delete import shred_file
+
+        shredded = 0
+        after_id = 0
+        while True:
+            files = self.get_queued_files(job_id, batch_size, after_id)
+            if not files:
+                return shredded
+            after_id = files[-1][0]
+            done, failed, total_bytes = [], [], 0
+            for queue_id, file_path in files:
+                size = shred_file(Path(file_path))
+                if size is None:
+                    failed.append(queue_id)
+                else:
+                    done.append(queue_id)
+                    total_bytes += size
+            self.complete_queued_files(job_id, done, total_bytes)
+            self.fail_queued_files(job_id, failed)
+            shredded += len(done)
+
+    def fail_deletion_job(self, job_id: int, error: str):
+        """Mark a job failed with an error message (it is no longer resumed)."""
+        with self._get_connection() as conn:
+            conn.execute(
+                "UPDATE deletion_jobs SET status = 'failed', error = ? WHERE id = ?",
+                (error, job_id)
+            )
+        logging.error(f"Deletion job {job_id} failed: {error}")
+
+    def get_deletion_job(self, job_id: int) -> Optional[Dict]:
+        """
+        Get a deletion job with its progress counters.
+
+        Returns:
+            Job dictionary (including files_pending) or None if not found
+        """
+        jobs = self._query_deletion_jobs("WHERE id = ?", (job_id,))
+        return jobs[0] if jobs else None
+
+    def get_deletion_jobs(self, active_only: bool = False) -> List[Dict]:
+        """
+        List deletion jobs, oldest first.
+
+        Args:
+            active_only: Only jobs still pending or shredding
+
+        Returns:
+            List of job dictionaries (including files_pending)
+        """
+        if active_only:
+            placeholders = ','.join('?' * len(ACTIVE_JOB_STATUSES))
+            return self._query_deletion_jobs(
+                f"WHERE status IN ({placeholders})", ACTIVE_JOB_STATUSES
+            )
+        return self._query_deletion_jobs("", ())
+
+    def _query_deletion_jobs(self, where: str, params) -> List[Dict]:
+        """Fetch deletion jobs with their pending file counts."""
+        with self._get_connection() as conn:
+            rows = conn.execute(f"""
+                SELECT deletion_jobs.*,
+                       (SELECT COUNT(*) FROM deletion_job_files f
+                        WHERE f.job_id = deletion_jobs.id) AS files_pending
+                FROM deletion_jobs {where}
+                ORDER BY id
+            """, params).fetchall()
+        return [dict(row) for row in rows]
+
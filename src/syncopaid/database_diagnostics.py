@@ -0,0 +1,325 @@
+"""
+Storage profiling and maintenance advice for the database file.
+
+Provides:
+- A storage report: file and page counts, free-list pages, bytes per
+  table and index (from the dbstat virtual table) and row-size
+  distributions of the largest tables
+- Maintenance advice: when ANALYZE, PRAGMA optimize or vacuuming is
+  worthwhile
+- Running that maintenance (the app does so in the night processing
+  window, when the tracker is idle)
+
+dbstat is compiled into most SQLite builds but is optional; without it
+the report still has page and free-list counts.
+
+Run with: python -m syncopaid.database_diagnostics [database_path]
+"""
+
+import logging
+import sqlite3
+from typing import Dict, List, Optional, Sequence
+
+
+# Tables whose row sizes are profiled, by logical name -> storage table
+PROFILED_TABLES = {
+    'events': 'event_rows',
+    'screenshots': 'screenshots',
+    'categorization_patterns': 'categorization_patterns',
+}
+
+# Free-list share of the file above which reclaiming space is advised
+FREELIST_ADVICE_RATIO = 0.10
+
+# Row count drift since the last ANALYZE above which statistics are stale
+STALE_STATS_RATIO = 0.25
+
+# Maintenance actions, cheapest first; 'vacuum' rewrites the whole file
+MAINTENANCE_ACTIONS = ('optimize', 'analyze', 'incremental_vacuum', 'vacuum')
+
+
+def _percentile(sorted_values: List[float], fraction: float) -> float:
+    """Nearest-rank percentile of an already sorted list."""
+    index = min(len(sorted_values) - 1, max(0, round(fraction * (len(sorted_values) - 1))))
+    return sorted_values[index]
+
+
+class DiagnosticsDatabaseMixin:
+    """
+    Mixin providing storage diagnostics and maintenance.
+
+    Requires _get_connection() method from ConnectionMixin.
+    """
+
+    def get_storage_report(self) -> Dict:
+        """
+        Profile how the database file's space is used.
+
+        Returns:
+            Dictionary with page_size, page_count, freelist_count, file_bytes,
+            free_bytes, auto_vacuum ('none', 'full' or 'incremental'),
+            dbstat_available, objects (per table/index: name, table, type,
+            pages, bytes, unused_bytes; largest first, empty without dbstat),
+            row_sizes (per PROFILED_TABLES entry: rows, analyzed_rows and
+            bytes-per-row min/avg/p50/p90/max over leaf pages) and
+            stats_analyzed (whether sqlite_stat1 exists)
+        """
+        with self._get_connection() as conn:
+            page_size = conn.execute("PRAGMA page_size").fetchone()[0]
+            page_count = conn.execute("PRAGMA page_count").fetchone()[0]
+            freelist_count = conn.execute("PRAGMA freelist_count").fetchone()[0]
+            auto_vacuum = conn.execute("PRAGMA auto_vacuum").fetchone()[0]
+
+            types = {
+                row['name']: (row['type'], row['tbl_name'])
+                for row in conn.execute("SELECT name, type, tbl_name FROM sqlite_master")
+            }
+
+            try:
+                dbstat = conn.execute("""
+                    SELECT name, COUNT(*) AS pages, SUM(pgsize) AS bytes, SUM(unused) AS unused_bytes
+                    FROM dbstat GROUP BY name ORDER BY bytes DESC
+                """).fetchall()
+                dbstat_available = True
+            except sqlite3.OperationalError:
+                dbstat, dbstat_available = [], False
+
+            objects = []
+            for row in dbstat:
+                object_type, table = types.get(row['name'], ('table', row['name']))
+                objects.append({
+                    'name': row['name'],
+                    'table': table,
+                    'type': object_type,
+                    'pages': row['pages'],
+                    'bytes': row['bytes'],
+                    'unused_bytes': row['unused_bytes'],
+                })
+
+            analyzed = self._analyzed_row_counts(conn)
+            row_sizes = {}
+            for name, storage in PROFILED_TABLES.items():
+                if storage not in types:
+                    continue
+                row_sizes[name] = self._row_size_profile(conn, storage, dbstat_available)
+                row_sizes[name]['analyzed_rows'] = analyzed.get(storage)
+
+        return {
+            'page_size': page_size,
+            'page_count': page_count,
+            'freelist_count': freelist_count,
+            'file_bytes': page_size * page_count,
+            'free_bytes': page_size * freelist_count,
+            'auto_vacuum': {0: 'none', 1: 'full', 2: 'incremental'}.get(auto_vacuum, str(auto_vacuum)),
+            'dbstat_available': dbstat_available,
+            'objects': objects,
+            'row_sizes': row_sizes,
+            'stats_analyzed': bool(analyzed),
+        }
+
+    @staticmethod
+    def _analyzed_row_counts(conn) -> Dict[str, int]:
+        """Row counts per table recorded by the last ANALYZE (empty if never analyzed)."""
+        exists = conn.execute(
+            "SELECT 1 FROM sqlite_master WHERE name = 'sqlite_stat1'"
+        ).fetchone()
+        if not exists:
+            return {}
+
+        counts = {}
+        for row in conn.execute("SELECT tbl, stat FROM sqlite_stat1"):
+            rows = int(str(row['stat']).split()[0])
+            counts[row['tbl']] = max(counts.get(row['tbl'], 0), rows)
+        return counts
+
+    @staticmethod
+    def _row_size_profile(conn, table: str, dbstat_available: bool) -> Dict:
+        """Row count and bytes-per-row distribution over a table's leaf pages."""
+        profile = {
+            'rows': conn.execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0],
+            'min_bytes': None, 'avg_bytes': None, 'p50_bytes': None,
+            'p90_bytes': None, 'max_bytes': None,
+        }
+        if not dbstat_available or profile['rows'] == 0:
+            return profile
+
+        leaves = conn.execute("""
+            SELECT payload, ncell FROM dbstat
+            WHERE name = ? AND pagetype = 'leaf' AND ncell > 0
+        """, (table,)).fetchall()
+        if not leaves:
+            return profile
+
+        per_row = sorted(row['payload'] / row['ncell'] for row in leaves)
+        total_payload = sum(row['payload'] for row in leaves)
+        total_cells = sum(row['ncell'] for row in leaves)
+        profile.update({
+            'min_bytes': round(per_row[0], 1),
+            'avg_bytes': round(total_payload / total_cells, 1),
+            'p50_bytes': round(_percentile(per_row, 0.5), 1),
+            'p90_bytes': round(_percentile(per_row, 0.9), 1),
+            'max_bytes': round(per_row[-1], 1),
+        })
+        return profile
+
+    def get_maintenance_advice(self, report: Optional[Dict] = None) -> List[Dict]:
+        """
+        Recommend maintenance based on a storage report.
+
+        Args:
+            report: Result of get_storage_report() (computed if omitted)
+
+        Returns:
+            List of {action, reason} dictionaries, actions from
+            MAINTENANCE_ACTIONS in the order they should run
+        """
+        report = report or self.get_storage_report()
+        advice = []
+
+        stale = [
+            name for name, profile in report['row_sizes'].items()
+            if profile['rows'] and (
+                not profile['analyzed_rows']
+                or abs(profile['rows'] - profile['analyzed_rows']) > STALE_STATS_RATIO * profile['analyzed_rows']
+            )
+        ]
+        if stale:
+            advice.append({
+                'action': 'analyze',
+                'reason': f"Query planner statistics missing or stale for {', '.join(stale)}",
+            })
+        elif report['stats_analyzed']:
+            advice.append({
+                'action': 'optimize',
+                'reason': "Routine PRAGMA optimize keeps planner statistics current",
+            })
+
+        if report['page_count'] and report['freelist_count'] / report['page_count'] > FREELIST_ADVICE_RATIO:
+            free_mb = report['free_bytes'] / (1024 * 1024)
+            if report['auto_vacuum'] == 'incremental':
+                advice.append({
+                    'action': 'incremental_vacuum',
+                    'reason': f"{free_mb:.1f} MB in free pages can be returned in small steps",
+                })
+            else:
+                advice.append({
+                    'action': 'vacuum',
+                    'reason': (
+                        f"{free_mb:.1f} MB in free pages; a full VACUUM reclaims it and "
+                        f"enables incremental vacuum for the future"
+                    ),
+                })
+
+        return advice
+
+    def run_maintenance(
+        self,
+        actions: Optional[Sequence[str]] = None,
+        allow_vacuum: bool = False,
+        vacuum_step_pages: int = 256
+    ) -> List[str]:
+        """
+        Run maintenance actions.
+
+        Args:
+            actions: Actions from MAINTENANCE_ACTIONS; None runs the advised ones
+            allow_vacuum: Permit a full VACUUM, which rewrites the file and
+                          blocks writers while it runs
+            vacuum_step_pages: Free pages released per incremental_vacuum step
+                               (writers get the lock between steps)
+
+        Returns:
+            Actions that ran (incremental_vacuum is skipped unless
+            auto_vacuum is incremental)
+        """
+        if actions is None:
+            actions = [item['action'] for item in self.get_maintenance_advice()]
+
+        unknown = [action for action in actions if action not in MAINTENANCE_ACTIONS]
+        if unknown:
+            raise ValueError(f"Unknown maintenance actions: {', '.join(unknown)}")
+
+        ran = []
+        for action in MAINTENANCE_ACTIONS:
+            if action not in actions:
+                continue
+            if action == 'vacuum' and not allow_vacuum:
+                logging.info("Database maintenance: full VACUUM advised but not allowed")
+                continue
+            if action == 'incremental_vacuum' and not self._incremental_vacuum_enabled():
+                logging.info("Database maintenance: incremental_vacuum skipped, auto_vacuum is not incremental")
+                continue
+
+            with self._get_connection() as conn:
+                if action == 'optimize':
+                    conn.execute("PRAGMA optimize")
+                elif action == 'analyze':
+                    conn.execute("ANALYZE")
+                elif action == 'vacuum':
+                    conn.commit()
+                    conn.execute("PRAGMA auto_vacuum = INCREMENTAL")
+                    conn.execute("VACUUM")
+
+            if action == 'incremental_vacuum':
+                while True:
+                    with self._get_connection() as conn:
+                        free_pages = conn.execute("PRAGMA freelist_count").fetchone()[0]
+                        if free_pages == 0:
+                            break
+                        conn.execute(f"PRAGMA incremental_vacuum({int(vacuum_step_pages)})").fetchall()
+                        # A step that frees nothing would repeat forever
+                        if conn.execute("PRAGMA freelist_count").fetchone()[0] >= free_pages:
+                            break
+
+            ran.append(action)
+            logging.info(f"Database maintenance: ran {action}")
+
+        return ran
+
+    def _incremental_vacuum_enabled(self) -> bool:
+        """Whether auto_vacuum is incremental, so PRAGMA incremental_vacuum can free pages."""
+        with self._get_connection() as conn:
+            return conn.execute("PRAGMA auto_vacuum").fetchone()[0] == 2
+
+
+def print_storage_report(report: Dict, advice: List[Dict]):
+    """Print a storage report and maintenance advice."""
+    mb = 1024 * 1024
+    print(f"File: {report['file_bytes'] / mb:.1f} MB ({report['page_count']} pages of {report['page_size']} bytes)")
+    print(f"Free pages: {report['freelist_count']} ({report['free_bytes'] / mb:.1f} MB), "
+          f"auto_vacuum={report['auto_vacuum']}")
+
+    if report['objects']:
+        print(f"\n{'Object':<40} {'Type':<6} {'Size (KB)':>10} {'Unused (KB)':>12}")
+        print("-" * 71)
+        for item in report['objects']:
+            print(f"{item['name']:<40} {item['type']:<6} {item['bytes'] / 1024:>10.1f} "
+                  f"{item['unused_bytes'] / 1024:>12.1f}")
+    else:
+        print("\n(dbstat is not available in this SQLite build; per-object sizes unavailable)")
+
+    print(f"\n{'Table':<26} {'Rows':>9} {'Analyzed':>9} {'Avg B':>7} {'p50 B':>7} {'p90 B':>7} {'Max B':>7}")
+    print("-" * 78)
+    for name, profile in report['row_sizes'].items():
+        cells = [profile[key] for key in ('avg_bytes', 'p50_bytes', 'p90_bytes', 'max_bytes')]
+        sizes = " ".join(f"{value:>7.0f}" if value is not None else f"{'-':>7}" for value in cells)
+        analyzed = profile['analyzed_rows'] if profile['analyzed_rows'] is not None else '-'
+        print(f"{name:<26} {profile['rows']:>9} {analyzed:>9} {sizes}")
+
+    print("\nAdvice:")
+    for item in advice or [{'action': 'none', 'reason': "No maintenance needed"}]:
+        print(f"  {item['action']}: {item['reason']}")
+
+
+if __name__ == "__main__":
+    import sys
+
+    from .config import ConfigManager
+    from .database import Database
+
+    logging.basicConfig(level=logging.WARNING)
+
+    db_path = sys.argv[1] if len(sys.argv) > 1 else ConfigManager().get_database_path()
+    database = Database(str(db_path))
+    storage = database.get_storage_report()
+    print_storage_report(storage, database.get_maintenance_advice(storage))
@@ -8,6 +8,8 @@ Users view keywords read-only; AI has full control over keyword maintenance.
 import logging
 from typing import List, Dict, Optional
 
+from .database_cache import cached_query
+
 
 class KeywordsDatabaseMixin:
     """
@@ -37,6 +39,7 @@ class KeywordsDatabaseMixin:
         """
         keyword = keyword.lower().strip()
         with self._get_connection() as conn:
+            self._touch_tables('matter_keywords')
             cursor = conn.cursor()
             cursor.execute("""
                 INSERT OR REPLACE INTO matter_keywords
@@ -46,6 +49,7 @@ class KeywordsDatabaseMixin:
             conn.commit()
             return cursor.lastrowid
 
+    @cached_query('matter_keywords')
     def get_matter_keywords(self, matter_id: int) -> List[Dict]:
         """
         Get all keywords for a matter.
@@ -78,6 +82,7 @@ class KeywordsDatabaseMixin:
             True if deleted, False if not found
         """
         with self._get_connection() as conn:
+            self._touch_tables('matter_keywords')
             cursor = conn.cursor()
             cursor.execute("DELETE FROM matter_keywords WHERE id = ?", (keyword_id,))
             conn.commit()
@@ -104,6 +109,7 @@ class KeywordsDatabaseMixin:
             Number of keywords inserted
         """
         with self._get_connection() as conn:
+            self._touch_tables('matter_keywords')
             cursor = conn.cursor()
 
             # Remove existing keywords from this source
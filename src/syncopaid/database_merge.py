@@ -0,0 +1,551 @@
+"""
+Merging another machine's SyncoPaid database into this one.
+
+Provides:
+- Bulk import of events, screenshot metadata, clients, matters and
+  categorization patterns from an attached source database (and its
+  month shards) using set-based SQL
+- Remapping clients and matters by natural key: client display_name, and
+  (client, matter display_name) for matters
+- Deduplicating events by (start, app, title, machine), so merging the
+  same source again only adds what is new
+- A report of conflicts that need a person to look at them
+
+Merged events record their machine in events.source_machine (NULL means
+this machine). Source rows are first copied into TEMP staging tables;
+duplicates against month shards of this database are resolved while
+each shard is attached, and everything written to the main database
+happens in one transaction at the end.
+
+Run with: python -m syncopaid.database_merge SOURCE [--machine NAME] [--db PATH]
+"""
+
+import logging
+import re
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from .database_schema_interning import (
+    EPOCH_TIME_COLUMNS, EVENT_VIEW_COLUMNS, INTERNED_COLUMNS, epoch_storage_values
+)
+from .database_shards import month_bounds_ms
+
+# Oldest source schema version that can be merged (epoch-ms time columns)
+MIN_SOURCE_SCHEMA_VERSION = 2
+
+# Staged event columns: the source events columns (id staged as src_id)
+MERGE_EVENT_COLUMNS = tuple(column for column in EVENT_VIEW_COLUMNS if column != 'id')
+
+# Staged screenshot columns (id staged as src_id)
+MERGE_SCREENSHOT_COLUMNS = (
+    'captured_at', 'file_path', 'window_app', 'window_title', 'dhash',
+    'analysis_data', 'analysis_status', 'captured_ms', 'event_id'
+)
+
+_MONTH_PATTERN = re.compile(r"^\d{4}-\d{2}$")
+
+
+@contextmanager
+def attached_database(conn, path: Path, alias: str):
+    """
+    Attach a database file to a connection for the duration of the block.
+
+    Like ShardDatabaseMixin._attached_shard, writes made in the block are
+    committed (or rolled back on error) before detaching, so the connection
+    must not have pending writes of its own when the block starts.
+
+    Yields:
+        The schema alias
+
+    Raises:
+        RuntimeError: If the connection is already inside a transaction
+    """
+    if conn.in_transaction:
+        raise RuntimeError(f"Cannot attach {path} inside an open transaction")
+    conn.execute(f"ATTACH DATABASE ? AS {alias}", (str(path),))
+    try:
+        yield alias
+    except Exception:
+        if conn.in_transaction:
+            conn.rollback()
+        raise
+    finally:
+        if conn.in_transaction:
+            conn.commit()
+        conn.execute(f"DETACH DATABASE {alias}")
+
+
+def _columns(conn, schema: str, table: str) -> List[str]:
+    """Column names of a table or view in a schema (empty if it does not exist)."""
+    return [row[1] for row in conn.execute(f"PRAGMA {schema}.table_info({table})")]
+
+
+def _select_list(available: List[str], wanted: Tuple[str, ...]) -> str:
+    """Select list of wanted columns, NULL for those a source lacks."""
+    present = set(available)
+    return ", ".join(name if name in present else f"NULL AS {name}" for name in wanted)
+
+
+class MergeDatabaseMixin:
+    """
+    Mixin providing multi-machine database merges.
+
+    Requires _get_connection() from ConnectionMixin, list_shards() and
+    shard_path() from ShardDatabaseMixin, and _touch_tables() from
+    QueryCacheMixin.
+    """
+
+    def merge_database(self, source_path, machine: Optional[str] = None) -> Dict:
+        """
+        Import another SyncoPaid database into this one.
+
+        Source events already merged from a third machine keep their
+        source_machine; all others are attributed to machine. Event ids
+        are reassigned; screenshots keep their link to the merged event.
+        Existing clients, matters and patterns are never modified.
+
+        Must not be called inside an open _get_connection() block: the merge
+        commits its staging steps and SQLite cannot detach inside a
+        transaction.
+
+        Args:
+            source_path: Path to the other machine's database file
+            machine: Name recorded in source_machine (default: the source
+                     file name without extension)
+
+        Returns:
+            Dictionary with machine, per-table counts (events, screenshots,
+            clients, matters, patterns: each {source, imported, duplicates})
+            and conflicts (list of {table, key, reason}, one per conflicting
+            client, matter or unresolved reference)
+
+        Raises:
+            FileNotFoundError: If the source database does not exist
+            ValueError: If the source is this database or its schema is too old
+            RuntimeError: If called inside an open transaction
+        """
+        source = Path(source_path)
+        if not source.is_file():
+            raise FileNotFoundError(f"Source database not found: {source}")
+        if source.resolve() == Path(self.db_path).resolve():
+            raise ValueError("Cannot merge a database into itself")
+        machine = machine or source.stem
+
+        conflicts = []
+        counts = {}
+
+        with self._get_connection() as conn:
+            self._check_not_nested(conn, "merge a database")
+            self._create_merge_staging(conn)
+            try:
+                with attached_database(conn, source, 'merge_src'):
+                    version = conn.execute("PRAGMA merge_src.user_version").fetchone()[0]
+                    if version < MIN_SOURCE_SCHEMA_VERSION or 'start_ms' not in _columns(conn, 'merge_src', 'events'):
+                        raise ValueError(
+                            f"Source database schema is too old (version {version}); "
+                            f"open it once with a current SyncoPaid to upgrade it"
+                        )
+
+                    self._stage_source(conn, 'merge_src', machine)
+                    conn.commit()
+                    for shard in self._source_shards(source):
+                        with attached_database(conn, shard, 'merge_src_shard') as alias:
+                            self._stage_source(conn, alias, machine)
+
+                    self._match_local_shards(conn)
+
+                    # Everything below is one transaction on the main database
+                    self._touch_tables('events', 'screenshots', 'clients', 'matters', 'categorization_patterns')
+                    counts['clients'] = self._merge_clients(conn, conflicts)
+                    counts['matters'] = self._merge_matters(conn, conflicts)
+                    counts['patterns'] = self._merge_patterns(conn, conflicts)
+                    counts['events'] = self._merge_events(conn, conflicts)
+                    counts['screenshots'] = self._merge_screenshots(conn)
+            finally:
+                self._drop_merge_staging(conn)
+
+        logging.info(
+            f"Merged {source} as '{machine}': "
+            + ", ".join(f"{table} +{result['imported']}" for table, result in counts.items())
+            + f" ({len(conflicts)} conflicts)"
+        )
+        return {'machine': machine, **counts, 'conflicts': conflicts}
+
+    @staticmethod
+    def _source_shards(source: Path) -> List[Path]:
+        """Month shard files belonging to a source database, oldest first."""
+        shard_dir = source.parent / f"{source.stem}-shards"
+        if not shard_dir.is_dir():
+            return []
+        return sorted(path for path in shard_dir.glob("*.db") if _MONTH_PATTERN.match(path.stem))
+
+    @staticmethod
+    def _create_merge_staging(conn):
+        """Create the TEMP staging tables for a merge."""
+        MergeDatabaseMixin._drop_merge_staging(conn)
+        conn.execute(f"""
+            CREATE TEMP TABLE merge_events (
+                row INTEGER PRIMARY KEY,
+                src_id INTEGER,
+                {', '.join(MERGE_EVENT_COLUMNS)},
+                source_machine TEXT,
+                app_id INTEGER, title_id INTEGER, cmdline_id INTEGER,
+                first_row INTEGER,
+                dst_id INTEGER
+            )
+        """)
+        conn.execute(f"""
+            CREATE TEMP TABLE merge_screenshots (
+                row INTEGER PRIMARY KEY,
+                src_id INTEGER,
+                {', '.join(MERGE_SCREENSHOT_COLUMNS)},
+                duplicate INTEGER NOT NULL DEFAULT 0
+            )
+        """)
+
+    @staticmethod
+    def _drop_merge_staging(conn):
+        """Drop the TEMP staging tables."""
+        for table in ('merge_events', 'merge_screenshots', 'merge_new_events',
+                      'merge_client_map', 'merge_matter_map'):
+            conn.execute(f"DROP TABLE IF EXISTS temp.{table}")
+
+    @staticmethod
+    def _stage_source(conn, alias: str, machine: str):
+        """Copy one source schema's events and screenshots into staging."""
+        event_columns = _columns(conn, alias, 'events')
+        machine_sql = "COALESCE(source_machine, ?)" if 'source_machine' in event_columns else "?"
+        conn.execute(f"""
+            INSERT INTO temp.merge_events (src_id, {', '.join(MERGE_EVENT_COLUMNS)}, source_machine)
+            SELECT id, {_select_list(event_columns, MERGE_EVENT_COLUMNS)}, {machine_sql}
+            FROM {alias}.events
+        """, (machine,))
+
+        screenshot_columns = _columns(conn, alias, 'screenshots')
+        if screenshot_columns:
+            conn.execute(f"""
+                INSERT INTO temp.merge_screenshots (src_id, {', '.join(MERGE_SCREENSHOT_COLUMNS)})
+                SELECT id, {_select_list(screenshot_columns, MERGE_SCREENSHOT_COLUMNS)}
+                FROM {alias}.screenshots
+            """)
+
+    def _match_local_shards(self, conn):
+        """
+        Resolve staged rows already archived in this database's shards.
+
+        Matching events take the shard event's id; matching screenshots are
+        marked duplicate. Each overlapping shard is attached in turn.
+        """
+        conn.execute("""
+            CREATE INDEX temp.merge_events_key
+            ON merge_events(start_ms, app, title, source_machine)
+        """)
+        conn.execute("CREATE INDEX temp.merge_events_src ON merge_events(src_id)")
+        conn.execute("CREATE INDEX temp.merge_screenshots_key ON merge_screenshots(captured_ms, file_path)")
+        conn.commit()
+
+        for month in self.list_shards():
+            month_start, month_end = month_bounds_ms(month)
+            staged = conn.execute("""
+                SELECT EXISTS (SELECT 1 FROM temp.merge_events WHERE start_ms >= ? AND start_ms < ?)
+                    OR EXISTS (SELECT 1 FROM temp.merge_screenshots WHERE captured_ms >= ? AND captured_ms < ?)
+            """, (month_start, month_end, month_start, month_end)).fetchone()[0]
+            if not staged:
+                continue
+
+            with attached_database(conn, self.shard_path(month), 'merge_local_shard') as alias:
+                shard_columns = _columns(conn, alias, 'events')
+                machine_sql = "e.source_machine" if 'source_machine' in shard_columns else "NULL"
+                conn.execute(f"""
+                    UPDATE temp.merge_events
+                    SET dst_id = (
+                        SELECT e.id FROM {alias}.events e
+                        WHERE e.start_ms = merge_events.start_ms
+                          AND e.app IS merge_events.app
+                          AND e.title IS merge_events.title
+                          AND {machine_sql} IS merge_events.source_machine
+                        LIMIT 1
+                    )
+                    WHERE start_ms >= ? AND start_ms < ? AND dst_id IS NULL
+                """, (month_start, month_end))
+                conn.execute(f"""
+                    UPDATE temp.merge_screenshots SET duplicate = 1
+                    WHERE captured_ms >= ? AND captured_ms < ?
+                      AND EXISTS (
+                        SELECT 1 FROM {alias}.screenshots s
+                        WHERE s.captured_ms = merge_screenshots.captured_ms
+                          AND s.file_path = merge_screenshots.file_path
+                      )
+                """, (month_start, month_end))
+
+    @staticmethod
+    def _shared_columns(conn, table: str, exclude: Tuple[str, ...]) -> List[str]:
+        """Columns of a table present in both databases, minus excluded ones."""
+        source = set(_columns(conn, 'merge_src', table))
+        return [name for name in _columns(conn, 'main', table) if name in source and name not in exclude]
+
+    def _merge_clients(self, conn, conflicts: List[Dict]) -> Dict[str, int]:
+        """Insert new clients and map source client ids by display_name."""
+        if not _columns(conn, 'merge_src', 'clients'):
+            conn.execute("CREATE TEMP TABLE merge_client_map (src_id INTEGER PRIMARY KEY, dst_id INTEGER)")
+            return {'source': 0, 'imported': 0, 'duplicates': 0}
+
+        columns = self._shared_columns(conn, 'clients', ('id',))
+        total = conn.execute(
+            "SELECT COUNT(*) FROM merge_src.clients WHERE display_name IS NOT NULL"
+        ).fetchone()[0]
+
+        for row in conn.execute("""
+            SELECT s.display_name, s.folder_path AS theirs, c.folder_path AS ours
+            FROM merge_src.clients s JOIN main.clients c ON c.display_name = s.display_name
+            WHERE s.folder_path IS NOT c.folder_path
+        """).fetchall():
+            conflicts.append({
+                'table': 'clients',
+                'key': row['display_name'],
+                'reason': f"folder differs (kept '{row['ours']}', source has '{row['theirs']}')",
+            })
+
+        imported = conn.execute(f"""
+            INSERT OR IGNORE INTO main.clients ({', '.join(columns)})
+            SELECT {', '.join(columns)} FROM merge_src.clients WHERE display_name IS NOT NULL
+        """).rowcount
+
+        conn.execute("""
+            CREATE TEMP TABLE merge_client_map AS
+            SELECT s.id AS src_id, c.id AS dst_id
+            FROM merge_src.clients s JOIN main.clients c ON c.display_name = s.display_name
+        """)
+        return {'source': total, 'imported': imported, 'duplicates': total - imported}
+
+    def _merge_matters(self, conn, conflicts: List[Dict]) -> Dict[str, int]:
+        """Insert new matters and map source matter ids by (client, display_name)."""
+        if not _columns(conn, 'merge_src', 'matters'):
+            conn.execute("CREATE TEMP TABLE merge_matter_map (src_id INTEGER PRIMARY KEY, dst_id INTEGER)")
+            return {'source': 0, 'imported': 0, 'duplicates': 0}
+
+        columns = self._shared_columns(conn, 'matters', ('id', 'client_id'))
+        total = conn.execute("SELECT COUNT(*) FROM merge_src.matters").fetchone()[0]
+
+        for row in conn.execute("""
+            SELECT s.id, s.display_name FROM merge_src.matters s
+            WHERE s.client_id NOT IN (SELECT src_id FROM temp.merge_client_map)
+        """).fetchall():
+            conflicts.append({
+                'table': 'matters',
+                'key': row['display_name'],
+                'reason': f"source matter {row['id']} has no client; not imported",
+            })
+
+        for row in conn.execute("""
+            SELECT c.display_name AS client, s.display_name, s.folder_path AS theirs, m.folder_path AS ours
+            FROM merge_src.matters s
+            JOIN temp.merge_client_map cm ON cm.src_id = s.client_id
+            JOIN main.matters m ON m.client_id = cm.dst_id AND m.display_name = s.display_name
+            JOIN main.clients c ON c.id = cm.dst_id
+            WHERE s.folder_path IS NOT m.folder_path
+        """).fetchall():
+            conflicts.append({
+                'table': 'matters',
+                'key': f"{row['client']} / {row['display_name']}",
+                'reason': f"folder differs (kept '{row['ours']}', source has '{row['theirs']}')",
+            })
+
+        imported = conn.execute(f"""
+            INSERT OR IGNORE INTO main.matters (client_id, {', '.join(columns)})
+            SELECT cm.dst_id, {', '.join('s.' + name for name in columns)}
+            FROM merge_src.matters s JOIN temp.merge_client_map cm ON cm.src_id = s.client_id
+        """).rowcount
+
+        conn.execute("""
+            CREATE TEMP TABLE merge_matter_map AS
+            SELECT s.id AS src_id, m.id AS dst_id
+            FROM merge_src.matters s
+            JOIN temp.merge_client_map cm ON cm.src_id = s.client_id
+            JOIN main.matters m ON m.client_id = cm.dst_id AND m.display_name = s.display_name
+        """)
+        conn.execute("CREATE UNIQUE INDEX temp.merge_matter_map_src ON merge_matter_map(src_id)")
+        return {'source': total, 'imported': imported, 'duplicates': total - imported}
+
+    def _merge_patterns(self, conn, conflicts: List[Dict]) -> Dict[str, int]:
+        """Insert categorization patterns not already present for the mapped matter."""
+        if not _columns(conn, 'merge_src', 'categorization_patterns'):
+            return {'source': 0, 'imported': 0, 'duplicates': 0}
+
+        columns = self._shared_columns(conn, 'categorization_patterns', ('id', 'matter_id'))
+        total = conn.execute("SELECT COUNT(*) FROM merge_src.categorization_patterns").fetchone()[0]
+
+        unmapped = conn.execute("""
+            SELECT COUNT(*) FROM merge_src.categorization_patterns
+            WHERE matter_id NOT IN (SELECT src_id FROM temp.merge_matter_map)
+        """).fetchone()[0]
+        if unmapped:
+            conflicts.append({
+                'table': 'categorization_patterns',
+                'key': f"{unmapped} patterns",
+                'reason': "source matter not found; not imported",
+            })
+
+        imported = conn.execute(f"""
+            INSERT INTO main.categorization_patterns (matter_id, {', '.join(columns)})
+            SELECT mm.dst_id, {', '.join('s.' + name for name in columns)}
+            FROM merge_src.categorization_patterns s
+            JOIN temp.merge_matter_map mm ON mm.src_id = s.matter_id
+            WHERE NOT EXISTS (
+                SELECT 1 FROM main.categorization_patterns p
+                WHERE p.matter_id = mm.dst_id
+                  AND p.app_pattern IS s.app_pattern
+                  AND p.url_pattern IS s.url_pattern
+                  AND p.title_pattern IS s.title_pattern
+            )
+        """).rowcount
+        return {'source': total, 'imported': imported, 'duplicates': total - unmapped - imported}
+
+    def _merge_events(self, conn, conflicts: List[Dict]) -> Dict[str, int]:
+        """Deduplicate staged events against the main database and insert the rest."""
+        total = conn.execute("SELECT COUNT(*) FROM temp.merge_events").fetchone()[0]
+
+        for column, (table, id_column) in INTERNED_COLUMNS.items():
+            conn.execute(f"""
+                INSERT OR IGNORE INTO main.{table} (value)
+                SELECT DISTINCT {column} FROM temp.merge_events WHERE {column} IS NOT NULL
+            """)
+            conn.execute(f"""
+                UPDATE temp.merge_events
+                SET {id_column} = (SELECT id FROM main.{table} WHERE value = merge_events.{column})
+                WHERE {column} IS NOT NULL
+            """)
+
+        # Copies of one event in the source (main and shard) collapse to the first
+        conn.execute("""
+            UPDATE temp.merge_events SET first_row = (
+                SELECT MIN(o.row) FROM temp.merge_events o
+                WHERE o.start_ms IS merge_events.start_ms
+                  AND o.app IS merge_events.app
+                  AND o.title IS merge_events.title
+                  AND o.source_machine IS merge_events.source_machine
+            )
+        """)
+        conn.execute("""
+            UPDATE temp.merge_events SET dst_id = (
+                SELECT r.id FROM main.event_rows r
+                WHERE r.start_ms IS merge_events.start_ms
+                  AND r.app_id IS merge_events.app_id
+                  AND r.title_id IS merge_events.title_id
+                  AND r.source_machine IS merge_events.source_machine
+                LIMIT 1
+            )
+            WHERE row = first_row AND dst_id IS NULL
+        """)
+
+        # New events get ids above every id ever used (shards included)
+        base = conn.execute("""
+            SELECT MAX(
+                COALESCE((SELECT seq FROM main.sqlite_sequence WHERE name = 'event_rows'), 0),
+                COALESCE((SELECT MAX(id) FROM main.event_rows), 0)
+            )
+        """).fetchone()[0]
+        conn.execute("CREATE TEMP TABLE merge_new_events (row INTEGER PRIMARY KEY, dst_id INTEGER)")
+        conn.execute("""
+            INSERT INTO temp.merge_new_events (row, dst_id)
+            SELECT row, ? + ROW_NUMBER() OVER (ORDER BY start_ms, row)
+            FROM temp.merge_events WHERE row = first_row AND dst_id IS NULL
+        """, (base,))
+        conn.execute("""
+            UPDATE temp.merge_events
+            SET dst_id = (SELECT n.dst_id FROM temp.merge_new_events n WHERE n.row = merge_events.row)
+            WHERE row = first_row AND dst_id IS NULL
+        """)
+        conn.execute("""
+            UPDATE temp.merge_events
+            SET dst_id = (SELECT f.dst_id FROM temp.merge_events f WHERE f.row = merge_events.first_row)
+            WHERE row != first_row
+        """)
+
+        for row in conn.execute("""
+            SELECT e.matter_id, COUNT(*) AS events FROM temp.merge_new_events n
+            JOIN temp.merge_events e ON e.row = n.row
+            WHERE e.matter_id IS NOT NULL
+              AND e.matter_id NOT IN (SELECT src_id FROM temp.merge_matter_map)
+            GROUP BY e.matter_id
+        """).fetchall():
+            conflicts.append({
+                'table': 'events',
+                'key': f"matter {row['matter_id']}",
+                'reason': f"source matter not found; {row['events']} events imported unassigned",
+            })
+
+        storage_columns = []
+        values = []
+        for column in MERGE_EVENT_COLUMNS:
+            if column in INTERNED_COLUMNS:
+                storage_columns.append(INTERNED_COLUMNS[column][1])
+                values.append(f"e.{INTERNED_COLUMNS[column][1]}")
+            elif column in EPOCH_TIME_COLUMNS:
+                for storage_column, value in epoch_storage_values(column, 'e'):
+                    storage_columns.append(storage_column)
+                    values.append(value)
+            elif column == 'matter_id':
+                storage_columns.append(column)
+                values.append("(SELECT dst_id FROM temp.merge_matter_map WHERE src_id = e.matter_id)")
+            else:
+                storage_columns.append(column)
+                values.append(f"e.{column}")
+        imported = conn.execute(f"""
+            INSERT INTO main.event_rows (id, {', '.join(storage_columns)}, source_machine)
+            SELECT n.dst_id, {', '.join(values)}, e.source_machine
+            FROM temp.merge_new_events n JOIN temp.merge_events e ON e.row = n.row
+            ORDER BY n.dst_id
+        """).rowcount
+        return {'source': total, 'imported': imported, 'duplicates': total - imported}
+
+    @staticmethod
+    def _merge_screenshots(conn) -> Dict[str, int]:
+        """Insert staged screenshots not already present, linked to merged events."""
+        total = conn.execute("SELECT COUNT(*) FROM temp.merge_screenshots").fetchone()[0]
+        columns = [name for name in MERGE_SCREENSHOT_COLUMNS if name != 'event_id']
+
+        imported = conn.execute(f"""
+            INSERT INTO main.screenshots ({', '.join(columns)}, event_id)
+            SELECT {', '.join('s.' + name for name in columns)},
+                   (SELECT e.dst_id FROM temp.merge_events e WHERE e.src_id = s.event_id LIMIT 1)
+            FROM temp.merge_screenshots s
+            WHERE s.duplicate = 0
+              AND s.row = (
+                SELECT MIN(o.row) FROM temp.merge_screenshots o
+                WHERE o.captured_ms IS s.captured_ms AND o.file_path IS s.file_path
+              )
+              AND NOT EXISTS (
+                SELECT 1 FROM main.screenshots m
+                WHERE m.captured_ms IS s.captured_ms AND m.file_path = s.file_path
+              )
+            ORDER BY s.captured_ms
+        """).rowcount
+        return {'source': total, 'imported': imported, 'duplicates': total - imported}
+
+
+if __name__ == "__main__":
+    import argparse
+
+    from .config import ConfigManager
+    from .database import Database
+
+    logging.basicConfig(level=logging.INFO)
+
+    parser = argparse.ArgumentParser(description="Merge another machine's SyncoPaid database into this one")
+    parser.add_argument("source", help="Path to the other machine's database")
+    parser.add_argument("--machine", help="Machine name recorded on merged events (default: source file name)")
+    parser.add_argument("--db", help="Destination database (default: the configured database)")
+    args = parser.parse_args()
+
+    database = Database(args.db or str(ConfigManager().get_database_path()))
+    result = database.merge_database(args.source, machine=args.machine)
+
+    print(f"Merged as '{result['machine']}'")
+    for table in ('clients', 'matters', 'patterns', 'events', 'screenshots'):
+        counts = result[table]
+        print(f"  {table:<12} {counts['imported']:>9} imported, {counts['duplicates']:>9} duplicates "
+              f"(of {counts['source']})")
+    for conflict in result['conflicts']:
+        print(f"  CONFLICT {conflict['table']} {conflict['key']}: {conflict['reason']}")
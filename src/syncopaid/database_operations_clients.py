@@ -6,6 +6,8 @@ Provides client management operations.
 
 from typing import List, Dict, Optional
 
+from .database_cache import cached_query
+
 
 class ClientOperationsMixin:
     """
@@ -26,10 +28,12 @@ class ClientOperationsMixin:
             The ID of the inserted client
         """
         with self._get_connection() as conn:
+            self._touch_tables('clients')
             cursor = conn.cursor()
             cursor.execute("INSERT INTO clients (display_name) VALUES (?)", (name,))
             return cursor.lastrowid
 
+    @cached_query('clients')
     def get_clients(self) -> List[Dict]:
         """
         Get all clients ordered by name.
@@ -52,6 +56,7 @@ class ClientOperationsMixin:
             notes: New notes (optional)
         """
         with self._get_connection() as conn:
+            self._touch_tables('clients')
             cursor = conn.cursor()
             cursor.execute("UPDATE clients SET display_name = ? WHERE id = ?",
                           (name, client_id))
@@ -64,5 +69,6 @@ class ClientOperationsMixin:
             client_id: ID of the client to delete
         """
         with self._get_connection() as conn:
+            self._touch_tables('clients')
             cursor = conn.cursor()
             cursor.execute("DELETE FROM clients WHERE id = ?", (client_id,))
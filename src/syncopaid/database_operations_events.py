@@ -5,6 +5,7 @@ Provides:
 - Insert single or batch events
 - Query events with filtering
 - Delete events by date range or IDs
+- Compact adjacent identical events
 """
 
 from .database_operations_events_conversion import EventConversionMixin
@@ -12,6 +13,7 @@ from .database_operations_events_insert import EventInsertMixin
 from .database_operations_events_query import EventQueryMixin
 from .database_operations_events_update import EventUpdateMixin
 from .database_operations_events_delete import EventDeleteMixin
+from .database_operations_events_compact import EventCompactMixin
 
 
 class EventOperationsMixin(
@@ -19,7 +21,8 @@ class EventOperationsMixin(
     EventInsertMixin,
     EventQueryMixin,
     EventUpdateMixin,
-    EventDeleteMixin
+    EventDeleteMixin,
+    EventCompactMixin
 ):
     """
     Mixin providing event-related database CRUD operations.
@@ -32,5 +35,6 @@ class EventOperationsMixin(
     - EventQueryMixin: Query operations
     - EventUpdateMixin: Update operations
     - EventDeleteMixin: Delete operations
+    - EventCompactMixin: Compaction of adjacent identical events
     """
     pass
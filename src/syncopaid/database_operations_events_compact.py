@@ -0,0 +1,217 @@
+"""
+Post-hoc compaction of adjacent identical events.
+
+Provides:
+- Coalescing runs of consecutive events with the same app, title, state
+  and matter assignment into a single row
+
+StateChangeDetector only merges switches shorter than merge_threshold, so
+a real day still leaves long runs of identical rows split by short gaps,
+brief flickers to other windows and idle blips. Compaction finds those
+runs in one window-function pass: flickers are set aside, each remaining
+row is compared with the previous one (LAG), rows that start a new run
+are marked and a running SUM of the marks numbers the runs; flickers then
+join the run around them.
+"""
+
+import logging
+from typing import Dict, Optional
+
+from .database_shards import ms_range_sql
+from .database_time import date_range_to_ms
+
+
+# event_rows columns that must match for two events to be merged. Matter
+# assignments are part of the key so compaction never changes billing.
+COMPACTION_KEY_COLUMNS = (
+    'app_id', 'title_id', 'cmdline_id', 'url', 'is_idle', 'state',
+    'matter_id', 'client', 'matter'
+)
+
+# The matter assignment a flicker must share with the run absorbing it
+COMPACTION_ASSIGNMENT_COLUMNS = ('matter_id', 'client', 'matter')
+
+
+class EventCompactMixin:
+    """
+    Mixin providing event compaction.
+
+    Requires _get_connection() method from ConnectionMixin.
+    """
+
+    def compact_events(
+        self,
+        start_date: Optional[str] = None,
+        end_date: Optional[str] = None,
+        gap_tolerance_seconds: float = 5.0,
+        flicker_seconds: float = 5.0
+    ) -> Dict[str, int]:
+        """
+        Merge adjacent compatible events within a date range.
+
+        Consecutive events (ordered by start time) are merged when every
+        COMPACTION_KEY_COLUMNS value matches and the next event starts at
+        most gap_tolerance_seconds after the previous one ends. Flickers
+        (events shorter than flicker_seconds that differ from the event
+        before them, such as a brief window switch or idle blip) are
+        transparent: they are absorbed when the events on both sides merge,
+        unless their matter assignment differs, in which case they are kept
+        and the events around them are not merged. A flicker identical to
+        the event right after it joins that event's run.
+
+        The first event of a run is kept: its duration becomes the sum of
+        the run's durations (gaps are not billed), its end becomes the run's
+        end and it stays flagged for review if any merged event was. The
+        other rows are deleted and their screenshots are linked to the kept
+        event.
+
+        Only the main database is compacted; archived months in shard
+        files are left as they are.
+
+        Args:
+            start_date: ISO date string (YYYY-MM-DD) for range start (inclusive)
+            end_date: ISO date string (YYYY-MM-DD) for range end (inclusive)
+            gap_tolerance_seconds: Largest gap between events that are merged
+            flicker_seconds: Events shorter than this may be absorbed into
+                             the run around them; 0 disables absorption
+
+        Returns:
+            Dictionary with rows_before, rows_after and runs_merged
+        """
+        start_ms, end_ms = date_range_to_ms(start_date, end_date)
+        range_sql, params = ms_range_sql('start_ms', start_ms, end_ms)
+        same_as_previous = " AND ".join(
+            f"{column} IS LAG({column}) OVER w" for column in COMPACTION_KEY_COLUMNS
+        )
+        same_as_next = " AND ".join(
+            f"c.{column} IS n.{column}" for column in COMPACTION_KEY_COLUMNS
+        )
+        same_assignment = " AND ".join(
+            f"a.{column} IS p.{column}" for column in COMPACTION_ASSIGNMENT_COLUMNS
+        )
+        gap_ms = gap_tolerance_seconds * 1000
+
+        with self._get_connection() as conn:
+            self._touch_tables('events')
+            cursor = conn.cursor()
+
+            cursor.execute(f"SELECT COUNT(*) FROM event_rows WHERE 1=1{range_sql}", params)
+            rows_before = cursor.fetchone()[0]
+
+            cursor.execute("DROP TABLE IF EXISTS temp.event_compaction")
+            cursor.execute(f"""
+                CREATE TEMP TABLE event_compaction AS
+                WITH ordered AS (
+                    SELECT id, start_ms, duration_seconds, end_ms,
+                           flagged_for_review, {', '.join(COMPACTION_KEY_COLUMNS)},
+                           COALESCE(end_ms, start_ms + CAST(ROUND(COALESCE(duration_seconds, 0) * 1000) AS INTEGER)) AS stop_ms,
+                           COALESCE(duration_seconds, 0) < ? AND NOT COALESCE({same_as_previous}, 0) AS flicker,
+                           ROW_NUMBER() OVER w AS pos
+                    FROM event_rows
+                    WHERE start_ms IS NOT NULL{range_sql}
+                    WINDOW w AS (ORDER BY start_ms, id)
+                ),
+                anchored AS (
+                    -- Nearest non-flicker row at or before, and at or after, each row
+                    SELECT *,
+                           MAX(CASE WHEN NOT flicker THEN pos END) OVER (ORDER BY pos) AS prev_pos,
+                           MIN(CASE WHEN NOT flicker THEN pos END) OVER (
+                               ORDER BY pos ROWS BETWEEN CURRENT ROW AND UNBOUNDED FOLLOWING
+                           ) AS next_pos
+                    FROM ordered
+                ),
+                counted AS (
+                    -- Flickers assigned differently from the row before them are
+                    -- kept, and no run continues across them
+                    SELECT a.*,
+                           SUM(a.flicker AND NOT COALESCE({same_assignment}, 0)) OVER (ORDER BY a.pos) AS kept_before,
+                           a.flicker AND NOT COALESCE({same_assignment}, 0) AS keeps
+                    FROM anchored a LEFT JOIN ordered p ON p.pos = a.prev_pos
+                ),
+                marked AS (
+                    SELECT *,
+                           CASE WHEN {same_as_previous}
+                                 AND start_ms - LAG(stop_ms) OVER w <= ?
+                                 AND kept_before = LAG(kept_before) OVER w
+                                THEN 0 ELSE 1 END AS starts_run
+                    FROM counted
+                    WHERE NOT flicker
+                    WINDOW w AS (ORDER BY pos)
+                ),
+                numbered AS (
+                    SELECT pos, SUM(starts_run) OVER (ORDER BY pos) AS run
+                    FROM marked
+                ),
+                members AS (
+                    SELECT c.*,
+                           CASE
+                               WHEN NOT c.flicker THEN own.run
+                               -- Short row identical to the row right after it
+                               WHEN c.pos = c.next_pos - 1 AND {same_as_next}
+                                    AND n.start_ms - c.stop_ms <= ? THEN next.run
+                               WHEN c.keeps THEN NULL
+                               -- Blip inside a run: the same run continues after it
+                               WHEN prev.run = next.run THEN prev.run
+                           END AS run
+                    FROM counted c
+                    LEFT JOIN numbered own ON own.pos = c.pos
+                    LEFT JOIN numbered prev ON prev.pos = c.prev_pos
+                    LEFT JOIN numbered next ON next.pos = c.next_pos
+                    LEFT JOIN ordered n ON n.pos = c.next_pos
+                ),
+                runs AS (
+                    SELECT id,
+                           FIRST_VALUE(id) OVER r AS keep_id,
+                           COUNT(*) OVER r AS run_rows,
+                           SUM(duration_seconds) OVER r AS run_duration,
+                           LAST_VALUE(end_ms) OVER r AS run_end_ms,
+                           MAX(flagged_for_review) OVER r AS run_flagged
+                    FROM members
+                    WHERE run IS NOT NULL
+                    WINDOW r AS (
+                        PARTITION BY run ORDER BY pos
+                        ROWS BETWEEN UNBOUNDED PRECEDING AND UNBOUNDED FOLLOWING
+                    )
+                )
+                SELECT * FROM runs WHERE run_rows > 1
+            """, [flicker_seconds] + params + [gap_ms, gap_ms])
+
+            # Extend each run's first event, then drop the rest of the run
+            # (rollup and search triggers follow both statements)
+            cursor.execute("""
+                UPDATE event_rows
+                SET (duration_seconds, end_ms, flagged_for_review) = (
+                    SELECT run_duration, run_end_ms, run_flagged
+                    FROM temp.event_compaction c WHERE c.id = event_rows.id
+                )
+                WHERE id IN (SELECT id FROM temp.event_compaction WHERE id = keep_id)
+            """)
+            runs_merged = cursor.rowcount
+
+            # Screenshots of merged events now belong to the kept event
+            self._touch_tables('screenshots')
+            cursor.execute("""
+                UPDATE screenshots
+                SET event_id = (
+                    SELECT keep_id FROM temp.event_compaction c WHERE c.id = screenshots.event_id
+                )
+                WHERE event_id IN (SELECT id FROM temp.event_compaction WHERE id != keep_id)
+            """)
+
+            cursor.execute("""
+                DELETE FROM event_rows
+                WHERE id IN (SELECT id FROM temp.event_compaction WHERE id != keep_id)
+            """)
+            removed = cursor.rowcount
+            cursor.execute("DROP TABLE temp.event_compaction")
+
+        result = {
+            'rows_before': rows_before,
+            'rows_after': rows_before - removed,
+            'runs_merged': runs_merged,
+        }
+        logging.info(
+            f"Compacted events: {result['rows_before']} -> {result['rows_after']} rows "
+            f"({runs_merged} runs merged)"
+        )
+        return result
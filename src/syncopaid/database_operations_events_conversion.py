@@ -3,11 +3,163 @@ Database row conversion utilities for activity events.
 
 Provides:
 - Convert database rows to dictionaries with backward compatibility
+- Schema-aware row decoder that resolves column positions once per cursor
+- EventRecord: __slots__ record type with lazy metadata/cmdline decoding
 """
 
 import json
-import logging
-from typing import List, Dict
+from functools import lru_cache
+from operator import itemgetter
+from typing import Callable, Dict, List, Optional, Tuple
+
+
+# Event fields produced by the decoder, in output order
+EVENT_FIELDS = (
+    'id', 'timestamp', 'duration_seconds', 'end_time', 'app', 'title', 'url',
+    'cmdline', 'is_idle', 'state', 'metadata', 'interaction_level',
+    'matter_id', 'confidence', 'flagged_for_review'
+)
+
+
+class EventRecord:
+    """
+    Lightweight event row with attribute and mapping-style access.
+
+    Uses __slots__ instead of a per-row dict, and defers json.loads of the
+    metadata and cmdline columns until they are first read.
+    """
+
+    __slots__ = (
+        'id', 'timestamp', 'duration_seconds', 'end_time', 'app', 'title', 'url',
+        'cmdline', 'is_idle', 'state', 'interaction_level',
+        'matter_id', 'confidence', 'flagged_for_review',
+        '_metadata_json', '_metadata', '_cmdline_args'
+    )
+
+    _UNDECODED = object()
+
+    def __init__(self, id, timestamp, duration_seconds, end_time, app, title, url,
+                 cmdline, is_idle, state, interaction_level, matter_id,
+                 confidence, flagged_for_review, metadata_json):
+        self.id = id
+        self.timestamp = timestamp
+        self.duration_seconds = duration_seconds
+        self.end_time = end_time
+        self.app = app
+        self.title = title
+        self.url = url
+        self.cmdline = cmdline
+        self.is_idle = bool(is_idle)
+        # Derive state from is_idle for older rows (backward compatibility)
+        self.state = state or ('Inactive' if is_idle else 'Active')
+        self.interaction_level = interaction_level or 'passive'
+        self.matter_id = matter_id
+        self.confidence = confidence
+        self.flagged_for_review = bool(flagged_for_review)
+        self._metadata_json = metadata_json
+        self._metadata = self._UNDECODED
+        self._cmdline_args = self._UNDECODED
+
+    @property
+    def metadata(self) -> Optional[Dict]:
+        """UI automation metadata, decoded from JSON on first access."""
+        if self._metadata is self._UNDECODED:
+            self._metadata = json.loads(self._metadata_json) if self._metadata_json else None
+        return self._metadata
+
+    @property
+    def cmdline_args(self) -> Optional[List[str]]:
+        """Command line as a list, decoded from the stored JSON on first access."""
+        if self._cmdline_args is self._UNDECODED:
+            self._cmdline_args = json.loads(self.cmdline) if self.cmdline else None
+        return self._cmdline_args
+
+    def __getitem__(self, key: str):
+        if key not in EVENT_FIELDS:
+            raise KeyError(key)
+        return getattr(self, key)
+
+    def get(self, key: str, default=None):
+        """Dictionary-style access with default, for code written against dicts."""
+        return getattr(self, key) if key in EVENT_FIELDS else default
+
+    def keys(self) -> Tuple[str, ...]:
+        """Field names, matching the keys of the dictionary representation."""
+        return EVENT_FIELDS
+
+    def to_dict(self) -> Dict:
+        """Convert to the dictionary shape returned by get_events()."""
+        return {field: getattr(self, field) for field in EVENT_FIELDS}
+
+    def __eq__(self, other) -> bool:
+        if isinstance(other, EventRecord):
+            other = other.to_dict()
+        return self.to_dict() == other
+
+    def __repr__(self) -> str:
+        return f"EventRecord(id={self.id}, timestamp={self.timestamp!r}, app={self.app!r})"
+
+
+@lru_cache(maxsize=32)
+def _event_decoder(column_names: Tuple[str, ...], as_records: bool) -> Callable:
+    """
+    Build a row decoder for a specific result-set layout.
+
+    Column positions are resolved once here, so decoding a row is a single
+    itemgetter call instead of repeated row.keys() membership checks.
+
+    Args:
+        column_names: Column names in result order (from cursor.description)
+        as_records: Produce EventRecord objects instead of dictionaries
+
+    Returns:
+        Function converting one row (sqlite3.Row or tuple) to an event
+    """
+    position = {name: i for i, name in enumerate(column_names)}
+    # Missing columns (older schemas) read from defaults appended to each row
+    none_slot, zero_slot = len(column_names), len(column_names) + 1
+    defaults = (None, 0)
+
+    def slot(name: str, missing: int) -> int:
+        return position.get(name, missing)
+
+    pick = itemgetter(
+        position['id'], position['timestamp'], position['duration_seconds'],
+        slot('end_time', none_slot), position['app'], position['title'],
+        position['url'], slot('cmdline', none_slot), position['is_idle'],
+        slot('state', none_slot), slot('interaction_level', none_slot),
+        slot('matter_id', none_slot), slot('confidence', zero_slot),
+        slot('flagged_for_review', zero_slot), slot('metadata', none_slot)
+    )
+
+    def decode_dict(row) -> Dict:
+        (event_id, timestamp, duration, end_time, app, title, url, cmdline,
+         is_idle, state, interaction_level, matter_id, confidence, flagged,
+         metadata_json) = pick(tuple(row) + defaults)
+        is_idle = bool(is_idle)
+        return {
+            'id': event_id,
+            'timestamp': timestamp,
+            'duration_seconds': duration,
+            'end_time': end_time,
+            'app': app,
+            'title': title,
+            'url': url,
+            'cmdline': cmdline,
+            'is_idle': is_idle,
+            # Derive state from is_idle for older rows (backward compatibility)
+            'state': state or ('Inactive' if is_idle else 'Active'),
+            'metadata': json.loads(metadata_json) if metadata_json else None,
+            'interaction_level': interaction_level or 'passive',
+            'matter_id': matter_id,
+            'confidence': confidence,
+            'flagged_for_review': bool(flagged)
+        }
+
+    if as_records:
+        return lambda row: EventRecord(*pick(tuple(row) + defaults))
+
+    return decode_dict
 
 
 class EventConversionMixin:
@@ -17,54 +169,33 @@ class EventConversionMixin:
     Handles backward compatibility for older database schemas.
     """
 
-    def _rows_to_dicts(self, rows) -> List[Dict]:
+    @staticmethod
+    def _cursor_decoder(cursor, as_records: bool = False) -> Callable:
+        """
+        Get the row decoder for a cursor's result layout.
+
+        Args:
+            cursor: Executed cursor (column names read from its description)
+            as_records: Produce EventRecord objects instead of dictionaries
+
+        Returns:
+            Function converting one row to an event
+        """
+        column_names = tuple(column[0] for column in cursor.description)
+        return _event_decoder(column_names, as_records)
+
+    def _rows_to_dicts(self, rows, as_records: bool = False) -> List:
         """
         Convert database rows to dictionaries with backward compatibility.
 
         Args:
             rows: Database rows with row factory
+            as_records: Return EventRecord objects instead of dictionaries
 
         Returns:
-            List of event dictionaries
+            List of event dictionaries (or EventRecord objects)
         """
-        events = []
-        for row in rows:
-            # Derive state from is_idle if column doesn't exist (backward compatibility)
-            if 'state' in row.keys() and row['state']:
-                state = row['state']
-            else:
-                state = 'Inactive' if row['is_idle'] else 'Active'
-
-            # Deserialize metadata JSON if present
-            metadata = None
-            if 'metadata' in row.keys() and row['metadata']:
-                metadata = json.loads(row['metadata'])
-
-            # Get cmdline field if it exists (backward compatibility)
-            cmdline = row['cmdline'] if 'cmdline' in row.keys() else None
-
-            # Get interaction_level with fallback for older records
-            if 'interaction_level' in row.keys() and row['interaction_level']:
-                interaction_level = row['interaction_level']
-            else:
-                interaction_level = 'passive'
-
-            events.append({
-                'id': row['id'],
-                'timestamp': row['timestamp'],
-                'duration_seconds': row['duration_seconds'],
-                'end_time': row['end_time'] if 'end_time' in row.keys() else None,
-                'app': row['app'],
-                'title': row['title'],
-                'url': row['url'],
-                'cmdline': cmdline,
-                'is_idle': bool(row['is_idle']),
-                'state': state,
-                'metadata': metadata,
-                'interaction_level': interaction_level,
-                'matter_id': row['matter_id'] if 'matter_id' in row.keys() else None,
-                'confidence': row['confidence'] if 'confidence' in row.keys() else 0,
-                'flagged_for_review': bool(row['flagged_for_review']) if 'flagged_for_review' in row.keys() else False
-            })
-
-        return events
+        if not rows:
+            return []
+        decode = _event_decoder(tuple(rows[0].keys()), as_records)
+        return [decode(row) for row in rows]
@@ -7,14 +7,19 @@ Provides:
 
 import logging
 from typing import List, Optional
-from datetime import datetime
+
+from .database_schema_interning import interned_ids, prune_interned_values
+from .database_time import date_range_to_ms
 
 
 class EventDeleteMixin:
     """
     Mixin providing event delete operations.
 
-    Requires _get_connection() method from ConnectionMixin.
+    Requires _get_connection() method from ConnectionMixin,
+    _delete_from_shards() from ShardDatabaseMixin, _unlink_screenshots()
+    from ScreenshotDatabaseMixin and the deletion job methods from
+    DeletionJobsDatabaseMixin.
     """
 
     def delete_events(
@@ -26,6 +31,8 @@ class EventDeleteMixin:
         Delete events within a date range.
 
         CAUTION: This permanently removes data. Use carefully.
+        Titles and command lines no other event uses are removed too;
+        screenshots are kept but no longer linked to the deleted events.
 
         Args:
             start_date: ISO date string (YYYY-MM-DD) for range start (inclusive)
@@ -38,27 +45,34 @@ class EventDeleteMixin:
             raise ValueError("Must specify at least start_date or end_date")
 
         with self._get_connection() as conn:
+            self._touch_tables('events')
             cursor = conn.cursor()
 
-            # Build delete query
-            query = "DELETE FROM events WHERE 1=1"
+            # Build delete condition
+            where = "1=1"
             params = []
 
-            if start_date:
-                query += " AND timestamp >= ?"
-                params.append(f"{start_date}T00:00:00")
+            start_ms, end_ms = date_range_to_ms(start_date, end_date)
+
+            if start_ms is not None:
+                where += " AND start_ms >= ?"
+                params.append(start_ms)
 
-            if end_date:
-                query += " AND timestamp < ?"
-                end_datetime = datetime.fromisoformat(end_date)
-                next_day = end_datetime.replace(hour=23, minute=59, second=59)
-                params.append(next_day.isoformat())
+            if end_ms is not None:
+                where += " AND start_ms < ?"
+                params.append(end_ms)
 
-            cursor.execute(query, params)
+            referenced = interned_ids(conn, where, params)
+            self._unlink_screenshots(conn, f"SELECT id FROM event_rows WHERE {where}", params)
+            cursor.execute(f"DELETE FROM event_rows WHERE {where}", params)
             deleted_count = cursor.rowcount
+            prune_interned_values(conn, referenced)
 
-            logging.warning(f"Deleted {deleted_count} events from database")
-            return deleted_count
+        # Archived months lose their rows (or whole shard files) too
+        deleted_count += self._delete_from_shards('events', "1", [], start_ms, end_ms)
+
+        logging.warning(f"Deleted {deleted_count} events from database")
+        return deleted_count
 
     def delete_events_by_ids(self, event_ids: List[int]) -> int:
         """
@@ -74,17 +88,27 @@ class EventDeleteMixin:
             return 0
 
         with self._get_connection() as conn:
+            self._touch_tables('events')
             cursor = conn.cursor()
 
             # Use parameterized query with placeholders
             placeholders = ','.join('?' * len(event_ids))
-            query = f"DELETE FROM events WHERE id IN ({placeholders})"
+            where = f"id IN ({placeholders})"
 
-            cursor.execute(query, event_ids)
+            referenced = interned_ids(conn, where, event_ids)
+            self._unlink_screenshots(conn, placeholders, event_ids)
+            cursor.execute(f"DELETE FROM event_rows WHERE {where}", event_ids)
             deleted_count = cursor.rowcount
+            prune_interned_values(conn, referenced)
+
+        # Remaining ids may belong to archived months
+        if deleted_count < len(set(event_ids)):
+            deleted_count += self._delete_from_shards(
+                'events', f"id IN ({placeholders})", event_ids
+            )
 
-            logging.warning(f"Deleted {deleted_count} events by ID from database")
-            return deleted_count
+        logging.warning(f"Deleted {deleted_count} events by ID from database")
+        return deleted_count
 
     def delete_events_securely(
         self,
@@ -92,10 +116,13 @@ class EventDeleteMixin:
         end_date: Optional[str] = None
     ) -> int:
         """
-        Securely delete events and associated screenshots.
+        Securely delete events, their linked screenshots and any other
+        screenshots captured in the range.
 
-        Uses secure_delete pragma for database records and overwrites
-        screenshot files before deletion.
+        Runs a deletion job to completion on the calling thread: rows are
+        deleted in short chunked transactions (secure_delete pragma), then
+        screenshot files are overwritten before deletion. Use
+        SecureDeletionEngine to purge large ranges in the background.
 
         Args:
             start_date: ISO date string (YYYY-MM-DD) for range start
@@ -104,15 +131,11 @@ class EventDeleteMixin:
         Returns:
             Number of events deleted
         """
-        if not start_date and not end_date:
-            raise ValueError("Must specify at least start_date or end_date")
-
-        # First, find and delete associated screenshots
-        # Screenshots are associated by timestamp overlap
-        screenshots = self.get_screenshots(start_date=start_date, end_date=end_date)
-        if screenshots:
-            screenshot_ids = [s['id'] for s in screenshots]
-            self.delete_screenshots_securely(screenshot_ids)
-
-        # Then delete events (secure_delete pragma handles secure deletion)
-        return self.delete_events(start_date=start_date, end_date=end_date)
+        job_id = self.create_deletion_job(start_date=start_date, end_date=end_date)
+        while self.delete_next_chunk(job_id):
+            pass
+        self.shred_job_files(job_id)
+
+        deleted_count = self.get_deletion_job(job_id)['events_deleted']
+        logging.warning(f"Securely deleted {deleted_count} events from database")
+        return deleted_count
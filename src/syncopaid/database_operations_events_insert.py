@@ -7,9 +7,11 @@ Provides:
 
 import json
 import logging
-from typing import List, Optional
+from typing import List, Optional, Sequence, Tuple
 
 from .tracker import ActivityEvent
+from .database_schema_interning import intern_values
+from .database_time import to_epoch_ms, utc_offset_minutes
 
 
 class EventInsertMixin:
@@ -19,6 +21,84 @@ class EventInsertMixin:
     Requires _get_connection() method from ConnectionMixin.
     """
 
+    # Writes event_rows directly; app, title and cmdline are looked up in
+    # their dictionary tables, which _insert_rows() fills first. Times are
+    # stored as epoch ms plus the timestamp's UTC offset.
+    _INSERT_EVENT_SQL = """
+        INSERT INTO event_rows (start_ms, duration_seconds, end_ms, app_id, title_id, url,
+                          cmdline_id, is_idle, state, metadata, interaction_level,
+                          matter_id, confidence, flagged_for_review, utc_offset_minutes)
+        VALUES (?, ?, ?,
+                (SELECT id FROM apps WHERE value = ?),
+                (SELECT id FROM titles WHERE value = ?),
+                ?,
+                (SELECT id FROM cmdlines WHERE value = ?),
+                ?, ?, ?, ?, ?, ?, ?, ?)
+    """
+
+    @staticmethod
+    def _insert_rows(conn, rows: List[Tuple]):
+        """
+        Intern the app, title and cmdline values of rows, then insert them.
+
+        Args:
+            conn: Database connection within the caller's transaction
+            rows: Tuples built by _event_row()
+
+        Returns:
+            Cursor of the insert (lastrowid is the last inserted event)
+        """
+        intern_values(conn, 'apps', (row[3] for row in rows))
+        intern_values(conn, 'titles', (row[4] for row in rows))
+        intern_values(conn, 'cmdlines', (row[6] for row in rows))
+        if len(rows) == 1:
+            return conn.execute(EventInsertMixin._INSERT_EVENT_SQL, rows[0])
+        return conn.executemany(EventInsertMixin._INSERT_EVENT_SQL, rows)
+
+    @staticmethod
+    def _event_row(
+        event: ActivityEvent,
+        matter_id: Optional[int] = None,
+        confidence: int = 0,
+        flagged_for_review: bool = False
+    ) -> Tuple:
+        """
+        Build the parameter tuple for inserting one event.
+
+        Args:
+            event: ActivityEvent object to store
+            matter_id: Optional matter ID for categorization
+            confidence: Confidence score (0-100) for matter assignment
+            flagged_for_review: Whether event needs manual review
+
+        Returns:
+            Tuple matching the columns of _INSERT_EVENT_SQL
+        """
+        # Get optional fields (may be None for older code paths)
+        end_time = getattr(event, 'end_time', None)
+        state = getattr(event, 'state', 'Active')
+        metadata = getattr(event, 'metadata', None)
+        cmdline = getattr(event, 'cmdline', None)
+        interaction_level = getattr(event, 'interaction_level', 'passive')
+
+        return (
+            to_epoch_ms(event.timestamp),
+            event.duration_seconds,
+            to_epoch_ms(end_time),
+            event.app,
+            event.title,
+            event.url,
+            json.dumps(cmdline) if cmdline else None,
+            1 if event.is_idle else 0,
+            state,
+            json.dumps(metadata) if metadata else None,
+            interaction_level,
+            matter_id,
+            confidence,
+            1 if flagged_for_review else 0,
+            utc_offset_minutes(event.timestamp)
+        )
+
     def insert_event(
         self,
         event: ActivityEvent,
@@ -39,51 +119,24 @@ class EventInsertMixin:
             The ID of the inserted event
         """
         with self._get_connection() as conn:
-            cursor = conn.cursor()
-
-            # Get optional fields (may be None for older code paths)
-            end_time = getattr(event, 'end_time', None)
-            state = getattr(event, 'state', 'Active')
-            metadata = getattr(event, 'metadata', None)
-            cmdline = getattr(event, 'cmdline', None)
-            interaction_level = getattr(event, 'interaction_level', 'passive')
-
-            # Serialize metadata to JSON if present
-            metadata_json = json.dumps(metadata) if metadata else None
-
-            # Serialize cmdline to JSON
-            cmdline_json = json.dumps(cmdline) if cmdline else None
-
-            cursor.execute("""
-                INSERT INTO events (timestamp, duration_seconds, end_time, app, title, url, cmdline,
-                                  is_idle, state, metadata, interaction_level,
-                                  matter_id, confidence, flagged_for_review)
-                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-            """, (
-                event.timestamp,
-                event.duration_seconds,
-                end_time,
-                event.app,
-                event.title,
-                event.url,
-                cmdline_json,
-                1 if event.is_idle else 0,
-                state,
-                metadata_json,
-                interaction_level,
-                matter_id,
-                confidence,
-                1 if flagged_for_review else 0
-            ))
-
+            self._touch_tables('events')
+            cursor = self._insert_rows(
+                conn, [self._event_row(event, matter_id, confidence, flagged_for_review)]
+            )
             return cursor.lastrowid
 
-    def insert_events_batch(self, events: List[ActivityEvent]) -> int:
+    def insert_events_batch(
+        self,
+        events: List[ActivityEvent],
+        categorizations: Optional[Sequence[Tuple[Optional[int], int, bool]]] = None
+    ) -> int:
         """
         Insert multiple events in a single transaction (more efficient).
 
         Args:
             events: List of ActivityEvent objects
+            categorizations: Optional sequence parallel to events of
+                            (matter_id, confidence, flagged_for_review) tuples
 
         Returns:
             Number of events inserted
@@ -91,20 +144,18 @@ class EventInsertMixin:
         if not events:
             return 0
 
+        if categorizations is None:
+            rows = [self._event_row(e) for e in events]
+        else:
+            if len(categorizations) != len(events):
+                raise ValueError("categorizations must match events one-to-one")
+            rows = [
+                self._event_row(e, *categorization)
+                for e, categorization in zip(events, categorizations)
+            ]
+
         with self._get_connection() as conn:
-            cursor = conn.cursor()
-
-            cursor.executemany("""
-                INSERT INTO events (timestamp, duration_seconds, end_time, app, title, url, cmdline, is_idle, state, metadata, interaction_level)
-                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-            """, [
-                (e.timestamp, e.duration_seconds, getattr(e, 'end_time', None),
-                 e.app, e.title, e.url,
-                 json.dumps(getattr(e, 'cmdline', None)) if getattr(e, 'cmdline', None) else None,
-                 1 if e.is_idle else 0, getattr(e, 'state', 'Active'),
-                 json.dumps(getattr(e, 'metadata', None)) if getattr(e, 'metadata', None) else None,
-                 getattr(e, 'interaction_level', 'passive'))
-                for e in events
-            ])
-
-            return len(events)
+            self._touch_tables('events')
+            self._insert_rows(conn, rows)
+
+        return len(events)
@@ -3,70 +3,377 @@ Database query operations for activity events.
 
 Provides:
 - Query events with filtering
+- Stream events in bounded memory
+- Keyset-paginated event pages for browsing
 - Get flagged events
+- Get titles of a matter's events
 """
 
 import logging
-from typing import List, Dict, Optional
-from datetime import datetime
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple
+
+from .database_time import date_range_to_ms
 
 
 class EventQueryMixin:
     """
     Mixin providing event query operations.
 
-    Requires _get_connection() and _rows_to_dicts() methods.
+    Requires _get_connection(), _cursor_decoder() and _sharded_sources() methods.
     """
 
+    # Columns callers may request from iter_events()
+    EVENT_COLUMNS = frozenset({
+        'id', 'timestamp', 'duration_seconds', 'end_time', 'app', 'title', 'url',
+        'cmdline', 'is_idle', 'state', 'metadata', 'interaction_level', 'matter_id',
+        'confidence', 'flagged_for_review', 'client', 'matter', 'start_ms', 'end_ms'
+    })
+
+    def _event_range_cursors(
+        self,
+        conn,
+        start_date: Optional[str],
+        end_date: Optional[str],
+        include_idle: bool,
+        columns: str = "*"
+    ) -> Iterator:
+        """
+        Run the range query shared by get_events() and iter_events().
+
+        The range is visited one month shard at a time (a single query when
+        no shards overlap it); each chunk's cursor is closed before the next.
+
+        Args:
+            conn: Database connection
+            start_date: ISO date string (YYYY-MM-DD) for range start (inclusive)
+            end_date: ISO date string (YYYY-MM-DD) for range end (inclusive)
+            include_idle: Whether to include idle events
+            columns: SQL column list to select
+
+        Yields:
+            Cursors over rows ordered by start time
+        """
+        # end_ms is midnight after end_date, making end_date inclusive
+        start_ms, end_ms = date_range_to_ms(start_date, end_date)
+        idle = "" if include_idle else " AND is_idle = 0"
+
+        sources = self._sharded_sources(conn, 'events', start_ms, end_ms)
+        try:
+            for source, range_sql, params in sources:
+                cursor = conn.execute(
+                    f"SELECT {columns} FROM {source} WHERE 1=1{range_sql}{idle} "
+                    f"ORDER BY start_ms ASC, id ASC",
+                    params
+                )
+                try:
+                    yield cursor
+                finally:
+                    cursor.close()
+        finally:
+            sources.close()
+
     def get_events(
         self,
         start_date: Optional[str] = None,
         end_date: Optional[str] = None,
         include_idle: bool = True,
-        limit: Optional[int] = None
+        limit: Optional[int] = None,
+        as_records: bool = False
     ) -> List[Dict]:
         """
         Query events with optional filtering.
 
+        Loads the whole range into memory; prefer iter_events() for large ranges.
+
         Args:
             start_date: ISO date string (YYYY-MM-DD) for range start (inclusive)
             end_date: ISO date string (YYYY-MM-DD) for range end (inclusive)
             include_idle: Whether to include idle events (default True)
             limit: Maximum number of events to return
+            as_records: Return EventRecord objects (lazy JSON decoding)
+                        instead of dictionaries
 
         Returns:
-            List of event dictionaries
+            List of event dictionaries (or EventRecord objects)
         """
+        events = []
         with self._get_connection() as conn:
-            cursor = conn.cursor()
+            for cursor in self._event_range_cursors(conn, start_date, end_date, include_idle):
+                # Convert rows to dictionaries
+                decode = self._cursor_decoder(cursor, as_records)
+                rows = cursor.fetchmany(limit - len(events)) if limit else cursor.fetchall()
+                events.extend(decode(row) for row in rows)
+                if limit and len(events) >= limit:
+                    break
+
+        return events
+
+    def iter_events(
+        self,
+        start_date: Optional[str] = None,
+        end_date: Optional[str] = None,
+        include_idle: bool = True,
+        columns: Optional[Sequence[str]] = None,
+        batch_size: int = 500,
+        as_records: bool = False
+    ) -> Iterator[Dict]:
+        """
+        Stream events in start-time order without materializing the range.
 
-            # Build query with filters
-            query = "SELECT * FROM events WHERE 1=1"
-            params = []
+        Rows are fetched batch_size at a time, each batch in its own short
+        transaction that resumes from the last (start_ms, id) key, so memory
+        use stays bounded and no read snapshot or open transaction is held
+        while the caller works through a batch (or abandons the generator).
 
-            if start_date:
-                query += " AND timestamp >= ?"
-                params.append(f"{start_date}T00:00:00")
+        Args:
+            start_date: ISO date string (YYYY-MM-DD) for range start (inclusive)
+            end_date: ISO date string (YYYY-MM-DD) for range end (inclusive)
+            include_idle: Whether to include idle events (default True)
+            columns: Event columns to fetch. None yields full event dictionaries
+                     (same shape as get_events()); otherwise each row is a
+                     dictionary holding only the requested columns.
+            batch_size: Rows fetched per transaction
+            as_records: With columns=None, yield EventRecord objects (lazy
+                        JSON decoding) instead of dictionaries
 
-            if end_date:
-                query += " AND timestamp < ?"
-                # Add one day to make end_date inclusive
-                end_datetime = datetime.fromisoformat(end_date)
-                next_day = end_datetime.replace(hour=23, minute=59, second=59)
-                params.append(next_day.isoformat())
+        Yields:
+            Event dictionaries
+        """
+        if columns is None:
+            select = "*"
+            key_columns = ()
+        else:
+            # The keyset needs start_ms and id even when the caller didn't ask
+            key_columns = tuple(c for c in ('id', 'start_ms') if c not in columns)
+            select = self._select_list(list(columns) + list(key_columns))
 
-            if not include_idle:
-                query += " AND is_idle = 0"
+        start_ms, end_ms = date_range_to_ms(start_date, end_date)
+        idle = "" if include_idle else " AND is_idle = 0"
+        after_key = None
 
-            query += " ORDER BY timestamp ASC"
+        while True:
+            keyset, key_params, batch_start_ms = self._event_keyset(after_key, start_ms)
+            keys = []
+            events = []
+            with self._get_connection() as conn:
+                sources = self._sharded_sources(conn, 'events', batch_start_ms, end_ms)
+                try:
+                    for source, range_sql, params in sources:
+                        cursor = conn.execute(
+                            f"SELECT {select} FROM {source} WHERE 1=1{range_sql}{idle}{keyset} "
+                            f"ORDER BY start_ms ASC, id ASC LIMIT ?",
+                            params + key_params + [batch_size - len(keys)]
+                        )
+                        rows = cursor.fetchall()
+                        if columns is None:
+                            events.extend(map(self._cursor_decoder(cursor, as_records), rows))
+                        else:
+                            for row in rows:
+                                event = self._column_row_to_dict(row)
+                                for column in key_columns:
+                                    del event[column]
+                                events.append(event)
+                        cursor.close()
+                        keys.extend((row['start_ms'], row['id']) for row in rows)
+                        if len(keys) == batch_size:
+                            break
+                finally:
+                    sources.close()
+
+            yield from events
+            if len(keys) < batch_size:
+                return
+            after_key = keys[-1]
 
-            if limit:
-                query += f" LIMIT {limit}"
+    @staticmethod
+    def _event_keyset(
+        after_key: Optional[Tuple[Optional[int], int]],
+        start_ms: Optional[int]
+    ) -> Tuple[str, List, Optional[int]]:
+        """
+        Build the predicate continuing an iter_events() scan after after_key.
 
-            cursor.execute(query, params)
+        Rows without start_ms sort first (and only appear in unbounded
+        ranges), so a key whose start_ms is None continues among them by id.
 
-            # Convert rows to dictionaries
-            return self._rows_to_dicts(cursor.fetchall())
+        Returns:
+            (' AND ...' condition, params, range start narrowed to the key so
+            shards wholly before it are skipped)
+        """
+        if after_key is None:
+            return "", [], start_ms
+        key_start, key_id = after_key
+        if key_start is None:
+            return " AND (start_ms IS NOT NULL OR id > ?)", [key_id], start_ms
+        start_ms = key_start if start_ms is None else max(start_ms, key_start)
+        return " AND (start_ms, id) > (?, ?)", [key_start, key_id], start_ms
+
+    def _select_list(self, columns: Sequence[str]) -> str:
+        """
+        Validate requested event columns and join them into a SELECT list.
+
+        Raises:
+            ValueError: If any column is not in EVENT_COLUMNS
+        """
+        unknown = set(columns) - self.EVENT_COLUMNS
+        if unknown:
+            raise ValueError(f"Unknown event columns: {sorted(unknown)}")
+        return ", ".join(columns)
+
+    @staticmethod
+    def _column_row_to_dict(row) -> Dict:
+        """Convert a row of selected columns to a dictionary with is_idle as bool."""
+        event = dict(row)
+        if 'is_idle' in event:
+            event['is_idle'] = bool(event['is_idle'])
+        return event
+
+    @staticmethod
+    def _build_page_filter(include_idle: bool, app: Optional[str]) -> Tuple[str, List]:
+        """
+        Build the filter shared by page_events() and count_events().
+
+        The time range is applied per shard chunk by _sharded_sources().
+
+        Returns:
+            (' AND ...' conditions, params)
+        """
+        # Rows without start_ms cannot be placed on the keyset
+        where = " AND start_ms IS NOT NULL"
+        params = []
+
+        if not include_idle:
+            where += " AND is_idle = 0"
+
+        if app is not None:
+            where += " AND app = ?"
+            params.append(app)
+
+        return where, params
+
+    def page_events(
+        self,
+        after_key: Optional[Tuple[int, int]] = None,
+        limit: int = 200,
+        start_ms: Optional[int] = None,
+        end_ms: Optional[int] = None,
+        include_idle: bool = True,
+        app: Optional[str] = None,
+        descending: bool = False,
+        columns: Optional[Sequence[str]] = None
+    ) -> Tuple[List[Dict], Optional[Tuple[int, int]]]:
+        """
+        Fetch one page of events using keyset pagination.
+
+        Pages are ordered by (start_ms, id) and continue from the last key of
+        the previous page, so each page costs an index seek regardless of how
+        deep into the range it is (unlike LIMIT/OFFSET).
+
+        Args:
+            after_key: (start_ms, id) returned with the previous page, or None
+                       for the first page
+            limit: Maximum number of events in the page
+            start_ms: Epoch-ms range start (inclusive); see date_range_to_ms()
+            end_ms: Epoch-ms range end (exclusive)
+            include_idle: Whether to include idle events
+            app: Only events from this application
+            descending: Newest first instead of oldest first
+            columns: Event columns to fetch (None = all). start_ms and id are
+                     always fetched since they form the key.
+
+        Returns:
+            (events, next_key) where next_key is None when there are no more pages
+        """
+        if columns is None:
+            select = "*"
+        else:
+            select = self._select_list(
+                list(columns) + [c for c in ('id', 'start_ms') if c not in columns]
+            )
+
+        where, filter_params = self._build_page_filter(include_idle, app)
+        direction = "DESC" if descending else "ASC"
+
+        if after_key is not None:
+            where += f" AND (start_ms, id) {'<' if descending else '>'} (?, ?)"
+            filter_params.extend(after_key)
+            # Skip shards wholly on the far side of the key
+            if descending:
+                end_ms = after_key[0] + 1 if end_ms is None else min(end_ms, after_key[0] + 1)
+            else:
+                start_ms = after_key[0] if start_ms is None else max(start_ms, after_key[0])
+
+        rows = []
+        events = []
+        with self._get_connection() as conn:
+            sources = self._sharded_sources(conn, 'events', start_ms, end_ms, descending)
+            try:
+                for source, range_sql, params in sources:
+                    cursor = conn.execute(
+                        f"SELECT {select} FROM {source} WHERE 1=1{range_sql}{where} "
+                        f"ORDER BY start_ms {direction}, id {direction} LIMIT ?",
+                        params + filter_params + [limit - len(rows)]
+                    )
+                    chunk = cursor.fetchall()
+                    if columns is None:
+                        decode = self._cursor_decoder(cursor)
+                        events.extend(decode(row) for row in chunk)
+                    else:
+                        events.extend(self._column_row_to_dict(row) for row in chunk)
+                    cursor.close()
+                    rows.extend(chunk)
+                    if len(rows) == limit:
+                        break
+            finally:
+                sources.close()
+
+        next_key = None
+        if len(rows) == limit:
+            next_key = (rows[-1]['start_ms'], rows[-1]['id'])
+
+        return events, next_key
+
+    def count_events(
+        self,
+        start_ms: Optional[int] = None,
+        end_ms: Optional[int] = None,
+        include_idle: bool = True,
+        app: Optional[str] = None
+    ) -> Dict:
+        """
+        Count events and sum recorded durations for page_events() filters.
+
+        Args:
+            start_ms: Epoch-ms range start (inclusive)
+            end_ms: Epoch-ms range end (exclusive)
+            include_idle: Whether to include idle events
+            app: Only events from this application
+
+        Returns:
+            Dictionary with total_events and total_duration_seconds
+        """
+        where, filter_params = self._build_page_filter(include_idle, app)
+        total_events = 0
+        total_duration = 0.0
+
+        with self._get_connection() as conn:
+            sources = self._sharded_sources(conn, 'events', start_ms, end_ms)
+            try:
+                for source, range_sql, params in sources:
+                    row = conn.execute(
+                        f"SELECT COUNT(*) as total_events, SUM(duration_seconds) as total_duration "
+                        f"FROM {source} WHERE 1=1{range_sql}{where}",
+                        params + filter_params
+                    ).fetchone()
+                    total_events += row['total_events'] or 0
+                    total_duration += row['total_duration'] or 0.0
+            finally:
+                sources.close()
+
+        return {
+            'total_events': total_events,
+            'total_duration_seconds': total_duration
+        }
 
     def get_flagged_events(
         self,
@@ -75,35 +382,58 @@ class EventQueryMixin:
         limit: Optional[int] = None
     ) -> List[Dict]:
         """Get events flagged for manual review."""
+        start_ms, _ = date_range_to_ms(start_date)
+        events = []
+
         with self._get_connection() as conn:
-            cursor = conn.cursor()
+            sources = self._sharded_sources(conn, 'events', start_ms)
+            try:
+                for source, range_sql, params in sources:
+                    query = (
+                        f"SELECT * FROM {source} WHERE 1=1{range_sql} AND flagged_for_review = 1 "
+                        f"ORDER BY start_ms ASC, id ASC"
+                    )
 
-            query = "SELECT * FROM events WHERE flagged_for_review = 1"
-            params = []
+                    if limit:
+                        query += f" LIMIT {limit - len(events)}"
 
-            if start_date:
-                query += " AND timestamp >= ?"
-                params.append(f"{start_date}T00:00:00")
+                    for row in conn.execute(query, params).fetchall():
+                        events.append({
+                            'id': row['id'],
+                            'timestamp': row['timestamp'],
+                            'duration_seconds': row['duration_seconds'],
+                            'app': row['app'],
+                            'title': row['title'],
+                            'matter_id': row['matter_id'] if 'matter_id' in row.keys() else None,
+                            'confidence': row['confidence'] if 'confidence' in row.keys() else 0,
+                            'flagged_for_review': True,
+                        })
 
-            query += " ORDER BY timestamp ASC"
+                    if limit and len(events) >= limit:
+                        break
+            finally:
+                sources.close()
 
-            if limit:
-                query += f" LIMIT {limit}"
+        return events
 
-            cursor.execute(query, params)
+    def get_matter_titles(self, matter_id: int, limit: int = 1000) -> List[str]:
+        """
+        Get window titles of recent active events assigned to a matter.
 
-            events = []
-            for row in cursor.fetchall():
-                state = row['state'] if 'state' in row.keys() and row['state'] else ('Inactive' if row['is_idle'] else 'Active')
-                events.append({
-                    'id': row['id'],
-                    'timestamp': row['timestamp'],
-                    'duration_seconds': row['duration_seconds'],
-                    'app': row['app'],
-                    'title': row['title'],
-                    'matter_id': row['matter_id'] if 'matter_id' in row.keys() else None,
-                    'confidence': row['confidence'] if 'confidence' in row.keys() else 0,
-                    'flagged_for_review': True,
-                })
-
-            return events
+        Only the main database is read, so archived months are not included.
+
+        Args:
+            matter_id: Matter ID
+            limit: Maximum number of titles, newest first
+
+        Returns:
+            List of window titles
+        """
+        with self._get_connection() as conn:
+            rows = conn.execute("""
+                SELECT title FROM events
+                WHERE matter_id = ? AND is_idle = 0 AND title IS NOT NULL
+                ORDER BY start_ms DESC
+                LIMIT ?
+            """, (matter_id, limit)).fetchall()
+        return [row['title'] for row in rows]
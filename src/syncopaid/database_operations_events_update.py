@@ -3,6 +3,7 @@ Database update operations for activity events.
 
 Provides:
 - Update event categorization
+- Update event client/matter assignment
 """
 
 import logging
@@ -25,11 +26,27 @@ class EventUpdateMixin:
     ):
         """Update categorization of an existing event."""
         with self._get_connection() as conn:
+            self._touch_tables('events')
             cursor = conn.cursor()
             cursor.execute("""
-                UPDATE events
+                UPDATE event_rows
                 SET matter_id = ?, confidence = ?, flagged_for_review = ?
                 WHERE id = ?
             """, (matter_id, confidence, 1 if flagged_for_review else 0, event_id))
 
             logging.info(f"Updated categorization for event {event_id}")
+
+    def update_event_assignment(
+        self,
+        event_id: int,
+        client: Optional[str] = None,
+        matter: Optional[str] = None
+    ):
+        """Update the client and matter names an event is assigned to."""
+        with self._get_connection() as conn:
+            self._touch_tables('events')
+            conn.execute("""
+                UPDATE event_rows SET client = ?, matter = ? WHERE id = ?
+            """, (client, matter, event_id))
+
+            logging.info(f"Updated assignment for event {event_id}")
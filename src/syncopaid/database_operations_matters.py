@@ -6,6 +6,8 @@ Provides matter management operations.
 
 from typing import List, Dict, Optional
 
+from .database_cache import cached_query
+
 
 class MatterOperationsMixin:
     """
@@ -29,6 +31,7 @@ class MatterOperationsMixin:
             The ID of the inserted matter
         """
         with self._get_connection() as conn:
+            self._touch_tables('matters')
             cursor = conn.cursor()
             cursor.execute("""
                 INSERT INTO matters (matter_number, client_id, description, status)
@@ -36,6 +39,7 @@ class MatterOperationsMixin:
             """, (matter_number, client_id, description, status))
             return cursor.lastrowid
 
+    @cached_query('matters', 'clients')
     def get_matters(self, status: str = 'active') -> List[Dict]:
         """
         Get matters with optional status filtering.
@@ -74,6 +78,7 @@ class MatterOperationsMixin:
             description: New description (optional)
         """
         with self._get_connection() as conn:
+            self._touch_tables('matters')
             cursor = conn.cursor()
             cursor.execute("""
                 UPDATE matters SET matter_number = ?, client_id = ?, description = ?,
@@ -89,6 +94,7 @@ class MatterOperationsMixin:
             status: New status (e.g., 'active', 'archived')
         """
         with self._get_connection() as conn:
+            self._touch_tables('matters')
             cursor = conn.cursor()
             cursor.execute("""
                 UPDATE matters SET status = ?, updated_at = datetime('now') WHERE id = ?
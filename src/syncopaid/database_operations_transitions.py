@@ -31,6 +31,7 @@ class TransitionOperationsMixin:
         context_json = json.dumps(context) if context else None
 
         with self._get_connection() as conn:
+            self._touch_tables('transitions')
             cursor = conn.execute(
                 "INSERT INTO transitions (timestamp, transition_type, context, user_response) VALUES (?, ?, ?, ?)",
                 (timestamp, transition_type, context_json, user_response)
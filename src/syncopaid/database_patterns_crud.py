@@ -8,6 +8,8 @@ learning patterns. Each pattern maps activity attributes (app, URL, title) to a
 import logging
 from typing import List, Dict, Optional
 
+from .database_cache import cached_query
+
 
 class PatternsCRUDMixin:
     """
@@ -41,6 +43,7 @@ class PatternsCRUDMixin:
             raise ValueError("At least one pattern (app, url, or title) is required")
 
         with self._get_connection() as conn:
+            self._touch_tables('categorization_patterns')
             cursor = conn.cursor()
             cursor.execute("""
                 INSERT INTO categorization_patterns
@@ -150,11 +153,13 @@ class PatternsCRUDMixin:
             True if deleted, False if not found
         """
         with self._get_connection() as conn:
+            self._touch_tables('categorization_patterns')
             cursor = conn.cursor()
             cursor.execute("DELETE FROM categorization_patterns WHERE id = ?", (pattern_id,))
             conn.commit()
             return cursor.rowcount > 0
 
+    @cached_query('categorization_patterns', 'matters', 'clients')
     def get_all_patterns(self, include_archived: bool = False) -> List[Dict]:
         """
         Get all patterns across all matters.
@@ -31,6 +31,7 @@ class PatternsExportMixin:
             Number of patterns archived
         """
         with self._get_connection() as conn:
+            self._touch_tables('categorization_patterns')
             cursor = conn.cursor()
             cutoff_date = (datetime.now() - timedelta(days=days)).isoformat()
 
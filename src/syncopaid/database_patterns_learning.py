@@ -44,6 +44,7 @@ class PatternsLearningMixin:
             raise ValueError("At least one attribute (app, url, or title) is required")
 
         with self._get_connection() as conn:
+            self._touch_tables('categorization_patterns')
             cursor = conn.cursor()
             now = datetime.now().isoformat()
 
@@ -112,6 +113,7 @@ class PatternsLearningMixin:
             ID of the created or reinforced pattern
         """
         with self._get_connection() as conn:
+            self._touch_tables('categorization_patterns')
             cursor = conn.cursor()
             now = datetime.now().isoformat()
 
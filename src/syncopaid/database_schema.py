@@ -5,15 +5,57 @@ Handles:
 - Creating tables and indices
 - Schema migrations for new columns
 - Backward compatibility for existing databases
+
+Schema changes are applied as numbered migrations recorded in
+PRAGMA user_version, so opening an up-to-date database costs a single
+pragma read. Every migration is idempotent: databases created before the
+registry existed start at version 0 and replay all steps safely.
 """
 
 import logging
 from .database_schema_events import EventsSchemaMixin
 from .database_schema_screenshots import ScreenshotsSchemaMixin
 from .database_schema_matters import MattersSchemaMixin
-
-
-class SchemaMixin(EventsSchemaMixin, ScreenshotsSchemaMixin, MattersSchemaMixin):
+from .database_schema_rollups import RollupsSchemaMixin
+from .database_schema_search import SearchSchemaMixin
+from .database_schema_interning import InterningSchemaMixin
+from .database_schema_deletion import DeletionSchemaMixin
+from .database_schema_changes import ChangesSchemaMixin
+
+
+# Ordered migration registry: (user_version, description, SchemaMixin method).
+# Each method takes a cursor inside the migration's transaction. Append new
+# steps at the end; never renumber or edit a released step.
+MIGRATIONS = (
+    (1, "base tables, indices and column migrations", '_migration_base_schema'),
+    (2, "epoch-millisecond time columns and range indices", '_migration_epoch_ms'),
+    (3, "daily_rollups table and triggers", '_create_daily_rollups_table'),
+    (4, "FTS5 search index over events and screenshots", '_create_search_index'),
+    (5, "dictionary-encoded app, title and cmdline storage", '_migrate_events_interning'),
+    (6, "secure deletion job tables", '_create_deletion_jobs_tables'),
+    (7, "change feed log, consumer checkpoints and triggers", '_create_change_feed'),
+    (8, "screenshot-to-event link column, index and trigger", '_migrate_screenshots_event_link'),
+    (9, "events.source_machine column for merged databases", '_migrate_events_source_machine'),
+    (10, "change log previous matter and consumer-gated triggers", '_migrate_change_feed_consumers'),
+    (11, "screenshot-to-event link backfill progress", '_create_screenshot_link_state'),
+    (12, "screenshot link trigger limited to local events", '_migrate_screenshot_link_local_events'),
+    (13, "failed shredding attempts per queued file", '_migrate_deletion_file_attempts'),
+    (14, "event times stored as epoch ms and UTC offset only", '_migrate_event_rows_epoch_only'),
+)
+
+SCHEMA_VERSION = MIGRATIONS[-1][0]
+
+
+class SchemaMixin(
+    EventsSchemaMixin,
+    ScreenshotsSchemaMixin,
+    MattersSchemaMixin,
+    RollupsSchemaMixin,
+    SearchSchemaMixin,
+    InterningSchemaMixin,
+    DeletionSchemaMixin,
+    ChangesSchemaMixin
+):
     """
     Mixin providing schema initialization and migration logic.
 
@@ -22,44 +64,90 @@ class SchemaMixin(EventsSchemaMixin, ScreenshotsSchemaMixin, MattersSchemaMixin)
 
     def _init_schema(self):
         """
-        Create database schema if it doesn't exist.
+        Bring the database schema up to SCHEMA_VERSION.
 
         Schema includes:
         - events table with all activity fields
         - screenshots table with captured screenshots metadata
         - Indices on timestamp and app for query performance
+        - daily_rollups table for O(days) statistics and summaries
+        - FTS5 search index over events and screenshot analysis
+        - apps/titles/cmdlines dictionaries behind the events view
+        - deletion_jobs tables for resumable secure deletion
+        - changes log and consumer checkpoints for incremental readers
+        - screenshots.event_id linking screenshots to their event
+        - events.source_machine naming the machine of merged events
+        - event times stored as epoch ms, the view rebuilding their text
         - Automatic migrations for schema updates
         """
+        version = self._get_schema_version()
+        if version == SCHEMA_VERSION:
+            return
+        if version > SCHEMA_VERSION:
+            logging.warning(
+                f"Database schema version {version} is newer than this build "
+                f"supports ({SCHEMA_VERSION}); skipping migrations"
+            )
+            return
+
+        self._run_migrations()
+        logging.info(f"Database schema initialized (version {SCHEMA_VERSION})")
+
+    def _get_schema_version(self) -> int:
+        """Return the migration version recorded in PRAGMA user_version."""
         with self._get_connection() as conn:
-            cursor = conn.cursor()
+            return conn.execute("PRAGMA user_version").fetchone()[0]
+
+    def _run_migrations(self):
+        """
+        Apply pending migrations in order, one transaction per step.
 
-            # Create events table
-            self._create_events_table(cursor)
+        Each step takes a write lock before re-reading user_version, so two
+        processes opening the same database never apply a step twice.
+        """
+        for version, description, method in MIGRATIONS:
+            with self._get_connection() as conn:
+                if not conn.in_transaction:
+                    conn.execute("BEGIN IMMEDIATE")
+                current = conn.execute("PRAGMA user_version").fetchone()[0]
+                if current >= version:
+                    continue
 
-            # Run migrations to add columns for existing databases
-            self._migrate_events_table(cursor)
+                getattr(self, method)(conn.cursor())
+                conn.execute(f"PRAGMA user_version = {version}")
 
-            # Create indices for query performance
-            self._create_events_indices(cursor)
+            logging.info(f"Database migration {version}: {description}")
 
-            # Create screenshots table
-            self._create_screenshots_table(cursor)
+    def _migration_base_schema(self, cursor):
+        """
+        Migration 1: core tables, their indices and legacy column additions.
 
-            # Create transitions table
-            self._create_transitions_table(cursor)
+        Args:
+            cursor: Database cursor within the migration transaction
+        """
+        self._create_events_table(cursor)
+        self._migrate_events_table(cursor)
+        self._create_events_indices(cursor)
 
-            # Create clients and matters tables (with migration for old schemas)
-            self._create_clients_table(cursor)
-            self._migrate_clients_table(cursor)
-            self._create_matters_table(cursor)
+        self._create_screenshots_table(cursor)
+        self._migrate_screenshots_table(cursor)
+        self._create_transitions_table(cursor)
 
-            # Create matter keywords table for AI keyword extraction
-            self._create_matter_keywords_table(cursor)
+        # Clients and matters tables (with migration for old schemas)
+        self._create_clients_table(cursor)
+        self._migrate_clients_table(cursor)
+        self._create_matters_table(cursor)
 
-            # Create categorization patterns table for AI learning
-            self._create_categorization_patterns_table(cursor)
+        # AI keyword extraction and categorization learning
+        self._create_matter_keywords_table(cursor)
+        self._create_categorization_patterns_table(cursor)
 
-        # Run migrations for screenshots table (outside cursor context)
-        self._migrate_screenshots_table()
+    def _migration_epoch_ms(self, cursor):
+        """
+        Migration 2: epoch-millisecond columns on events and screenshots.
 
-        logging.info("Database schema initialized")
+        Args:
+            cursor: Database cursor within the migration transaction
+        """
+        self._migrate_events_epoch_ms(cursor)
+        self._migrate_screenshots_epoch_ms(cursor)
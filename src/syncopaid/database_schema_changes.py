@@ -0,0 +1,112 @@
+"""
+Change-data-capture feed tables and triggers.
+
+Handles:
+- changes: an append-only log of inserted, updated and deleted rows
+- change_consumers: the last sequence number each downstream consumer
+  has processed
+- Triggers recording every write to the tracked tables
+
+The log only names the row (table, id, operation); consumers read the
+row's current contents when they process it. Event updates and deletes
+also record the matter the row belonged to before the write, so a
+consumer can revisit matters an event left. Nothing is logged while no
+consumer is registered. Writes to archived month shards are not logged.
+"""
+
+from typing import Sequence
+
+from .database_schema_interning import events_storage
+
+
+# Tables whose writes are logged, by the name recorded in changes
+CHANGE_TRACKED_TABLES = ('events', 'screenshots', 'matters', 'clients')
+
+
+class ChangesSchemaMixin:
+    """
+    Mixin providing the change feed tables and triggers.
+
+    Requires _get_connection() method from ConnectionMixin.
+    """
+
+    def _create_change_feed(self, cursor):
+        """
+        Create changes, change_consumers and the logging triggers.
+
+        Args:
+            cursor: Database cursor for creating tables and triggers
+        """
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS changes (
+                seq INTEGER PRIMARY KEY AUTOINCREMENT,
+                table_name TEXT NOT NULL,
+                row_id INTEGER NOT NULL,
+                operation TEXT NOT NULL
+            )
+        """)
+
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS change_consumers (
+                name TEXT PRIMARY KEY,
+                last_seq INTEGER NOT NULL DEFAULT 0,
+                updated_at TEXT DEFAULT CURRENT_TIMESTAMP
+            )
+        """)
+
+        for table in CHANGE_TRACKED_TABLES:
+            storage = events_storage(cursor)[0] if table == 'events' else table
+            for operation, row in (('insert', 'NEW'), ('update', 'NEW'), ('delete', 'OLD')):
+                cursor.execute(f"""
+                    CREATE TRIGGER IF NOT EXISTS {table}_change_{operation}
+                    AFTER {operation.upper()} ON {storage}
+                    BEGIN
+                        INSERT INTO changes (table_name, row_id, operation)
+                        VALUES ('{table}', {row}.id, '{operation}');
+                    END
+                """)
+
+    def _migrate_change_feed_consumers(self, cursor):
+        """
+        Record each event's previous matter and log only while consumed.
+
+        Adds changes.old_matter_id and recreates the logging triggers so
+        they fire only while a consumer is registered. Entries logged
+        before any consumer existed are dropped.
+
+        Args:
+            cursor: Database cursor within the migration transaction
+        """
+        cursor.execute("PRAGMA table_info(changes)")
+        if 'old_matter_id' not in {row[1] for row in cursor.fetchall()}:
+            cursor.execute("ALTER TABLE changes ADD COLUMN old_matter_id INTEGER")
+
+        self._create_change_triggers(cursor)
+
+        cursor.execute("""
+            DELETE FROM changes
+            WHERE NOT EXISTS (SELECT 1 FROM change_consumers)
+        """)
+
+    def _create_change_triggers(self, cursor, tables: Sequence[str] = CHANGE_TRACKED_TABLES):
+        """
+        (Re)create the consumer-gated logging triggers of tracked tables.
+
+        Args:
+            cursor: Database cursor for creating triggers
+            tables: Tracked tables whose triggers to recreate
+        """
+        for table in tables:
+            storage = events_storage(cursor)[0] if table == 'events' else table
+            for operation, row in (('insert', 'NEW'), ('update', 'NEW'), ('delete', 'OLD')):
+                old_matter = 'OLD.matter_id' if table == 'events' and operation != 'insert' else 'NULL'
+                cursor.execute(f"DROP TRIGGER IF EXISTS {table}_change_{operation}")
+                cursor.execute(f"""
+                    CREATE TRIGGER {table}_change_{operation}
+                    AFTER {operation.upper()} ON {storage}
+                    WHEN EXISTS (SELECT 1 FROM change_consumers)
+                    BEGIN
+                        INSERT INTO changes (table_name, row_id, operation, old_matter_id)
+                        VALUES ('{table}', {row}.id, '{operation}', {old_matter});
+                    END
+                """)
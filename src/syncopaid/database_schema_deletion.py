@@ -0,0 +1,76 @@
+"""
+Secure deletion job tables.
+
+Handles:
+- deletion_jobs: one row per requested purge, with progress counters
+- deletion_job_files: screenshot files waiting to be shredded
+
+Rows are removed from the database in short chunked transactions; each
+chunk records the file paths of the screenshots it deletes in
+deletion_job_files within the same transaction. Files are shredded
+afterwards and their queue rows removed, so a crash at any point leaves
+either rows still to delete or files still queued, never an orphaned file.
+A file that cannot be shredded stays queued with a count of its attempts.
+"""
+
+
+class DeletionSchemaMixin:
+    """
+    Mixin providing the secure deletion job tables.
+
+    Requires _get_connection() method from ConnectionMixin.
+    """
+
+    def _create_deletion_jobs_tables(self, cursor):
+        """
+        Create deletion_jobs and deletion_job_files.
+
+        Args:
+            cursor: Database cursor for creating tables
+        """
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS deletion_jobs (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                kind TEXT NOT NULL,
+                start_ms INTEGER,
+                end_ms INTEGER,
+                status TEXT NOT NULL DEFAULT 'pending',
+                created_at TEXT DEFAULT CURRENT_TIMESTAMP,
+                completed_at TEXT,
+                events_deleted INTEGER DEFAULT 0,
+                screenshots_deleted INTEGER DEFAULT 0,
+                files_queued INTEGER DEFAULT 0,
+                files_shredded INTEGER DEFAULT 0,
+                bytes_shredded INTEGER DEFAULT 0,
+                error TEXT
+            )
+        """)
+
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS deletion_job_files (
+                id INTEGER PRIMARY KEY,
+                job_id INTEGER NOT NULL REFERENCES deletion_jobs(id),
+                file_path TEXT NOT NULL,
+                UNIQUE(job_id, file_path)
+            )
+        """)
+
+        cursor.execute(
+            "CREATE INDEX IF NOT EXISTS idx_deletion_jobs_status ON deletion_jobs(status)"
+        )
+
+    def _migrate_deletion_file_attempts(self, cursor):
+        """
+        Add deletion_job_files.attempts, the failed shredding attempts per file.
+
+        A file that cannot be shredded stays queued and is retried until
+        the attempt limit fails its job.
+
+        Args:
+            cursor: Database cursor within the migration transaction
+        """
+        cursor.execute("PRAGMA table_info(deletion_job_files)")
+        if 'attempts' not in {row[1] for row in cursor.fetchall()}:
+            cursor.execute(
+                "ALTER TABLE deletion_job_files ADD COLUMN attempts INTEGER NOT NULL DEFAULT 0"
+            )
@@ -9,6 +9,9 @@ Handles:
 
 import logging
 
+from .database_schema_interning import event_rows_epoch_only
+from .database_time import EPOCH_MS_SQL
+
 
 class EventsSchemaMixin:
     """
@@ -120,3 +123,84 @@ class EventsSchemaMixin:
             CREATE INDEX IF NOT EXISTS idx_app
             ON events(app)
         """)
+
+    def _migrate_events_epoch_ms(self, cursor):
+        """
+        Add epoch-millisecond time columns, their fill triggers and range indices.
+
+        Args:
+            cursor: Database cursor for executing migrations
+        """
+        cursor.execute("PRAGMA table_info(events)")
+        columns = [row[1] for row in cursor.fetchall()]
+
+        if 'start_ms' not in columns:
+            cursor.execute("ALTER TABLE events ADD COLUMN start_ms INTEGER")
+            cursor.execute("ALTER TABLE events ADD COLUMN end_ms INTEGER")
+            cursor.execute(f"""
+                UPDATE events
+                SET start_ms = {EPOCH_MS_SQL.format(column='timestamp')},
+                    end_ms = {EPOCH_MS_SQL.format(column='end_time')}
+            """)
+            logging.info(
+                f"Database migration: Added start_ms/end_ms columns to events table "
+                f"(backfilled {cursor.rowcount} rows)"
+            )
+
+        self._create_events_epoch_objects(cursor)
+
+    def _create_events_epoch_objects(self, cursor, table: str = 'events'):
+        """
+        Create the epoch-ms fill triggers and composite range indices.
+
+        Args:
+            cursor: Database cursor for creating triggers and indices
+            table: Table holding the events ('event_rows' from migration 5 on)
+        """
+        # Fallback for writers that don't supply start_ms/end_ms themselves;
+        # event_rows without the ISO text (migration 14 on) has nothing to fill from
+        if table == 'event_rows' and event_rows_epoch_only(cursor):
+            self._create_events_range_indices(cursor, table)
+            return
+
+        cursor.execute(f"""
+            CREATE TRIGGER IF NOT EXISTS events_fill_epoch_ms
+            AFTER INSERT ON {table}
+            WHEN NEW.start_ms IS NULL
+            BEGIN
+                UPDATE {table}
+                SET start_ms = {EPOCH_MS_SQL.format(column='NEW.timestamp')},
+                    end_ms = {EPOCH_MS_SQL.format(column='NEW.end_time')}
+                WHERE id = NEW.id;
+            END
+        """)
+        cursor.execute(f"""
+            CREATE TRIGGER IF NOT EXISTS events_update_epoch_ms
+            AFTER UPDATE OF timestamp, end_time ON {table}
+            BEGIN
+                UPDATE {table}
+                SET start_ms = {EPOCH_MS_SQL.format(column='NEW.timestamp')},
+                    end_ms = {EPOCH_MS_SQL.format(column='NEW.end_time')}
+                WHERE id = NEW.id;
+            END
+        """)
+
+        self._create_events_range_indices(cursor, table)
+
+    def _create_events_range_indices(self, cursor, table: str = 'events'):
+        """
+        Create the composite indices for epoch-ms range scans.
+
+        Args:
+            cursor: Database cursor for creating indices
+            table: Table holding the events
+        """
+        cursor.execute(f"""
+            CREATE INDEX IF NOT EXISTS idx_events_start_state
+            ON {table}(start_ms, state)
+        """)
+
+        cursor.execute(f"""
+            CREATE INDEX IF NOT EXISTS idx_events_matter_start
+            ON {table}(matter_id, start_ms)
+        """)
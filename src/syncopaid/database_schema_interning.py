@@ -0,0 +1,608 @@
+"""
+Dictionary-encoded storage for event apps, titles and cmdlines.
+
+Handles:
+- apps, titles and cmdlines dictionary tables (one row per distinct value)
+- event_rows, the physical events table holding integer references
+- The events compatibility view, with INSTEAD OF triggers so existing
+  SELECT/INSERT/UPDATE/DELETE statements against events keep working
+- Converting databases that still store events as a plain table
+
+A day of tracking is dominated by a few hundred distinct windows, so
+storing each app, title and cmdline once and referencing it by id shrinks
+events several-fold and turns GROUP BY app/title into integer grouping.
+
+Library write paths insert into event_rows directly (so lastrowid and
+rowcount work); the view's triggers are the compatibility path for raw SQL.
+Migration 5 re-attaches the triggers and indices that earlier migrations
+created on the plain events table (epoch-ms fill, rollups, search) to
+event_rows; the earlier steps themselves are left untouched.
+
+Migration 14 drops the ISO timestamp/end_time text from event_rows: only
+start_ms/end_ms and the UTC offset the text was written with are stored,
+and the view rebuilds the text (at millisecond precision).
+"""
+
+import logging
+from typing import Dict, Iterable, List, Sequence, Set, Tuple
+
+from .database_time import EPOCH_MS_SQL, ISO_TIME_SQL, UTC_OFFSET_MINUTES_SQL
+
+
+# Interned view column -> (dictionary table, event_rows reference column)
+INTERNED_COLUMNS = {
+    'app': ('apps', 'app_id'),
+    'title': ('titles', 'title_id'),
+    'cmdline': ('cmdlines', 'cmdline_id'),
+}
+
+# Columns of the events view, in the order of the original events table
+EVENT_VIEW_COLUMNS = (
+    'id', 'timestamp', 'duration_seconds', 'end_time', 'app', 'title', 'url',
+    'is_idle', 'state', 'metadata', 'cmdline', 'interaction_level', 'matter_id',
+    'confidence', 'flagged_for_review', 'client', 'matter', 'start_ms', 'end_ms'
+)
+
+# Columns later migrations added to event_rows; the view exposes those present
+EVENT_ROWS_ADDED_COLUMNS = ('source_machine',)
+
+# events view text columns rebuilt from epoch-ms storage (migration 14 on)
+EPOCH_STORED_COLUMNS = {'timestamp': 'start_ms', 'end_time': 'end_ms'}
+
+# events view columns written through epoch_storage_values()
+EPOCH_TIME_COLUMNS = tuple(EPOCH_STORED_COLUMNS) + tuple(EPOCH_STORED_COLUMNS.values())
+
+# Defaults the original events table applied to omitted columns
+_VIEW_INSERT_DEFAULTS = {
+    'is_idle': "0",
+    'state': "'Active'",
+    'interaction_level': "'passive'",
+    'confidence': "0",
+    'flagged_for_review': "0",
+}
+
+
+def events_storage(cursor) -> Tuple[str, bool]:
+    """
+    Find the table that triggers and indices on events must attach to.
+
+    Args:
+        cursor: Database cursor
+
+    Returns:
+        ('event_rows', True) once events is the dictionary-encoded view,
+        otherwise ('events', False) for a plain events table
+    """
+    cursor.execute("SELECT type FROM sqlite_master WHERE name = 'events'")
+    row = cursor.fetchone()
+    if row is not None and row[0] == 'view':
+        return 'event_rows', True
+    return 'events', False
+
+
+def event_rows_epoch_only(cursor) -> bool:
+    """
+    Check whether event_rows stores times as epoch ms only (migration 14 on).
+
+    Args:
+        cursor: Database cursor
+
+    Returns:
+        True once event_rows no longer has the timestamp text column
+    """
+    cursor.execute("PRAGMA table_info(event_rows)")
+    columns = {row[1] for row in cursor.fetchall()}
+    return bool(columns) and 'timestamp' not in columns
+
+
+def event_column_sql(row: str, column: str, interned: bool, epoch_only: bool = False) -> str:
+    """
+    SQL expression for an events column of a trigger row (NEW/OLD alias).
+
+    Args:
+        row: Row alias, e.g. NEW, OLD or a table name
+        column: events view column name
+        interned: Whether the row belongs to event_rows
+        epoch_only: Whether event_rows stores times as epoch ms only
+
+    Returns:
+        Column reference, a dictionary lookup for interned columns, or the
+        rebuilt ISO text for timestamp/end_time
+    """
+    if interned and column in INTERNED_COLUMNS:
+        table, id_column = INTERNED_COLUMNS[column]
+        return f"(SELECT value FROM {table} WHERE id = {row}.{id_column})"
+    if epoch_only and column in EPOCH_STORED_COLUMNS:
+        return ISO_TIME_SQL.format(
+            ms=f"{row}.{EPOCH_STORED_COLUMNS[column]}", offset=f"{row}.utc_offset_minutes"
+        )
+    return f"{row}.{column}"
+
+
+def event_storage_columns(columns: Iterable[str], interned: bool, epoch_only: bool = False) -> str:
+    """Map events view columns to their storage columns for UPDATE OF lists."""
+    if not interned:
+        return ", ".join(columns)
+    storage = []
+    for column in columns:
+        if column in INTERNED_COLUMNS:
+            storage.append(INTERNED_COLUMNS[column][1])
+        elif epoch_only and column == 'timestamp':
+            storage.extend(('start_ms', 'utc_offset_minutes'))
+        elif epoch_only and column in EPOCH_STORED_COLUMNS:
+            storage.append(EPOCH_STORED_COLUMNS[column])
+        else:
+            storage.append(column)
+    return ", ".join(storage)
+
+
+def epoch_storage_values(column: str, row: str) -> List[Tuple[str, str]]:
+    """
+    Epoch-ms event_rows columns and values storing one events time column.
+
+    start_ms/end_ms fall back to the ISO text when a writer left them out,
+    and timestamp supplies the UTC offset, so the rebuilt text keeps the
+    offset it was written with.
+
+    Args:
+        column: timestamp, end_time, start_ms or end_ms
+        row: Row alias holding events view columns, e.g. NEW
+
+    Returns:
+        (event_rows column, value SQL) pairs; none for end_time
+    """
+    if column == 'timestamp':
+        return [('utc_offset_minutes', UTC_OFFSET_MINUTES_SQL.format(column=f"{row}.timestamp"))]
+    if column == 'end_time':
+        return []
+    text_column = {ms: text for text, ms in EPOCH_STORED_COLUMNS.items()}[column]
+    return [(column, f"COALESCE({row}.{column}, {EPOCH_MS_SQL.format(column=f'{row}.{text_column}')})")]
+
+
+def intern_values(conn, table: str, values: Iterable) -> None:
+    """
+    Ensure each non-NULL value has a row in a dictionary table.
+
+    Args:
+        conn: Database connection within the caller's transaction
+        table: apps, titles or cmdlines
+        values: Values to intern (duplicates and None are ignored)
+    """
+    distinct = {value for value in values if value is not None}
+    if distinct:
+        conn.executemany(
+            f"INSERT OR IGNORE INTO {table} (value) VALUES (?)",
+            [(value,) for value in distinct]
+        )
+
+
+def interned_ids(conn, where: str, params: Sequence = (), table: str = 'event_rows') -> Dict[str, Set[int]]:
+    """
+    Collect the dictionary ids referenced by the event rows matching where.
+
+    Call before deleting those rows and pass the result to
+    prune_interned_values().
+
+    Args:
+        conn: Database connection within the caller's transaction
+        where: SQL condition selecting event_rows rows
+        params: Parameters for where
+        table: event_rows, optionally schema-qualified (e.g. main.event_rows)
+
+    Returns:
+        Dictionary table name -> referenced ids
+    """
+    id_columns = [id_column for _, id_column in INTERNED_COLUMNS.values()]
+    ids = {dictionary: set() for dictionary, _ in INTERNED_COLUMNS.values()}
+    rows = conn.execute(
+        f"SELECT DISTINCT {', '.join(id_columns)} FROM {table} WHERE {where}", params
+    )
+    for row in rows:
+        for (dictionary, _), value in zip(INTERNED_COLUMNS.values(), row):
+            if value is not None:
+                ids[dictionary].add(value)
+    return ids
+
+
+def prune_interned_values(conn, candidates: Dict[str, Iterable[int]]) -> int:
+    """
+    Delete candidate dictionary entries no longer referenced by any event.
+
+    Deleting events must not leave their titles or command lines behind
+    in the dictionary tables. Only the ids the deleted rows referenced (see
+    interned_ids()) are checked, each with an index lookup, so the cost
+    follows the deleted rows rather than the dictionary size.
+
+    Args:
+        conn: Database connection within the caller's transaction
+        candidates: Dictionary table name -> ids to check
+
+    Returns:
+        Number of dictionary rows removed
+    """
+    removed = 0
+    for table, id_column in INTERNED_COLUMNS.values():
+        ids = [(value, value) for value in candidates.get(table, ())]
+        if not ids:
+            continue
+        cursor = conn.executemany(f"""
+            DELETE FROM {table}
+            WHERE id = ? AND NOT EXISTS (SELECT 1 FROM event_rows WHERE {id_column} = ?)
+        """, ids)
+        removed += cursor.rowcount
+    return removed
+
+
+def _lookup_id_sql(column: str, value_sql: str) -> str:
+    """SQL looking up the dictionary id for an interned value expression."""
+    table, _ = INTERNED_COLUMNS[column]
+    return f"(SELECT id FROM {table} WHERE value = {value_sql})"
+
+
+def _intern_sql(column: str, value_sql: str) -> str:
+    """Trigger statement interning one value expression."""
+    table, _ = INTERNED_COLUMNS[column]
+    return f"INSERT OR IGNORE INTO {table} (value) SELECT {value_sql} WHERE {value_sql} IS NOT NULL;"
+
+
+class InterningSchemaMixin:
+    """
+    Mixin providing dictionary-encoded event storage and the events view.
+
+    Requires the events, rollups, search, changes and screenshots schema
+    mixins, whose trigger and index helpers are re-run against event_rows
+    after conversion.
+    """
+
+    def _create_dictionary_tables(self, cursor):
+        """
+        Create the apps, titles and cmdlines dictionary tables.
+
+        Args:
+            cursor: Database cursor for creating tables
+        """
+        for table, _ in INTERNED_COLUMNS.values():
+            cursor.execute(f"""
+                CREATE TABLE IF NOT EXISTS {table} (
+                    id INTEGER PRIMARY KEY,
+                    value TEXT NOT NULL UNIQUE
+                )
+            """)
+
+    def _create_event_rows_table(self, cursor):
+        """
+        Create event_rows, the dictionary-encoded events storage.
+
+        Args:
+            cursor: Database cursor for creating table
+        """
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS event_rows (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                timestamp TEXT NOT NULL,
+                duration_seconds REAL,
+                end_time TEXT,
+                app_id INTEGER REFERENCES apps(id),
+                title_id INTEGER REFERENCES titles(id),
+                url TEXT,
+                is_idle INTEGER DEFAULT 0,
+                state TEXT DEFAULT 'Active',
+                metadata TEXT,
+                cmdline_id INTEGER REFERENCES cmdlines(id),
+                interaction_level TEXT DEFAULT 'passive',
+                matter_id INTEGER,
+                confidence INTEGER DEFAULT 0,
+                flagged_for_review INTEGER DEFAULT 0,
+                client TEXT,
+                matter TEXT,
+                start_ms INTEGER,
+                end_ms INTEGER
+            )
+        """)
+
+    def _migrate_events_interning(self, cursor):
+        """
+        Convert events to dictionary-encoded storage behind a compatibility view.
+
+        Idempotent: a database whose events is already the view only has its
+        triggers and indices ensured.
+
+        Args:
+            cursor: Database cursor within the migration transaction
+        """
+        self._create_dictionary_tables(cursor)
+
+        _, interned = events_storage(cursor)
+        if not interned:
+            self._convert_events_table(cursor)
+
+        self._create_events_view(cursor)
+
+        # Re-attach events triggers and indices to event_rows
+        self._create_event_rows_indices(cursor)
+        self._create_events_epoch_objects(cursor, 'event_rows')
+        self._create_rollup_triggers(cursor, interned=True)
+        self._create_search_triggers(cursor, 'events', interned=True)
+
+    def _create_event_rows_indices(self, cursor):
+        """
+        Create the event_rows counterparts of the events table indices.
+
+        Range queries use start_ms, so event_rows drops the text timestamp
+        index; the title/cmdline references serve GROUP BY title and pruning
+        of unused dictionary values.
+
+        Args:
+            cursor: Database cursor for creating indices
+        """
+        cursor.execute("""
+            CREATE INDEX IF NOT EXISTS idx_app
+            ON event_rows(app_id)
+        """)
+
+        cursor.execute("""
+            CREATE INDEX IF NOT EXISTS idx_events_title
+            ON event_rows(title_id)
+        """)
+
+        cursor.execute("""
+            CREATE INDEX IF NOT EXISTS idx_events_cmdline
+            ON event_rows(cmdline_id)
+        """)
+
+    def _convert_events_table(self, cursor):
+        """
+        Move rows from a plain events table into event_rows and drop it.
+
+        Dropping the table also drops its triggers and indices; the caller
+        recreates them on event_rows. Row ids and the AUTOINCREMENT sequence
+        are preserved so search index rowids stay valid.
+
+        Args:
+            cursor: Database cursor within the migration transaction
+        """
+        for column, (table, _) in INTERNED_COLUMNS.items():
+            cursor.execute(f"""
+                INSERT OR IGNORE INTO {table} (value)
+                SELECT DISTINCT {column} FROM events WHERE {column} IS NOT NULL
+            """)
+
+        self._create_event_rows_table(cursor)
+
+        storage_columns = []
+        select_columns = []
+        for column in EVENT_VIEW_COLUMNS:
+            if column in INTERNED_COLUMNS:
+                storage_columns.append(INTERNED_COLUMNS[column][1])
+                select_columns.append(_lookup_id_sql(column, f"events.{column}"))
+            else:
+                storage_columns.append(column)
+                select_columns.append(column)
+
+        cursor.execute(f"""
+            INSERT INTO event_rows ({', '.join(storage_columns)})
+            SELECT {', '.join(select_columns)} FROM events
+        """)
+        converted = cursor.rowcount
+
+        cursor.execute("SELECT seq FROM sqlite_sequence WHERE name = 'events'")
+        row = cursor.fetchone()
+        if row is not None:
+            cursor.execute(
+                "UPDATE sqlite_sequence SET seq = MAX(seq, ?) WHERE name = 'event_rows'",
+                (row[0],)
+            )
+
+        cursor.execute("DROP TABLE events")
+        logging.info(
+            f"Database migration: Converted {converted} events to dictionary-encoded storage"
+        )
+
+    def _migrate_events_source_machine(self, cursor):
+        """
+        Add event_rows.source_machine and expose it through the events view.
+
+        The column names the machine a merged event was tracked on (NULL for
+        this machine). Dropping the view also drops its INSTEAD OF triggers;
+        both are recreated with the new column.
+
+        Args:
+            cursor: Database cursor within the migration transaction
+        """
+        cursor.execute("PRAGMA table_info(event_rows)")
+        if 'source_machine' not in {row[1] for row in cursor.fetchall()}:
+            cursor.execute("ALTER TABLE event_rows ADD COLUMN source_machine TEXT")
+
+        cursor.execute("DROP VIEW IF EXISTS events")
+        self._create_events_view(cursor)
+
+    def _migrate_event_rows_epoch_only(self, cursor):
+        """
+        Rebuild event_rows without the timestamp and end_time text.
+
+        The text duplicated start_ms/end_ms; only the UTC offset it was
+        written with is kept, so the events view can rebuild it. SQLite
+        cannot drop columns that triggers and the view refer to, so the
+        table is copied and everything attached to it recreated. Row ids
+        and the AUTOINCREMENT sequence are preserved.
+
+        Args:
+            cursor: Database cursor within the migration transaction
+        """
+        if event_rows_epoch_only(cursor):
+            return
+
+        cursor.execute("DROP VIEW IF EXISTS events")
+        cursor.execute("PRAGMA table_info(event_rows)")
+        kept = [row[1] for row in cursor.fetchall() if row[1] not in EPOCH_TIME_COLUMNS]
+        self._create_epoch_event_rows_table(cursor, 'event_rows_epoch')
+
+        times = [pair for column in EPOCH_TIME_COLUMNS
+                 for pair in epoch_storage_values(column, 'event_rows')]
+        cursor.execute(f"""
+            INSERT INTO event_rows_epoch ({', '.join(kept + [name for name, _ in times])})
+            SELECT {', '.join(kept + [value for _, value in times])} FROM event_rows
+        """)
+        converted = cursor.rowcount
+
+        cursor.execute("SELECT seq FROM sqlite_sequence WHERE name = 'event_rows'")
+        row = cursor.fetchone()
+        cursor.execute("DROP TABLE event_rows")
+        cursor.execute("ALTER TABLE event_rows_epoch RENAME TO event_rows")
+        if row is not None:
+            cursor.execute(
+                "UPDATE sqlite_sequence SET seq = MAX(seq, ?) WHERE name = 'event_rows'",
+                (row[0],)
+            )
+            if cursor.rowcount == 0:
+                cursor.execute(
+                    "INSERT INTO sqlite_sequence (name, seq) VALUES ('event_rows', ?)", (row[0],)
+                )
+
+        self._create_events_view(cursor)
+        self._create_event_rows_indices(cursor)
+        self._create_events_range_indices(cursor, 'event_rows')
+        self._create_rollup_triggers(cursor, interned=True)
+        self._create_search_triggers(cursor, 'events', interned=True)
+        self._create_change_triggers(cursor, ('events',))
+        self._create_screenshot_link_trigger(cursor)
+        logging.info(
+            f"Database migration: Rebuilt {converted} events without timestamp text"
+        )
+
+    def _create_epoch_event_rows_table(self, cursor, name: str = 'event_rows'):
+        """
+        Create event_rows storing times as epoch ms and a UTC offset only.
+
+        utc_offset_minutes is the offset the timestamp text was written with
+        (NULL for naive text); the events view renders both times at it.
+
+        Args:
+            cursor: Database cursor for creating table
+            name: Table name (a temporary name while rebuilding)
+        """
+        cursor.execute(f"""
+            CREATE TABLE IF NOT EXISTS {name} (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                start_ms INTEGER,
+                end_ms INTEGER,
+                utc_offset_minutes INTEGER,
+                duration_seconds REAL,
+                app_id INTEGER REFERENCES apps(id),
+                title_id INTEGER REFERENCES titles(id),
+                url TEXT,
+                is_idle INTEGER DEFAULT 0,
+                state TEXT DEFAULT 'Active',
+                metadata TEXT,
+                cmdline_id INTEGER REFERENCES cmdlines(id),
+                interaction_level TEXT DEFAULT 'passive',
+                matter_id INTEGER,
+                confidence INTEGER DEFAULT 0,
+                flagged_for_review INTEGER DEFAULT 0,
+                client TEXT,
+                matter TEXT,
+                source_machine TEXT
+            )
+        """)
+
+    def _create_events_view(self, cursor):
+        """
+        Create the events view over event_rows and its INSTEAD OF triggers.
+
+        Args:
+            cursor: Database cursor for creating the view
+        """
+        cursor.execute("PRAGMA table_info(event_rows)")
+        present = {row[1] for row in cursor.fetchall()}
+        epoch_only = 'timestamp' not in present
+        view_columns = EVENT_VIEW_COLUMNS + tuple(
+            column for column in EVENT_ROWS_ADDED_COLUMNS if column in present
+        )
+
+        select_columns = []
+        joins = []
+        for column in view_columns:
+            if column in INTERNED_COLUMNS:
+                table, id_column = INTERNED_COLUMNS[column]
+                select_columns.append(f"{table}.value AS {column}")
+                joins.append(f"LEFT JOIN {table} ON {table}.id = event_rows.{id_column}")
+            elif epoch_only and column in EPOCH_STORED_COLUMNS:
+                select_columns.append(f"{event_column_sql('event_rows', column, True, True)} AS {column}")
+            else:
+                select_columns.append(f"event_rows.{column}")
+
+        cursor.execute(f"""
+            CREATE VIEW IF NOT EXISTS events AS
+            SELECT {', '.join(select_columns)}
+            FROM event_rows
+            {' '.join(joins)}
+        """)
+
+        interns = "\n".join(
+            _intern_sql(column, f"NEW.{column}") for column in INTERNED_COLUMNS
+        )
+
+        storage_columns = []
+        values = []
+        for column in view_columns:
+            if column in INTERNED_COLUMNS:
+                storage_columns.append(INTERNED_COLUMNS[column][1])
+                values.append(_lookup_id_sql(column, f"NEW.{column}"))
+            elif epoch_only and column in EPOCH_TIME_COLUMNS:
+                for storage_column, value in epoch_storage_values(column, 'NEW'):
+                    storage_columns.append(storage_column)
+                    values.append(value)
+            elif column in _VIEW_INSERT_DEFAULTS:
+                storage_columns.append(column)
+                values.append(f"COALESCE(NEW.{column}, {_VIEW_INSERT_DEFAULTS[column]})")
+            else:
+                storage_columns.append(column)
+                values.append(f"NEW.{column}")
+
+        cursor.execute(f"""
+            CREATE TRIGGER IF NOT EXISTS events_view_insert
+            INSTEAD OF INSERT ON events
+            BEGIN
+                {interns}
+                INSERT INTO event_rows ({', '.join(storage_columns)})
+                VALUES ({', '.join(values)});
+            END
+        """)
+
+        cursor.execute("""
+            CREATE TRIGGER IF NOT EXISTS events_view_delete
+            INSTEAD OF DELETE ON events
+            BEGIN
+                DELETE FROM event_rows WHERE id = OLD.id;
+            END
+        """)
+
+        # One trigger per column, so an UPDATE only rewrites the columns it sets
+        for column in view_columns:
+            if column == 'id':
+                continue
+            if column in INTERNED_COLUMNS:
+                body = (
+                    f"{_intern_sql(column, f'NEW.{column}')}\n"
+                    f"UPDATE event_rows SET {INTERNED_COLUMNS[column][1]} = "
+                    f"{_lookup_id_sql(column, f'NEW.{column}')} WHERE id = OLD.id;"
+                )
+            elif epoch_only and column in EPOCH_STORED_COLUMNS:
+                # Setting the text sets the epoch ms (and, for timestamp, the offset)
+                assignments = (
+                    f"{EPOCH_STORED_COLUMNS[column]} = {EPOCH_MS_SQL.format(column=f'NEW.{column}')}"
+                )
+                if column == 'timestamp':
+                    assignments += (
+                        f", utc_offset_minutes = {UTC_OFFSET_MINUTES_SQL.format(column='NEW.timestamp')}"
+                    )
+                body = f"UPDATE event_rows SET {assignments} WHERE id = OLD.id;"
+            else:
+                body = f"UPDATE event_rows SET {column} = NEW.{column} WHERE id = OLD.id;"
+            cursor.execute(f"""
+                CREATE TRIGGER IF NOT EXISTS events_view_update_{column}
+                INSTEAD OF UPDATE OF {column} ON events
+                BEGIN
+                    {body}
+                END
+            """)
@@ -0,0 +1,219 @@
+"""
+Daily rollup table schema and maintenance triggers.
+
+Handles:
+- Creating the daily_rollups table keyed by (day, state, app, matter_id)
+- Triggers keeping rollups in step with inserts, updates and deletes on events
+- Populating rollups from the events table (migration and rebuild)
+
+Rollup days are UTC calendar days, matching the epoch-ms date ranges used
+by event queries. NULL app and matter_id are stored as '' and 0 so that
+they take part in the primary key.
+"""
+
+import logging
+from typing import Tuple
+
+from .database_schema_interning import event_column_sql, event_rows_epoch_only, event_storage_columns
+
+
+# Events columns that change which rollup row an event counts towards, or by how much
+_ROLLUP_SOURCE_COLUMNS = ('timestamp', 'duration_seconds', 'is_idle', 'state', 'app', 'matter_id')
+
+
+def _rollup_keys(row: str, interned: bool = False, epoch_only: bool = False) -> Tuple[str, ...]:
+    """
+    Rollup key expressions for an events row alias (NEW, OLD or events).
+
+    Args:
+        row: Row alias
+        interned: Whether the row belongs to dictionary-encoded event_rows
+        epoch_only: Whether event_rows stores times as epoch ms only
+
+    Returns:
+        (day, state, app, matter_id) SQL expressions
+    """
+    def col(column):
+        return event_column_sql(row, column, interned, epoch_only)
+
+    return (
+        f"COALESCE(date({col('timestamp')}), '')",
+        f"COALESCE({col('state')}, CASE WHEN {col('is_idle')} = 1 THEN 'Inactive' ELSE 'Active' END)",
+        f"COALESCE({col('app')}, '')",
+        f"COALESCE({col('matter_id')}, 0)",
+    )
+
+
+def _rollup_adjust_sql(row: str, sign: int, interned: bool = False, epoch_only: bool = False) -> str:
+    """
+    Build an upsert adding (sign=1) or removing (sign=-1) one event's totals.
+
+    Args:
+        row: Trigger row alias, NEW or OLD
+        sign: +1 to add the event, -1 to subtract it
+        interned: Whether the trigger is on dictionary-encoded event_rows
+        epoch_only: Whether event_rows stores times as epoch ms only
+
+    Returns:
+        SQL statement for use in a trigger body
+    """
+    keys = ", ".join(_rollup_keys(row, interned, epoch_only))
+    duration = f"COALESCE({row}.duration_seconds, 0)"
+    return f"""
+        INSERT INTO daily_rollups (
+            day, state, app, matter_id, event_count, active_event_count,
+            duration_seconds, active_duration_seconds, idle_duration_seconds
+        )
+        VALUES (
+            {keys},
+            {sign},
+            {sign} * CASE WHEN {row}.is_idle = 0 THEN 1 ELSE 0 END,
+            {sign} * {duration},
+            {sign} * CASE WHEN {row}.is_idle = 0 THEN {duration} ELSE 0 END,
+            {sign} * CASE WHEN {row}.is_idle = 1 THEN {duration} ELSE 0 END
+        )
+        ON CONFLICT(day, state, app, matter_id) DO UPDATE SET
+            event_count = event_count + excluded.event_count,
+            active_event_count = active_event_count + excluded.active_event_count,
+            duration_seconds = duration_seconds + excluded.duration_seconds,
+            active_duration_seconds = active_duration_seconds + excluded.active_duration_seconds,
+            idle_duration_seconds = idle_duration_seconds + excluded.idle_duration_seconds;
+    """
+
+
+def _rollup_prune_sql(row: str, interned: bool = False, epoch_only: bool = False) -> str:
+    """Build a statement removing the rollup row for an alias once it is empty."""
+    keys = _rollup_keys(row, interned, epoch_only)
+    return f"""
+        DELETE FROM daily_rollups
+        WHERE day = {keys[0]} AND state = {keys[1]} AND app = {keys[2]}
+          AND matter_id = {keys[3]} AND event_count <= 0;
+    """
+
+
+class RollupsSchemaMixin:
+    """
+    Mixin providing the daily_rollups table and its maintenance triggers.
+
+    Requires _get_connection() method from ConnectionMixin.
+    """
+
+    def _create_daily_rollups_table(self, cursor):
+        """
+        Create daily_rollups table and triggers, populating it on first creation.
+
+        Args:
+            cursor: Database cursor for creating table
+        """
+        cursor.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'daily_rollups'")
+        is_new = cursor.fetchone() is None
+
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS daily_rollups (
+                day TEXT NOT NULL,
+                state TEXT NOT NULL,
+                app TEXT NOT NULL,
+                matter_id INTEGER NOT NULL,
+                event_count INTEGER NOT NULL DEFAULT 0,
+                active_event_count INTEGER NOT NULL DEFAULT 0,
+                duration_seconds REAL NOT NULL DEFAULT 0,
+                active_duration_seconds REAL NOT NULL DEFAULT 0,
+                idle_duration_seconds REAL NOT NULL DEFAULT 0,
+                PRIMARY KEY (day, state, app, matter_id)
+            ) WITHOUT ROWID
+        """)
+
+        self._create_rollup_triggers(cursor)
+
+        if is_new:
+            count = self._populate_daily_rollups(cursor)
+            logging.info(f"Database migration: Created daily_rollups table ({count} rollup rows)")
+
+    def _create_rollup_triggers(self, cursor, interned: bool = False):
+        """
+        Create the triggers keeping daily_rollups in step with events.
+
+        Args:
+            cursor: Database cursor for creating triggers
+            interned: Attach to dictionary-encoded event_rows (migration 5 on)
+                      instead of the plain events table
+        """
+        table = 'event_rows' if interned else 'events'
+        epoch_only = interned and event_rows_epoch_only(cursor)
+
+        cursor.execute(f"""
+            CREATE TRIGGER IF NOT EXISTS events_rollup_insert
+            AFTER INSERT ON {table}
+            BEGIN
+                {_rollup_adjust_sql('NEW', 1, interned, epoch_only)}
+            END
+        """)
+        cursor.execute(f"""
+            CREATE TRIGGER IF NOT EXISTS events_rollup_delete
+            AFTER DELETE ON {table}
+            BEGIN
+                {_rollup_adjust_sql('OLD', -1, interned, epoch_only)}
+                {_rollup_prune_sql('OLD', interned, epoch_only)}
+            END
+        """)
+        cursor.execute(f"""
+            CREATE TRIGGER IF NOT EXISTS events_rollup_update
+            AFTER UPDATE OF {event_storage_columns(_ROLLUP_SOURCE_COLUMNS, interned, epoch_only)} ON {table}
+            BEGIN
+                {_rollup_adjust_sql('OLD', -1, interned, epoch_only)}
+                {_rollup_prune_sql('OLD', interned, epoch_only)}
+                {_rollup_adjust_sql('NEW', 1, interned, epoch_only)}
+            END
+        """)
+
+    def _populate_daily_rollups(self, cursor) -> int:
+        """
+        Replace the contents of daily_rollups with totals computed from events.
+
+        Args:
+            cursor: Database cursor within the caller's transaction
+
+        Returns:
+            Number of rollup rows written
+        """
+        cursor.execute("DELETE FROM daily_rollups")
+        return self._add_daily_rollups(cursor)
+
+    def _add_daily_rollups(self, cursor, source: str = "events", where: str = "1", params=()) -> int:
+        """
+        Add the totals of a set of events rows onto daily_rollups.
+
+        Args:
+            cursor: Database cursor within the caller's transaction
+            source: Table or view with events columns (e.g. an attached shard's events)
+            where: SQL condition selecting the rows to add
+            params: Parameters for the condition
+
+        Returns:
+            Number of rollup rows written or updated
+        """
+        keys = ", ".join(_rollup_keys('events'))
+
+        cursor.execute(f"""
+            INSERT INTO daily_rollups (
+                day, state, app, matter_id, event_count, active_event_count,
+                duration_seconds, active_duration_seconds, idle_duration_seconds
+            )
+            SELECT
+                {keys},
+                COUNT(*),
+                SUM(CASE WHEN is_idle = 0 THEN 1 ELSE 0 END),
+                TOTAL(duration_seconds),
+                TOTAL(CASE WHEN is_idle = 0 THEN duration_seconds ELSE 0 END),
+                TOTAL(CASE WHEN is_idle = 1 THEN duration_seconds ELSE 0 END)
+            FROM {source} AS events
+            WHERE {where}
+            GROUP BY 1, 2, 3, 4
+            ON CONFLICT(day, state, app, matter_id) DO UPDATE SET
+                event_count = event_count + excluded.event_count,
+                active_event_count = active_event_count + excluded.active_event_count,
+                duration_seconds = duration_seconds + excluded.duration_seconds,
+                active_duration_seconds = active_duration_seconds + excluded.active_duration_seconds,
+                idle_duration_seconds = idle_duration_seconds + excluded.idle_duration_seconds
+        """, params)
+        return cursor.rowcount
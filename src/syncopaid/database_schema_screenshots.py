@@ -5,10 +5,21 @@ Handles:
 - Creating screenshots table with metadata tracking
 - Creating transitions table for timing patterns
 - Schema migrations for analysis features
+- Linking screenshots to the event they were captured during
 """
 
 import logging
 
+from .database_schema_interning import events_storage
+from .database_time import EPOCH_MS_SQL
+
+
+# SQL for the epoch-ms end of an event row (prefix is the row alias)
+EVENT_STOP_MS_SQL = (
+    "COALESCE({prefix}end_ms, {prefix}start_ms + "
+    "CAST(ROUND(COALESCE({prefix}duration_seconds, 0) * 1000) AS INTEGER))"
+)
+
 
 class ScreenshotsSchemaMixin:
     """
@@ -41,22 +52,61 @@ class ScreenshotsSchemaMixin:
             ON screenshots(captured_at)
         """)
 
-    def _migrate_screenshots_table(self):
-        """Apply migrations to screenshots table for analysis support."""
-        with self._get_connection() as conn:
-            cursor = conn.cursor()
-            cursor.execute("PRAGMA table_info(screenshots)")
-            columns = [row[1] for row in cursor.fetchall()]
+    def _migrate_screenshots_table(self, cursor):
+        """
+        Apply migrations to screenshots table for analysis support.
+
+        Args:
+            cursor: Database cursor for executing migrations
+        """
+        cursor.execute("PRAGMA table_info(screenshots)")
+        columns = [row[1] for row in cursor.fetchall()]
+
+        if 'analysis_data' not in columns:
+            cursor.execute("ALTER TABLE screenshots ADD COLUMN analysis_data TEXT")
+            logging.info("Migration: Added analysis_data column to screenshots")
 
-            if 'analysis_data' not in columns:
-                cursor.execute("ALTER TABLE screenshots ADD COLUMN analysis_data TEXT")
-                logging.info("Migration: Added analysis_data column to screenshots")
+        if 'analysis_status' not in columns:
+            cursor.execute("ALTER TABLE screenshots ADD COLUMN analysis_status TEXT DEFAULT 'pending'")
+            logging.info("Migration: Added analysis_status column to screenshots")
 
-            if 'analysis_status' not in columns:
-                cursor.execute("ALTER TABLE screenshots ADD COLUMN analysis_status TEXT DEFAULT 'pending'")
-                logging.info("Migration: Added analysis_status column to screenshots")
+    def _migrate_screenshots_epoch_ms(self, cursor):
+        """
+        Add the captured_ms column, its fill trigger and range index.
 
-            conn.commit()
+        Args:
+            cursor: Database cursor for executing migrations
+        """
+        cursor.execute("PRAGMA table_info(screenshots)")
+        columns = [row[1] for row in cursor.fetchall()]
+
+        if 'captured_ms' not in columns:
+            cursor.execute("ALTER TABLE screenshots ADD COLUMN captured_ms INTEGER")
+            cursor.execute(f"""
+                UPDATE screenshots
+                SET captured_ms = {EPOCH_MS_SQL.format(column='captured_at')}
+            """)
+            logging.info(
+                f"Migration: Added captured_ms column to screenshots "
+                f"(backfilled {cursor.rowcount} rows)"
+            )
+
+        cursor.execute("""
+            CREATE INDEX IF NOT EXISTS idx_screenshots_captured_ms
+            ON screenshots(captured_ms)
+        """)
+
+        # Fallback for writers that don't supply captured_ms themselves
+        cursor.execute(f"""
+            CREATE TRIGGER IF NOT EXISTS screenshots_fill_epoch_ms
+            AFTER INSERT ON screenshots
+            WHEN NEW.captured_ms IS NULL
+            BEGIN
+                UPDATE screenshots
+                SET captured_ms = {EPOCH_MS_SQL.format(column='NEW.captured_at')}
+                WHERE id = NEW.id;
+            END
+        """)
 
     def _create_transitions_table(self, cursor):
         """
@@ -81,3 +131,111 @@ class ScreenshotsSchemaMixin:
             CREATE INDEX IF NOT EXISTS idx_transitions_timestamp
             ON transitions(timestamp)
         """)
+
+    def _migrate_screenshots_event_link(self, cursor):
+        """
+        Add screenshots.event_id, its index and the event-side link trigger.
+
+        A screenshot belongs to the event whose [start_ms, end) span contains
+        its captured_ms. Whichever row is written second makes the link:
+        insert_screenshot() looks up an event that is already stored, and
+        this trigger claims unlinked screenshots when the event arrives
+        (the tracker writes an event only once it has ended).
+
+        Args:
+            cursor: Database cursor for executing migrations
+        """
+        cursor.execute("PRAGMA table_info(screenshots)")
+        columns = [row[1] for row in cursor.fetchall()]
+
+        if 'event_id' not in columns:
+            cursor.execute("ALTER TABLE screenshots ADD COLUMN event_id INTEGER")
+            logging.info("Migration: Added event_id column to screenshots")
+
+        cursor.execute("""
+            CREATE INDEX IF NOT EXISTS idx_screenshots_event_id
+            ON screenshots(event_id)
+        """)
+
+        table, _ = events_storage(cursor)
+        cursor.execute(f"""
+            CREATE TRIGGER IF NOT EXISTS events_link_screenshots
+            AFTER INSERT ON {table}
+            WHEN NEW.start_ms IS NOT NULL
+            BEGIN
+                UPDATE screenshots
+                SET event_id = NEW.id
+                WHERE event_id IS NULL
+                  AND captured_ms >= NEW.start_ms
+                  AND captured_ms < {EVENT_STOP_MS_SQL.format(prefix='NEW.')};
+            END
+        """)
+
+    def _create_screenshot_link_state(self, cursor):
+        """
+        Record which screenshots the screenshot-to-event backfill still has to examine.
+
+        Only screenshots stored so far that have no event are candidates
+        (ids up to target_id); later screenshots are linked as they or
+        their events are written. The backfill sweeps candidates in
+        (captured_ms, id) order, stores how far it got in done_ms/done_id
+        and deletes the row once finished, so screenshots no event covers
+        are examined only once.
+
+        Args:
+            cursor: Database cursor within the migration transaction
+        """
+        cursor.execute(
+            "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'screenshot_link_state'"
+        )
+        is_new = cursor.fetchone() is None
+
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS screenshot_link_state (
+                target_id INTEGER NOT NULL,
+                done_ms INTEGER NOT NULL DEFAULT -1,
+                done_id INTEGER NOT NULL DEFAULT 0
+            )
+        """)
+
+        if is_new:
+            cursor.execute("""
+                INSERT INTO screenshot_link_state (target_id)
+                SELECT MAX(id) FROM screenshots WHERE event_id IS NULL
+                HAVING MAX(id) IS NOT NULL
+            """)
+
+    def _migrate_screenshot_link_local_events(self, cursor):
+        """
+        Restrict the event-side link trigger to events tracked on this machine.
+
+        Events merged from another machine (source_machine set) cover that
+        machine's time, so they must not claim this machine's unlinked
+        screenshots; merged screenshots arrive with their own links.
+
+        Args:
+            cursor: Database cursor within the migration transaction
+        """
+        self._create_screenshot_link_trigger(cursor)
+
+    def _create_screenshot_link_trigger(self, cursor):
+        """
+        (Re)create the trigger linking a new local event to its screenshots.
+
+        Args:
+            cursor: Database cursor for creating the trigger
+        """
+        table, _ = events_storage(cursor)
+        cursor.execute("DROP TRIGGER IF EXISTS events_link_screenshots")
+        cursor.execute(f"""
+            CREATE TRIGGER events_link_screenshots
+            AFTER INSERT ON {table}
+            WHEN NEW.start_ms IS NOT NULL AND NEW.source_machine IS NULL
+            BEGIN
+                UPDATE screenshots
+                SET event_id = NEW.id
+                WHERE event_id IS NULL
+                  AND captured_ms >= NEW.start_ms
+                  AND captured_ms < {EVENT_STOP_MS_SQL.format(prefix='NEW.')};
+            END
+        """)
@@ -0,0 +1,140 @@
+"""
+Full-text search index schema and sync triggers.
+
+Handles:
+- events_fts (title, url, metadata) and screenshots_fts (analysis_data)
+  FTS5 tables using the source tables as external content
+- Triggers keeping both indices in sync with inserts, updates and deletes
+- Backfill bookkeeping so existing rows can be indexed in the background
+
+When the index is added to an existing database, rows up to the current
+maximum id are left for the backfill job (search_index_state.target_id),
+while the triggers index everything newer. A row is in the index when
+id > target_id or id <= done_id, and triggers only touch indexed rows.
+"""
+
+import logging
+
+from .database_schema_interning import event_column_sql, event_storage_columns
+
+
+# FTS tables: source table -> (fts table, indexed columns)
+SEARCH_SOURCES = {
+    'events': ('events_fts', ('title', 'url', 'metadata')),
+    'screenshots': ('screenshots_fts', ('analysis_data',)),
+}
+
+def _indexed_sql(source: str, row: str) -> str:
+    """SQL predicate: is this row (NEW/OLD alias) present in the FTS index?"""
+    return f"""
+        EXISTS (
+            SELECT 1 FROM search_index_state
+            WHERE source = '{source}' AND ({row}.id > target_id OR {row}.id <= done_id)
+        )
+    """
+
+
+def _fts_write_sql(source: str, row: str, delete: bool, interned: bool = False) -> str:
+    """Build an FTS insert (or external-content 'delete') for a trigger row."""
+    fts_table, columns = SEARCH_SOURCES[source]
+    values = ", ".join(event_column_sql(row, column, interned) for column in columns)
+    if delete:
+        return (
+            f"INSERT INTO {fts_table} ({fts_table}, rowid, {', '.join(columns)}) "
+            f"SELECT 'delete', {row}.id, {values} WHERE {_indexed_sql(source, row)};"
+        )
+    return (
+        f"INSERT INTO {fts_table} (rowid, {', '.join(columns)}) "
+        f"SELECT {row}.id, {values} WHERE {_indexed_sql(source, row)};"
+    )
+
+
+class SearchSchemaMixin:
+    """
+    Mixin providing the FTS5 search index tables and triggers.
+
+    Requires _get_connection() method from ConnectionMixin.
+    """
+
+    def _create_search_index(self, cursor):
+        """
+        Create FTS tables, sync triggers and backfill state for new and existing databases.
+
+        Args:
+            cursor: Database cursor for creating tables
+        """
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS search_index_state (
+                source TEXT PRIMARY KEY,
+                target_id INTEGER NOT NULL,
+                done_id INTEGER NOT NULL DEFAULT 0
+            )
+        """)
+
+        for source, (fts_table, columns) in SEARCH_SOURCES.items():
+            cursor.execute(
+                "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = ?",
+                (fts_table,)
+            )
+            is_new = cursor.fetchone() is None
+
+            cursor.execute(f"""
+                CREATE VIRTUAL TABLE IF NOT EXISTS {fts_table} USING fts5(
+                    {', '.join(columns)},
+                    content='{source}',
+                    content_rowid='id',
+                    tokenize='unicode61 remove_diacritics 2'
+                )
+            """)
+
+            if is_new:
+                # Existing rows are indexed later by backfill_search_index()
+                cursor.execute(f"SELECT COALESCE(MAX(id), 0) FROM {source}")
+                target_id = cursor.fetchone()[0]
+                cursor.execute(
+                    "INSERT OR REPLACE INTO search_index_state (source, target_id, done_id) VALUES (?, ?, 0)",
+                    (source, target_id)
+                )
+                if target_id:
+                    logging.info(
+                        f"Database migration: Created {fts_table}; "
+                        f"rows up to id {target_id} queued for backfill"
+                    )
+
+            self._create_search_triggers(cursor, source)
+
+    def _create_search_triggers(self, cursor, source: str, interned: bool = False):
+        """
+        Create the triggers keeping one FTS table in sync with its source.
+
+        Args:
+            cursor: Database cursor for creating triggers
+            source: Key of SEARCH_SOURCES ('events' or 'screenshots')
+            interned: For events, attach to dictionary-encoded event_rows
+                      (migration 5 on) instead of the plain events table
+        """
+        fts_table, columns = SEARCH_SOURCES[source]
+        table = 'event_rows' if interned else source
+
+        cursor.execute(f"""
+            CREATE TRIGGER IF NOT EXISTS {fts_table}_insert
+            AFTER INSERT ON {table}
+            BEGIN
+                {_fts_write_sql(source, 'NEW', delete=False, interned=interned)}
+            END
+        """)
+        cursor.execute(f"""
+            CREATE TRIGGER IF NOT EXISTS {fts_table}_delete
+            AFTER DELETE ON {table}
+            BEGIN
+                {_fts_write_sql(source, 'OLD', delete=True, interned=interned)}
+            END
+        """)
+        cursor.execute(f"""
+            CREATE TRIGGER IF NOT EXISTS {fts_table}_update
+            AFTER UPDATE OF {event_storage_columns(columns, interned)} ON {table}
+            BEGIN
+                {_fts_write_sql(source, 'OLD', delete=True, interned=interned)}
+                {_fts_write_sql(source, 'NEW', delete=False, interned=interned)}
+            END
+        """)
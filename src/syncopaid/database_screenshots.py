@@ -2,15 +2,29 @@
 Database operations for screenshot management.
 
 Provides methods for inserting, updating, and querying screenshot records
-in the SQLite database.
+in the SQLite database, and for the screenshots.event_id link to the event
+each screenshot was captured during.
 """
 
 import sqlite3
 import logging
-from typing import List, Dict, Optional
-from datetime import datetime
+from typing import List, Dict, Optional, Tuple
 from contextlib import contextmanager
 
+from .database_schema_screenshots import EVENT_STOP_MS_SQL
+from .database_time import to_epoch_ms, date_range_to_ms
+
+
+# Id of the stored event containing an epoch-ms instant (bind the instant twice):
+# the latest event tracked on this machine starting at or before it, if it
+# has not ended yet (merged events cover another machine's screen)
+_EVENT_AT_MS_SQL = f"""
+    (SELECT id FROM (
+        SELECT id, start_ms, end_ms, duration_seconds FROM event_rows
+        WHERE start_ms <= ? AND source_machine IS NULL ORDER BY start_ms DESC LIMIT 1
+    ) WHERE ? < {EVENT_STOP_MS_SQL.format(prefix='')})
+"""
+
 
 class ScreenshotDatabaseMixin:
     """
@@ -19,6 +33,8 @@ class ScreenshotDatabaseMixin:
     Must be mixed with a class that provides:
     - self.db_path: Path to SQLite database
     - self._get_connection(): Context manager for database connections
+    - self._sharded_sources(): From ShardDatabaseMixin
+    - self.queue_screenshot_deletion(), self.shred_job_files(): From DeletionJobsDatabaseMixin
     """
 
     def insert_screenshot(
@@ -27,28 +43,39 @@ class ScreenshotDatabaseMixin:
         file_path: str,
         window_app: Optional[str] = None,
         window_title: Optional[str] = None,
-        dhash: Optional[str] = None
+        dhash: Optional[str] = None,
+        event_id: Optional[int] = None
     ) -> int:
         """
         Insert a screenshot record into the database.
 
+        Without an explicit event_id the screenshot is linked to the stored
+        event it was captured during, if any; otherwise the event claims it
+        when it is written.
+
         Args:
             captured_at: ISO timestamp when screenshot was captured
             file_path: Path to the saved screenshot file
             window_app: Application name when screenshot was taken
             window_title: Window title when screenshot was taken
             dhash: Perceptual hash (dHash) of the screenshot for deduplication
+            event_id: ID of the event the screenshot belongs to
 
         Returns:
             The ID of the inserted screenshot record
         """
+        captured_ms = to_epoch_ms(captured_at)
+
         with self._get_connection() as conn:
+            self._touch_tables('screenshots')
             cursor = conn.cursor()
 
-            cursor.execute("""
-                INSERT INTO screenshots (captured_at, file_path, window_app, window_title, dhash)
-                VALUES (?, ?, ?, ?, ?)
-            """, (captured_at, file_path, window_app, window_title, dhash))
+            cursor.execute(f"""
+                INSERT INTO screenshots (captured_at, captured_ms, file_path, window_app, window_title,
+                                         dhash, event_id)
+                VALUES (?, ?, ?, ?, ?, ?, COALESCE(?, {_EVENT_AT_MS_SQL}))
+            """, (captured_at, captured_ms, file_path, window_app, window_title, dhash,
+                  event_id, captured_ms, captured_ms))
 
             return cursor.lastrowid
 
@@ -67,6 +94,7 @@ class ScreenshotDatabaseMixin:
             dhash: New perceptual hash (if changed)
         """
         with self._get_connection() as conn:
+            self._touch_tables('screenshots')
             cursor = conn.cursor()
 
             updates = []
@@ -104,43 +132,158 @@ class ScreenshotDatabaseMixin:
         Returns:
             List of screenshot dictionaries
         """
+        start_ms, end_ms = date_range_to_ms(start_date, end_date)
+        screenshots = []
+
         with self._get_connection() as conn:
-            cursor = conn.cursor()
+            sources = self._sharded_sources(conn, 'screenshots', start_ms, end_ms, descending=True)
+            try:
+                for source, range_sql, params in sources:
+                    query = f"SELECT * FROM {source} WHERE 1=1{range_sql} ORDER BY captured_ms DESC"
+
+                    if limit:
+                        query += f" LIMIT {limit - len(screenshots)}"
+
+                    # Convert rows to dictionaries
+                    for row in conn.execute(query, params).fetchall():
+                        screenshots.append({
+                            'id': row['id'],
+                            'captured_at': row['captured_at'],
+                            'file_path': row['file_path'],
+                            'window_app': row['window_app'],
+                            'window_title': row['window_title'],
+                            'dhash': row['dhash'],
+                            'event_id': row['event_id']
+                        })
+
+                    if limit and len(screenshots) >= limit:
+                        break
+            finally:
+                sources.close()
+
+        return screenshots
+
+    def get_screenshots_for_events(self, event_ids: List[int]) -> List[Dict]:
+        """
+        Get the screenshots linked to events (indexed by screenshots.event_id).
 
-            # Build query with filters
-            query = "SELECT * FROM screenshots WHERE 1=1"
-            params = []
+        Only the main database is searched; archived months are not.
 
-            if start_date:
-                query += " AND captured_at >= ?"
-                params.append(f"{start_date}T00:00:00")
+        Args:
+            event_ids: Event IDs
 
-            if end_date:
-                query += " AND captured_at < ?"
-                end_datetime = datetime.fromisoformat(end_date)
-                next_day = end_datetime.replace(hour=23, minute=59, second=59)
-                params.append(next_day.isoformat())
+        Returns:
+            List of screenshot dictionaries (including event_id), oldest first
+        """
+        screenshots = []
+        if not event_ids:
+            return screenshots
 
-            query += " ORDER BY captured_at DESC"
+        with self._get_connection() as conn:
+            # Stay under SQLite's bound-parameter limit
+            for offset in range(0, len(event_ids), 500):
+                chunk = list(event_ids[offset:offset + 500])
+                rows = conn.execute(f"""
+                    SELECT id, captured_at, file_path, window_app, window_title, dhash, event_id
+                    FROM screenshots
+                    WHERE event_id IN ({','.join('?' * len(chunk))})
+                """, chunk).fetchall()
+                screenshots.extend(dict(row) for row in rows)
+
+        screenshots.sort(key=lambda screenshot: (screenshot['captured_at'], screenshot['id']))
+        return screenshots
+
+    def link_screenshots_to_events(self, batch_size: int = 1000) -> Tuple[int, bool]:
+        """
+        Link one batch of unlinked screenshots to their events.
 
-            if limit:
-                query += f" LIMIT {limit}"
+        Backfill for screenshots stored before screenshots.event_id
+        existed. The batch of screenshots (in capture order) and the events
+        spanning it (in start order) are merged in a single sorted sweep;
+        each screenshot goes to the latest event starting at or before it,
+        if that event has not ended (merged events from other machines are
+        ignored). Progress is stored in
+        screenshot_link_state, so an interrupted backfill resumes where it
+        stopped and screenshots no event covers are examined only once.
 
-            cursor.execute(query, params)
+        Args:
+            batch_size: Screenshots examined per call
 
-            # Convert rows to dictionaries
-            screenshots = []
-            for row in cursor.fetchall():
-                screenshots.append({
-                    'id': row['id'],
-                    'captured_at': row['captured_at'],
-                    'file_path': row['file_path'],
-                    'window_app': row['window_app'],
-                    'window_title': row['window_title'],
-                    'dhash': row['dhash']
-                })
+        Returns:
+            (screenshots linked, True while screenshots remain to be examined)
+        """
+        with self._get_connection() as conn:
+            state = conn.execute(
+                "SELECT target_id, done_ms, done_id FROM screenshot_link_state"
+            ).fetchone()
+            if state is None:
+                return 0, False
+
+            shots = conn.execute("""
+                SELECT id, captured_ms FROM screenshots
+                WHERE event_id IS NULL AND id <= ? AND (captured_ms, id) > (?, ?)
+                ORDER BY captured_ms, id
+                LIMIT ?
+            """, (state['target_id'], state['done_ms'], state['done_id'], batch_size)).fetchall()
+
+            more = len(shots) == batch_size
+            if more:
+                conn.execute(
+                    "UPDATE screenshot_link_state SET done_ms = ?, done_id = ?",
+                    (shots[-1]['captured_ms'], shots[-1]['id'])
+                )
+            else:
+                conn.execute("DELETE FROM screenshot_link_state")
+            if not shots:
+                return 0, False
+
+            first_ms, last_ms = shots[0]['captured_ms'], shots[-1]['captured_ms']
+            events = conn.execute(f"""
+                SELECT id, start_ms, {EVENT_STOP_MS_SQL.format(prefix='')} AS stop_ms
+                FROM event_rows
+                WHERE source_machine IS NULL
+                  AND start_ms >= COALESCE(
+                          (SELECT MAX(start_ms) FROM event_rows
+                           WHERE start_ms <= ? AND source_machine IS NULL), ?)
+                  AND start_ms <= ?
+                ORDER BY start_ms, id
+            """, (first_ms, first_ms, last_ms)).fetchall()
+
+            links = []
+            current = None
+            position = 0
+            for shot in shots:
+                while position < len(events) and events[position]['start_ms'] <= shot['captured_ms']:
+                    current = events[position]
+                    position += 1
+                if current is not None and shot['captured_ms'] < current['stop_ms']:
+                    links.append((current['id'], shot['id']))
+
+            if links:
+                self._touch_tables('screenshots')
+                conn.executemany(
+                    "UPDATE screenshots SET event_id = ? WHERE id = ? AND event_id IS NULL",
+                    links
+                )
+
+        return len(links), more
+
+    def _unlink_screenshots(self, conn, event_ids_sql: str, params, schemas=('main',)):
+        """
+        Clear screenshots.event_id for screenshots linked to events about to be deleted.
 
-            return screenshots
+        Args:
+            conn: Database connection within the deleting transaction
+            event_ids_sql: Subquery or placeholder list producing the event IDs
+            params: Parameters for event_ids_sql
+            schemas: Schemas whose screenshots tables are updated
+        """
+        self._touch_tables('screenshots')
+        for schema in schemas:
+            conn.execute(
+                f"UPDATE {schema}.screenshots SET event_id = NULL WHERE event_id IN ({event_ids_sql})",
+                list(params)
+            )
 
     def get_latest_screenshot(self) -> Optional[Dict]:
         """
@@ -156,7 +299,9 @@ class ScreenshotDatabaseMixin:
         """
         Securely delete screenshots by ID, removing both database records and files.
 
-        Files are overwritten with zeros before deletion to prevent forensic recovery.
+        Records are deleted in chunks (files queued in the same transaction),
+        then files are overwritten with zeros before deletion to prevent
+        forensic recovery.
 
         Args:
             screenshot_ids: List of screenshot IDs to delete
@@ -164,37 +309,13 @@ class ScreenshotDatabaseMixin:
         Returns:
             Number of screenshots deleted
         """
-        from .secure_delete import secure_delete_file
-        from pathlib import Path
-
         if not screenshot_ids:
             return 0
 
-        deleted_count = 0
-
-        with self._get_connection() as conn:
-            cursor = conn.cursor()
-
-            # Get file paths before deletion
-            placeholders = ','.join('?' * len(screenshot_ids))
-            cursor.execute(
-                f"SELECT id, file_path FROM screenshots WHERE id IN ({placeholders})",
-                screenshot_ids
-            )
-            screenshots = cursor.fetchall()
-
-            # Securely delete each file
-            for row in screenshots:
-                file_path = Path(row['file_path'])
-                secure_delete_file(file_path)
-
-            # Delete database records
-            cursor.execute(
-                f"DELETE FROM screenshots WHERE id IN ({placeholders})",
-                screenshot_ids
-            )
-            deleted_count = cursor.rowcount
+        job_id = self.queue_screenshot_deletion(screenshot_ids)
+        self.shred_job_files(job_id)
 
+        deleted_count = self.get_deletion_job(job_id)['screenshots_deleted']
         logging.info(f"Securely deleted {deleted_count} screenshots")
         return deleted_count
 
@@ -213,6 +334,7 @@ class ScreenshotDatabaseMixin:
             analysis_status: 'pending', 'completed', or 'failed'
         """
         with self._get_connection() as conn:
+            self._touch_tables('screenshots')
             cursor = conn.cursor()
             cursor.execute("""
                 UPDATE screenshots
@@ -237,7 +359,7 @@ class ScreenshotDatabaseMixin:
                 SELECT id, file_path, window_app, window_title
                 FROM screenshots
                 WHERE analysis_status = 'pending' OR analysis_status IS NULL
-                ORDER BY captured_at DESC
+                ORDER BY captured_ms DESC
                 LIMIT ?
             """, (limit,))
             return [dict(row) for row in cursor.fetchall()]
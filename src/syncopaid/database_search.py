@@ -0,0 +1,171 @@
+"""
+Full-text search over activity history.
+
+Provides:
+- Ranked (bm25) search across event titles, URLs, UI metadata and
+  screenshot analysis text
+- Incremental backfill of the search index for pre-existing rows
+"""
+
+import logging
+import re
+from typing import Dict, List, Optional
+
+from .database_schema_search import SEARCH_SOURCES
+from .database_time import date_range_to_ms
+
+
+def build_fts_query(text: str) -> str:
+    """
+    Turn free text into an FTS5 query matching all of its words.
+
+    Each word is quoted so punctuation in titles and paths ("Smith-Contract",
+    "C:\\Users") can't be misread as FTS5 syntax. A trailing * keeps its
+    prefix meaning.
+
+    Args:
+        text: User search text, e.g. "smith contr*"
+
+    Returns:
+        FTS5 MATCH expression, or '' if the text has no searchable words
+    """
+    terms = []
+    for word in text.split():
+        prefix = word.endswith('*')
+        word = word.rstrip('*')
+        if not re.search(r'\w', word):
+            continue
+        quoted = '"' + word.replace('"', '""') + '"'
+        terms.append(quoted + '*' if prefix else quoted)
+    return " ".join(terms)
+
+
+class SearchDatabaseMixin:
+    """
+    Mixin providing full-text search operations.
+
+    Must be mixed with a class that provides:
+    - self._get_connection(): Context manager for database connections
+    - FTS tables from SearchSchemaMixin
+    - self._shards_in_range(), self._attached_shard(): From ShardDatabaseMixin
+    """
+
+    def search(
+        self,
+        query: str,
+        start_date: Optional[str] = None,
+        end_date: Optional[str] = None,
+        limit: int = 50
+    ) -> List[Dict]:
+        """
+        Search events and screenshot analysis text, best matches first.
+
+        Args:
+            query: Free-text search, e.g. "smith contract"
+            start_date: ISO date string (YYYY-MM-DD) for range start (inclusive)
+            end_date: ISO date string (YYYY-MM-DD) for range end (inclusive)
+            limit: Maximum number of results
+
+        Returns:
+            List of result dictionaries with source ('event' or 'screenshot'),
+            id, timestamp, app, title, url, file_path, snippet and score
+            (bm25; lower is a better match)
+        """
+        match = build_fts_query(query)
+        if not match:
+            return []
+
+        start_ms, end_ms = date_range_to_ms(start_date, end_date)
+
+        def range_filter(column: str):
+            clause, params = "", []
+            if start_ms is not None:
+                clause += f" AND {column} >= ?"
+                params.append(start_ms)
+            if end_ms is not None:
+                clause += f" AND {column} < ?"
+                params.append(end_ms)
+            return clause, params
+
+        event_range, event_params = range_filter('e.start_ms')
+        screenshot_range, screenshot_params = range_filter('s.captured_ms')
+        params = [match] + event_params + [match] + screenshot_params + [limit]
+
+        def search_sql(schema: str) -> str:
+            return f"""
+                SELECT 'event' AS source, e.id, e.timestamp, e.app, e.title, e.url,
+                       NULL AS file_path,
+                       snippet(events_fts, -1, '[', ']', '...', 10) AS snippet,
+                       bm25(events_fts) AS score
+                FROM {schema}.events_fts
+                JOIN {schema}.events e ON e.id = events_fts.rowid
+                WHERE events_fts MATCH ?{event_range}
+                UNION ALL
+                SELECT 'screenshot' AS source, s.id, s.captured_at, s.window_app, s.window_title,
+                       NULL AS url, s.file_path,
+                       snippet(screenshots_fts, -1, '[', ']', '...', 10) AS snippet,
+                       bm25(screenshots_fts) AS score
+                FROM {schema}.screenshots_fts
+                JOIN {schema}.screenshots s ON s.id = screenshots_fts.rowid
+                WHERE screenshots_fts MATCH ?{screenshot_range}
+                ORDER BY score
+                LIMIT ?
+            """
+
+        with self._get_connection() as conn:
+            results = [dict(row) for row in conn.execute(search_sql('main'), params).fetchall()]
+
+            # Each shard has its own index; merge the best matches of each.
+            # bm25 statistics are per index, so cross-shard ranking is approximate.
+            for month in self._shards_in_range(start_ms, end_ms):
+                with self._attached_shard(conn, month) as alias:
+                    seen = {(r['source'], r['id']) for r in results}
+                    for row in conn.execute(search_sql(alias), params).fetchall():
+                        if (row['source'], row['id']) not in seen:
+                            results.append(dict(row))
+
+        results.sort(key=lambda result: result['score'])
+        return results[:limit]
+
+    def backfill_search_index(self, batch_size: int = 2000) -> int:
+        """
+        Index one batch of rows that existed before the search index was created.
+
+        Safe to call repeatedly (e.g. from a background thread) until it
+        returns 0; progress is stored in search_index_state, so an
+        interrupted backfill resumes where it stopped.
+
+        Args:
+            batch_size: Maximum rows indexed per source per call
+
+        Returns:
+            Number of row ids still waiting to be indexed (0 when done)
+        """
+        remaining = 0
+
+        with self._get_connection() as conn:
+            for source, (fts_table, columns) in SEARCH_SOURCES.items():
+                state = conn.execute(
+                    "SELECT target_id, done_id FROM search_index_state WHERE source = ?",
+                    (source,)
+                ).fetchone()
+                if state is None or state['done_id'] >= state['target_id']:
+                    continue
+
+                batch_end = min(state['done_id'] + batch_size, state['target_id'])
+                column_list = ", ".join(columns)
+                conn.execute(
+                    f"INSERT INTO {fts_table} (rowid, {column_list}) "
+                    f"SELECT id, {column_list} FROM {source} WHERE id > ? AND id <= ?",
+                    (state['done_id'], batch_end)
+                )
+                conn.execute(
+                    "UPDATE search_index_state SET done_id = ? WHERE source = ?",
+                    (batch_end, source)
+                )
+
+                remaining += state['target_id'] - batch_end
+
+        if remaining == 0:
+            logging.debug("Search index backfill complete")
+        return remaining
@@ -0,0 +1,504 @@
+"""
+Per-month shard files for events and screenshot rows.
+
+Provides:
+- Archiving closed months out of the main database into shard files
+  (<db stem>-shards/YYYY-MM.db next to the database)
+- Range iteration that ATTACHes only the shards a time range touches
+- Dropping a month as a file operation
+
+The main database keeps the current month hot, so tracking inserts and
+their indices stay small. Each shard holds plain events and screenshots
+tables with the same columns as the main database, plus its own FTS
+tables for search. Row ids are preserved when a month is archived, so ids
+stay unique across the main database and all shards.
+
+A month's rows may be split between the main database and its shard
+(late arrivals, screenshots still pending analysis), so readers always
+union both for a sharded month. Months are disjoint in time, which lets
+range queries visit one month-sized chunk at a time and attach at most
+one shard per query.
+
+daily_rollups in the main database keeps covering archived months;
+shard changes refresh the affected month's rollups explicitly.
+"""
+
+import logging
+import re
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from .database_schema_interning import interned_ids, prune_interned_values
+from .database_schema_search import SEARCH_SOURCES
+
+# Sharded tables and the epoch-ms column they are partitioned by
+SHARD_TABLES = {
+    'events': 'start_ms',
+    'screenshots': 'captured_ms',
+}
+
+_MONTH_PATTERN = re.compile(r"^\d{4}-\d{2}$")
+
+
+def month_bounds_ms(month: str) -> Tuple[int, int]:
+    """
+    Get the half-open UTC epoch-ms range covered by a month.
+
+    Args:
+        month: Month key, YYYY-MM
+
+    Returns:
+        (start_ms, end_ms) of the month
+    """
+    start = datetime.strptime(month, "%Y-%m").replace(tzinfo=timezone.utc)
+    if start.month == 12:
+        end = start.replace(year=start.year + 1, month=1)
+    else:
+        end = start.replace(month=start.month + 1)
+    return round(start.timestamp() * 1000), round(end.timestamp() * 1000)
+
+
+def month_of_ms(epoch_ms: int) -> str:
+    """Get the YYYY-MM key of the UTC month containing an epoch-ms instant."""
+    return datetime.fromtimestamp(epoch_ms / 1000, tz=timezone.utc).strftime("%Y-%m")
+
+
+def ms_range_sql(column: str, lo: Optional[int], hi: Optional[int], include_null: bool = False) -> Tuple[str, List]:
+    """Build ' AND ...' predicates restricting column to [lo, hi)."""
+    clauses, params = [], []
+    if lo is not None:
+        clauses.append(f"{column} >= ?")
+        params.append(lo)
+    if hi is not None:
+        clauses.append(f"{column} < ?")
+        params.append(hi)
+    if not clauses:
+        return "", params
+    condition = " AND ".join(clauses)
+    if include_null:
+        condition = f"({condition} OR {column} IS NULL)"
+    return f" AND {condition}", params
+
+
+class ShardDatabaseMixin:
+    """
+    Mixin providing month shard storage for events and screenshots.
+
+    Must be mixed with a class that provides:
+    - self.db_path: Path to the main SQLite database
+    - self._get_connection(): Context manager for database connections
+    - self._add_daily_rollups(): Rollup accumulation from RollupsSchemaMixin
+    - self._unlink_screenshots(): From ScreenshotDatabaseMixin
+    """
+
+    def _init_shards(self):
+        """Locate the shard directory and index the shard files already present."""
+        self.shard_dir = self.db_path.parent / f"{self.db_path.stem}-shards"
+        self._shard_months = set()
+        if self.shard_dir.is_dir():
+            for path in self.shard_dir.glob("*.db"):
+                if _MONTH_PATTERN.match(path.stem):
+                    self._shard_months.add(path.stem)
+
+    def list_shards(self) -> List[str]:
+        """
+        List the months stored in shard files.
+
+        Returns:
+            Sorted YYYY-MM month keys
+        """
+        return sorted(self._shard_months)
+
+    def shard_path(self, month: str) -> Path:
+        """Get the shard file path for a YYYY-MM month."""
+        return self.shard_dir / f"{month}.db"
+
+    def _shards_in_range(self, start_ms: Optional[int], end_ms: Optional[int]) -> List[str]:
+        """Get the shard months overlapping a half-open epoch-ms range, oldest first."""
+        months = []
+        for month in sorted(self._shard_months):
+            month_start, month_end = month_bounds_ms(month)
+            if (end_ms is None or month_start < end_ms) and (start_ms is None or month_end > start_ms):
+                months.append(month)
+        return months
+
+    @contextmanager
+    def _attached_shard(self, conn, month: str):
+        """
+        Attach a month's shard to a connection for the duration of the block.
+
+        SQLite cannot detach inside a transaction, so writes made in the
+        block are committed (or rolled back on error) before detaching.
+        The block must therefore be the caller's own transaction: attaching
+        while an outer block is open or has pending writes raises rather
+        than committing those writes on the outer block's behalf.
+
+        Yields:
+            Schema alias of the attached shard
+
+        Raises:
+            RuntimeError: If called inside an outer transaction
+        """
+        alias = f"shard_{month.replace('-', '_')}"
+        attached = {row[1] for row in conn.execute("PRAGMA database_list")}
+        if alias in attached:
+            # Already attached by an enclosing block, which owns the commit
+            yield alias
+            return
+
+        self._check_not_nested(conn, f"attach shard {month}")
+        conn.execute(f"ATTACH DATABASE ? AS {alias}", (str(self.shard_path(month)),))
+        try:
+            yield alias
+        except Exception:
+            if conn.in_transaction:
+                conn.rollback()
+            raise
+        finally:
+            if conn.in_transaction:
+                conn.commit()
+            conn.execute(f"DETACH DATABASE {alias}")
+
+    @staticmethod
+    def _table_columns(conn, schema: str, table: str) -> List[Tuple[str, str]]:
+        """Get (name, declared type) of a table's columns in a schema."""
+        return [(row[1], row[2]) for row in conn.execute(f"PRAGMA {schema}.table_info({table})")]
+
+    def _shard_select_list(self, conn, alias: str, table: str) -> str:
+        """Select list reading a shard table in the main table's column order."""
+        shard_columns = {name for name, _ in self._table_columns(conn, alias, table)}
+        return ", ".join(
+            name if name in shard_columns else f"NULL AS {name}"
+            for name, _ in self._table_columns(conn, 'main', table)
+        )
+
+    def _sharded_sources(
+        self,
+        conn,
+        table: str,
+        start_ms: Optional[int] = None,
+        end_ms: Optional[int] = None,
+        descending: bool = False
+    ) -> Iterator[Tuple[str, str, List]]:
+        """
+        Split a time range into month-aligned row sources, in time order.
+
+        Without shards in range this yields the table itself once. Otherwise
+        each sharded month yields a UNION ALL of main and shard rows (with
+        the shard attached until the caller advances), and the gaps between
+        shards yield the main table. Callers must finish with each chunk's
+        cursor before advancing.
+
+        Args:
+            conn: Database connection (not inside a transaction)
+            table: Key of SHARD_TABLES
+            start_ms: Range start (inclusive), None for unbounded
+            end_ms: Range end (exclusive), None for unbounded
+            descending: Yield newest chunk first
+
+        Yields:
+            (source, range_sql, params) to use as
+            f"SELECT ... FROM {source} WHERE 1=1{range_sql} ..." with params first
+        """
+        column = SHARD_TABLES[table]
+        include_null = start_ms is None and end_ms is None
+        months = self._shards_in_range(start_ms, end_ms)
+        if not months:
+            range_sql, params = ms_range_sql(column, start_ms, end_ms)
+            yield table, range_sql, params
+            return
+
+        chunks = []
+        cursor_ms = start_ms
+        for month in months:
+            month_start, month_end = month_bounds_ms(month)
+            if cursor_ms is None or cursor_ms < month_start:
+                chunks.append((cursor_ms, month_start, None))
+            lo = month_start if cursor_ms is None else max(cursor_ms, month_start)
+            hi = month_end if end_ms is None else min(end_ms, month_end)
+            chunks.append((lo, hi, month))
+            cursor_ms = month_end
+        if end_ms is None or cursor_ms < end_ms:
+            chunks.append((cursor_ms, end_ms, None))
+
+        if descending:
+            chunks.reverse()
+
+        for lo, hi, month in chunks:
+            # Rows without a time sort before every chunk; keep them in the oldest
+            range_sql, params = ms_range_sql(column, lo, hi, include_null and lo is None)
+            if month is None:
+                yield table, range_sql, params
+                continue
+
+            with self._attached_shard(conn, month) as alias:
+                source = (
+                    f"(SELECT * FROM main.{table} WHERE 1=1{range_sql} "
+                    f"UNION ALL "
+                    f"SELECT {self._shard_select_list(conn, alias, table)} "
+                    f"FROM {alias}.{table} WHERE 1=1{range_sql})"
+                )
+                yield source, "", params + params
+
+    def _ensure_shard_schema(self, conn, alias: str):
+        """
+        Create (or extend) a shard's tables to match the main database columns.
+
+        Args:
+            conn: Connection with the shard attached as alias
+            alias: Schema alias of the shard
+        """
+        for table, column in SHARD_TABLES.items():
+            main_columns = self._table_columns(conn, 'main', table)
+            shard_columns = {name for name, _ in self._table_columns(conn, alias, table)}
+
+            if not shard_columns:
+                definitions = ", ".join(
+                    "id INTEGER PRIMARY KEY" if name == 'id' else f"{name} {declared}".strip()
+                    for name, declared in main_columns
+                )
+                conn.execute(f"CREATE TABLE {alias}.{table} ({definitions})")
+            else:
+                for name, declared in main_columns:
+                    if name not in shard_columns:
+                        conn.execute(f"ALTER TABLE {alias}.{table} ADD COLUMN {name} {declared}")
+
+            conn.execute(
+                f"CREATE INDEX IF NOT EXISTS {alias}.idx_{table}_{column} ON {table}({column})"
+            )
+
+        for source, (fts_table, columns) in SEARCH_SOURCES.items():
+            conn.execute(f"""
+                CREATE VIRTUAL TABLE IF NOT EXISTS {alias}.{fts_table} USING fts5(
+                    {', '.join(columns)},
+                    content='{source}',
+                    content_rowid='id',
+                    tokenize='unicode61 remove_diacritics 2'
+                )
+            """)
+            # Shards only ever lose rows after archiving; rebuild covers inserts
+            old_values = ", ".join(f"OLD.{c}" for c in columns)
+            conn.execute(f"""
+                CREATE TRIGGER IF NOT EXISTS {alias}.{fts_table}_delete
+                AFTER DELETE ON {source}
+                BEGIN
+                    INSERT INTO {fts_table} ({fts_table}, rowid, {', '.join(columns)})
+                    VALUES ('delete', OLD.id, {old_values});
+                END
+            """)
+
+    def _refresh_month_rollups(self, conn, month: str, alias: Optional[str] = None):
+        """
+        Recompute a month's daily_rollups from the main database and its shard.
+
+        Args:
+            conn: Database connection within a transaction
+            month: YYYY-MM month key
+            alias: Schema alias of the attached shard, if it still exists
+        """
+        month_start, month_end = month_bounds_ms(month)
+        next_month = month_of_ms(month_end)
+        cursor = conn.cursor()
+        cursor.execute(
+            "DELETE FROM daily_rollups WHERE day >= ? AND day < ?",
+            (f"{month}-01", f"{next_month}-01")
+        )
+        where = "start_ms >= ? AND start_ms < ?"
+        self._add_daily_rollups(cursor, "main.events", where, (month_start, month_end))
+        if alias is not None:
+            self._add_daily_rollups(cursor, f"{alias}.events", where, (month_start, month_end))
+
+    def archive_month(self, month: str) -> Dict[str, int]:
+        """
+        Move a month's events and screenshot rows into its shard file.
+
+        Screenshots still pending analysis stay in the main database until a
+        later run. Rows are copied and committed to the shard before they are
+        deleted from the main database, so an interruption can only leave
+        duplicates, which the next run of the same month resolves.
+
+        Args:
+            month: YYYY-MM month key
+
+        Returns:
+            Dictionary mapping table name to rows moved
+        """
+        month_start, month_end = month_bounds_ms(month)
+        self.shard_dir.mkdir(parents=True, exist_ok=True)
+        moved = {}
+
+        with self._get_connection() as conn:
+            with self._attached_shard(conn, month) as alias:
+                self._ensure_shard_schema(conn, alias)
+
+                for table, column in SHARD_TABLES.items():
+                    columns = ", ".join(name for name, _ in self._table_columns(conn, 'main', table))
+                    pending = " AND analysis_status IS NOT 'pending'" if table == 'screenshots' else ""
+                    conn.execute(f"""
+                        INSERT OR REPLACE INTO {alias}.{table} ({columns})
+                        SELECT {columns} FROM main.{table}
+                        WHERE {column} >= ? AND {column} < ?{pending}
+                    """, (month_start, month_end))
+
+                for fts_table, _ in SEARCH_SOURCES.values():
+                    conn.execute(f"INSERT INTO {alias}.{fts_table} ({fts_table}) VALUES ('rebuild')")
+                conn.commit()
+
+                # Only rows now safely in the shard leave the main database
+                referenced = interned_ids(
+                    conn, f"start_ms >= ? AND start_ms < ? AND id IN (SELECT id FROM {alias}.events)",
+                    (month_start, month_end), 'main.event_rows'
+                )
+                for table, column in SHARD_TABLES.items():
+                    storage = 'event_rows' if table == 'events' else table
+                    cursor = conn.execute(f"""
+                        DELETE FROM main.{storage}
+                        WHERE {column} >= ? AND {column} < ?
+                          AND id IN (SELECT id FROM {alias}.{table})
+                    """, (month_start, month_end))
+                    moved[table] = cursor.rowcount
+
+                    # Moved rows still exist, so the change feed should not report them deleted
+                    conn.execute(f"""
+                        DELETE FROM main.changes
+                        WHERE table_name = ? AND operation = 'delete'
+                          AND row_id IN (SELECT id FROM {alias}.{table})
+                    """, (table,))
+
+                prune_interned_values(conn, referenced)
+                self._refresh_month_rollups(conn, month, alias)
+
+        self._shard_months.add(month)
+        logging.info(
+            f"Archived {month} to shard: {moved['events']} events, "
+            f"{moved['screenshots']} screenshots"
+        )
+        return moved
+
+    def archive_closed_months(self, now_ms: Optional[int] = None) -> Dict[str, Dict[str, int]]:
+        """
+        Archive every month before the current one that still has rows in the main database.
+
+        Args:
+            now_ms: Current time in epoch ms (defaults to now)
+
+        Returns:
+            Dictionary mapping archived month to rows moved per table
+        """
+        if now_ms is None:
+            now_ms = round(datetime.now(timezone.utc).timestamp() * 1000)
+        current_start, _ = month_bounds_ms(month_of_ms(now_ms))
+
+        months = set()
+        with self._get_connection() as conn:
+            for table, column in SHARD_TABLES.items():
+                rows = conn.execute(f"""
+                    SELECT DISTINCT strftime('%Y-%m', {column} / 1000, 'unixepoch')
+                    FROM {table} WHERE {column} < ?
+                """, (current_start,)).fetchall()
+                months.update(row[0] for row in rows if row[0])
+
+        return {month: self.archive_month(month) for month in sorted(months)}
+
+    def drop_shard(self, month: str) -> int:
+        """
+        Securely delete a month's shard file.
+
+        Screenshot image files referenced by the shard are not touched; use
+        delete_events_securely() to remove those as well.
+
+        Args:
+            month: YYYY-MM month key
+
+        Returns:
+            Number of events the shard held
+        """
+        from .secure_delete import secure_delete_file
+
+        if month not in self._shard_months:
+            return 0
+
+        with self._get_connection() as conn:
+            with self._attached_shard(conn, month) as alias:
+                count = conn.execute(f"SELECT COUNT(*) FROM {alias}.events").fetchone()[0]
+
+            self._shard_months.discard(month)
+            secure_delete_file(self.shard_path(month))
+            self._refresh_month_rollups(conn, month)
+
+        logging.warning(f"Dropped shard {month} ({count} events)")
+        return count
+
+    def _delete_from_shards(
+        self,
+        table: str,
+        where: str,
+        params: List,
+        start_ms: Optional[int] = None,
+        end_ms: Optional[int] = None,
+        limit: Optional[int] = None
+    ) -> int:
+        """
+        Delete matching rows from the shards overlapping a time range.
+
+        A shard whose month is fully covered by the range and which holds
+        no screenshots is removed as a file instead of row by row.
+        Screenshots linked to deleted events are unlinked.
+
+        Args:
+            table: Key of SHARD_TABLES
+            where: SQL condition (without range) selecting rows to delete
+            params: Parameters for the condition
+            start_ms: Range start (inclusive), None for unbounded
+            end_ms: Range end (exclusive), None for unbounded
+            limit: Stop after deleting this many rows (or dropping one
+                   shard file), for chunked deletion; None deletes all
+
+        Returns:
+            Number of rows deleted
+        """
+        deleted = 0
+        column = SHARD_TABLES[table]
+
+        for month in self._shards_in_range(start_ms, end_ms):
+            if limit is not None and deleted >= limit:
+                break
+            month_start, month_end = month_bounds_ms(month)
+            covered = (start_ms is None or start_ms <= month_start) and \
+                      (end_ms is None or end_ms >= month_end)
+
+            with self._get_connection() as conn:
+                with self._attached_shard(conn, month) as alias:
+                    screenshots = conn.execute(
+                        f"SELECT COUNT(*) FROM {alias}.screenshots"
+                    ).fetchone()[0]
+                    if covered and table == 'events' and where == "1" and screenshots == 0:
+                        drop_file = True
+                        # Pending screenshots left in the main database may link to the shard's events
+                        self._unlink_screenshots(conn, f"SELECT id FROM {alias}.events", [])
+                    else:
+                        drop_file = False
+                        range_sql, range_params = ms_range_sql(column, start_ms, end_ms)
+                        selection = f"SELECT id FROM {alias}.{table} WHERE {where}{range_sql}"
+                        selection_params = list(params) + range_params
+                        if limit is not None:
+                            selection += " ORDER BY id LIMIT ?"
+                            selection_params.append(limit - deleted)
+                        if table == 'events':
+                            self._unlink_screenshots(conn, selection, selection_params, ('main', alias))
+                        cursor = conn.execute(
+                            f"DELETE FROM {alias}.{table} WHERE id IN ({selection})",
+                            selection_params
+                        )
+                        deleted += cursor.rowcount
+                        if cursor.rowcount and table == 'events':
+                            self._refresh_month_rollups(conn, month, alias)
+
+            if drop_file:
+                deleted += self.drop_shard(month)
+                if limit is not None:
+                    break
+
+        return deleted
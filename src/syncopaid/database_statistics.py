@@ -6,9 +6,23 @@ duration values for human-readable display.
 """
 
 import logging
-from typing import Dict
+from typing import Dict, List, Optional, Sequence, Tuple
 from datetime import datetime
 
+from .database_cache import cached_query
+
+
+# get_range_summary() dimensions: output key and SQL over daily_rollups.
+# Weeks are keyed by their Monday, months by YYYY-MM.
+SUMMARY_DIMENSIONS = {
+    'day': ('day', "NULLIF(day, '')"),
+    'week': ('week', "date(NULLIF(day, ''), '-6 days', 'weekday 1')"),
+    'month': ('month', "substr(NULLIF(day, ''), 1, 7)"),
+    'app': ('app', "NULLIF(app, '')"),
+    'matter': ('matter_id', "NULLIF(matter_id, 0)"),
+    'state': ('state', "state"),
+}
+
 
 class StatisticsDatabaseMixin:
     """
@@ -16,13 +30,18 @@ class StatisticsDatabaseMixin:
 
     Must be mixed with a class that provides:
     - self._get_connection(): Context manager for database connections
-    - self.get_events(): Method to query events
+    - self._populate_daily_rollups(): Rollup rebuild from RollupsSchemaMixin
+    - self.list_shards(), self._attached_shard(): From ShardDatabaseMixin
     """
 
+    @cached_query('events')
     def get_statistics(self) -> Dict:
         """
         Get database statistics.
 
+        Totals come from daily_rollups (O(days)); first/last event use the
+        start_ms index of the main database and each shard.
+
         Returns:
             Dictionary with:
             - total_events: Total number of events
@@ -39,22 +58,30 @@ class StatisticsDatabaseMixin:
             # Get counts and durations
             cursor.execute("""
                 SELECT
-                    COUNT(*) as total_events,
+                    SUM(event_count) as total_events,
                     SUM(duration_seconds) as total_duration,
-                    SUM(CASE WHEN is_idle = 0 THEN duration_seconds ELSE 0 END) as active_duration,
-                    SUM(CASE WHEN is_idle = 1 THEN duration_seconds ELSE 0 END) as idle_duration,
-                    MIN(timestamp) as first_event,
-                    MAX(timestamp) as last_event
-                FROM events
+                    SUM(active_duration_seconds) as active_duration,
+                    SUM(idle_duration_seconds) as idle_duration
+                FROM daily_rollups
             """)
-
             row = cursor.fetchone()
 
+            # Archived months keep their first/last events in shard files
+            edges = self._event_edges(conn, 'main')
+            for month in self.list_shards():
+                with self._attached_shard(conn, month) as alias:
+                    edges += self._event_edges(conn, alias)
+
+            bounds = {'first_event': None, 'last_event': None}
+            if edges:
+                bounds['first_event'] = min(edges)[1]
+                bounds['last_event'] = max(edges)[1]
+
             # Calculate date range
             date_range_days = 0
-            if row['first_event'] and row['last_event']:
-                first = datetime.fromisoformat(row['first_event'])
-                last = datetime.fromisoformat(row['last_event'])
+            if bounds['first_event'] and bounds['last_event']:
+                first = datetime.fromisoformat(bounds['first_event'])
+                last = datetime.fromisoformat(bounds['last_event'])
                 date_range_days = (last - first).days + 1
 
             return {
@@ -62,11 +89,169 @@ class StatisticsDatabaseMixin:
                 'total_duration_seconds': row['total_duration'] or 0.0,
                 'active_duration_seconds': row['active_duration'] or 0.0,
                 'idle_duration_seconds': row['idle_duration'] or 0.0,
-                'first_event': row['first_event'],
-                'last_event': row['last_event'],
+                'first_event': bounds['first_event'],
+                'last_event': bounds['last_event'],
                 'date_range_days': date_range_days
             }
 
+    @staticmethod
+    def _event_edges(conn, schema: str) -> List[Tuple[int, str]]:
+        """Get (start_ms, timestamp) of the first and last event in a schema."""
+        rows = conn.execute(f"""
+            SELECT start_ms, timestamp FROM (
+                SELECT start_ms, timestamp FROM {schema}.events WHERE start_ms IS NOT NULL
+                ORDER BY start_ms ASC LIMIT 1)
+            UNION ALL
+            SELECT start_ms, timestamp FROM (
+                SELECT start_ms, timestamp FROM {schema}.events WHERE start_ms IS NOT NULL
+                ORDER BY start_ms DESC LIMIT 1)
+        """).fetchall()
+        return [(row['start_ms'], row['timestamp']) for row in rows]
+
+    @staticmethod
+    def _rollup_day_filter(start_date: Optional[str], end_date: Optional[str]) -> Tuple[str, List]:
+        """
+        Build a WHERE clause selecting rollup days in an inclusive date range.
+
+        Args:
+            start_date: ISO date string (YYYY-MM-DD) for range start (inclusive)
+            end_date: ISO date string (YYYY-MM-DD) for range end (inclusive)
+
+        Returns:
+            (where_clause, params)
+        """
+        where = "WHERE 1=1"
+        params = []
+        if start_date:
+            where += " AND day >= ?"
+            params.append(start_date[:10])
+        if end_date:
+            # '' holds events with unparseable timestamps, outside any range
+            where += " AND day <= ? AND day != ''"
+            params.append(end_date[:10])
+        return where, params
+
+    def get_range_summary(
+        self,
+        start_date: Optional[str] = None,
+        end_date: Optional[str] = None,
+        group_by: Sequence[str] = ('day',)
+    ) -> List[Dict]:
+        """
+        Aggregate event totals for a date range in one GROUP BY over daily_rollups.
+
+        daily_rollups is keyed by (day, state, app, matter_id) and covers
+        archived months, so any combination of these dimensions (plus week
+        and month, derived from day) costs O(rollup rows), not O(events).
+
+        Args:
+            start_date: ISO date string (YYYY-MM-DD) for range start (inclusive)
+            end_date: ISO date string (YYYY-MM-DD) for range end (inclusive)
+            group_by: Dimensions from SUMMARY_DIMENSIONS ('day', 'week',
+                      'month', 'app', 'matter', 'state'); empty for one
+                      grand-total row
+
+        Returns:
+            List of dictionaries ordered by the group keys, each with the
+            group keys (day, week, month, app, matter_id, state; None for
+            unknown) and event_count, active_event_count, duration_seconds,
+            active_duration_seconds and idle_duration_seconds
+        """
+        unknown = [dimension for dimension in group_by if dimension not in SUMMARY_DIMENSIONS]
+        if unknown:
+            raise ValueError(f"Unknown summary dimensions: {', '.join(unknown)}")
+
+        keys = [SUMMARY_DIMENSIONS[dimension] for dimension in group_by]
+        select_keys = "".join(f"{expression} AS {name}, " for name, expression in keys)
+        names = ", ".join(name for name, _ in keys)
+        group = f"GROUP BY {names} ORDER BY {names}" if keys else ""
+        where, params = self._rollup_day_filter(start_date, end_date)
+
+        with self._get_connection() as conn:
+            rows = conn.execute(f"""
+                SELECT {select_keys}
+                       SUM(event_count) AS event_count,
+                       SUM(active_event_count) AS active_event_count,
+                       SUM(duration_seconds) AS duration_seconds,
+                       SUM(active_duration_seconds) AS active_duration_seconds,
+                       SUM(idle_duration_seconds) AS idle_duration_seconds
+                FROM daily_rollups {where}
+                {group}
+            """, params).fetchall()
+
+        summary = []
+        for row in rows:
+            if row['event_count'] is None:
+                continue  # Grand total over an empty range
+            group_row = dict(row)
+            for column in ('duration_seconds', 'active_duration_seconds', 'idle_duration_seconds'):
+                group_row[column] = group_row[column] or 0.0
+            summary.append(group_row)
+        return summary
+
+    def get_event_totals(
+        self,
+        start_date: Optional[str] = None,
+        end_date: Optional[str] = None,
+        include_idle: bool = True
+    ) -> Dict:
+        """
+        Aggregate event counts and durations for a date range from daily_rollups.
+
+        Args:
+            start_date: ISO date string (YYYY-MM-DD) for range start (inclusive)
+            end_date: ISO date string (YYYY-MM-DD) for range end (inclusive)
+            include_idle: Whether to include idle events
+
+        Returns:
+            Dictionary with total_events, total_duration_seconds,
+            active_duration_seconds, idle_duration_seconds and unique_applications
+        """
+        return totals_from_app_summary(
+            self.get_range_summary(start_date, end_date, group_by=('app',)), include_idle
+        )
+
+    def get_app_durations(
+        self,
+        start_date: Optional[str] = None,
+        end_date: Optional[str] = None
+    ) -> Dict[Optional[str], float]:
+        """
+        Get active (non-idle) seconds per application for a date range.
+
+        Args:
+            start_date: ISO date string (YYYY-MM-DD) for range start (inclusive)
+            end_date: ISO date string (YYYY-MM-DD) for range end (inclusive)
+
+        Returns:
+            Dictionary mapping app name (None for unknown) to active seconds,
+            for apps with active time in the range
+        """
+        return app_durations_from_summary(
+            self.get_range_summary(start_date, end_date, group_by=('app',))
+        )
+
+    def rebuild_daily_rollups(self) -> int:
+        """
+        Recompute daily_rollups from the events table and month shards.
+
+        Rollups are kept current by triggers; rebuilding is only needed to
+        repair drift (e.g. after restoring an events table from elsewhere).
+
+        Returns:
+            Number of rollup rows written
+        """
+        with self._get_connection() as conn:
+            count = self._populate_daily_rollups(conn.cursor())
+
+        for month in self.list_shards():
+            with self._get_connection() as conn:
+                with self._attached_shard(conn, month) as alias:
+                    count += self._add_daily_rollups(conn.cursor(), f"{alias}.events")
+
+        logging.info(f"Rebuilt daily_rollups ({count} rollup rows)")
+        return count
+
     def get_daily_summary(self, target_date: str) -> Dict:
         """
         Get summary statistics for a specific day.
@@ -77,23 +262,56 @@ class StatisticsDatabaseMixin:
         Returns:
             Dictionary with daily statistics
         """
-        events = self.get_events(start_date=target_date, end_date=target_date)
+        totals = self.get_event_totals(start_date=target_date, end_date=target_date)
+
+        return {
+            'date': target_date,
+            'total_events': totals['total_events'],
+            'total_duration_seconds': totals['total_duration_seconds'],
+            'active_duration_seconds': totals['active_duration_seconds'],
+            'idle_duration_seconds': totals['idle_duration_seconds'],
+            'unique_applications': totals['unique_applications']
+        }
 
-        total_duration = sum(e['duration_seconds'] for e in events)
-        active_duration = sum(e['duration_seconds'] for e in events if not e['is_idle'])
-        idle_duration = sum(e['duration_seconds'] for e in events if e['is_idle'])
 
-        # Count unique apps
-        unique_apps = len(set(e['app'] for e in events if e['app']))
+def totals_from_app_summary(app_summary: List[Dict], include_idle: bool = True) -> Dict:
+    """
+    Reduce a get_range_summary(group_by=('app',)) result to range totals.
 
+    Args:
+        app_summary: Per-app summary rows
+        include_idle: Whether to include idle events
+
+    Returns:
+        Dictionary with total_events, total_duration_seconds,
+        active_duration_seconds, idle_duration_seconds and unique_applications
+    """
+    active_duration = sum(row['active_duration_seconds'] for row in app_summary)
+    if include_idle:
         return {
-            'date': target_date,
-            'total_events': len(events),
-            'total_duration_seconds': total_duration,
+            'total_events': sum(row['event_count'] for row in app_summary),
+            'total_duration_seconds': sum(row['duration_seconds'] for row in app_summary),
             'active_duration_seconds': active_duration,
-            'idle_duration_seconds': idle_duration,
-            'unique_applications': unique_apps
+            'idle_duration_seconds': sum(row['idle_duration_seconds'] for row in app_summary),
+            'unique_applications': sum(1 for row in app_summary if row['app'] is not None)
         }
+    return {
+        'total_events': sum(row['active_event_count'] for row in app_summary),
+        'total_duration_seconds': active_duration,
+        'active_duration_seconds': active_duration,
+        'idle_duration_seconds': 0.0,
+        'unique_applications': sum(
+            1 for row in app_summary if row['app'] is not None and row['active_event_count'] > 0
+        )
+    }
+
+
+def app_durations_from_summary(app_summary: List[Dict]) -> Dict[Optional[str], float]:
+    """Map app to active seconds from per-app summary rows with active time."""
+    return {
+        row['app']: row['active_duration_seconds']
+        for row in app_summary if row['active_event_count'] > 0
+    }
 
 
 def format_duration(seconds: float) -> str:
@@ -120,3 +338,20 @@ def format_duration(seconds: float) -> str:
         return f"{hours}h"
 
     return f"{hours}h {remaining_minutes}m"
+
+
+if __name__ == "__main__":
+    import sys
+
+    from .config import ConfigManager
+    from .database import Database
+
+    if len(sys.argv) < 2 or sys.argv[1] != "rebuild-rollups":
+        print("Usage: python -m syncopaid.database_statistics rebuild-rollups [database_path]")
+        sys.exit(1)
+
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+
+    db_path = sys.argv[2] if len(sys.argv) > 2 else ConfigManager().get_database_path()
+    rows = Database(str(db_path)).rebuild_daily_rollups()
+    print(f"Rebuilt daily_rollups for {db_path}: {rows} rollup rows")
@@ -0,0 +1,110 @@
+"""
+Epoch-millisecond time helpers for database range queries.
+
+Event timestamps are stored as UTC "+00:00" ISO strings while action
+screenshots use local-offset strings, so comparing the ISO text directly
+is both slow and wrong across offsets. Range queries instead use integer
+epoch-millisecond columns (events.start_ms/end_ms, screenshots.captured_ms)
+computed by these helpers.
+
+Naive timestamps and date strings (no offset) are interpreted as UTC,
+matching how SQLite's julianday() treats them.
+
+Since migration 14, events keep only the epoch-ms columns and the UTC
+offset the text was written with; the events view rebuilds the ISO text
+with ISO_TIME_SQL, at millisecond precision.
+"""
+
+from datetime import datetime, timedelta, timezone
+from typing import Optional, Tuple
+
+
+# SQL expression converting an ISO-8601 column to epoch milliseconds.
+# Used for migration backfills and trigger fallbacks; format with the column name.
+EPOCH_MS_SQL = "CAST(ROUND((julianday({column}) - 2440587.5) * 86400000) AS INTEGER)"
+
+# SQL expression for the UTC offset, in minutes, of an ISO-8601 column;
+# NULL for naive text. Format with the column name.
+UTC_OFFSET_MINUTES_SQL = (
+    "CASE WHEN {column} LIKE '%Z' THEN 0 "
+    "WHEN substr({column}, -6, 1) IN ('+', '-') AND substr({column}, -3, 1) = ':' "
+    "THEN (CASE substr({column}, -6, 1) WHEN '-' THEN -1 ELSE 1 END) "
+    "* (CAST(substr({column}, -5, 2) AS INTEGER) * 60 + CAST(substr({column}, -2) AS INTEGER)) END"
+)
+
+# SQL expression rebuilding ISO-8601 text from an epoch-ms column and a UTC
+# offset in minutes (NULL: naive text), as datetime.isoformat() writes it.
+# Format with ms and offset.
+ISO_TIME_SQL = (
+    "strftime('%Y-%m-%dT%H:%M:%S', ({ms} + COALESCE({offset}, 0) * 60000) / 1000.0, 'unixepoch')"
+    " || CASE WHEN {ms} % 1000 = 0 THEN '' ELSE printf('.%03d000', ({ms} % 1000 + 1000) % 1000) END"
+    " || CASE WHEN {offset} IS NULL THEN '' ELSE printf('%s%02d:%02d',"
+    " CASE WHEN {offset} < 0 THEN '-' ELSE '+' END, abs({offset}) / 60, abs({offset}) % 60) END"
+)
+
+
+def to_epoch_ms(timestamp: Optional[str]) -> Optional[int]:
+    """
+    Convert an ISO-8601 timestamp string to epoch milliseconds.
+
+    Args:
+        timestamp: ISO timestamp with or without UTC offset (naive = UTC)
+
+    Returns:
+        Milliseconds since the Unix epoch, or None if missing/unparseable
+    """
+    if not timestamp:
+        return None
+    try:
+        dt = datetime.fromisoformat(timestamp)
+    except (TypeError, ValueError):
+        return None
+    if dt.tzinfo is None:
+        dt = dt.replace(tzinfo=timezone.utc)
+    return round(dt.timestamp() * 1000)
+
+
+def utc_offset_minutes(timestamp: Optional[str]) -> Optional[int]:
+    """
+    Get the UTC offset an ISO-8601 timestamp string was written with.
+
+    Args:
+        timestamp: ISO timestamp with or without UTC offset
+
+    Returns:
+        Offset in minutes east of UTC, or None if naive/missing/unparseable
+    """
+    if not timestamp:
+        return None
+    try:
+        offset = datetime.fromisoformat(timestamp).utcoffset()
+    except (TypeError, ValueError):
+        return None
+    if offset is None:
+        return None
+    return round(offset.total_seconds() / 60)
+
+
+def date_range_to_ms(
+    start_date: Optional[str] = None,
+    end_date: Optional[str] = None
+) -> Tuple[Optional[int], Optional[int]]:
+    """
+    Convert an inclusive YYYY-MM-DD date range to a half-open ms range.
+
+    Args:
+        start_date: ISO date string for range start (inclusive)
+        end_date: ISO date string for range end (inclusive)
+
+    Returns:
+        (start_ms, end_ms) where end_ms is midnight after end_date (exclusive).
+        Either value is None if the corresponding date is None.
+    """
+    start_ms = to_epoch_ms(f"{start_date[:10]}T00:00:00") if start_date else None
+
+    end_ms = None
+    if end_date:
+        day_after = datetime.fromisoformat(end_date[:10]) + timedelta(days=1)
+        end_ms = to_epoch_ms(day_after.isoformat())
+
+    return start_ms, end_ms
@@ -0,0 +1,274 @@
+"""
+Background secure deletion engine.
+
+Purges large date ranges without blocking tracking: database rows are
+deleted one bounded chunk per short transaction (with a pause between
+chunks so the tracker's writes get the lock), and screenshot files are
+shredded on a small worker pool under a shared I/O rate limit.
+
+Jobs live in the deletion_jobs table, so work interrupted by a crash or
+shutdown resumes the next time the engine starts. Files that cannot be
+shredded stay queued and are retried after retry_seconds.
+"""
+
+import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from syncopaid.secure_delete import shred_file
+
+
+class RateLimiter:
+    """
+    Token bucket limiting bytes per second across threads.
+
+    consume() blocks until the requested bytes fit under the rate; bursts
+    of up to one second's worth of bytes pass without waiting.
+    """
+
+    def __init__(self, bytes_per_second: float):
+        """
+        Initialize the limiter.
+
+        Args:
+            bytes_per_second: Sustained rate; 0 or less disables limiting
+        """
+        self.bytes_per_second = bytes_per_second
+        self._allowance = bytes_per_second
+        self._last = time.monotonic()
+        self._lock = threading.Lock()
+
+    def consume(self, amount: int):
+        """Block until amount bytes may be written."""
+        if self.bytes_per_second <= 0:
+            return
+        with self._lock:
+            now = time.monotonic()
+            self._allowance = min(
+                self.bytes_per_second,
+                self._allowance + (now - self._last) * self.bytes_per_second
+            )
+            self._last = now
+            self._allowance -= amount
+            wait = -self._allowance / self.bytes_per_second if self._allowance < 0 else 0.0
+        if wait > 0:
+            time.sleep(wait)
+
+
+class SecureDeletionEngine:
+    """
+    Runs deletion jobs on a background thread.
+
+    Jobs are processed oldest first: rows are deleted chunk by chunk, then
+    the job's queued files are shredded in parallel. Progress (including
+    throughput measured in this session) is available from get_progress().
+    """
+
+    def __init__(
+        self,
+        database,
+        workers: int = 2,
+        max_bytes_per_second: float = 20 * 1024 * 1024,
+        chunk_size: int = 500,
+        chunk_pause_seconds: float = 0.05,
+        retry_seconds: float = 60.0
+    ):
+        """
+        Initialize the engine.
+
+        Args:
+            database: Database instance providing the deletion job methods
+            workers: Threads shredding files in parallel
+            max_bytes_per_second: Shared overwrite rate limit (0 = unlimited)
+            chunk_size: Rows deleted per transaction
+            chunk_pause_seconds: Pause between row chunks
+            retry_seconds: Wait before retrying files that could not be shredded
+        """
+        self.database = database
+        self.workers = workers
+        self.chunk_size = chunk_size
+        self.chunk_pause_seconds = chunk_pause_seconds
+        self.retry_seconds = retry_seconds
+        self.rate_limiter = RateLimiter(max_bytes_per_second)
+
+        self._thread: Optional[threading.Thread] = None
+        self._running = False
+        self._wake = threading.Event()
+        self._stats_lock = threading.Lock()
+        self._throughput: Dict[int, Dict] = {}
+
+    def start(self):
+        """Start the engine thread, resuming any unfinished jobs."""
+        if self._running:
+            return
+        self._running = True
+        self._thread = threading.Thread(
+            target=self._run,
+            name='secure_deletion',
+            daemon=True
+        )
+        self._thread.start()
+        logging.info(
+            f"Secure deletion engine started: workers={self.workers}, "
+            f"max_bytes_per_second={self.rate_limiter.bytes_per_second:.0f}"
+        )
+
+    def stop(self, timeout: float = 10.0):
+        """
+        Stop after the current chunk or file batch; unfinished jobs resume on next start.
+
+        Args:
+            timeout: Seconds to wait for the engine thread
+        """
+        if not self._running:
+            return
+        self._running = False
+        self._wake.set()
+        if self._thread:
+            self._thread.join(timeout=timeout)
+        logging.info("Secure deletion engine stopped")
+
+    def submit_range(self, start_date: Optional[str] = None, end_date: Optional[str] = None) -> int:
+        """
+        Queue secure deletion of events and screenshots within a date range.
+
+        Args:
+            start_date: ISO date string (YYYY-MM-DD) for range start (inclusive)
+            end_date: ISO date string (YYYY-MM-DD) for range end (inclusive)
+
+        Returns:
+            ID of the deletion job
+        """
+        job_id = self.database.create_deletion_job(start_date=start_date, end_date=end_date)
+        self._wake.set()
+        return job_id
+
+    def submit_screenshots(self, screenshot_ids: List[int]) -> int:
+        """
+        Delete screenshot records now and shred their files in the background.
+
+        Args:
+            screenshot_ids: IDs of screenshots to delete
+
+        Returns:
+            ID of the deletion job
+        """
+        job_id = self.database.queue_screenshot_deletion(screenshot_ids, self.chunk_size)
+        self._wake.set()
+        return job_id
+
+    def get_progress(self, active_only: bool = True) -> List[Dict]:
+        """
+        Get deletion job progress for display.
+
+        Args:
+            active_only: Only jobs still pending or shredding
+
+        Returns:
+            Job dictionaries from get_deletion_jobs(), plus elapsed_seconds,
+            rows_per_second and bytes_per_second measured since the job
+            started running in this session (0 if it has not)
+        """
+        jobs = self.database.get_deletion_jobs(active_only=active_only)
+        self._add_throughput(jobs)
+        return jobs
+
+    def get_job_progress(self, job_id: int) -> Optional[Dict]:
+        """
+        Get one deletion job's progress, as in get_progress().
+
+        Args:
+            job_id: Deletion job ID
+
+        Returns:
+            Job dictionary with throughput fields, or None if not found
+        """
+        job = self.database.get_deletion_job(job_id)
+        if job is not None:
+            self._add_throughput([job])
+        return job
+
+    def _add_throughput(self, jobs: List[Dict]):
+        """Add this session's elapsed time and throughput to job dictionaries."""
+        now = time.monotonic()
+        with self._stats_lock:
+            for job in jobs:
+                stats = self._throughput.get(job['id'])
+                elapsed = now - stats['started'] if stats else 0.0
+                job['elapsed_seconds'] = round(elapsed, 3)
+                job['rows_per_second'] = round(stats['rows'] / elapsed, 1) if elapsed else 0.0
+                job['bytes_per_second'] = round(stats['bytes'] / elapsed, 1) if elapsed else 0.0
+
+    def _record(self, job_id: int, rows: int = 0, bytes_written: int = 0):
+        """Add work done on a job to its session throughput counters."""
+        with self._stats_lock:
+            stats = self._throughput.setdefault(
+                job_id, {'started': time.monotonic(), 'rows': 0, 'bytes': 0}
+            )
+            stats['rows'] += rows
+            stats['bytes'] += bytes_written
+
+    def _run(self):
+        """Process jobs until stopped, sleeping while there is nothing to do."""
+        with ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix='shred') as pool:
+            while self._running:
+                self._wake.clear()
+                try:
+                    jobs = self.database.get_deletion_jobs(active_only=True)
+                except Exception as e:
+                    logging.error(f"Secure deletion engine could not list jobs: {e}", exc_info=True)
+                    jobs = []
+
+                retry = False
+                for job in jobs:
+                    if not self._running:
+                        break
+                    try:
+                        retry = self._process_job(job['id'], pool) or retry
+                    except Exception as e:
+                        self.database.fail_deletion_job(job['id'], str(e))
+
+                if not jobs:
+                    self._wake.wait(timeout=60)
+                elif retry:
+                    self._wake.wait(timeout=self.retry_seconds)
+
+    def _process_job(self, job_id: int, pool: ThreadPoolExecutor) -> bool:
+        """
+        Delete a job's remaining rows, then make one pass over its queued files.
+
+        Returns:
+            True if some files could not be shredded and stay queued
+        """
+        self._record(job_id)
+
+        while self._running:
+            deleted = self.database.delete_next_chunk(job_id, self.chunk_size)
+            if not deleted:
+                break
+            self._record(job_id, rows=deleted)
+            time.sleep(self.chunk_pause_seconds)
+
+        failed = False
+        after_id = 0
+        while self._running:
+            files = self.database.get_queued_files(job_id, limit=self.workers * 8, after_id=after_id)
+            if not files:
+                break
+            after_id = files[-1][0]
+            sizes = list(pool.map(self._shred, [file_path for _, file_path in files]))
+            done = [(queue_id, size) for (queue_id, _), size in zip(files, sizes) if size is not None]
+            failures = [queue_id for (queue_id, _), size in zip(files, sizes) if size is None]
+            shredded_bytes = sum(size for _, size in done)
+            self.database.complete_queued_files(job_id, [queue_id for queue_id, _ in done], shredded_bytes)
+            self.database.fail_queued_files(job_id, failures)
+            self._record(job_id, bytes_written=shredded_bytes)
+            failed = failed or bool(failures)
+        return failed
+
+    def _shred(self, file_path: str) -> Optional[int]:
+        """Shred one file under the rate limit; returns bytes overwritten, or None on failure."""
+        return shred_file(Path(file_path), throttle=self.rate_limiter.consume)
@@ -0,0 +1,275 @@
+"""
+Write-behind event writer for the tracking loop.
+
+Buffers activity events from TrackerLoop in a bounded queue and writes them
+to the database from a dedicated thread, grouping many events (including
+their categorization columns) into a single transaction per flush.
+"""
+
+import logging
+import queue
+import threading
+import time
+from typing import Dict, List, Optional, Tuple
+
+from syncopaid.tracker_state import ActivityEvent
+
+
+class _FlushRequest:
+    """Queue marker asking the writer to write everything received so far."""
+
+    def __init__(self):
+        self.done = threading.Event()
+
+
+class EventWriter:
+    """
+    Bounded write-behind queue with its own writer thread.
+
+    Events are flushed when the batch reaches batch_size, when flush_interval
+    seconds have passed since the oldest buffered event, or on an explicit
+    flush()/stop() (tracking pause and application shutdown).
+
+    If the queue is full, submit() falls back to a direct synchronous insert
+    rather than dropping the event. Likewise, a batch whose transaction fails
+    is retried one event at a time, so only the offending events are lost.
+    """
+
+    def __init__(
+        self,
+        database,
+        flush_interval: float = 5.0,
+        batch_size: int = 50,
+        max_queue_size: int = 1000
+    ):
+        """
+        Initialize the event writer.
+
+        Args:
+            database: Database instance providing insert_events_batch() and
+                      insert_event()
+            flush_interval: Max seconds an event waits in the buffer
+            batch_size: Number of events that triggers an immediate flush
+            max_queue_size: Queue capacity before submit() writes directly
+        """
+        self.database = database
+        self.flush_interval = flush_interval
+        self.batch_size = batch_size
+        self.max_queue_size = max_queue_size
+
+        self._queue: queue.Queue = queue.Queue(maxsize=max_queue_size)
+        self._thread: Optional[threading.Thread] = None
+        self._running = False
+        self._stats_lock = threading.Lock()
+
+        # Counters
+        self.events_submitted = 0
+        self.events_written = 0
+        self.events_failed = 0
+        self.direct_writes = 0
+        self.flush_count = 0
+        self.max_queue_depth = 0
+        self.last_flush_ms = 0.0
+        self.max_flush_ms = 0.0
+        self._total_flush_ms = 0.0
+
+    def start(self):
+        """Start the writer thread."""
+        if self._running:
+            return
+        self._running = True
+        self._thread = threading.Thread(
+            target=self._writer_loop,
+            name='event_writer',
+            daemon=True
+        )
+        self._thread.start()
+        logging.info(
+            f"Event writer started: flush_interval={self.flush_interval}s, "
+            f"batch_size={self.batch_size}, max_queue_size={self.max_queue_size}"
+        )
+
+    def submit(
+        self,
+        event: ActivityEvent,
+        matter_id: Optional[int] = None,
+        confidence: int = 0,
+        flagged_for_review: bool = False
+    ):
+        """
+        Queue an event for writing.
+
+        Args:
+            event: ActivityEvent to store
+            matter_id: Optional matter ID for categorization
+            confidence: Confidence score (0-100) for matter assignment
+            flagged_for_review: Whether event needs manual review
+        """
+        item = (event, (matter_id, confidence, flagged_for_review))
+
+        with self._stats_lock:
+            self.events_submitted += 1
+
+        if not self._running:
+            self._write_direct(item)
+            return
+
+        try:
+            self._queue.put_nowait(item)
+        except queue.Full:
+            logging.warning("Event writer queue full, writing event directly")
+            self._write_direct(item)
+            return
+
+        depth = self._queue.qsize()
+        with self._stats_lock:
+            if depth > self.max_queue_depth:
+                self.max_queue_depth = depth
+
+    def flush(self, timeout: Optional[float] = 10.0) -> bool:
+        """
+        Write all events submitted so far and wait for completion.
+
+        Args:
+            timeout: Seconds to wait for the writer (None waits forever)
+
+        Returns:
+            True if the flush completed within the timeout
+        """
+        if not self._running:
+            return True
+        request = _FlushRequest()
+        self._queue.put(request)
+        return request.done.wait(timeout)
+
+    def stop(self, timeout: float = 10.0):
+        """
+        Flush pending events and stop the writer thread.
+
+        Args:
+            timeout: Seconds to wait for the final flush
+        """
+        if not self._running:
+            return
+        self.flush(timeout)
+        self._running = False
+        self._queue.put(None)
+        if self._thread:
+            self._thread.join(timeout=timeout)
+        logging.info(f"Event writer stopped. Stats: {self.get_statistics()}")
+
+    def get_statistics(self) -> Dict:
+        """
+        Get writer counters.
+
+        Returns:
+            Dictionary with queue_depth, max_queue_depth, events_submitted,
+            events_written, events_failed, direct_writes, flush_count,
+            last_flush_ms, avg_flush_ms and max_flush_ms
+        """
+        with self._stats_lock:
+            avg_flush_ms = self._total_flush_ms / self.flush_count if self.flush_count else 0.0
+            return {
+                'queue_depth': self._queue.qsize(),
+                'max_queue_depth': self.max_queue_depth,
+                'events_submitted': self.events_submitted,
+                'events_written': self.events_written,
+                'events_failed': self.events_failed,
+                'direct_writes': self.direct_writes,
+                'flush_count': self.flush_count,
+                'last_flush_ms': round(self.last_flush_ms, 3),
+                'avg_flush_ms': round(avg_flush_ms, 3),
+                'max_flush_ms': round(self.max_flush_ms, 3),
+            }
+
+    def _writer_loop(self):
+        """Collect queued events into batches and write them."""
+        batch: List[Tuple] = []
+        deadline = None
+
+        while True:
+            timeout = None if deadline is None else max(0.0, deadline - time.monotonic())
+            try:
+                item = self._queue.get(timeout=timeout)
+            except queue.Empty:
+                # Flush window elapsed
+                self._write_batch(batch)
+                batch, deadline = [], None
+                continue
+
+            if item is None:
+                self._write_batch(batch)
+                return
+
+            if isinstance(item, _FlushRequest):
+                self._write_batch(batch)
+                batch, deadline = [], None
+                item.done.set()
+                continue
+
+            batch.append(item)
+            if deadline is None:
+                deadline = time.monotonic() + self.flush_interval
+
+            if len(batch) >= self.batch_size:
+                self._write_batch(batch)
+                batch, deadline = [], None
+
+    def _write_batch(self, batch: List[Tuple]):
+        """Write a batch of (event, categorization) items in one transaction."""
+        if not batch:
+            return
+
+        start = time.perf_counter()
+        try:
+            self.database.insert_events_batch(
+                [event for event, _ in batch],
+                [categorization for _, categorization in batch]
+            )
+        except Exception as e:
+            logging.error(
+                f"Event writer failed to write {len(batch)} events as a batch, "
+                f"retrying one at a time: {e}"
+            )
+            self._write_individually(batch)
+            return
+
+        elapsed_ms = (time.perf_counter() - start) * 1000
+        with self._stats_lock:
+            self.events_written += len(batch)
+            self.flush_count += 1
+            self.last_flush_ms = elapsed_ms
+            self.max_flush_ms = max(self.max_flush_ms, elapsed_ms)
+            self._total_flush_ms += elapsed_ms
+
+    def _write_individually(self, batch: List[Tuple]):
+        """Write a failed batch event by event so one bad row loses only itself."""
+        written = 0
+        for event, (matter_id, confidence, flagged_for_review) in batch:
+            try:
+                self.database.insert_event(
+                    event,
+                    matter_id=matter_id,
+                    confidence=confidence,
+                    flagged_for_review=flagged_for_review
+                )
+                written += 1
+            except Exception as e:
+                logging.error(f"Event writer failed to write event at {event.timestamp}: {e}")
+
+        with self._stats_lock:
+            self.events_written += written
+            self.events_failed += len(batch) - written
+
+    def _write_direct(self, item: Tuple):
+        """Write one item synchronously on the caller's thread."""
+        event, (matter_id, confidence, flagged_for_review) = item
+        self.database.insert_event(
+            event,
+            matter_id=matter_id,
+            confidence=confidence,
+            flagged_for_review=flagged_for_review
+        )
+        with self._stats_lock:
+            self.events_written += 1
+            self.direct_writes += 1
@@ -13,11 +13,18 @@ from typing import Dict, Optional
 
 from .database import Database
 from .exporter_formatting import (
+    format_event_for_export,
     format_events_for_export,
     generate_llm_prompt_data,
-    format_file_size
+    format_file_size,
+    write_json_with_streamed_list
 )
-from .exporter_analysis import calculate_app_breakdown, calculate_duration_stats
+from .exporter_analysis import build_app_breakdown
+from .database_statistics import app_durations_from_summary, totals_from_app_summary
+
+
+# Event columns needed by format_event_for_export()
+EXPORT_COLUMNS = ('timestamp', 'duration_seconds', 'end_time', 'app', 'title', 'url', 'is_idle', 'state')
 
 
 class Exporter:
@@ -26,6 +33,7 @@ class Exporter:
 
     Provides methods for:
     - Exporting date ranges to JSON
+    - Exporting only the events changed since the previous delta export
     - Formatting data for LLM processing
     - Generating summary statistics
     """
@@ -61,55 +69,120 @@ class Exporter:
         Returns:
             Dictionary containing export metadata (stats, file size, etc.)
         """
-        # Query events from database
-        events = self.database.get_events(
+        # Aggregate totals in SQL so the header can be written before the events
+        totals = self.database.get_event_totals(
             start_date=start_date,
             end_date=end_date,
             include_idle=include_idle
         )
 
-        # Calculate statistics
-        stats = calculate_duration_stats(events)
-
-        # Build export structure
-        export_data = {
+        # Build export header (events are streamed after it)
+        header = {
             "export_date": datetime.now().isoformat(),
             "date_range": {
                 "start": start_date or "all",
                 "end": end_date or "all"
             },
-            "total_events": len(events),
-            "total_duration_seconds": round(stats['total_duration'], 2),
-            "active_duration_seconds": round(stats['active_duration'], 2),
-            "idle_duration_seconds": round(stats['idle_duration'], 2),
-            "include_idle": include_idle,
-            "events": format_events_for_export(events)
+            "total_events": totals['total_events'],
+            "total_duration_seconds": round(totals['total_duration_seconds'], 2),
+            "active_duration_seconds": round(totals['active_duration_seconds'], 2),
+            "idle_duration_seconds": round(totals['idle_duration_seconds'], 2),
+            "include_idle": include_idle
         }
 
-        # Write to file
+        events = self.database.iter_events(
+            start_date=start_date,
+            end_date=end_date,
+            include_idle=include_idle,
+            columns=EXPORT_COLUMNS
+        )
+
+        # Write to file, streaming events in bounded memory
         output_path = Path(output_path)
         output_path.parent.mkdir(parents=True, exist_ok=True)
 
         with open(output_path, 'w') as f:
-            if pretty_print:
-                json.dump(export_data, f, indent=2)
-            else:
-                json.dump(export_data, f)
+            events_written = write_json_with_streamed_list(
+                f, header, "events",
+                (format_event_for_export(event) for event in events),
+                pretty_print=pretty_print
+            )
 
         # Get file size
         file_size = output_path.stat().st_size
 
         logging.info(
-            f"Exported {len(events)} events to {output_path} "
+            f"Exported {events_written} events to {output_path} "
             f"({file_size:,} bytes)"
         )
 
         return {
             "file_path": str(output_path),
             "file_size_bytes": file_size,
-            "events_exported": len(events),
-            "date_range": export_data["date_range"],
-            "total_duration_hours": round(stats['total_duration'] / 3600, 2)
+            "events_exported": events_written,
+            "date_range": header["date_range"],
+            "total_duration_hours": round(totals['total_duration_seconds'] / 3600, 2)
+        }
+
+    def export_changes_to_json(
+        self,
+        output_path: str,
+        consumer: str = "exporter",
+        limit: int = 10000,
+        pretty_print: bool = True
+    ) -> Dict:
+        """
+        Export events changed since this consumer's previous delta export.
+
+        The first call for a consumer only registers it (an empty delta);
+        pair it with a full export_to_json(). Each later call exports up to
+        limit change log entries and advances the consumer's checkpoint
+        once the file is written. Events carry their id so downstream
+        copies can be updated in place.
+
+        Args:
+            output_path: Path where JSON file will be saved
+            consumer: Change feed consumer name holding the checkpoint
+            limit: Maximum number of change log entries to export
+            pretty_print: Whether to format JSON with indentation
+
+        Returns:
+            Dictionary containing export metadata (file, counts, sequence range)
+        """
+        since_seq = self.database.register_change_consumer(consumer)
+        delta = self.database.get_event_changes(since_seq, limit=limit)
+
+        header = {
+            "export_date": datetime.now().isoformat(),
+            "since_seq": since_seq,
+            "last_seq": delta['last_seq'],
+            "deleted_ids": delta['deleted_ids']
+        }
+
+        output_path = Path(output_path)
+        output_path.parent.mkdir(parents=True, exist_ok=True)
+
+        with open(output_path, 'w') as f:
+            events_written = write_json_with_streamed_list(
+                f, header, "events",
+                ({"id": event['id'], **format_event_for_export(event)} for event in delta['events']),
+                pretty_print=pretty_print
+            )
+
+        self.database.advance_change_consumer(consumer, delta['last_seq'])
+
+        logging.info(
+            f"Exported {events_written} changed events and {len(delta['deleted_ids'])} "
+            f"deletions to {output_path}"
+        )
+
+        return {
+            "file_path": str(output_path),
+            "file_size_bytes": output_path.stat().st_size,
+            "events_exported": events_written,
+            "events_deleted": len(delta['deleted_ids']),
+            "since_seq": since_seq,
+            "last_seq": delta['last_seq']
         }
 
     def export_daily_summary(
@@ -127,8 +200,10 @@ class Exporter:
         Returns:
             Export metadata
         """
-        # Get daily summary from database
-        summary = self.database.get_daily_summary(target_date)
+        # Day totals and per-application breakdown from one rollup query
+        app_summary = self.database.get_range_summary(target_date, target_date, group_by=('app',))
+        summary = totals_from_app_summary(app_summary)
+        app_breakdown = build_app_breakdown(app_durations_from_summary(app_summary))
 
         # Get events for the day
         events = self.database.get_events(
@@ -137,9 +212,6 @@ class Exporter:
             include_idle=True
         )
 
-        # Group events by application
-        app_breakdown = calculate_app_breakdown(events)
-
         # Build summary structure
         summary_data = {
             "export_date": datetime.now().isoformat(),
@@ -173,6 +245,72 @@ class Exporter:
             "total_events": summary['total_events']
         }
 
+    def export_range_summary(
+        self,
+        output_path: str,
+        start_date: Optional[str] = None,
+        end_date: Optional[str] = None,
+        period: str = 'week'
+    ) -> Dict:
+        """
+        Export per-period totals with a per-application breakdown (e.g. weekly or monthly views).
+
+        Args:
+            output_path: Path where JSON file will be saved
+            start_date: ISO date string (YYYY-MM-DD) for range start
+            end_date: ISO date string (YYYY-MM-DD) for range end
+            period: 'day', 'week' (keyed by Monday) or 'month' (YYYY-MM)
+
+        Returns:
+            Export metadata
+        """
+        if period not in ('day', 'week', 'month'):
+            raise ValueError(f"Unsupported summary period: {period}")
+
+        # One rollup query for every period and application
+        rows = self.database.get_range_summary(start_date, end_date, group_by=(period, 'app'))
+        by_period = {}
+        for row in rows:
+            by_period.setdefault(row[period], []).append(row)
+
+        periods = []
+        for key, app_summary in by_period.items():
+            totals = totals_from_app_summary(app_summary)
+            periods.append({
+                period: key,
+                "total_events": totals['total_events'],
+                "total_duration_hours": round(totals['total_duration_seconds'] / 3600, 2),
+                "active_duration_hours": round(totals['active_duration_seconds'] / 3600, 2),
+                "idle_duration_hours": round(totals['idle_duration_seconds'] / 3600, 2),
+                "unique_applications": totals['unique_applications'],
+                "application_breakdown": build_app_breakdown(app_durations_from_summary(app_summary))
+            })
+
+        summary_data = {
+            "export_date": datetime.now().isoformat(),
+            "date_range": {
+                "start": start_date or "all",
+                "end": end_date or "all"
+            },
+            "period": period,
+            "periods": periods
+        }
+
+        output_path = Path(output_path)
+        output_path.parent.mkdir(parents=True, exist_ok=True)
+
+        with open(output_path, 'w') as f:
+            json.dump(summary_data, f, indent=2)
+
+        logging.info(f"Exported {len(periods)} {period} summaries to {output_path}")
+
+        return {
+            "file_path": str(output_path),
+            "file_size_bytes": output_path.stat().st_size,
+            "period": period,
+            "periods_exported": len(periods)
+        }
+
     def generate_llm_prompt_data(
         self,
         start_date: Optional[str] = None,
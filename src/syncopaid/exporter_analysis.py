@@ -5,7 +5,7 @@ Provides functions for calculating aggregate statistics and breakdowns
 from activity event data.
 """
 
-from typing import List, Dict
+from typing import List, Dict, Optional
 
 
 def calculate_app_breakdown(events: List[Dict]) -> List[Dict]:
@@ -21,7 +21,6 @@ def calculate_app_breakdown(events: List[Dict]) -> List[Dict]:
     """
     # Aggregate by app
     app_totals = {}
-    total_duration = 0
 
     for event in events:
         if event['is_idle']:
@@ -32,14 +31,31 @@ def calculate_app_breakdown(events: List[Dict]) -> List[Dict]:
             continue
 
         app = event['app'] or 'unknown'
-        duration = event['duration_seconds']
+        app_totals[app] = app_totals.get(app, 0) + event['duration_seconds']
 
-        app_totals[app] = app_totals.get(app, 0) + duration
-        total_duration += duration
+    return build_app_breakdown(app_totals)
+
+
+def build_app_breakdown(app_totals: Dict[Optional[str], float]) -> List[Dict]:
+    """
+    Format per-application active seconds as a breakdown with percentages.
+
+    Args:
+        app_totals: Mapping of app name to active seconds (None = unknown),
+                    e.g. from Database.get_app_durations()
+
+    Returns:
+        List of {app, duration_seconds, duration_hours, percentage} dictionaries,
+        sorted by duration (descending)
+    """
+    merged = {}
+    for app, duration in app_totals.items():
+        merged[app or 'unknown'] = merged.get(app or 'unknown', 0) + duration
+    total_duration = sum(merged.values())
 
     # Convert to list and calculate percentages
     breakdown = []
-    for app, duration in sorted(app_totals.items(), key=lambda x: x[1], reverse=True):
+    for app, duration in sorted(merged.items(), key=lambda x: x[1], reverse=True):
         percentage = (duration / total_duration * 100) if total_duration > 0 else 0
         breakdown.append({
             "app": app,
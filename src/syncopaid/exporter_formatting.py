@@ -6,7 +6,34 @@ including simplified LLM-ready JSON.
 """
 
 import json
-from typing import List, Dict, Optional
+from typing import Dict, Iterable, List, Optional, TextIO
+
+
+def format_event_for_export(event: Dict) -> Dict:
+    """
+    Format a single event for JSON export.
+
+    Args:
+        event: Event dictionary from database
+
+    Returns:
+        Formatted event dictionary without internal database IDs
+    """
+    # Derive state from is_idle if not present (backward compatibility)
+    state = event.get('state')
+    if not state:
+        state = 'Inactive' if event['is_idle'] else 'Active'
+
+    return {
+        "timestamp": event['timestamp'],
+        "duration_seconds": event['duration_seconds'],
+        "end_time": event.get('end_time'),
+        "app": event['app'],
+        "title": event['title'],
+        "url": event['url'],
+        "is_idle": event['is_idle'],
+        "state": state
+    }
 
 
 def format_events_for_export(events: List[Dict]) -> List[Dict]:
@@ -21,26 +48,57 @@ def format_events_for_export(events: List[Dict]) -> List[Dict]:
     Returns:
         List of formatted event dictionaries
     """
-    formatted = []
+    return [format_event_for_export(event) for event in events]
 
-    for event in events:
-        # Derive state from is_idle if not present (backward compatibility)
-        state = event.get('state')
-        if not state:
-            state = 'Inactive' if event['is_idle'] else 'Active'
 
-        formatted.append({
-            "timestamp": event['timestamp'],
-            "duration_seconds": event['duration_seconds'],
-            "end_time": event.get('end_time'),
-            "app": event['app'],
-            "title": event['title'],
-            "url": event['url'],
-            "is_idle": event['is_idle'],
-            "state": state
-        })
+def write_json_with_streamed_list(
+    f: TextIO,
+    header: Dict,
+    list_key: str,
+    items: Iterable[Dict],
+    pretty_print: bool = True
+) -> int:
+    """
+    Write a JSON object whose last key is a list, streaming the list items.
 
-    return formatted
+    Produces the same text as json.dump({**header, list_key: list(items)})
+    without holding the list in memory.
+
+    Args:
+        f: Text file opened for writing
+        header: Keys written before the list
+        list_key: Name of the trailing list key
+        items: Iterable of JSON-serializable list items
+        pretty_print: Whether to format JSON with indentation
+
+    Returns:
+        Number of list items written
+    """
+    indent = 2 if pretty_print else None
+    opening = json.dumps(header, indent=indent)[:-1]  # Drop closing brace
+
+    if pretty_print:
+        separator = ",\n" if header else "\n"
+        f.write(f"{opening.rstrip()}{separator}  {json.dumps(list_key)}: [")
+    else:
+        separator = ", " if header else ""
+        f.write(f"{opening}{separator}{json.dumps(list_key)}: [")
+
+    count = 0
+    for item in items:
+        if pretty_print:
+            body = json.dumps(item, indent=2).replace("\n", "\n    ")
+            f.write(("," if count else "") + "\n    " + body)
+        else:
+            f.write((", " if count else "") + json.dumps(item))
+        count += 1
+
+    if pretty_print:
+        f.write("\n  ]\n}" if count else "]\n}")
+    else:
+        f.write("]}")
+
+    return count
 
 
 def generate_llm_prompt_data(events: List[Dict]) -> str:
@@ -10,6 +10,9 @@ from typing import List, Optional
 
 from .keyword_extractor import KeywordExtractor
 
+# Change feed consumer holding the keyword refresh checkpoint
+KEYWORD_REFRESH_CONSUMER = "keyword_analyzer"
+
 
 class MatterKeywordAnalyzer:
     """
@@ -81,6 +84,51 @@ class MatterKeywordAnalyzer:
         logging.info(f"Updated {count} keywords for matter {matter_id}")
         return count
 
+    def analyze_changed_matters(
+        self,
+        consumer: str = KEYWORD_REFRESH_CONSUMER,
+        top_n: int = 10,
+        batch_size: int = 1000
+    ) -> dict:
+        """
+        Re-analyze only the matters whose events changed since the last run.
+
+        Reads the database change feed from this consumer's checkpoint,
+        re-extracts keywords for every matter that gained, changed or lost
+        an event, then advances the checkpoint. A matter left with no
+        activity loses its AI keywords.
+
+        Args:
+            consumer: Change feed consumer name holding the checkpoint
+            top_n: Maximum number of keywords to store per matter
+            batch_size: Change log entries read per batch
+
+        Returns:
+            Dict with matter_id -> keyword_count mappings
+        """
+        seq = self.db.register_change_consumer(consumer)
+        matter_ids = set()
+        while True:
+            delta = self.db.get_event_changes(seq, limit=batch_size)
+            matter_ids.update(
+                event['matter_id'] for event in delta['events'] if event.get('matter_id')
+            )
+            matter_ids.update(delta['old_matter_ids'])
+            if delta['last_seq'] == seq:
+                break
+            seq = delta['last_seq']
+
+        results = {}
+        for matter_id in sorted(matter_ids):
+            titles = self.db.get_matter_titles(matter_id)
+            if titles:
+                results[matter_id] = self.analyze_matter(matter_id, activity_titles=titles, top_n=top_n)
+            else:
+                results[matter_id] = self.db.update_matter_keywords(matter_id, [], source="ai")
+
+        self.db.advance_change_consumer(consumer, seq)
+        return results
+
     def analyze_all_matters(self) -> dict:
         """
         Analyze all active matters and update their keywords.
@@ -20,13 +20,20 @@ from syncopaid.tray import TrayIcon, sync_startup_registry
 from syncopaid.main_single_instance import release_single_instance
 from syncopaid.resource_monitor import ResourceMonitor
 from syncopaid.night_processor import NightProcessor
+from syncopaid.keyword_analyzer import KEYWORD_REFRESH_CONSUMER, MatterKeywordAnalyzer
 from syncopaid.main_app_initialization import (
     initialize_screenshot_worker,
     initialize_action_screenshot_worker,
     initialize_archiver,
     initialize_transition_detector,
     initialize_activity_matcher,
-    initialize_tracker_loop
+    initialize_event_writer,
+    initialize_deletion_engine,
+    initialize_backup_scheduler,
+    initialize_tracker_loop,
+    start_search_backfill,
+    start_screenshot_link_backfill,
+    start_shard_archiving
 )
 from syncopaid.main_app_tracking import start_tracking, pause_tracking
 from syncopaid.main_app_display import (
@@ -60,7 +67,10 @@ class SyncoPaidApp:
 
         # Initialize database
         db_path = self.config_manager.get_database_path()
-        self.database = Database(str(db_path))
+        self.database = Database(
+            str(db_path),
+            query_cache_size=self.config.database_query_cache_size
+        )
 
         # Initialize exporter
         self.exporter = Exporter(self.database)
@@ -89,6 +99,24 @@ class SyncoPaidApp:
         # Initialize activity matcher (for categorization)
         self.matcher = initialize_activity_matcher(self.database, self.config)
 
+        # Initialize write-behind event writer (batches tracker inserts)
+        self.event_writer = initialize_event_writer(self.config, self.database)
+
+        # Background secure deletion (resumes interrupted purges)
+        self.deletion_engine = initialize_deletion_engine(self.config, self.database)
+
+        # Rotating verified snapshots (if enabled)
+        self.backup_scheduler = initialize_backup_scheduler(self.config, self.database)
+
+        # Index history from before full-text search existed (no-op once done)
+        start_search_backfill(self.database)
+
+        # Link screenshots from before the event link existed (no-op once done)
+        start_screenshot_link_backfill(self.database)
+
+        # Move closed months into shard files (if enabled)
+        start_shard_archiving(self.config, self.database)
+
         # Initialize tracker loop
         self.tracker = initialize_tracker_loop(
             self.config,
@@ -98,9 +126,21 @@ class SyncoPaidApp:
             self.resource_monitor
         )
 
-        # Initialize night processor (if enabled)
+        # The keyword refresh reads the change feed; an idle consumer would
+        # keep the log from being truncated, so it only exists while enabled
+        if self.config.matter_keyword_refresh_enabled:
+            self.database.register_change_consumer(KEYWORD_REFRESH_CONSUMER)
+        else:
+            self.database.unregister_change_consumer(KEYWORD_REFRESH_CONSUMER)
+
+        # Initialize night processor (if screenshot processing or any maintenance is enabled)
         self.night_processor = None
-        if self.config.night_processing_enabled:
+        maintenance_enabled = (
+            self.config.event_compaction_enabled
+            or self.config.matter_keyword_refresh_enabled
+            or self.config.database_maintenance_enabled
+        )
+        if self.config.night_processing_enabled or maintenance_enabled:
             self.night_processor = NightProcessor(
                 start_hour=self.config.night_processing_start_hour,
                 end_hour=self.config.night_processing_end_hour,
@@ -108,8 +148,11 @@ class SyncoPaidApp:
                 batch_size=self.config.night_processing_batch_size,
                 get_idle_seconds=self._get_current_idle_seconds,
                 get_pending_count=self.database.get_pending_screenshot_count,
-                process_batch=self._process_screenshot_batch,
-                enabled=True
+                process_batch=(
+                    self._process_screenshot_batch if self.config.night_processing_enabled else None
+                ),
+                enabled=True,
+                run_maintenance=self._run_night_maintenance if maintenance_enabled else None
             )
 
         # Tracking state
@@ -142,6 +185,35 @@ class SyncoPaidApp:
             return self.screenshot_analyzer.process_batch(batch_size)
         return 0
 
+    def _run_night_maintenance(self) -> dict:
+        """Run the enabled nightly maintenance tasks for night processor."""
+        result = {}
+        if self.config.event_compaction_enabled:
+            result['compaction'] = self._compact_recent_events()
+        # Keywords are refreshed after compaction so they see its merges
+        if self.config.matter_keyword_refresh_enabled:
+            result['keywords'] = MatterKeywordAnalyzer(self.database).analyze_changed_matters(
+                consumer=KEYWORD_REFRESH_CONSUMER
+            )
+        # Storage maintenance runs after compaction so it sees the freed pages
+        if self.config.database_maintenance_enabled:
+            result['storage'] = self.database.run_maintenance(
+                allow_vacuum=self.config.database_maintenance_allow_vacuum
+            )
+        return result
+
+    def _compact_recent_events(self) -> dict:
+        """Compact the events of the last few completed days for night processor."""
+        from datetime import date, timedelta
+        yesterday = date.today() - timedelta(days=1)
+        first_day = yesterday - timedelta(days=self.config.event_compaction_days - 1)
+        return self.database.compact_events(
+            start_date=first_day.isoformat(),
+            end_date=yesterday.isoformat(),
+            gap_tolerance_seconds=self.config.event_compaction_gap_seconds,
+            flicker_seconds=self.config.event_compaction_flicker_seconds
+        )
+
     def start_tracking(self):
         """Start the tracking loop in a background thread."""
         start_tracking(self)
@@ -197,6 +269,20 @@ class SyncoPaidApp:
         if self.is_tracking:
             self.pause_tracking()
 
+        # Let the tracking thread hand over its final event, then flush it
+        if self.tracking_thread:
+            self.tracking_thread.join(timeout=5.0)
+        if self.event_writer:
+            self.event_writer.stop()
+
+        # Stop secure deletion (unfinished jobs resume on next launch)
+        if self.deletion_engine:
+            self.deletion_engine.stop()
+
+        # Stop scheduled snapshots
+        if self.backup_scheduler:
+            self.backup_scheduler.stop()
+
         # Stop night processor
         if self.night_processor:
             self.night_processor.stop()
@@ -223,6 +309,9 @@ class SyncoPaidApp:
         # Show final statistics
         self.show_statistics()
 
+        # Worker threads are stopped; release this thread's connection
+        self.database.close()
+
         # Release single-instance mutex
         release_single_instance()
 
@@ -27,7 +27,7 @@ def show_main_window_wrapper(app):
     Args:
         app: SyncoPaidApp instance with database, tray, quit_app
     """
-    show_main_window(app.database, app.tray, app.quit_app)
+    show_main_window(app.database, app.tray, app.quit_app, getattr(app, 'deletion_engine', None))
 
 
 def show_settings_dialog(app):
@@ -67,4 +67,14 @@ def show_statistics(app):
         print(f"Last event: {stats['last_event'][:19]}")
         print(f"Days tracked: {stats['date_range_days']}")
 
+    engine = getattr(app, 'deletion_engine', None)
+    if engine:
+        for job in engine.get_progress():
+            print(
+                f"Secure deletion #{job['id']} ({job['status']}): "
+                f"{job['events_deleted']} events, {job['screenshots_deleted']} screenshots deleted; "
+                f"{job['files_shredded']}/{job['files_queued']} files shredded "
+                f"({job['bytes_per_second'] / (1024 * 1024):.1f} MB/s)"
+            )
+
     print("="*60 + "\n")
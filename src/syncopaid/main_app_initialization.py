@@ -5,6 +5,8 @@ Contains component initialization logic for the main application.
 """
 
 import logging
+import threading
+import time
 
 from syncopaid.config import ConfigManager
 from syncopaid.database import Database
@@ -14,6 +16,9 @@ from syncopaid.action_screenshot_worker import ActionScreenshotWorker
 from syncopaid.action_screenshot_capture import get_action_screenshot_directory
 from syncopaid.archiver import ArchiveWorker
 from syncopaid.categorizer import ActivityMatcher
+from syncopaid.event_writer import EventWriter
+from syncopaid.deletion_engine import SecureDeletionEngine
+from syncopaid.backup_scheduler import BackupScheduler
 from syncopaid.tracker import TrackerLoop
 
 
@@ -129,6 +134,181 @@ def initialize_activity_matcher(database, config):
     return matcher
 
 
+def initialize_event_writer(config, database):
+    """
+    Initialize and start the write-behind event writer.
+
+    Args:
+        config: Application configuration object
+        database: Database instance events are written to
+
+    Returns:
+        Running EventWriter instance
+    """
+    writer = EventWriter(
+        database,
+        flush_interval=config.event_writer_flush_interval_seconds,
+        batch_size=config.event_writer_batch_size,
+        max_queue_size=config.event_writer_max_queue_size
+    )
+    writer.start()
+    return writer
+
+
+def initialize_deletion_engine(config, database):
+    """
+    Initialize and start the background secure deletion engine.
+
+    Starting the engine resumes any deletion job interrupted by a crash
+    or shutdown.
+
+    Args:
+        config: Application configuration object
+        database: Database instance holding the deletion jobs
+
+    Returns:
+        Running SecureDeletionEngine instance
+    """
+    engine = SecureDeletionEngine(
+        database,
+        workers=config.secure_delete_workers,
+        max_bytes_per_second=config.secure_delete_max_mb_per_second * 1024 * 1024,
+        chunk_size=config.secure_delete_chunk_size
+    )
+    engine.start()
+    return engine
+
+
+def initialize_backup_scheduler(config, database):
+    """
+    Initialize and start scheduled database snapshots if enabled in config.
+
+    Args:
+        config: Application configuration object
+        database: Database instance to back up
+
+    Returns:
+        Running BackupScheduler instance or None if disabled
+    """
+    if not config.backup_enabled:
+        return None
+
+    backup_dir = config.backup_directory or database.db_path.parent / "backups"
+    scheduler = BackupScheduler(
+        database,
+        backup_dir,
+        interval_hours=config.backup_interval_hours,
+        keep=config.backup_keep
+    )
+    scheduler.start()
+    return scheduler
+
+
+def start_search_backfill(database, batch_size=2000, pause_seconds=0.5):
+    """
+    Index pre-existing rows into the full-text search index in the background.
+
+    Only does work the first time a database without a search index is
+    opened; afterwards triggers keep the index current. Batches are small
+    and spaced out so tracking writes are not starved.
+
+    Args:
+        database: Database instance
+        batch_size: Row ids indexed per batch
+        pause_seconds: Delay between batches
+
+    Returns:
+        Started daemon thread, or None if there is nothing to backfill
+    """
+    if database.backfill_search_index(batch_size) == 0:
+        return None
+
+    def run_backfill():
+        try:
+            while database.backfill_search_index(batch_size) > 0:
+                time.sleep(pause_seconds)
+            logging.info("Search index backfill complete")
+        except Exception as e:
+            logging.error(f"Search index backfill failed: {e}", exc_info=True)
+
+    thread = threading.Thread(target=run_backfill, daemon=True, name="SearchBackfill")
+    thread.start()
+    logging.info("Search index backfill started")
+    return thread
+
+
+def start_screenshot_link_backfill(database, batch_size=1000, pause_seconds=0.5):
+    """
+    Link screenshots stored before screenshots.event_id existed to their events.
+
+    Only does work until the one sorted sweep over those screenshots has
+    finished (progress is stored in the database); new screenshots are
+    linked as they (or their events) are written.
+
+    Args:
+        database: Database instance
+        batch_size: Screenshots examined per batch
+        pause_seconds: Delay between batches
+
+    Returns:
+        Started daemon thread, or None if there is nothing to backfill
+    """
+    linked, more = database.link_screenshots_to_events(batch_size)
+    if not more:
+        if linked:
+            logging.info(f"Linked {linked} screenshots to their events")
+        return None
+
+    def run_backfill():
+        try:
+            total = linked
+            more = True
+            while more:
+                time.sleep(pause_seconds)
+                count, more = database.link_screenshots_to_events(batch_size)
+                total += count
+            logging.info(f"Linked {total} screenshots to their events")
+        except Exception as e:
+            logging.error(f"Screenshot link backfill failed: {e}", exc_info=True)
+
+    thread = threading.Thread(target=run_backfill, daemon=True, name="ScreenshotLinkBackfill")
+    thread.start()
+    return thread
+
+
+def start_shard_archiving(config, database, interval_hours=24):
+    """
+    Periodically move closed months into per-month shard files.
+
+    Runs once at startup and then every interval_hours, so the main
+    database only holds the current month (plus screenshots still
+    awaiting analysis).
+
+    Args:
+        config: Application configuration object
+        database: Database instance
+        interval_hours: Hours between archiving runs
+
+    Returns:
+        Started daemon thread, or None if month shards are disabled
+    """
+    if not config.database_month_shards:
+        return None
+
+    def run_archiving():
+        while True:
+            try:
+                database.archive_closed_months()
+            except Exception as e:
+                logging.error(f"Month shard archiving failed: {e}", exc_info=True)
+            time.sleep(interval_hours * 3600)
+
+    thread = threading.Thread(target=run_archiving, daemon=True, name="ShardArchiver")
+    thread.start()
+    logging.info("Month shard archiving started")
+    return thread
+
+
 def initialize_tracker_loop(config, screenshot_worker, transition_detector, database, resource_monitor=None):
     """
     Initialize the tracker loop.
@@ -153,6 +333,11 @@ def initialize_tracker_loop(config, screenshot_worker, transition_detector, data
         transition_detector=transition_detector,
         transition_callback=database.insert_transition if transition_detector else None,
         prompt_enabled=config.transition_prompt_enabled,
-        resource_monitor=resource_monitor
+        resource_monitor=resource_monitor,
+        profile=config.tracker_profiling_enabled,
+        profile_log_interval=config.tracker_profile_log_minutes * 60,
+        adaptive_polling=config.adaptive_polling_enabled,
+        max_poll_interval=config.adaptive_poll_max_seconds,
+        poll_backoff=config.adaptive_poll_backoff
     )
     return tracker
@@ -61,10 +61,10 @@ def _run_tracking_loop(app):
     Run the tracking loop and store events in database.
 
     This runs in a background thread and continuously captures
-    activity events, storing them to the database.
+    activity events, handing them to the write-behind event writer.
 
     Args:
-        app: SyncoPaidApp instance with tracker, matcher, database
+        app: SyncoPaidApp instance with tracker, matcher, event_writer
     """
     logging.info("Tracking loop thread started")
 
@@ -78,8 +78,8 @@ def _run_tracking_loop(app):
                 path=None
             )
 
-            # Store event in database with categorization
-            event_id = app.database.insert_event(
+            # Queue event for the write-behind writer with categorization
+            app.event_writer.submit(
                 event,
                 matter_id=categorization.matter_id,
                 confidence=categorization.confidence,
@@ -97,4 +97,6 @@ def _run_tracking_loop(app):
         logging.error(f"Error in tracking loop: {e}", exc_info=True)
 
     finally:
+        # Write everything buffered so far (covers pause and shutdown)
+        app.event_writer.flush()
         logging.info("Tracking loop thread ended")
@@ -61,12 +61,9 @@ def show_assignment_dialog(database, event_id, current_client, current_matter, o
     btn_frame.grid(row=2, column=0, columnspan=2, pady=15)
 
     def save():
-        with database._get_connection() as conn:
-            cursor = conn.cursor()
-            cursor.execute("""
-                UPDATE events SET client = ?, matter = ? WHERE id = ?
-            """, (client_var.get() or None, matter_var.get() or None, event_id))
-            conn.commit()
+        database.update_event_assignment(
+            event_id, client_var.get() or None, matter_var.get() or None
+        )
         on_save(client_var.get(), matter_var.get())
         root.destroy()
 
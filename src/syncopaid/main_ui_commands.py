@@ -15,7 +15,7 @@ from syncopaid.main_ui_utilities import parse_duration_to_seconds
 from syncopaid.database import format_duration
 
 
-def create_command_handler(tree, database, tray, quit_callback, root, header_label):
+def create_command_handler(tree, database, tray, quit_callback, root, header_label, get_totals=None):
     """
     Create command execution handler for the main window.
 
@@ -26,12 +26,22 @@ def create_command_handler(tree, database, tray, quit_callback, root, header_lab
         quit_callback: Callback function to quit the application
         root: Root Tk window
         header_label: Label widget for header totals
+        get_totals: Optional callable returning (total_seconds, event_count)
+                    for the whole range, used when the tree loads rows
+                    incrementally. Defaults to summing the tree's rows.
 
     Returns:
         Callable that executes commands
     """
     def update_header_totals():
         """Recalculate and update the header with current totals."""
+        if get_totals is not None:
+            total_secs, count = get_totals()
+            header_label.config(
+                text=f"Activity: {format_duration(total_secs)} ({count} events)"
+            )
+            return
+
         total_secs = 0
         count = 0
         for item in tree.get_children():
@@ -0,0 +1,159 @@
+"""
+Incremental event loading for the main window Treeview.
+
+Instead of loading every event of the range up front, the Treeview is
+filled one keyset page at a time (Database.page_events), fetching the
+next page when the user scrolls near the bottom.
+"""
+
+import logging
+import tkinter as tk
+from typing import Dict, Optional, Tuple
+
+from syncopaid.database import format_duration
+
+
+# Event columns shown in the main window
+MAIN_WINDOW_COLUMNS = ('id', 'timestamp', 'duration_seconds', 'end_time', 'app', 'title', 'client', 'matter')
+
+
+def format_event_row(event: Dict) -> Tuple:
+    """
+    Format an event as Treeview values (id, start, duration, end, app, title, client, matter).
+
+    Args:
+        event: Event dictionary with MAIN_WINDOW_COLUMNS
+
+    Returns:
+        Tuple of display values
+    """
+    # Start time - always show (required field)
+    start_ts = event['timestamp'][:19].replace('T', ' ')
+
+    # Duration - show blank if not recorded (don't calculate)
+    dur = ''
+    if event['duration_seconds'] is not None:
+        dur = format_duration(event['duration_seconds'])
+
+    # End time - show blank if not recorded (don't calculate)
+    end_ts = ''
+    if event.get('end_time'):
+        end_ts = event['end_time'][:19].replace('T', ' ')
+
+    return (
+        event['id'], start_ts, dur, end_ts,
+        event['app'] or '', event['title'] or '',
+        event.get('client') or '', event.get('matter') or ''
+    )
+
+
+class EventTreeLoader:
+    """
+    Fills a Treeview with events page by page as it is scrolled.
+
+    Install with tree.configure(yscrollcommand=loader.on_scroll) so the
+    scrollbar is updated and more rows are fetched near the bottom.
+    """
+
+    def __init__(
+        self,
+        tree,
+        database,
+        scrollbar=None,
+        start_ms: Optional[int] = None,
+        end_ms: Optional[int] = None,
+        include_idle: bool = False,
+        page_size: int = 200,
+        prefetch_fraction: float = 0.8
+    ):
+        """
+        Initialize loader.
+
+        Args:
+            tree: ttk.Treeview to fill
+            database: Database instance providing page_events()/count_events()
+            scrollbar: Scrollbar to keep in sync (optional)
+            start_ms: Epoch-ms range start (inclusive)
+            end_ms: Epoch-ms range end (exclusive)
+            include_idle: Whether to show idle events
+            page_size: Events fetched per page
+            prefetch_fraction: Fetch the next page once the bottom of the
+                               view passes this fraction of loaded rows
+        """
+        self.tree = tree
+        self.database = database
+        self.scrollbar = scrollbar
+        self.start_ms = start_ms
+        self.end_ms = end_ms
+        self.include_idle = include_idle
+        self.page_size = page_size
+        self.prefetch_fraction = prefetch_fraction
+
+        self._next_key = None
+        self._exhausted = False
+        self._pending = False
+        self.loaded_count = 0
+
+    @property
+    def has_more(self) -> bool:
+        """Whether more events remain to be fetched."""
+        return not self._exhausted
+
+    def load_next_page(self) -> int:
+        """
+        Fetch the next page (newest first) and append it to the Treeview.
+
+        Returns:
+            Number of rows added
+        """
+        self._pending = False
+        if self._exhausted:
+            return 0
+
+        events, self._next_key = self.database.page_events(
+            after_key=self._next_key,
+            limit=self.page_size,
+            start_ms=self.start_ms,
+            end_ms=self.end_ms,
+            include_idle=self.include_idle,
+            descending=True,
+            columns=MAIN_WINDOW_COLUMNS
+        )
+        self._exhausted = self._next_key is None
+
+        for event in events:
+            self.tree.insert('', tk.END, values=format_event_row(event))
+
+        self.loaded_count += len(events)
+        logging.debug(f"Main window loaded {len(events)} events ({self.loaded_count} total)")
+        return len(events)
+
+    def on_scroll(self, first, last):
+        """
+        yscrollcommand handler: sync the scrollbar and prefetch near the bottom.
+
+        Args:
+            first: Fraction of rows above the visible area
+            last: Fraction of rows up to the bottom of the visible area
+        """
+        if self.scrollbar is not None:
+            self.scrollbar.set(first, last)
+
+        if float(last) >= self.prefetch_fraction and not self._exhausted and not self._pending:
+            # Insert outside the scroll callback to avoid re-entrant updates
+            self._pending = True
+            self.tree.after_idle(self.load_next_page)
+
+    def get_totals(self) -> Tuple[float, int]:
+        """
+        Total recorded duration and event count for the whole range (not just loaded rows).
+
+        Returns:
+            (total_seconds, event_count)
+        """
+        totals = self.database.count_events(
+            start_ms=self.start_ms,
+            end_ms=self.end_ms,
+            include_idle=self.include_idle
+        )
+        return totals['total_duration_seconds'], totals['total_events']
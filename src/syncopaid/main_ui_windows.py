@@ -6,18 +6,19 @@ Contains the Main window implementation.
 
 import logging
 import threading
+import time
 import tkinter as tk
 from tkinter import ttk, messagebox
-from datetime import datetime, timedelta
 
 from syncopaid.database import format_duration
 from syncopaid.main_ui_utilities import set_window_icon
 from syncopaid.main_ui_commands import create_command_handler
 from syncopaid.main_ui_assignment_dialog import show_assignment_dialog
 from syncopaid.main_ui_import_dialog import show_import_dialog
+from syncopaid.main_ui_event_pager import EventTreeLoader
 
 
-def show_main_window(database, tray, quit_callback):
+def show_main_window(database, tray, quit_callback, deletion_engine=None):
     """
     Show main application window displaying activity from the past 24 hours.
 
@@ -25,38 +26,16 @@ def show_main_window(database, tray, quit_callback):
         database: Database instance for querying events
         tray: TrayIcon instance for stopping the tray
         quit_callback: Callback function to quit the application
+        deletion_engine: Optional SecureDeletionEngine shredding deleted
+                         screenshots in the background
     """
     logging.info("show_main_window called - starting window thread")
 
     def run_window():
         logging.info("run_window thread started")
         try:
-            # Query events from the past 24 hours
-            cutoff = datetime.now() - timedelta(hours=24)
-            cutoff_iso = cutoff.isoformat()
-
-            # Get events directly with timestamp comparison
-            events = []
-            with database._get_connection() as conn:
-                cursor = conn.cursor()
-                cursor.execute(
-                    """SELECT id, timestamp, duration_seconds, end_time, app, title, client, matter
-                       FROM events
-                       WHERE timestamp >= ? AND is_idle = 0
-                       ORDER BY timestamp DESC""",
-                    (cutoff_iso,)
-                )
-                for row in cursor.fetchall():
-                    events.append({
-                        'id': row['id'],
-                        'timestamp': row['timestamp'],
-                        'duration_seconds': row['duration_seconds'],
-                        'end_time': row['end_time'],
-                        'app': row['app'],
-                        'title': row['title'],
-                        'client': row['client'],
-                        'matter': row['matter'],
-                    })
+            # Show events from the past 24 hours (epoch ms is offset-independent)
+            cutoff_ms = int((time.time() - 24 * 3600) * 1000)
 
             # Create window
             root = tk.Tk()
@@ -112,7 +91,7 @@ def show_main_window(database, tray, quit_callback):
             def review_screenshots():
                 """Open screenshot review dialog for deletion."""
                 from syncopaid.screenshot_review_dialog import show_screenshot_review_dialog
-                show_screenshot_review_dialog(root, database)
+                show_screenshot_review_dialog(root, database, deletion_engine)
 
             view_menu.add_command(label="Review && Delete Screenshots...", command=review_screenshots)
 
@@ -157,14 +136,8 @@ def show_main_window(database, tray, quit_callback):
             header = tk.Frame(root, pady=10)
             header.pack(fill=tk.X)
 
-            # Calculate totals (only count events with duration recorded)
-            total_seconds = sum(
-                e['duration_seconds'] for e in events
-                if e['duration_seconds'] is not None
-            )
             header_label = tk.Label(
                 header,
-                text=f"Activity: {format_duration(total_seconds)} ({len(events)} events)",
                 font=('Segoe UI', 12, 'bold')
             )
             header_label.pack()
@@ -190,9 +163,17 @@ def show_main_window(database, tray, quit_callback):
             tree.column('client', width=120, minwidth=80)
             tree.column('matter', width=120, minwidth=80)
 
-            # Scrollbar
+            # Scrollbar; rows are fetched page by page as the tree is scrolled
             scrollbar = ttk.Scrollbar(root, orient=tk.VERTICAL, command=tree.yview)
-            tree.configure(yscrollcommand=scrollbar.set)
+            loader = EventTreeLoader(tree, database, scrollbar, start_ms=cutoff_ms)
+            tree.configure(yscrollcommand=loader.on_scroll)
+
+            # Totals cover the whole range, not just the loaded pages
+            # (only events with duration recorded contribute to the time)
+            total_seconds, event_count = loader.get_totals()
+            header_label.config(
+                text=f"Activity: {format_duration(total_seconds)} ({event_count} events)"
+            )
 
             # Command entry frame (at bottom)
             command_frame = tk.Frame(root, pady=10)
@@ -209,7 +190,8 @@ def show_main_window(database, tray, quit_callback):
 
             # Create command handler
             execute_command = create_command_handler(
-                tree, database, tray, quit_callback, root, header_label
+                tree, database, tray, quit_callback, root, header_label,
+                get_totals=loader.get_totals
             )
 
             # Bind Enter key to execute command
@@ -250,26 +232,8 @@ def show_main_window(database, tray, quit_callback):
             tree.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
             scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
 
-            # Insert events
-            for event in events:
-                # Start time - always show (required field)
-                start_ts = event['timestamp'][:19].replace('T', ' ')
-
-                # Duration - show blank if not recorded (don't calculate)
-                dur = ''
-                if event['duration_seconds'] is not None:
-                    dur = format_duration(event['duration_seconds'])
-
-                # End time - show blank if not recorded (don't calculate)
-                end_ts = ''
-                if event.get('end_time'):
-                    end_ts = event['end_time'][:19].replace('T', ' ')
-
-                app = event['app'] or ''
-                title = event['title'] or ''
-                client = event.get('client') or ''
-                matter = event.get('matter') or ''
-                tree.insert('', tk.END, values=(event['id'], start_ts, dur, end_ts, app, title, client, matter))
+            # Load the first page; later pages are fetched on scroll
+            loader.load_next_page()
 
             root.mainloop()
 
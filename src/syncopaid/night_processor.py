@@ -1,8 +1,8 @@
-"""Overnight screenshot processing scheduler."""
+"""Overnight screenshot processing and database maintenance scheduler."""
 import logging
 import threading
 import time
-from datetime import datetime
+from datetime import datetime, timedelta
 from typing import Callable, Optional
 
 
@@ -11,7 +11,8 @@ class NightProcessor:
     Schedules screenshot analysis during overnight idle periods.
 
     Monitors time-of-day and idle state to trigger batch processing
-    when user is not actively working.
+    when user is not actively working. An optional maintenance callback
+    runs once per night window under the same conditions.
     """
 
     def __init__(
@@ -23,7 +24,8 @@ class NightProcessor:
         get_idle_seconds: Callable[[], float] = None,
         get_pending_count: Callable[[], int] = None,
         process_batch: Callable[[int], int] = None,
-        enabled: bool = True
+        enabled: bool = True,
+        run_maintenance: Callable[[], object] = None
     ):
         self.start_hour = start_hour
         self.end_hour = end_hour
@@ -34,11 +36,13 @@ class NightProcessor:
         self._get_idle_seconds = get_idle_seconds
         self._get_pending_count = get_pending_count
         self._process_batch = process_batch
+        self._run_maintenance = run_maintenance
 
         self._running = False
         self._thread: Optional[threading.Thread] = None
         self._processing = False
         self._last_check = None
+        self._last_maintenance = None
 
     def is_night_window(self) -> bool:
         """Check if current time is within night processing window."""
@@ -82,6 +86,7 @@ class NightProcessor:
         while self._running:
             try:
                 if self.should_process() and not self._processing:
+                    self._run_maintenance_once()
                     self._run_processing()
             except Exception as e:
                 logging.error(f"Night processor error: {e}")
@@ -105,6 +110,21 @@ class NightProcessor:
         finally:
             self._processing = False
 
+    def _run_maintenance_once(self):
+        """Run the maintenance callback if it has not run this night."""
+        if self._run_maintenance is None:
+            return
+
+        # Name the night after the evening it started in
+        now = datetime.now()
+        night = now.date() if now.hour >= self.end_hour else now.date() - timedelta(days=1)
+        if self._last_maintenance == night:
+            return
+
+        self._last_maintenance = night
+        logging.info("Night processing: running database maintenance")
+        self._run_maintenance()
+
     def trigger_manual(self) -> int:
         """Manually trigger processing (for on-demand use)."""
         if self._process_batch is None:
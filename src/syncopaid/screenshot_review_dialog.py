@@ -10,21 +10,30 @@ class ScreenshotReviewDialog:
     Dialog for reviewing and deleting screenshots.
 
     Provides a list of captured screenshots with the ability to
-    select and securely delete sensitive content.
+    select and securely delete sensitive content. With a deletion engine,
+    records are removed immediately and files are shredded in the
+    background while the dialog shows the job's progress.
     """
 
-    def __init__(self, parent: tk.Tk, db: Database):
+    # Milliseconds between shredding progress updates
+    PROGRESS_POLL_MS = 500
+
+    def __init__(self, parent: tk.Tk, db: Database, deletion_engine=None):
         """
         Initialize the screenshot review dialog.
 
         Args:
             parent: Parent tkinter window
             db: Database instance for screenshot operations
+            deletion_engine: Optional running SecureDeletionEngine; without
+                             one, files are shredded on the calling thread
         """
         self.parent = parent
         self.db = db
+        self.deletion_engine = deletion_engine
         self.window: Optional[tk.Toplevel] = None
         self.screenshots = []
+        self.status_var: Optional[tk.StringVar] = None
 
     def show(self):
         """Show the screenshot review dialog."""
@@ -70,6 +79,10 @@ class ScreenshotReviewDialog:
         ttk.Button(button_frame, text="Delete Selected", command=self._delete_selected).pack(side=tk.LEFT, padx=5)
         ttk.Button(button_frame, text="Close", command=self.window.destroy).pack(side=tk.RIGHT, padx=5)
 
+        # Background shredding progress
+        self.status_var = tk.StringVar(value='')
+        ttk.Label(button_frame, textvariable=self.status_var).pack(side=tk.LEFT, padx=10)
+
         # Load initial data
         self._refresh()
 
@@ -115,7 +128,12 @@ class ScreenshotReviewDialog:
             return
 
         # Perform secure deletion
-        deleted = self.db.delete_screenshots_securely(selected_ids)
+        if self.deletion_engine:
+            job_id = self.deletion_engine.submit_screenshots(selected_ids)
+            deleted = self.db.get_deletion_job(job_id)['screenshots_deleted']
+            self._poll_deletion_progress(job_id)
+        else:
+            deleted = self.db.delete_screenshots_securely(selected_ids)
 
         # Remove from listbox (in reverse order to preserve indices)
         for i in reversed(selected_indices):
@@ -124,18 +142,40 @@ class ScreenshotReviewDialog:
 
         messagebox.showinfo("Deleted", f"Securely deleted {deleted} screenshot{'s' if deleted != 1 else ''}.", parent=self.window)
 
+    def _poll_deletion_progress(self, job_id: int):
+        """Show a background deletion job's shredding progress until it finishes."""
+        if not self.window or not self.window.winfo_exists():
+            return
+        job = self.deletion_engine.get_job_progress(job_id)
+        if job is None:
+            return
+
+        if job['status'] == 'completed':
+            self.status_var.set(f"Shredded {job['files_shredded']} file{'s' if job['files_shredded'] != 1 else ''}.")
+            return
+        if job['status'] == 'failed':
+            self.status_var.set(f"Shredding failed: {job['error']}")
+            return
+
+        self.status_var.set(
+            f"Shredding files: {job['files_shredded']}/{job['files_queued']} "
+            f"({job['bytes_per_second'] / (1024 * 1024):.1f} MB/s)"
+        )
+        self.window.after(self.PROGRESS_POLL_MS, self._poll_deletion_progress, job_id)
+
 
-def show_screenshot_review_dialog(parent: tk.Tk, db: Database) -> ScreenshotReviewDialog:
+def show_screenshot_review_dialog(parent: tk.Tk, db: Database, deletion_engine=None) -> ScreenshotReviewDialog:
     """
     Show the screenshot review dialog.
 
     Args:
         parent: Parent tkinter window
         db: Database instance
+        deletion_engine: Optional running SecureDeletionEngine for background shredding
 
     Returns:
         The dialog instance
     """
-    dialog = ScreenshotReviewDialog(parent, db)
+    dialog = ScreenshotReviewDialog(parent, db, deletion_engine)
     dialog.show()
     return dialog
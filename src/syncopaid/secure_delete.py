@@ -3,15 +3,22 @@
 import os
 from pathlib import Path
 import logging
+from typing import Callable, Optional
 
 
-def secure_delete_file(file_path: Path, passes: int = 1) -> bool:
+def secure_delete_file(
+    file_path: Path,
+    passes: int = 1,
+    throttle: Optional[Callable[[int], None]] = None
+) -> bool:
     """
     Securely delete a file by overwriting with zeros before unlinking.
 
     Args:
         file_path: Path to file to securely delete
         passes: Number of overwrite passes (default 1 for SSD optimization)
+        throttle: Called with each chunk's size before it is written; may
+                  block to rate-limit I/O
 
     Returns:
         True if file was successfully deleted, False if file didn't exist
@@ -32,6 +39,8 @@ def secure_delete_file(file_path: Path, passes: int = 1) -> bool:
                 remaining = file_size
                 while remaining > 0:
                     write_size = min(chunk_size, remaining)
+                    if throttle is not None:
+                        throttle(write_size)
                     f.write(b'\x00' * write_size)
                     remaining -= write_size
                 f.flush()
@@ -50,3 +59,36 @@ def secure_delete_file(file_path: Path, passes: int = 1) -> bool:
             return True
         except Exception:
             return False
+
+
+def shred_file(
+    file_path: Path,
+    throttle: Optional[Callable[[int], None]] = None
+) -> Optional[int]:
+    """
+    Securely delete a file, treating a file that is already gone as done.
+
+    Unlike secure_delete_file(), a file that exists but cannot be deleted
+    (for example one held open by a viewer on Windows) is reported as a
+    failure rather than as missing.
+
+    Args:
+        file_path: Path to file to securely delete
+        throttle: Passed to secure_delete_file()
+
+    Returns:
+        Bytes overwritten (0 if the file no longer existed), or None if
+        the file could not be deleted
+    """
+    file_path = Path(file_path)
+    try:
+        size = file_path.stat().st_size
+    except FileNotFoundError:
+        return 0
+    except OSError as e:
+        logging.error(f"Cannot shred {file_path}: {e}")
+        return None
+
+    if not secure_delete_file(file_path, throttle=throttle) and file_path.exists():
+        return None
+    return size
@@ -10,6 +10,10 @@ from typing import Optional, List, Dict
 from syncopaid.timeline_view_styling import get_app_color
 
 
+# Event columns needed by TimelineBlock.from_event()
+TIMELINE_COLUMNS = ('timestamp', 'end_time', 'duration_seconds', 'app', 'title', 'is_idle')
+
+
 @dataclass
 class TimelineBlock:
     """
@@ -86,10 +90,11 @@ def get_timeline_blocks(
     Returns:
         List of TimelineBlock sorted by start time
     """
-    events = db.get_events(
+    events = db.iter_events(
         start_date=date,
         end_date=date,
-        include_idle=include_idle
+        include_idle=include_idle,
+        columns=TIMELINE_COLUMNS
     )
 
     blocks = []
@@ -6,17 +6,14 @@ detects idle periods, merges consecutive identical activities, and yields
 events for storage.
 """
 
-import time
 import logging
 from typing import Generator
 
 from syncopaid.tracker_state import ActivityEvent
-from syncopaid.tracker_windows import (
-    get_active_window,
-    get_idle_seconds,
-    is_screensaver_active,
-    is_workstation_locked
-)
+from syncopaid.tracker_loop_clock import SYSTEM_CLOCK
+from syncopaid.tracker_loop_sources import SYSTEM_WINDOW_SOURCE
+from syncopaid.tracker_loop_profiler import TickProfiler
+from syncopaid.tracker_loop_polling import AdaptivePollScheduler
 from syncopaid.tracker_loop_idle import IdleTracker
 from syncopaid.tracker_loop_screenshots import ScreenshotScheduler
 from syncopaid.tracker_loop_state import StateChangeDetector
@@ -46,6 +43,16 @@ class TrackerLoop:
         transition_detector: Optional TransitionDetector for detecting task switches
         transition_callback: Callback to record transitions in database
         prompt_enabled: Whether to show prompts at transitions
+        clock: Time source for timestamps and sleeping (default: real time;
+               a VirtualClock replays traces faster than real time)
+        window_source: Window, idle, lock and input source (default: the
+                       live system; see tracker_loop_sources)
+        profile: Record per-stage tick timings (see tracker_loop_profiler)
+        profile_log_interval: Seconds between profile summary log lines
+        adaptive_polling: Back off the poll interval while locked, idle or
+                          unchanged (see tracker_loop_polling)
+        max_poll_interval: Longest backed-off poll interval (seconds)
+        poll_backoff: Factor the poll interval grows by on each quiet tick
     """
 
     def __init__(
@@ -62,20 +69,43 @@ class TrackerLoop:
         prompt_enabled: bool = True,
         interaction_threshold: float = 5.0,
         resource_monitor=None,
-        throttled_poll_interval: float = 5.0
+        throttled_poll_interval: float = 5.0,
+        clock=None,
+        window_source=None,
+        profile: bool = False,
+        profile_log_interval: float = 300.0,
+        adaptive_polling: bool = False,
+        max_poll_interval: float = 15.0,
+        poll_backoff: float = 2.0
     ):
         self.poll_interval = poll_interval
         self.running = False
+        self.clock = clock or SYSTEM_CLOCK
+        self.window_source = window_source or SYSTEM_WINDOW_SOURCE
 
         # Delegate to specialized components
-        self.idle_tracker = IdleTracker(minimum_idle_duration)
-        self.screenshot_scheduler = ScreenshotScheduler(screenshot_worker, screenshot_interval) if screenshot_worker else None
-        self.state_detector = StateChangeDetector(merge_threshold)
-        self.event_finalizer = EventFinalizer(ui_automation_worker)
-        self.interaction_detector = InteractionLevelDetector(idle_threshold, interaction_threshold)
-        self.transition_handler = TransitionHandler(transition_detector, transition_callback, prompt_enabled)
+        self.idle_tracker = IdleTracker(minimum_idle_duration, clock=self.clock)
+        self.screenshot_scheduler = (
+            ScreenshotScheduler(screenshot_worker, screenshot_interval, clock=self.clock)
+            if screenshot_worker else None
+        )
+        self.state_detector = StateChangeDetector(merge_threshold, clock=self.clock)
+        self.event_finalizer = EventFinalizer(ui_automation_worker, clock=self.clock)
+        self.interaction_detector = InteractionLevelDetector(
+            idle_threshold, interaction_threshold, clock=self.clock, window_source=self.window_source
+        )
+        self.transition_handler = TransitionHandler(
+            transition_detector, transition_callback, prompt_enabled, clock=self.clock
+        )
         self.resource_monitor = resource_monitor
         self.throttled_poll_interval = throttled_poll_interval
+        self.profiler = TickProfiler(profile_log_interval) if profile else None
+        self.poll_scheduler = (
+            AdaptivePollScheduler(
+                poll_interval, max_poll_interval, poll_backoff, idle_threshold, clock=self.clock
+            )
+            if adaptive_polling else None
+        )
 
         logging.info(
             f"TrackerLoop initialized: "
@@ -83,7 +113,8 @@ class TrackerLoop:
             f"merge_threshold={merge_threshold}s, "
             f"minimum_idle_duration={minimum_idle_duration}s, "
             f"screenshot_enabled={screenshot_worker is not None}, "
-            f"transition_detection={transition_detector is not None}"
+            f"transition_detection={transition_detector is not None}, "
+            f"adaptive_polling={adaptive_polling}"
         )
 
     def get_effective_poll_interval(self) -> float:
@@ -91,11 +122,32 @@ class TrackerLoop:
         Get current poll interval, considering throttling.
 
         Returns throttled interval (5s) if system CPU is high,
-        otherwise returns normal poll interval (1s).
+        otherwise returns normal poll interval (1s), or the adaptive
+        scheduler's current interval if adaptive polling is on.
         """
+        interval = self.poll_scheduler.interval if self.poll_scheduler else self.poll_interval
         if self.resource_monitor and self.resource_monitor.should_throttle_polling():
-            return self.throttled_poll_interval
-        return self.poll_interval
+            return max(interval, self.throttled_poll_interval)
+        return interval
+
+    def get_poll_stats(self):
+        """
+        Get adaptive polling wake-up statistics.
+
+        Returns:
+            AdaptivePollScheduler.stats() dictionary, or None if adaptive
+            polling is off
+        """
+        return self.poll_scheduler.stats() if self.poll_scheduler else None
+
+    def get_profile_stats(self):
+        """
+        Get per-stage tick timings.
+
+        Returns:
+            TickProfiler.stats() dictionary, or None if profiling is off
+        """
+        return self.profiler.stats() if self.profiler else None
 
     def start(self) -> Generator[ActivityEvent, None, None]:
         """
@@ -110,24 +162,41 @@ class TrackerLoop:
         self.running = True
         logging.info("Tracking started")
 
+        profiler = self.profiler
+
         while self.running:
             try:
+                if profiler:
+                    profiler.start_tick()
+
                 # Get current state
-                window = get_active_window()
-                idle_seconds = get_idle_seconds()
+                window = self.window_source.get_active_window()
+                if profiler:
+                    profiler.mark('window')
+                idle_seconds = self.window_source.get_idle_seconds()
                 is_idle = idle_seconds >= self.interaction_detector.idle_threshold
 
                 # Handle idle state transitions
                 resumption_event = self.idle_tracker.update_idle_state(is_idle, idle_seconds)
+                if profiler:
+                    profiler.mark('idle')
                 if resumption_event:
+                    if profiler:
+                        profiler.pause()
                     yield resumption_event
+                    if profiler:
+                        profiler.resume()
 
                 # Detect lock screen / screensaver
-                is_locked_or_screensaver = is_workstation_locked() or is_screensaver_active()
+                is_locked_or_screensaver = self.window_source.is_locked_or_screensaver()
                 self.state_detector.log_lock_transitions(is_locked_or_screensaver)
+                if profiler:
+                    profiler.mark('lock')
 
                 # Get interaction level
                 interaction_level = self.interaction_detector.get_interaction_level(idle_seconds)
+                if profiler:
+                    profiler.mark('interaction')
 
                 # Create state dict for comparison
                 state = {
@@ -144,19 +213,28 @@ class TrackerLoop:
                 # Submit screenshot if enabled and interval elapsed
                 if self.screenshot_scheduler:
                     self.screenshot_scheduler.maybe_capture_screenshot(window, idle_seconds)
+                if profiler:
+                    profiler.mark('screenshot')
 
                 # Check if state changed
-                if self.state_detector.has_state_changed(state):
+                state_changed = self.state_detector.has_state_changed(state)
+                if state_changed:
                     # Yield the completed event (if any)
                     completed_event = self.event_finalizer.finalize_event(
                         self.state_detector.current_event,
                         self.state_detector.event_start_time
                     )
                     if completed_event:
+                        if profiler:
+                            profiler.pause()
                         yield completed_event
+                        if profiler:
+                            profiler.resume()
 
                     # Start new event
                     self.state_detector.start_new_event(state)
+                if profiler:
+                    profiler.mark('state')
 
                 # Check for transitions (if enabled)
                 self.transition_handler.check_for_transitions(state, idle_seconds)
@@ -164,12 +242,20 @@ class TrackerLoop:
                 # Update previous state for next iteration
                 self.transition_handler.update_previous_state(state)
 
-                # Sleep until next poll (adaptive based on resource usage)
-                time.sleep(self.get_effective_poll_interval())
+                # Sleep until next poll (adaptive based on activity and resource usage)
+                if self.poll_scheduler:
+                    self.poll_scheduler.update(
+                        idle_seconds, is_idle, is_locked_or_screensaver, state_changed
+                    )
+                poll_interval = self.get_effective_poll_interval()
+                if profiler:
+                    profiler.mark('transitions')
+                    profiler.end_tick(poll_interval)
+                self.clock.sleep(poll_interval)
 
             except Exception as e:
                 logging.error(f"Error in tracking loop: {e}")
-                time.sleep(self.poll_interval)
+                self.clock.sleep(self.poll_interval)
 
         # Yield final event when stopped
         completed_event = self.event_finalizer.finalize_event(
@@ -0,0 +1,84 @@
+"""
+Clocks for TrackerLoop and its components.
+
+Provides:
+- SystemClock: wall-clock time and real sleeping (the default)
+- VirtualClock: simulated time that only advances when the loop sleeps,
+  so a recorded trace can be replayed deterministically and far faster
+  than real time
+
+Every component reads time through the same clock, so event timestamps,
+durations, merge windows, idle resumption cooldowns and screenshot
+intervals all follow simulated time during a replay.
+"""
+
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Callable, Optional
+
+
+class SystemClock:
+    """Real time: time.time(), datetime.now() and time.sleep()."""
+
+    def time(self) -> float:
+        """Current time as seconds since the epoch."""
+        return time.time()
+
+    def now(self) -> datetime:
+        """Current time as an aware UTC datetime."""
+        return datetime.now(timezone.utc)
+
+    def sleep(self, seconds: float) -> None:
+        """Block for the given number of seconds."""
+        time.sleep(seconds)
+
+
+# Shared default for components constructed without a clock
+SYSTEM_CLOCK = SystemClock()
+
+
+class VirtualClock:
+    """
+    Simulated time advanced only by sleep() and advance().
+
+    Attributes:
+        sleeps: Number of sleep() calls (one per tracking loop tick)
+        deadline: Optional simulated epoch time at which on_deadline is called
+    """
+
+    def __init__(self, start: datetime):
+        """
+        Initialize the clock.
+
+        Args:
+            start: Simulated start time (naive values are taken as UTC)
+        """
+        if start.tzinfo is None:
+            start = start.replace(tzinfo=timezone.utc)
+        self._start = start.astimezone(timezone.utc)
+        self._start_epoch = self._start.timestamp()
+        self.elapsed: float = 0.0
+        self.sleeps: int = 0
+        self.deadline: Optional[float] = None
+        self.on_deadline: Optional[Callable[[], None]] = None
+
+    def time(self) -> float:
+        """Simulated time as seconds since the epoch."""
+        return self._start_epoch + self.elapsed
+
+    def now(self) -> datetime:
+        """Simulated time as an aware UTC datetime."""
+        return self._start + timedelta(seconds=self.elapsed)
+
+    def sleep(self, seconds: float) -> None:
+        """Advance simulated time without blocking."""
+        self.sleeps += 1
+        self.advance(seconds)
+
+    def advance(self, seconds: float) -> None:
+        """Advance simulated time, firing on_deadline once it is reached."""
+        self.elapsed += max(0.0, seconds)
+        if self.deadline is not None and self.time() >= self.deadline:
+            self.deadline = None
+            if self.on_deadline:
+                self.on_deadline()
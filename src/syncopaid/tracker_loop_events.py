@@ -4,9 +4,11 @@ Event finalization and creation logic for TrackerLoop.
 Converts tracked state into ActivityEvent objects ready for storage.
 """
 
-from datetime import datetime, timezone
+from datetime import datetime
 from typing import Dict, Optional
 
+from syncopaid.tracker_loop_clock import SYSTEM_CLOCK
+
 from syncopaid.tracker_state import (
     ActivityEvent,
     InteractionLevel,
@@ -24,14 +26,16 @@ class EventFinalizer:
     formatted ActivityEvent with timestamps, duration, and metadata.
     """
 
-    def __init__(self, ui_automation_worker=None):
+    def __init__(self, ui_automation_worker=None, clock=None):
         """
         Initialize event finalizer.
 
         Args:
             ui_automation_worker: Optional worker for extracting UI metadata
+            clock: Time source (default: SYSTEM_CLOCK)
         """
         self.ui_automation_worker = ui_automation_worker
+        self.clock = clock or SYSTEM_CLOCK
         self.total_events: int = 0
 
     def finalize_event(
@@ -53,7 +57,7 @@ class EventFinalizer:
             return None
 
         # Calculate duration and end time
-        end_time = datetime.now(timezone.utc)
+        end_time = self.clock.now()
         duration = (end_time - event_start_time).total_seconds()
 
         # Skip events that are too short (< 0.5 seconds)
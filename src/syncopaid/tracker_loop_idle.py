@@ -6,10 +6,11 @@ when the user returns to active usage.
 """
 
 import logging
-from datetime import datetime, timezone
+from datetime import datetime
 from typing import Optional
 
 from syncopaid.tracker_state import IdleResumptionEvent
+from syncopaid.tracker_loop_clock import SYSTEM_CLOCK
 
 
 class IdleTracker:
@@ -20,15 +21,17 @@ class IdleTracker:
     generating IdleResumptionEvent objects when appropriate.
     """
 
-    def __init__(self, minimum_idle_duration: float = 180.0):
+    def __init__(self, minimum_idle_duration: float = 180.0, clock=None):
         """
         Initialize idle tracker.
 
         Args:
             minimum_idle_duration: Minimum idle time (seconds) before generating
                                    a resumption event
+            clock: Time source (default: SYSTEM_CLOCK)
         """
         self.minimum_idle_duration = minimum_idle_duration
+        self.clock = clock or SYSTEM_CLOCK
         self.was_idle: bool = False
         self.last_idle_resumption_time: Optional[datetime] = None
         self._peak_idle_seconds: float = 0.0
@@ -54,7 +57,7 @@ class IdleTracker:
                 # Check if enough time passed since last resumption (prevent duplicates)
                 should_emit = True
                 if self.last_idle_resumption_time:
-                    time_since_last = (datetime.now(timezone.utc) - self.last_idle_resumption_time).total_seconds()
+                    time_since_last = (self.clock.now() - self.last_idle_resumption_time).total_seconds()
                     # Only emit if at least 60 seconds passed since last resumption
                     # This prevents rapid fire events from flaky idle detection
                     if time_since_last < 60.0:
@@ -64,11 +67,11 @@ class IdleTracker:
                 if should_emit:
                     idle_minutes = self._peak_idle_seconds / 60.0
                     resumption_event = IdleResumptionEvent(
-                        resumption_timestamp=datetime.now(timezone.utc).isoformat(),
+                        resumption_timestamp=self.clock.now().isoformat(),
                         idle_duration=self._peak_idle_seconds
                     )
                     logging.info(f"User resumed after {idle_minutes:.1f} minutes idle")
-                    self.last_idle_resumption_time = datetime.now(timezone.utc)
+                    self.last_idle_resumption_time = self.clock.now()
 
                 # Always reset peak after processing transition
                 self._peak_idle_seconds = 0.0
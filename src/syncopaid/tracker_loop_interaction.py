@@ -5,10 +5,9 @@ Determines the level of user interaction based on keyboard and mouse activity.
 """
 
 import logging
-from datetime import datetime, timezone
-
 from syncopaid.tracker_state import InteractionLevel
-from syncopaid.tracker_windows import get_keyboard_activity, get_mouse_activity
+from syncopaid.tracker_loop_clock import SYSTEM_CLOCK
+from syncopaid.tracker_loop_sources import SYSTEM_WINDOW_SOURCE
 
 
 class InteractionLevelDetector:
@@ -22,16 +21,26 @@ class InteractionLevelDetector:
     - PASSIVE: Reading or passive reference (no activity)
     """
 
-    def __init__(self, idle_threshold: float = 180.0, interaction_threshold: float = 5.0):
+    def __init__(
+        self,
+        idle_threshold: float = 180.0,
+        interaction_threshold: float = 5.0,
+        clock=None,
+        window_source=None
+    ):
         """
         Initialize the interaction level detector.
 
         Args:
             idle_threshold: Seconds before marking as idle
             interaction_threshold: Seconds to consider activity as "recent"
+            clock: Time source (default: SYSTEM_CLOCK)
+            window_source: Keyboard/mouse activity source (default: SYSTEM_WINDOW_SOURCE)
         """
         self.idle_threshold = idle_threshold
         self.interaction_threshold = interaction_threshold
+        self.clock = clock or SYSTEM_CLOCK
+        self.window_source = window_source or SYSTEM_WINDOW_SOURCE
         self.last_typing_time = None
         self.last_click_time = None
 
@@ -53,19 +62,19 @@ class InteractionLevelDetector:
         Returns:
             InteractionLevel enum value
         """
-        now = datetime.now(timezone.utc)
+        now = self.clock.now()
 
         # Check if globally idle first
         if idle_seconds >= self.idle_threshold:
             return InteractionLevel.IDLE
 
         # Check for current keyboard activity
-        if get_keyboard_activity():
+        if self.window_source.get_keyboard_activity():
             self.last_typing_time = now
             return InteractionLevel.TYPING
 
         # Check for current mouse activity
-        if get_mouse_activity():
+        if self.window_source.get_mouse_activity():
             self.last_click_time = now
             return InteractionLevel.CLICKING
 
@@ -0,0 +1,119 @@
+"""
+Adaptive poll interval scheduling for TrackerLoop.
+
+While nothing happens (workstation locked, user idle, or the same window
+with no input) the loop does not need to sample every second.
+AdaptivePollScheduler multiplies the interval by a backoff factor on each
+quiet tick and drops back to the base interval as soon as input or a state
+change is seen.
+
+Limits keep tracking accurate:
+- While the user is active (not yet idle, not locked) the interval is
+  capped at active_max_interval, so a window switch made without a
+  preceding input sample is picked up within a few seconds
+- Before the user counts as idle, a sleep never runs past the moment
+  idle time reaches idle_threshold, so idle periods start on time
+- During lock/idle the interval is capped at max_interval, which bounds
+  how late a return to the desk is noticed
+"""
+
+from typing import Dict, Optional
+
+from syncopaid.tracker_loop_clock import SYSTEM_CLOCK
+
+
+class AdaptivePollScheduler:
+    """
+    Chooses the sleep before the next tracking tick.
+
+    Attributes:
+        interval: Interval chosen by the latest update() (seconds)
+        wakeups: Ticks observed
+        backed_off: Ticks followed by a sleep longer than the base interval
+    """
+
+    def __init__(
+        self,
+        base_interval: float = 1.0,
+        max_interval: float = 15.0,
+        backoff: float = 2.0,
+        idle_threshold: float = 180.0,
+        active_max_interval: float = 5.0,
+        clock=None
+    ):
+        """
+        Initialize the scheduler.
+
+        Args:
+            base_interval: Interval used whenever there is activity (seconds)
+            max_interval: Longest interval while idle or locked (seconds)
+            backoff: Factor the interval grows by on each quiet tick
+            idle_threshold: Seconds without input before the user is idle
+            active_max_interval: Longest interval while the user is not idle
+            clock: Time source (default: SYSTEM_CLOCK)
+        """
+        self.base_interval = base_interval
+        self.max_interval = max(max_interval, base_interval)
+        self.backoff = max(backoff, 1.0)
+        self.idle_threshold = idle_threshold
+        self.active_max_interval = max(min(active_max_interval, self.max_interval), base_interval)
+        self.clock = clock or SYSTEM_CLOCK
+        self.interval = base_interval
+        self.wakeups = 0
+        self.backed_off = 0
+        self._first_wakeup: Optional[float] = None
+        self._last_wakeup: Optional[float] = None
+
+    def update(self, idle_seconds: float, is_idle: bool, is_locked: bool, state_changed: bool) -> float:
+        """
+        Record a tick and choose the interval before the next one.
+
+        Args:
+            idle_seconds: Seconds since the last user input
+            is_idle: Whether the user counts as idle
+            is_locked: Whether the workstation is locked or the screensaver is on
+            state_changed: Whether this tick started a new event
+
+        Returns:
+            Seconds to sleep
+        """
+        now = self.clock.time()
+        since_last = now - self._last_wakeup if self._last_wakeup is not None else None
+        if self._first_wakeup is None:
+            self._first_wakeup = now
+        self._last_wakeup = now
+        self.wakeups += 1
+
+        # Input since the previous tick resets idle time below the time slept
+        input_seen = since_last is None or idle_seconds < since_last
+
+        if input_seen or state_changed:
+            interval = self.base_interval
+        elif is_idle or is_locked:
+            interval = min(self.interval * self.backoff, self.max_interval)
+        else:
+            interval = min(self.interval * self.backoff, self.active_max_interval)
+            # Wake up when idle_threshold is reached, not after it
+            interval = min(interval, max(self.base_interval, self.idle_threshold - idle_seconds))
+
+        self.interval = interval
+        if interval > self.base_interval:
+            self.backed_off += 1
+        return interval
+
+    def stats(self) -> Dict[str, float]:
+        """
+        Get wake-up statistics.
+
+        Returns:
+            Dictionary with wakeups, backed_off, hours (since the first
+            tick), wakeups_per_hour and interval (the current one)
+        """
+        hours = (self._last_wakeup - self._first_wakeup) / 3600.0 if self._first_wakeup is not None else 0.0
+        return {
+            'wakeups': self.wakeups,
+            'backed_off': self.backed_off,
+            'hours': round(hours, 3),
+            'wakeups_per_hour': round(self.wakeups / hours, 1) if hours else 0.0,
+            'interval': self.interval,
+        }
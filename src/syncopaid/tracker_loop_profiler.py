@@ -0,0 +1,202 @@
+"""
+Per-tick stage profiling for TrackerLoop.
+
+Records how long each stage of a tracking tick takes (window lookup, idle
+time, lock checks, interaction level, screenshot scheduling, state
+detection, transitions) into fixed-size latency histograms, counts ticks
+whose work overran the poll interval, and logs a percentile summary
+periodically.
+
+Timings use time.perf_counter() (monotonic wall time), also when the loop
+runs on a VirtualClock, so a trace replay measures real loop cost. Time
+spent by the consumer of yielded events is excluded.
+
+Profiling is off by default; TrackerLoop then only tests for a missing
+profiler at each stage boundary.
+"""
+
+import logging
+import time
+from bisect import bisect_left
+from typing import Dict, Optional
+
+# Tick stages in loop order; 'tick' is the whole tick
+PROFILE_STAGES = (
+    'window', 'idle', 'lock', 'interaction', 'screenshot', 'state', 'transitions', 'tick'
+)
+
+# Histogram bucket upper bounds: 1 us to ~67 s, four buckets per doubling
+# (each bucket spans about 19%, which bounds the percentile error)
+_BUCKET_BOUNDS = tuple(1e-6 * 2 ** (i / 4) for i in range(105))
+
+
+class LatencyHistogram:
+    """
+    Fixed-size latency histogram with log-spaced buckets.
+
+    Memory does not grow with the number of samples. Percentiles are
+    reported as the upper bound of the bucket they fall in (never above
+    the largest sample).
+    """
+
+    __slots__ = ('counts', 'count', 'total', 'max')
+
+    def __init__(self):
+        self.counts = [0] * (len(_BUCKET_BOUNDS) + 1)
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def record(self, seconds: float) -> None:
+        """Add one sample."""
+        self.counts[bisect_left(_BUCKET_BOUNDS, seconds)] += 1
+        self.count += 1
+        self.total += seconds
+        if seconds > self.max:
+            self.max = seconds
+
+    def percentile(self, fraction: float) -> float:
+        """
+        Get a percentile in seconds.
+
+        Args:
+            fraction: Percentile as a fraction, e.g. 0.95
+
+        Returns:
+            Seconds (0.0 without samples)
+        """
+        if not self.count:
+            return 0.0
+        rank = max(1, round(fraction * self.count))
+        seen = 0
+        for index, bucket_count in enumerate(self.counts):
+            seen += bucket_count
+            if seen >= rank:
+                bound = _BUCKET_BOUNDS[index] if index < len(_BUCKET_BOUNDS) else self.max
+                return min(bound, self.max)
+        return self.max
+
+    def summary(self) -> Dict[str, float]:
+        """Get count, mean, p50, p95, p99 and max (times in milliseconds)."""
+        return {
+            'count': self.count,
+            'mean_ms': round(self.total * 1000 / self.count, 4) if self.count else 0.0,
+            'p50_ms': round(self.percentile(0.50) * 1000, 4),
+            'p95_ms': round(self.percentile(0.95) * 1000, 4),
+            'p99_ms': round(self.percentile(0.99) * 1000, 4),
+            'max_ms': round(self.max * 1000, 4),
+        }
+
+
+class TickProfiler:
+    """
+    Lap timer over the stages of a tracking tick.
+
+    Usage per tick: start_tick(), then mark(stage) after each stage (the
+    lap since the previous mark is recorded), pause()/resume() around
+    yields, and end_tick(budget) before sleeping.
+
+    Attributes:
+        ticks: Completed ticks
+        overruns: Ticks whose work took longer than their poll interval
+    """
+
+    def __init__(self, log_interval: float = 300.0):
+        """
+        Initialize the profiler.
+
+        Args:
+            log_interval: Seconds between summary log lines; 0 disables them
+        """
+        self.log_interval = log_interval
+        self.histograms = {stage: LatencyHistogram() for stage in PROFILE_STAGES}
+        self.ticks = 0
+        self.overruns = 0
+        self.last_overrun: Optional[Dict[str, float]] = None
+        self._tick_start = 0.0
+        self._last = 0.0
+        self._paused_at = 0.0
+        self._laps = {}
+        self._last_log = time.perf_counter()
+
+    def start_tick(self) -> None:
+        """Begin timing a tick."""
+        self._tick_start = self._last = time.perf_counter()
+        self._laps = {}
+
+    def mark(self, stage: str) -> None:
+        """Record the time since the previous mark (or tick start) for a stage."""
+        now = time.perf_counter()
+        lap = now - self._last
+        self._last = now
+        self._laps[stage] = self._laps.get(stage, 0.0) + lap
+
+    def pause(self) -> None:
+        """Stop the tick's clock while the loop yields to its consumer."""
+        self._paused_at = time.perf_counter()
+
+    def resume(self) -> None:
+        """Restart the tick's clock, excluding the time since pause()."""
+        paused = time.perf_counter() - self._paused_at
+        self._last += paused
+        self._tick_start += paused
+
+    def end_tick(self, budget: float) -> None:
+        """
+        Finish a tick: record stage laps and the tick total.
+
+        Args:
+            budget: Poll interval the tick's work should fit in (seconds)
+        """
+        now = time.perf_counter()
+        total = now - self._tick_start
+        for stage, lap in self._laps.items():
+            self.histograms[stage].record(lap)
+        self.histograms['tick'].record(total)
+        self.ticks += 1
+
+        if total > budget:
+            self.overruns += 1
+            self.last_overrun = {stage: round(lap * 1000, 3) for stage, lap in self._laps.items()}
+            logging.debug(
+                f"Tracker tick overran poll interval: {total * 1000:.1f}ms > {budget * 1000:.0f}ms "
+                f"({', '.join(f'{stage}={ms}ms' for stage, ms in self.last_overrun.items())})"
+            )
+
+        if self.log_interval and now - self._last_log >= self.log_interval:
+            self._last_log = now
+            self.log_summary()
+
+    def stats(self) -> Dict:
+        """
+        Get profiling statistics.
+
+        Returns:
+            Dictionary with ticks, overruns, last_overrun (per-stage ms of the
+            latest overrunning tick) and stages (PROFILE_STAGES entry ->
+            LatencyHistogram.summary())
+        """
+        return {
+            'ticks': self.ticks,
+            'overruns': self.overruns,
+            'last_overrun': self.last_overrun,
+            'stages': {stage: histogram.summary() for stage, histogram in self.histograms.items()},
+        }
+
+    def log_summary(self) -> None:
+        """Log one line of per-stage p50/p95/p99 timings."""
+        stages = self.stats()['stages']
+        logging.info(
+            f"Tracker tick profile ({self.ticks} ticks, {self.overruns} overruns), p50/p95/p99 ms: "
+            + ", ".join(
+                f"{stage}={s['p50_ms']:.2f}/{s['p95_ms']:.2f}/{s['p99_ms']:.2f}"
+                for stage, s in stages.items() if s['count']
+            )
+        )
+
+    def reset(self) -> None:
+        """Discard all recorded timings."""
+        self.histograms = {stage: LatencyHistogram() for stage in PROFILE_STAGES}
+        self.ticks = 0
+        self.overruns = 0
+        self.last_overrun = None
@@ -4,12 +4,12 @@ Screenshot timing and submission logic for TrackerLoop.
 Manages periodic screenshot capture based on configured intervals.
 """
 
-import time
 import logging
 from typing import Dict, Optional
 
 from syncopaid.tracker_screenshot import submit_screenshot
 from syncopaid.tracker_windows import WINDOWS_APIS_AVAILABLE
+from syncopaid.tracker_loop_clock import SYSTEM_CLOCK
 
 
 class ScreenshotScheduler:
@@ -20,17 +20,20 @@ class ScreenshotScheduler:
     to the screenshot worker for processing.
     """
 
-    def __init__(self, screenshot_worker, screenshot_interval: float = 10.0):
+    def __init__(self, screenshot_worker, screenshot_interval: float = 10.0, clock=None):
         """
         Initialize screenshot scheduler.
 
         Args:
             screenshot_worker: The worker that processes screenshot submissions
             screenshot_interval: Seconds between screenshot attempts
+            clock: Time source (default: SYSTEM_CLOCK)
         """
         self.screenshot_worker = screenshot_worker
         self.screenshot_interval = screenshot_interval
+        self.clock = clock or SYSTEM_CLOCK
         self.last_screenshot_time: float = 0
+        self.screenshots_scheduled: int = 0
         self._diagnostic_logged: bool = False
 
     def maybe_capture_screenshot(self, window: Dict, idle_seconds: float) -> None:
@@ -44,7 +47,7 @@ class ScreenshotScheduler:
         if not self.screenshot_worker:
             return
 
-        current_time = time.time()
+        current_time = self.clock.time()
         time_since_last = current_time - self.last_screenshot_time
 
         # Log diagnostic info on first screenshot attempt
@@ -59,3 +62,4 @@ class ScreenshotScheduler:
             logging.debug(f"Triggering screenshot capture (elapsed: {time_since_last:.1f}s)")
             submit_screenshot(self.screenshot_worker, window, idle_seconds)
             self.last_screenshot_time = current_time
+            self.screenshots_scheduled += 1
@@ -0,0 +1,44 @@
+"""
+Window and input sources for TrackerLoop.
+
+A window source supplies everything the loop samples each tick:
+
+- get_active_window(): dict with app, title, pid, url and cmdline
+- get_idle_seconds(): seconds since the last keyboard/mouse input
+- is_locked_or_screensaver(): workstation locked or screensaver running
+- get_keyboard_activity() / get_mouse_activity(): input seen this tick
+
+SystemWindowSource reads the live system through tracker_windows (mock
+data off Windows). tracker_replay.TraceWindowSource replays a recorded
+trace instead.
+"""
+
+from syncopaid import tracker_windows
+
+
+class SystemWindowSource:
+    """Window source backed by the platform APIs in tracker_windows."""
+
+    def get_active_window(self) -> dict:
+        """Get the foreground window's app, title, pid, url and cmdline."""
+        return tracker_windows.get_active_window()
+
+    def get_idle_seconds(self) -> float:
+        """Get seconds since the last user input."""
+        return tracker_windows.get_idle_seconds()
+
+    def is_locked_or_screensaver(self) -> bool:
+        """Check whether the workstation is locked or the screensaver is active."""
+        return tracker_windows.is_workstation_locked() or tracker_windows.is_screensaver_active()
+
+    def get_keyboard_activity(self) -> bool:
+        """Check for keyboard input since the last call."""
+        return tracker_windows.get_keyboard_activity()
+
+    def get_mouse_activity(self) -> bool:
+        """Check for mouse input since the last call."""
+        return tracker_windows.get_mouse_activity()
+
+
+# Shared default for loops constructed without a window source
+SYSTEM_WINDOW_SOURCE = SystemWindowSource()
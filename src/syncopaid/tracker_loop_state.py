@@ -6,9 +6,11 @@ brief window switches into a single continuous event.
 """
 
 import logging
-from datetime import datetime, timezone
+from datetime import datetime
 from typing import Dict, Optional
 
+from syncopaid.tracker_loop_clock import SYSTEM_CLOCK
+
 
 class StateChangeDetector:
     """
@@ -19,14 +21,16 @@ class StateChangeDetector:
     to avoid creating events for brief accidental window switches.
     """
 
-    def __init__(self, merge_threshold: float = 2.0):
+    def __init__(self, merge_threshold: float = 2.0, clock=None):
         """
         Initialize state change detector.
 
         Args:
             merge_threshold: Max gap (seconds) to merge identical windows
+            clock: Time source (default: SYSTEM_CLOCK)
         """
         self.merge_threshold = merge_threshold
+        self.clock = clock or SYSTEM_CLOCK
         self.current_event: Optional[Dict] = None
         self.event_start_time: Optional[datetime] = None
         self.merged_events: int = 0
@@ -56,7 +60,7 @@ class StateChangeDetector:
 
             # State changed - check if within merge threshold
             if self.event_start_time:
-                elapsed = (datetime.now(timezone.utc) - self.event_start_time).total_seconds()
+                elapsed = (self.clock.now() - self.event_start_time).total_seconds()
                 if elapsed < self.merge_threshold:
                     # Too quick - might be accidental switch, merge it
                     self.merged_events += 1
@@ -74,7 +78,7 @@ class StateChangeDetector:
             state: The state dictionary for the new event
         """
         self.current_event = state
-        self.event_start_time = datetime.now(timezone.utc)
+        self.event_start_time = self.clock.now()
 
     def log_lock_transitions(self, is_locked_or_screensaver: bool) -> None:
         """
@@ -4,10 +4,10 @@ Transition detection and prompt handling for tracking loop.
 Detects task transitions and optionally shows prompts to users.
 """
 
-import time
 import logging
 import threading
-from datetime import datetime, timezone
+
+from syncopaid.tracker_loop_clock import SYSTEM_CLOCK
 
 
 class TransitionHandler:
@@ -28,7 +28,8 @@ class TransitionHandler:
         self,
         transition_detector=None,
         transition_callback=None,
-        prompt_enabled: bool = True
+        prompt_enabled: bool = True,
+        clock=None
     ):
         """
         Initialize the transition handler.
@@ -37,8 +38,10 @@ class TransitionHandler:
             transition_detector: Optional TransitionDetector for detecting task switches
             transition_callback: Callback to record transitions in database
             prompt_enabled: Whether to show prompts at transitions
+            clock: Time source (default: SYSTEM_CLOCK)
         """
         self.transition_detector = transition_detector
+        self.clock = clock or SYSTEM_CLOCK
         self.transition_callback = transition_callback
         self.prompt_enabled = prompt_enabled
         self.prev_window_state = None
@@ -95,14 +98,14 @@ class TransitionHandler:
         # Record transition in database
         if self.transition_callback:
             self.transition_callback(
-                timestamp=datetime.now(timezone.utc).isoformat(),
+                timestamp=self.clock.now().isoformat(),
                 transition_type=transition_type,
                 context={"app": state['app'], "title": state['title']},
                 user_response=None
             )
 
         # Check cooldown before showing prompt
-        current_time = time.time()
+        current_time = self.clock.time()
         if current_time - self._last_prompt_time < self.PROMPT_COOLDOWN:
             logging.debug(f"Skipping prompt due to cooldown")
             return
@@ -149,7 +152,7 @@ class TransitionHandler:
 
         # User is active and no popup showing - show the popup
         self._show_prompt_async(state, transition_type)
-        self._last_prompt_time = time.time()
+        self._last_prompt_time = self.clock.time()
 
     def _show_prompt_async(self, state: dict, transition_type: str):
         """
@@ -174,7 +177,7 @@ class TransitionHandler:
                 # Update transition record with user response
                 if response and self.transition_callback:
                     self.transition_callback(
-                        timestamp=datetime.now(timezone.utc).isoformat(),
+                        timestamp=self.clock.now().isoformat(),
                         transition_type=transition_type,
                         context={"app": state['app'], "title": state['title']},
                         user_response=response
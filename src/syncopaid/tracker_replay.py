@@ -0,0 +1,443 @@
+"""
+Deterministic trace recording and replay for TrackerLoop.
+
+Provides:
+- A JSONL trace format of window, idle, lock and input samples
+- TraceWindowSource: a window source that plays a trace back against a
+  VirtualClock
+- Recording a trace from the live system
+- A deterministic synthetic workday generator for benchmarks
+- replay_trace(): drives the full TrackerLoop (state detection, merging,
+  idle resumption, transitions, screenshot scheduling, finalization)
+  over a trace at thousands of times real speed and reports events per
+  simulated day and loop overhead per tick
+
+Trace format: the first line is a header
+    {"trace": "syncopaid", "version": 1, "start": "2025-12-09T08:00:00+00:00"}
+and each following line a sample at t seconds after start, e.g.
+    {"t": 0, "app": "WINWORD.EXE", "title": "Contract.docx - Word", "idle": 0}
+Samples are sparse: a key a sample omits keeps its previous value, except
+idle, which keeps growing by the time elapsed since it was last given (no
+input). Keys: app, title, url, cmdline, pid, idle, locked, keyboard, mouse.
+
+Run with:
+    python -m syncopaid.tracker_replay replay TRACE [--poll SECONDS] [--profile] [--adaptive]
+    python -m syncopaid.tracker_replay synthetic [--days N] [--seed N] [--out TRACE] [--profile] [--adaptive]
+    python -m syncopaid.tracker_replay record TRACE [--seconds N]
+"""
+
+import json
+import logging
+import random
+import time
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from syncopaid.tracker_loop import TrackerLoop
+from syncopaid.tracker_loop_clock import SYSTEM_CLOCK, VirtualClock
+from syncopaid.tracker_loop_sources import SYSTEM_WINDOW_SOURCE
+from syncopaid.tracker_state import ActivityEvent, IdleResumptionEvent
+
+TRACE_VERSION = 1
+
+# Sample keys and the value they hold before the first sample sets them
+TRACE_DEFAULTS = {
+    'app': None,
+    'title': None,
+    'url': None,
+    'cmdline': None,
+    'pid': None,
+    'idle': 0.0,
+    'locked': False,
+    'keyboard': False,
+    'mouse': False,
+}
+
+# Window keys of a sample, as returned by get_active_window()
+_WINDOW_KEYS = ('app', 'title', 'pid', 'url', 'cmdline')
+
+SECONDS_PER_DAY = 86400.0
+
+
+def read_trace(path) -> Tuple[datetime, List[Dict]]:
+    """
+    Read a JSONL trace.
+
+    Args:
+        path: Trace file path
+
+    Returns:
+        (start, samples) with samples in file order
+
+    Raises:
+        ValueError: If the file has no valid trace header
+    """
+    with open(path, 'r', encoding='utf-8') as f:
+        header = json.loads(f.readline() or 'null')
+        if not isinstance(header, dict) or header.get('trace') != 'syncopaid':
+            raise ValueError(f"Not a SyncoPaid trace: {path}")
+        if header.get('version', 1) > TRACE_VERSION:
+            raise ValueError(f"Unsupported trace version {header['version']}: {path}")
+        samples = [json.loads(line) for line in f if line.strip()]
+    return datetime.fromisoformat(header['start']), samples
+
+
+def write_trace(path, start: datetime, samples: List[Dict]) -> None:
+    """
+    Write samples as a JSONL trace.
+
+    Args:
+        path: Trace file path
+        start: Time that t=0 corresponds to
+        samples: Sample dictionaries with a t key
+    """
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write(json.dumps({'trace': 'syncopaid', 'version': TRACE_VERSION, 'start': start.isoformat()}) + "\n")
+        for sample in samples:
+            f.write(json.dumps(sample, separators=(',', ':')) + "\n")
+
+
+class TraceWindowSource:
+    """
+    Window source that plays back trace samples against a clock.
+
+    The sample in effect is the last one whose t has been reached. The
+    clock must not move backwards.
+    """
+
+    def __init__(self, samples: List[Dict], clock: VirtualClock):
+        """
+        Initialize the source.
+
+        Args:
+            samples: Trace samples (sparse, as read by read_trace)
+            clock: Clock whose elapsed time selects the sample
+        """
+        self.clock = clock
+        self._times = []
+        self._states = []
+        state = dict(TRACE_DEFAULTS, idle_t=0.0)
+        for sample in sorted(samples, key=lambda s: s['t']):
+            state = dict(state)
+            state.update({key: value for key, value in sample.items() if key in TRACE_DEFAULTS})
+            if 'idle' in sample:
+                state['idle_t'] = sample['t']
+            state['window'] = {key: state[key] for key in _WINDOW_KEYS}
+            self._times.append(float(sample['t']))
+            self._states.append(state)
+        self._index = -1
+        self.end = self._times[-1] if self._times else 0.0
+
+    def _current(self) -> Dict:
+        """The sample state in effect at the clock's elapsed time."""
+        elapsed = self.clock.elapsed
+        while self._index + 1 < len(self._times) and self._times[self._index + 1] <= elapsed:
+            self._index += 1
+        if self._index < 0:
+            return dict(TRACE_DEFAULTS, idle_t=0.0, window={key: None for key in _WINDOW_KEYS})
+        return self._states[self._index]
+
+    def get_active_window(self) -> dict:
+        """Get the traced foreground window."""
+        return dict(self._current()['window'])
+
+    def get_idle_seconds(self) -> float:
+        """Get idle time: the last traced value plus the time since it was traced."""
+        state = self._current()
+        return float(state['idle']) + max(0.0, self.clock.elapsed - state['idle_t'])
+
+    def is_locked_or_screensaver(self) -> bool:
+        """Get the traced lock/screensaver state."""
+        return bool(self._current()['locked'])
+
+    def get_keyboard_activity(self) -> bool:
+        """Get the traced keyboard activity."""
+        return bool(self._current()['keyboard'])
+
+    def get_mouse_activity(self) -> bool:
+        """Get the traced mouse activity."""
+        return bool(self._current()['mouse'])
+
+
+def record_trace(path, seconds: float, poll_interval: float = 1.0, window_source=None, clock=None) -> int:
+    """
+    Record the live window source to a trace file.
+
+    Only changes are written: window or lock changes, input flags, and
+    idle time that dropped (input happened) since it was last written.
+
+    Args:
+        path: Trace file to write
+        seconds: How long to record
+        poll_interval: Seconds between samples
+        window_source: Source to record (default: the live system)
+        clock: Time source (default: real time)
+
+    Returns:
+        Number of samples written
+    """
+    source = window_source or SYSTEM_WINDOW_SOURCE
+    clock = clock or SYSTEM_CLOCK
+    start = clock.now()
+    start_time = clock.time()
+    samples = []
+    last = dict(TRACE_DEFAULTS)
+    idle_base = (0.0, 0.0)  # (idle, t) last written
+
+    while True:
+        t = round(clock.time() - start_time, 3)
+        if t > seconds:
+            break
+
+        window = source.get_active_window()
+        current = {key: window.get(key) for key in _WINDOW_KEYS}
+        current['locked'] = source.is_locked_or_screensaver()
+        current['keyboard'] = source.get_keyboard_activity()
+        current['mouse'] = source.get_mouse_activity()
+
+        sample = {'t': t}
+        sample.update({key: value for key, value in current.items() if value != last[key]})
+        idle = source.get_idle_seconds()
+        if not samples or idle < idle_base[0] + (t - idle_base[1]) - poll_interval:
+            sample['idle'] = round(idle, 3)
+            idle_base = (idle, t)
+
+        if len(sample) > 1:
+            samples.append(sample)
+            last.update(current)
+        clock.sleep(poll_interval)
+
+    write_trace(path, start, samples)
+    return len(samples)
+
+
+def generate_synthetic_trace(days: int = 1, seed: int = 0, start: Optional[datetime] = None) -> Tuple[datetime, List[Dict]]:
+    """
+    Generate a deterministic synthetic trace of office workdays.
+
+    Each day: locked overnight, work from about 08:30 to 17:30 switching
+    between a pool of documents, browser tabs and mail every few seconds
+    to several minutes, short idle breaks, and a locked lunch hour.
+
+    Args:
+        days: Number of days
+        seed: Random seed (same seed, same trace)
+        start: Midnight of the first day (default: 2025-12-08 UTC, a Monday)
+
+    Returns:
+        (start, samples)
+    """
+    rng = random.Random(seed)
+    start = start or datetime(2025, 12, 8, tzinfo=timezone.utc)
+    windows = (
+        [('WINWORD.EXE', f"{client}-{doc}.docx - Word", None)
+         for client in ('Smith', 'Jones', 'Acme', 'Baker') for doc in ('Contract', 'Memo', 'Brief')]
+        + [('chrome.exe', f"{site} - Google Chrome", f"https://{site.lower()}.example.com")
+           for site in ('Westlaw', 'CanLII', 'Court Portal', 'News')]
+        + [('OUTLOOK.EXE', f"RE: {client} matter - Outlook", None)
+           for client in ('Smith', 'Jones', 'Acme')]
+        + [('EXCEL.EXE', "Time Sheet.xlsx - Excel", None)]
+    )
+
+    samples = [{'t': 0.0, 'app': 'LogonUI.exe', 'title': 'Windows Default Lock Screen', 'locked': True, 'idle': 0.0}]
+    for day in range(days):
+        day_start = day * SECONDS_PER_DAY
+        t = day_start + 8.5 * 3600 + rng.uniform(-900, 900)
+        lunch = day_start + 12 * 3600 + rng.uniform(-600, 600)
+        lunch_taken = False
+        end = day_start + 17.5 * 3600 + rng.uniform(-900, 900)
+
+        while t < end:
+            if not lunch_taken and t >= lunch:
+                samples.append({'t': round(t, 1), 'app': 'LogonUI.exe', 'title': 'Windows Default Lock Screen',
+                                'url': None, 'locked': True})
+                t += rng.uniform(2400, 3600)
+                lunch_taken = True
+
+            app, title, url = rng.choice(windows)
+            samples.append({'t': round(t, 1), 'app': app, 'title': title, 'url': url,
+                            'locked': False, 'idle': 0.0, 'keyboard': rng.random() < 0.4})
+            # Mostly short focus spells, sometimes long drafting with steady input
+            spell = rng.expovariate(1 / 45) if rng.random() < 0.8 else rng.uniform(300, 1800)
+            for offset in range(60, int(spell), 60):
+                samples.append({'t': round(t + offset, 1), 'idle': 0.0})
+            t += spell
+
+            if rng.random() < 0.03:
+                # Stepped away: no input, so traced idle time keeps growing
+                t += rng.uniform(240, 1200)
+
+        samples.append({'t': round(end, 1), 'app': 'LogonUI.exe', 'title': 'Windows Default Lock Screen',
+                        'url': None, 'locked': True, 'keyboard': False})
+
+    return start, samples
+
+
+class ReplayScreenshotWorker:
+    """Screenshot worker stand-in that counts submissions during replay."""
+
+    def __init__(self):
+        self.submitted = 0
+
+    def submit(self, **kwargs):
+        """Count a screenshot submission."""
+        self.submitted += 1
+
+
+@dataclass
+class ReplayResult:
+    """Outcome of a trace replay."""
+    events: List[ActivityEvent] = field(default_factory=list)
+    resumptions: List[IdleResumptionEvent] = field(default_factory=list)
+    ticks: int = 0
+    simulated_seconds: float = 0.0
+    wall_seconds: float = 0.0
+    screenshots_scheduled: int = 0
+    merged_events: int = 0
+    profile: Optional[Dict] = None
+
+    @property
+    def events_per_day(self) -> float:
+        """Activity events per simulated day."""
+        return len(self.events) * SECONDS_PER_DAY / self.simulated_seconds if self.simulated_seconds else 0.0
+
+    @property
+    def wakeups_per_hour(self) -> float:
+        """Loop ticks per simulated hour."""
+        return self.ticks * 3600.0 / self.simulated_seconds if self.simulated_seconds else 0.0
+
+    @property
+    def tick_overhead_us(self) -> float:
+        """Mean wall-clock cost of one loop tick in microseconds."""
+        return self.wall_seconds * 1e6 / self.ticks if self.ticks else 0.0
+
+    @property
+    def speedup(self) -> float:
+        """Simulated seconds per wall-clock second."""
+        return self.simulated_seconds / self.wall_seconds if self.wall_seconds else 0.0
+
+
+def replay_trace(
+    start: datetime,
+    samples: List[Dict],
+    poll_interval: float = 1.0,
+    duration: Optional[float] = None,
+    **tracker_options
+) -> ReplayResult:
+    """
+    Run TrackerLoop over a trace on a virtual clock.
+
+    The result depends only on the trace and options, never on the
+    machine or the time the replay runs.
+
+    Args:
+        start: Time that t=0 corresponds to
+        samples: Trace samples
+        poll_interval: Loop poll interval in simulated seconds
+        duration: Simulated seconds to run (default: until the last sample)
+        **tracker_options: Further TrackerLoop arguments (idle_threshold,
+                           merge_threshold, screenshot_interval, ...);
+                           prompts are disabled unless prompt_enabled is given
+
+    Returns:
+        ReplayResult
+    """
+    clock = VirtualClock(start)
+    source = TraceWindowSource(samples, clock)
+    screenshot_worker = tracker_options.pop('screenshot_worker', None) or ReplayScreenshotWorker()
+    tracker_options.setdefault('prompt_enabled', False)
+
+    tracker = TrackerLoop(
+        poll_interval=poll_interval,
+        screenshot_worker=screenshot_worker,
+        clock=clock,
+        window_source=source,
+        **tracker_options
+    )
+    clock.deadline = clock.time() + (duration if duration is not None else source.end + poll_interval)
+    clock.on_deadline = tracker.stop
+
+    result = ReplayResult()
+    wall_start = time.perf_counter()
+    for item in tracker.start():
+        if isinstance(item, IdleResumptionEvent):
+            result.resumptions.append(item)
+        else:
+            result.events.append(item)
+    result.wall_seconds = time.perf_counter() - wall_start
+
+    result.ticks = clock.sleeps
+    result.simulated_seconds = clock.elapsed
+    result.screenshots_scheduled = tracker.screenshot_scheduler.screenshots_scheduled
+    result.merged_events = tracker.state_detector.merged_events
+    result.profile = tracker.get_profile_stats()
+    return result
+
+
+def print_replay_report(result: ReplayResult):
+    """Print a replay summary."""
+    days = result.simulated_seconds / SECONDS_PER_DAY
+    active = sum(e.duration_seconds for e in result.events if e.state == 'Active')
+    print(f"Simulated:        {result.simulated_seconds:,.0f}s ({days:.2f} days) in {result.wall_seconds:.2f}s "
+          f"({result.speedup:,.0f}x real time)")
+    print(f"Ticks:            {result.ticks:,} ({result.tick_overhead_us:.1f} us/tick, "
+          f"{result.wakeups_per_hour:,.0f} wakeups/hour)")
+    print(f"Events:           {len(result.events):,} ({result.events_per_day:,.1f}/day), "
+          f"{result.merged_events:,} brief switches merged")
+    print(f"Active time:      {active / 3600:.2f}h")
+    print(f"Idle resumptions: {len(result.resumptions):,}")
+    print(f"Screenshots:      {result.screenshots_scheduled:,} scheduled")
+
+    if result.profile:
+        print(f"\n{'Stage':<12} {'p50 us':>9} {'p95 us':>9} {'p99 us':>9} {'max us':>9}")
+        print("-" * 52)
+        for stage, s in result.profile['stages'].items():
+            print(f"{stage:<12} {s['p50_ms'] * 1000:>9.1f} {s['p95_ms'] * 1000:>9.1f} "
+                  f"{s['p99_ms'] * 1000:>9.1f} {s['max_ms'] * 1000:>9.1f}")
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Record, generate and replay TrackerLoop traces")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    replay_parser = commands.add_parser("replay", help="Replay a trace through TrackerLoop")
+    replay_parser.add_argument("trace", type=Path)
+    replay_parser.add_argument("--poll", type=float, default=1.0, help="Poll interval (simulated seconds)")
+    replay_parser.add_argument("--profile", action="store_true", help="Report per-stage tick timings")
+    replay_parser.add_argument("--adaptive", action="store_true", help="Back off polling while locked/idle/unchanged")
+
+    synthetic_parser = commands.add_parser("synthetic", help="Generate (and replay) a synthetic trace")
+    synthetic_parser.add_argument("--days", type=int, default=5)
+    synthetic_parser.add_argument("--seed", type=int, default=0)
+    synthetic_parser.add_argument("--out", type=Path, help="Write the trace instead of replaying it")
+    synthetic_parser.add_argument("--poll", type=float, default=1.0, help="Poll interval (simulated seconds)")
+    synthetic_parser.add_argument("--profile", action="store_true", help="Report per-stage tick timings")
+    synthetic_parser.add_argument("--adaptive", action="store_true", help="Back off polling while locked/idle/unchanged")
+
+    record_parser = commands.add_parser("record", help="Record the live system to a trace")
+    record_parser.add_argument("trace", type=Path)
+    record_parser.add_argument("--seconds", type=float, default=60.0)
+
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.WARNING)
+
+    if args.command == "record":
+        count = record_trace(args.trace, args.seconds)
+        print(f"Recorded {count} samples to {args.trace}")
+    elif args.command == "synthetic" and args.out:
+        trace_start, trace_samples = generate_synthetic_trace(args.days, args.seed)
+        write_trace(args.out, trace_start, trace_samples)
+        print(f"Wrote {len(trace_samples)} samples ({args.days} days) to {args.out}")
+    else:
+        if args.command == "synthetic":
+            trace_start, trace_samples = generate_synthetic_trace(args.days, args.seed)
+        else:
+            trace_start, trace_samples = read_trace(args.trace)
+        print_replay_report(replay_trace(
+            trace_start, trace_samples, poll_interval=args.poll,
+            profile=args.profile, profile_log_interval=0, adaptive_polling=args.adaptive
+        ))
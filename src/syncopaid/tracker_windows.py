@@ -36,6 +36,10 @@ from .tracker_windows_cmdline import (
     get_process_cmdline,
     redact_sensitive_paths,
 )
+from .tracker_windows_process import (
+    ProcessInfoCache,
+    get_process_info,
+)
 from .tracker_windows_lock import (
     is_screensaver_active,
     is_workstation_locked,
@@ -49,6 +53,8 @@ __all__ = [
     'get_mouse_activity',
     'get_process_cmdline',
     'redact_sensitive_paths',
+    'ProcessInfoCache',
+    'get_process_info',
     'is_screensaver_active',
     'is_workstation_locked',
 ]
@@ -10,6 +10,7 @@ import logging
 from typing import Dict, Optional
 
 from syncopaid.context_extraction import extract_context
+from syncopaid.tracker_windows_process import get_process_info
 
 # Platform detection
 WINDOWS = sys.platform == 'win32'
@@ -68,18 +69,8 @@ def get_active_window(config=None) -> Dict[str, Optional[str]]:
         if pid < 0:
             pid = pid & 0xFFFFFFFF  # Convert to unsigned
 
-        process_name = None
-        cmdline = None
-
-        try:
-            process = psutil.Process(pid)
-            process_name = process.name()
-            raw_cmdline = process.cmdline()
-            if raw_cmdline:
-                from .tracker_windows_cmdline import redact_sensitive_paths
-                cmdline = redact_sensitive_paths(raw_cmdline)
-        except (psutil.NoSuchProcess, psutil.AccessDenied, ValueError):
-            pass
+        # Name and redacted cmdline, cached per (pid, create_time)
+        process_name, cmdline = get_process_info(pid)
 
         # Extract URL if browser and config enabled
         url = None
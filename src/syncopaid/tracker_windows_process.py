@@ -0,0 +1,188 @@
+"""
+Process metadata cache for active window sampling.
+
+The foreground process rarely changes between polls, but reading its name
+and command line (and redacting the command line) on every tick costs
+several system calls. ProcessInfoCache keeps name and redacted cmdline per
+process, keyed by (pid, create_time) so a PID reused by a new process is
+never served the old process's metadata. Entries are evicted least
+recently used first.
+
+psutil is optional: without it lookups return (None, None). The process
+factory can be replaced, so the cache also runs (and is tested) off
+Windows.
+
+Run the benchmark with: python -m syncopaid.tracker_windows_process
+"""
+
+import logging
+import os
+import time
+from collections import OrderedDict
+from typing import Callable, Dict, Optional, Tuple
+
+from .tracker_windows_cmdline import redact_sensitive_paths
+
+try:
+    import psutil
+    PSUTIL_AVAILABLE = True
+    _PROCESS_ERRORS = (psutil.NoSuchProcess, psutil.AccessDenied, ValueError)
+except ImportError:
+    psutil = None
+    PSUTIL_AVAILABLE = False
+    _PROCESS_ERRORS = (ValueError,)
+
+# Distinct foreground processes remembered; a working session rarely
+# cycles through more than a few dozen
+DEFAULT_MAX_ENTRIES = 64
+
+
+class ProcessInfoCache:
+    """
+    LRU cache of process name and redacted cmdline keyed by (pid, create_time).
+
+    Attributes:
+        hits: Lookups served from the cache
+        misses: Lookups that read the process
+        evictions: Entries dropped to stay within max_entries
+    """
+
+    def __init__(self, max_entries: int = DEFAULT_MAX_ENTRIES, process_factory: Optional[Callable] = None):
+        """
+        Initialize the cache.
+
+        Args:
+            max_entries: Processes kept before evicting the least recently used
+            process_factory: Callable taking a pid and returning an object with
+                             create_time(), name() and cmdline() (default:
+                             psutil.Process)
+        """
+        self.max_entries = max(1, max_entries)
+        self._process_factory = process_factory or (psutil.Process if PSUTIL_AVAILABLE else None)
+        self._entries: "OrderedDict[Tuple[int, float], Tuple[Optional[str], Optional[tuple]]]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def lookup(self, pid: int) -> Tuple[Optional[str], Optional[list]]:
+        """
+        Get a process's name and redacted command line.
+
+        Args:
+            pid: Process ID
+
+        Returns:
+            (name, cmdline); cmdline is None when empty or not readable, and
+            both are None when the process is gone or cannot be opened
+        """
+        if self._process_factory is None:
+            return None, None
+
+        try:
+            process = self._process_factory(pid)
+            key = (pid, process.create_time())
+        except _PROCESS_ERRORS:
+            return None, None
+
+        entry = self._entries.get(key)
+        if entry is not None:
+            self._entries.move_to_end(key)
+            self.hits += 1
+        else:
+            self.misses += 1
+            try:
+                name = process.name()
+            except _PROCESS_ERRORS:
+                return None, None
+            try:
+                raw_cmdline = process.cmdline()
+            except _PROCESS_ERRORS:
+                raw_cmdline = None
+            cmdline = tuple(redact_sensitive_paths(raw_cmdline)) if raw_cmdline else None
+
+            entry = (name, cmdline)
+            self._entries[key] = entry
+            if len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+        name, cmdline = entry
+        return name, list(cmdline) if cmdline is not None else None
+
+    def clear(self) -> None:
+        """Drop all cached entries."""
+        self._entries.clear()
+
+    def stats(self) -> Dict[str, int]:
+        """Get entries, hits, misses and evictions."""
+        return {
+            'entries': len(self._entries),
+            'hits': self.hits,
+            'misses': self.misses,
+            'evictions': self.evictions,
+        }
+
+
+# Shared cache used by get_active_window()
+PROCESS_INFO_CACHE = ProcessInfoCache()
+
+
+def get_process_info(pid: int) -> Tuple[Optional[str], Optional[list]]:
+    """Get a process's name and redacted cmdline through the shared cache."""
+    return PROCESS_INFO_CACHE.lookup(pid)
+
+
+def _uncached_process_info(pid: int) -> Tuple[Optional[str], Optional[list]]:
+    """Read name and redacted cmdline directly, as every poll did before caching."""
+    try:
+        process = psutil.Process(pid)
+        name = process.name()
+        raw_cmdline = process.cmdline()
+        return name, redact_sensitive_paths(raw_cmdline) if raw_cmdline else None
+    except _PROCESS_ERRORS:
+        return None, None
+
+
+def benchmark_process_lookup(iterations: int = 5000, pid: Optional[int] = None) -> Dict[str, float]:
+    """
+    Compare per-tick process metadata lookups with and without the cache.
+
+    Args:
+        iterations: Lookups timed per variant
+        pid: Process to look up (default: this process)
+
+    Returns:
+        Dictionary with uncached_us, cached_us (mean microseconds per lookup)
+        and speedup
+
+    Raises:
+        RuntimeError: If psutil is not installed
+    """
+    if not PSUTIL_AVAILABLE:
+        raise RuntimeError("psutil is required for the process lookup benchmark")
+    pid = pid if pid is not None else os.getpid()
+    cache = ProcessInfoCache()
+
+    start = time.perf_counter()
+    for _ in range(iterations):
+        _uncached_process_info(pid)
+    uncached = (time.perf_counter() - start) / iterations
+
+    start = time.perf_counter()
+    for _ in range(iterations):
+        cache.lookup(pid)
+    cached = (time.perf_counter() - start) / iterations
+
+    return {
+        'uncached_us': round(uncached * 1e6, 2),
+        'cached_us': round(cached * 1e6, 2),
+        'speedup': round(uncached / cached, 1) if cached else 0.0,
+    }
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.WARNING)
+    result = benchmark_process_lookup()
+    print(f"Uncached lookup: {result['uncached_us']:>8.2f} us/tick")
+    print(f"Cached lookup:   {result['cached_us']:>8.2f} us/tick")
+    print(f"Speedup:         {result['speedup']:>8.1f}x")
@@ -0,0 +1,54 @@
+"""Tests for adaptive poll interval scheduling."""
+from datetime import datetime, timezone
+
+from syncopaid.tracker_loop_clock import VirtualClock
+from syncopaid.tracker_loop_polling import AdaptivePollScheduler
+from syncopaid.tracker_replay import generate_synthetic_trace, replay_trace
+
+START = datetime(2025, 12, 9, 9, 0, tzinfo=timezone.utc)
+
+
+def run_ticks(scheduler, clock, idle_at_start, ticks, is_idle=False, is_locked=False):
+    """Feed a scheduler ticks with no input; return the chosen intervals."""
+    intervals = []
+    for _ in range(ticks):
+        idle = idle_at_start + clock.elapsed
+        interval = scheduler.update(idle, is_idle, is_locked, state_changed=False)
+        intervals.append(interval)
+        clock.sleep(interval)
+    return intervals
+
+
+def test_backs_off_while_locked_and_snaps_back_on_input():
+    clock = VirtualClock(START)
+    scheduler = AdaptivePollScheduler(1.0, max_interval=15.0, clock=clock)
+    assert run_ticks(scheduler, clock, 0.0, 6, is_locked=True) == [1.0, 2.0, 4.0, 8.0, 15.0, 15.0]
+
+    # Input during the last sleep: idle time is below the time slept
+    assert scheduler.update(3.0, False, False, state_changed=False) == 1.0
+    assert scheduler.stats()['backed_off'] == 5
+
+
+def test_active_backoff_stops_at_idle_threshold():
+    clock = VirtualClock(START)
+    scheduler = AdaptivePollScheduler(1.0, idle_threshold=20.0, active_max_interval=5.0, clock=clock)
+    intervals = run_ticks(scheduler, clock, 0.0, 7)
+    assert intervals == [1.0, 2.0, 4.0, 5.0, 5.0, 3.0, 1.0]
+    assert clock.elapsed == 21.0
+    assert scheduler.update(5.0, False, False, state_changed=True) == 1.0
+
+
+def test_replay_wakes_less_and_keeps_idle_onsets():
+    start, samples = generate_synthetic_trace(days=2, seed=1, start=START)
+    fixed = replay_trace(start, samples)
+    adaptive = replay_trace(start, samples, adaptive_polling=True)
+
+    assert fixed.wakeups_per_hour == 3600
+    assert adaptive.wakeups_per_hour < fixed.wakeups_per_hour / 5
+
+    # Idle periods begin when idle_threshold is reached, as with fixed polling
+    fixed_idle = [datetime.fromisoformat(e.timestamp) for e in fixed.events if e.state == 'Inactive']
+    adaptive_idle = [datetime.fromisoformat(e.timestamp) for e in adaptive.events if e.state == 'Inactive']
+    assert len(adaptive_idle) == len(fixed_idle) > 0
+    for ours, theirs in zip(adaptive_idle, fixed_idle):
+        assert abs((ours - theirs).total_seconds()) <= 1.0
@@ -0,0 +1,157 @@
+"""Tests for the change-data-capture feed and its consumers."""
+import json
+
+import pytest
+
+from syncopaid.database import Database
+from syncopaid.exporter import Exporter
+from syncopaid.keyword_analyzer import MatterKeywordAnalyzer
+from syncopaid.tracker_state import ActivityEvent
+
+
+def _event(timestamp, title="Smith-Contract.docx - Word"):
+    return ActivityEvent(
+        timestamp=timestamp,
+        duration_seconds=60.0,
+        app="WINWORD.EXE",
+        title=title,
+        is_idle=False
+    )
+
+
+@pytest.fixture
+def db(tmp_path):
+    return Database(str(tmp_path / "test.db"))
+
+
+@pytest.fixture
+def consumed_db(db):
+    db.register_change_consumer("test")
+    return db
+
+
+def test_nothing_is_logged_without_consumers(db):
+    db.insert_event(_event("2025-12-09T09:00:00+00:00"))
+    assert db.changes_since(0) == []
+
+
+def test_writes_are_logged_in_order(consumed_db):
+    db = consumed_db
+    event_id = db.insert_event(_event("2025-12-09T09:00:00+00:00"))
+    db.update_event_categorization(event_id, matter_id=3)
+    db.delete_events_by_ids([event_id])
+
+    changes = db.changes_since(0, tables=['events'])
+    assert [(c['row_id'], c['operation'], c['old_matter_id']) for c in changes] == [
+        (event_id, 'insert', None), (event_id, 'update', None), (event_id, 'delete', 3)
+    ]
+    assert changes[-1]['seq'] == db.get_latest_change_seq()
+    assert db.changes_since(changes[0]['seq'], limit=1)[0]['seq'] == changes[1]['seq']
+
+
+def test_event_changes_coalesce_per_row(consumed_db):
+    db = consumed_db
+    ids = [db.insert_event(_event(f"2025-12-09T09:0{i}:00+00:00")) for i in range(3)]
+    db.update_event_categorization(ids[0], matter_id=3)
+    db.delete_events_by_ids([ids[1]])
+
+    delta = db.get_event_changes(0)
+    assert [e['id'] for e in delta['events']] == [ids[0], ids[2]]
+    assert delta['events'][0]['matter_id'] == 3
+    assert delta['deleted_ids'] == [ids[1]]
+    assert delta['old_matter_ids'] == []
+    assert delta['last_seq'] == db.get_latest_change_seq()
+
+
+def test_truncation_waits_for_every_consumer(db):
+    assert db.register_change_consumer("a") == 0
+    db.insert_event(_event("2025-12-09T09:00:00+00:00"))
+    db.advance_change_consumer("a", db.get_latest_change_seq())
+    db.register_change_consumer("b")
+    db.insert_event(_event("2025-12-09T09:01:00+00:00"))
+    db.insert_event(_event("2025-12-09T09:02:00+00:00"))
+    latest = db.get_latest_change_seq()
+
+    db.advance_change_consumer("a", latest)
+    assert len(db.changes_since(0)) == 2
+
+    db.advance_change_consumer("b", latest - 1)
+    assert [c['seq'] for c in db.changes_since(0)] == [latest]
+
+    db.unregister_change_consumer("b")
+    assert db.changes_since(0) == []
+    assert db.get_change_checkpoint("a") == latest
+
+    with pytest.raises(ValueError):
+        db.advance_change_consumer("missing", latest)
+
+
+def test_archiving_is_not_reported_as_deletion(consumed_db):
+    db = consumed_db
+    db.insert_event(_event("2025-11-03T09:00:00+00:00"))
+    seq = db.get_latest_change_seq()
+    db.archive_month("2025-11")
+    assert db.get_event_changes(seq)['deleted_ids'] == []
+
+
+def test_exporter_writes_only_deltas(db, tmp_path):
+    exporter = Exporter(db)
+    db.insert_event(_event("2025-12-09T09:00:00+00:00"))
+
+    first = exporter.export_changes_to_json(str(tmp_path / "d1.json"))
+    assert first['events_exported'] == 0
+
+    new_id = db.insert_event(_event("2025-12-09T09:01:00+00:00", title="Inbox - Outlook"))
+    second = exporter.export_changes_to_json(str(tmp_path / "d2.json"))
+    data = json.loads((tmp_path / "d2.json").read_text())
+    assert second['events_exported'] == 1
+    assert [(e['id'], e['title']) for e in data['events']] == [(new_id, "Inbox - Outlook")]
+    assert data['since_seq'] == first['last_seq']
+
+    assert exporter.export_changes_to_json(str(tmp_path / "d3.json"))['events_exported'] == 0
+
+
+def test_keyword_analyzer_processes_changed_matters(db):
+    matter_id = 42
+    analyzer = MatterKeywordAnalyzer(db)
+    assert analyzer.analyze_changed_matters() == {}
+
+    event_id = db.insert_event(_event("2025-12-09T09:00:00+00:00", title="Smith Contract Draft - Word"))
+    db.update_event_categorization(event_id, matter_id=matter_id)
+
+    results = analyzer.analyze_changed_matters()
+    assert list(results) == [matter_id]
+    assert results[matter_id] > 0
+    assert analyzer.analyze_changed_matters() == {}
+
+
+def test_keyword_analyzer_revisits_matters_events_left(db):
+    analyzer = MatterKeywordAnalyzer(db)
+    analyzer.analyze_changed_matters()
+    moved, deleted = (
+        db.insert_event(_event(f"2025-12-09T09:0{i}:00+00:00", title="Smith Contract Draft - Word"))
+        for i in range(2)
+    )
+    db.update_event_categorization(moved, matter_id=1)
+    db.update_event_categorization(deleted, matter_id=2)
+    analyzer.analyze_changed_matters()
+    assert db.get_matter_keywords(1) and db.get_matter_keywords(2)
+
+    db.update_event_categorization(moved, matter_id=3)
+    db.delete_events_by_ids([deleted])
+
+    assert sorted(analyzer.analyze_changed_matters()) == [1, 2, 3]
+    assert db.get_matter_keywords(1) == db.get_matter_keywords(2) == []
+    assert db.get_matter_keywords(3)
+
+
+def test_events_archived_after_logging_are_not_reported_deleted(consumed_db):
+    db = consumed_db
+    seq = db.get_latest_change_seq()
+    event_id = db.insert_event(_event("2025-01-15T09:00:00+00:00"))
+    db.archive_month("2025-01")
+
+    delta = db.get_event_changes(seq)
+    assert [e['id'] for e in delta['events']] == [event_id]
+    assert delta['events'][0]['title'] == "Smith-Contract.docx - Word"
+    assert delta['deleted_ids'] == []
@@ -162,3 +162,31 @@ class TestGracefulErrorHandling:
         long_title = "A" * 10000
         result = extract_context("chrome.exe", long_title)
         assert result is None or isinstance(result, str)
+
+
+class TestExtractionMemo:
+    """Test per-app dispatch and memoization of extract_context."""
+
+    def setup_method(self):
+        from syncopaid.context_extraction import clear_extraction_cache
+        clear_extraction_cache()
+
+    def test_repeated_title_is_served_from_memo(self):
+        from syncopaid.context_extraction import get_extraction_cache_stats
+        for _ in range(10):
+            assert extract_context("WINWORD.EXE", "Brief.docx - Word") == "Brief.docx"
+        stats = get_extraction_cache_stats()['context']
+        assert (stats['hits'], stats['misses'], stats['entries']) == (9, 1, 1)
+        assert stats['hit_rate'] == 0.9
+
+    def test_dispatch_is_case_insensitive_and_skips_unknown_apps(self):
+        assert extract_context("Chrome.EXE", "https://canlii.org - Google Chrome") == "https://canlii.org"
+        assert extract_context("outlook.exe", "RE: Smith - Message (HTML) - Outlook") == "RE: Smith"
+        assert extract_context("notepad.exe", "https://example.com - Notepad") is None
+
+    def test_legal_context_memo_counts_hits(self):
+        from syncopaid.context_extraction import extract_legal_context, get_extraction_cache_stats
+        for _ in range(3):
+            assert extract_legal_context("westlaw.exe", "2023 SCC 15") == "2023 SCC 15"
+        stats = get_extraction_cache_stats()['legal']
+        assert (stats['hits'], stats['misses']) == (2, 1)
@@ -0,0 +1,160 @@
+"""Tests for the incrementally maintained daily_rollups table."""
+import json
+import sqlite3
+
+import pytest
+
+from syncopaid.database import Database
+from syncopaid.exporter import Exporter
+from syncopaid.tracker_state import ActivityEvent
+
+
+def _event(timestamp, app="WINWORD.EXE", duration=60.0, is_idle=False):
+    return ActivityEvent(
+        timestamp=timestamp,
+        duration_seconds=duration,
+        app=app,
+        title="Smith-Contract.docx - Word",
+        is_idle=is_idle
+    )
+
+
+def _rollups(db):
+    with db._get_connection() as conn:
+        return [tuple(row) for row in conn.execute("SELECT * FROM daily_rollups ORDER BY 1, 2, 3, 4")]
+
+
+@pytest.fixture
+def db(tmp_path):
+    db = Database(str(tmp_path / "test.db"))
+    db.insert_events_batch([
+        _event("2025-12-09T09:00:00+00:00"),
+        _event("2025-12-09T09:01:00+00:00", app="chrome.exe", duration=30.0),
+        _event("2025-12-09T09:02:00+00:00", app=None, duration=120.0, is_idle=True),
+        _event("2025-12-10T09:00:00+00:00", duration=45.0),
+        # 20:00 at UTC-8 is 04:00 UTC the next day
+        _event("2025-12-10T20:00:00-08:00", app="chrome.exe", duration=15.0),
+    ])
+    return db
+
+
+def test_triggers_match_rebuild_after_changes(db):
+    """Inserts, updates and deletes leave rollups equal to a full rebuild."""
+    with db._get_connection() as conn:
+        conn.execute("UPDATE events SET matter_id = 5, duration_seconds = 90 WHERE app = 'WINWORD.EXE'")
+        conn.execute("UPDATE events SET is_idle = 1, state = 'Inactive' WHERE app = 'chrome.exe'")
+        conn.execute("DELETE FROM events WHERE timestamp LIKE '2025-12-10T09%'")
+    incremental = _rollups(db)
+
+    db.rebuild_daily_rollups()
+
+    assert _rollups(db) == incremental
+
+
+def test_emptied_rollup_rows_are_removed(db):
+    """Deleting every event of a day leaves no rollup rows for it."""
+    db.delete_events(start_date="2025-12-09", end_date="2025-12-09")
+
+    assert all(row[0] != "2025-12-09" for row in _rollups(db))
+
+
+def test_daily_summary_from_rollups(db):
+    """Daily totals match the day's events, bucketed by UTC day."""
+    summary = db.get_daily_summary("2025-12-09")
+
+    assert summary['total_events'] == 3
+    assert summary['total_duration_seconds'] == 210.0
+    assert summary['active_duration_seconds'] == 90.0
+    assert summary['idle_duration_seconds'] == 120.0
+    assert summary['unique_applications'] == 2
+    assert db.get_daily_summary("2025-12-11")['total_events'] == 1
+
+
+def test_event_totals_excluding_idle(db):
+    """include_idle=False counts only active events and apps."""
+    totals = db.get_event_totals(start_date="2025-12-09", end_date="2025-12-10", include_idle=False)
+
+    assert totals['total_events'] == 3
+    assert totals['total_duration_seconds'] == 135.0
+    assert totals['idle_duration_seconds'] == 0.0
+    assert totals['unique_applications'] == 2
+
+
+def test_statistics_from_rollups(db):
+    """Whole-database statistics come from rollups plus first/last event."""
+    stats = db.get_statistics()
+
+    assert stats['total_events'] == 5
+    assert stats['total_duration_seconds'] == 270.0
+    assert stats['first_event'] == "2025-12-09T09:00:00+00:00"
+    assert stats['last_event'] == "2025-12-10T20:00:00-08:00"
+    assert stats['date_range_days'] == 2
+
+
+def test_migration_populates_rollups_for_existing_events(tmp_path):
+    """Opening a database without daily_rollups builds it from events."""
+    db_path = tmp_path / "legacy.db"
+    conn = sqlite3.connect(db_path)
+    conn.execute("""
+        CREATE TABLE events (
+            id INTEGER PRIMARY KEY AUTOINCREMENT, timestamp TEXT NOT NULL,
+            duration_seconds REAL, end_time TEXT, app TEXT, title TEXT, url TEXT,
+            is_idle INTEGER DEFAULT 0
+        )
+    """)
+    conn.execute("INSERT INTO events (timestamp, duration_seconds, app) VALUES ('2025-12-09T09:00:00', 60, 'a.exe')")
+    conn.commit()
+    conn.close()
+
+    db = Database(str(db_path))
+
+    assert db.get_daily_summary("2025-12-09")['active_duration_seconds'] == 60.0
+
+
+def test_export_daily_summary_app_breakdown(db, tmp_path):
+    """The exported application breakdown is built from rollups."""
+    output = tmp_path / "summary.json"
+    Exporter(db).export_daily_summary(str(output), "2025-12-09")
+
+    breakdown = json.loads(output.read_text())['application_breakdown']
+    assert [(b['app'], b['duration_seconds'], b['percentage']) for b in breakdown] == [
+        ("WINWORD.EXE", 60.0, 66.7),
+        ("chrome.exe", 30.0, 33.3),
+    ]
+
+
+def test_range_summary_groups_in_one_query(db):
+    by_day_app = db.get_range_summary("2025-12-09", "2025-12-11", group_by=('day', 'app'))
+    assert [(row['day'], row['app'], row['event_count'], row['active_duration_seconds'])
+            for row in by_day_app] == [
+        ("2025-12-09", None, 1, 0.0),
+        ("2025-12-09", "WINWORD.EXE", 1, 60.0),
+        ("2025-12-09", "chrome.exe", 1, 30.0),
+        ("2025-12-10", "WINWORD.EXE", 1, 45.0),
+        ("2025-12-11", "chrome.exe", 1, 15.0),
+    ]
+
+    by_state = db.get_range_summary(group_by=('week', 'state'))
+    assert [(row['week'], row['state'], row['duration_seconds']) for row in by_state] == [
+        ("2025-12-08", "Active", 270.0),
+    ]
+
+    total = db.get_range_summary("2025-12-09", "2025-12-09", group_by=())
+    assert [(row['event_count'], row['idle_duration_seconds']) for row in total] == [(3, 120.0)]
+    assert db.get_range_summary("2026-01-01", "2026-01-31", group_by=()) == []
+
+    with pytest.raises(ValueError):
+        db.get_range_summary(group_by=('title',))
+
+
+def test_export_range_summary_by_month(db, tmp_path):
+    output = tmp_path / "monthly.json"
+    result = Exporter(db).export_range_summary(str(output), period='month')
+
+    data = json.loads(output.read_text())
+    assert result['periods_exported'] == 1
+    month = data['periods'][0]
+    assert month['month'] == "2025-12"
+    assert month['total_events'] == 5
+    assert month['unique_applications'] == 2
+    assert [app['app'] for app in month['application_breakdown']] == ["WINWORD.EXE", "chrome.exe"]
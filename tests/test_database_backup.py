@@ -0,0 +1,105 @@
+"""Tests for online database backups and rotating snapshots."""
+import threading
+
+import pytest
+
+from syncopaid.backup_scheduler import BackupScheduler
+from syncopaid.database import Database
+from syncopaid.database_schema import SCHEMA_VERSION
+from syncopaid.tracker_state import ActivityEvent
+
+
+def _event(timestamp, title="Smith-Contract.docx - Word"):
+    return ActivityEvent(
+        timestamp=timestamp,
+        duration_seconds=60.0,
+        app="WINWORD.EXE",
+        title=title,
+        is_idle=False
+    )
+
+
+@pytest.fixture
+def db(tmp_path):
+    db = Database(str(tmp_path / "test.db"))
+    db.insert_events_batch([
+        _event(f"2025-12-09T09:{i % 60:02d}:00+00:00", title=f"Doc {i} " + "x" * 200)
+        for i in range(500)
+    ])
+    return db
+
+
+def test_backup_while_writing(db, tmp_path):
+    stop = threading.Event()
+
+    def writer():
+        while not stop.is_set():
+            db.insert_event(_event("2025-12-10T09:00:00+00:00"))
+
+    thread = threading.Thread(target=writer)
+    thread.start()
+    try:
+        snapshot = db.backup(tmp_path / "snap.db", pages_per_step=4, sleep=0)
+    finally:
+        stop.set()
+        thread.join()
+
+    result = db.verify_backup(snapshot)
+    assert result['ok']
+    assert result['event_count'] >= 500
+    assert result['schema_version'] == SCHEMA_VERSION
+
+    restored = Database(str(snapshot))
+    assert len(restored.get_events(start_date="2025-12-09", end_date="2025-12-09")) == 500
+
+
+def test_verify_rejects_corrupt_snapshot(db, tmp_path):
+    snapshot = db.backup(tmp_path / "snap.db")
+    data = bytearray(snapshot.read_bytes())
+    data[4096:8192] = b"\x00" * 4096
+    snapshot.write_bytes(bytes(data))
+
+    result = db.verify_backup(snapshot)
+    assert not result['ok']
+    assert result['integrity'] != "ok"
+
+    assert not db.verify_backup(tmp_path / "missing.db")['ok']
+
+
+def test_backup_copies_shards(tmp_path):
+    db = Database(str(tmp_path / "test.db"))
+    db.insert_events_batch([_event("2025-11-03T09:00:00+00:00"), _event("2025-12-09T09:00:00+00:00")])
+    db.archive_month("2025-11")
+
+    snapshot = db.backup(tmp_path / "out" / "snap.db")
+    assert (tmp_path / "out" / "snap-shards" / "2025-11.db").exists()
+
+    # The snapshot opens with its shards like the original
+    restored = Database(str(snapshot))
+    assert restored.list_shards() == ["2025-11"]
+    assert restored.count_events()['total_events'] == 2
+
+
+def test_scheduler_rotates_verified_snapshots(db, tmp_path, monkeypatch):
+    import syncopaid.backup_scheduler as backup_scheduler
+
+    stamps = iter(f"2025120{i}-090000" for i in range(1, 6))
+
+    class FakeDatetime:
+        @staticmethod
+        def now():
+            class Now:
+                def strftime(self, fmt):
+                    return next(stamps)
+            return Now()
+
+    monkeypatch.setattr(backup_scheduler, "datetime", FakeDatetime)
+
+    scheduler = BackupScheduler(db, tmp_path / "backups", keep=3, sleep=0)
+    for _ in range(5):
+        assert scheduler.run_once()['ok']
+
+    names = [path.name for path in scheduler.list_snapshots()]
+    assert names == [f"syncopaid-2025120{i}-090000.db" for i in (3, 4, 5)]
+    assert not list((tmp_path / "backups").glob("*.partial"))
+    assert scheduler.last_result['path'].endswith("syncopaid-20251205-090000.db")
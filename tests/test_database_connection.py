@@ -0,0 +1,183 @@
+"""Tests for persistent per-thread database connections."""
+import threading
+
+import pytest
+
+from syncopaid.database import Database
+from syncopaid.database_benchmark import benchmark_connection_modes
+from syncopaid.tracker_state import ActivityEvent
+
+
+def _event(title="Smith-Contract.docx - Word"):
+    return ActivityEvent(
+        timestamp="2025-12-17T10:30:00",
+        duration_seconds=60.0,
+        app="WINWORD.EXE",
+        title=title,
+        is_idle=False
+    )
+
+
+def test_database_uses_wal_mode(tmp_path):
+    """Persistent connections switch the database file to WAL."""
+    db = Database(str(tmp_path / "test.db"))
+
+    with db._get_connection() as conn:
+        assert conn.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+        # synchronous=NORMAL is reported as 1
+        assert conn.execute("PRAGMA synchronous").fetchone()[0] == 1
+
+
+def test_same_thread_reuses_connection(tmp_path):
+    """Repeated calls on one thread share a single connection."""
+    db = Database(str(tmp_path / "test.db"))
+
+    with db._get_connection() as first:
+        pass
+    with db._get_connection() as second:
+        pass
+
+    assert first is second
+
+
+def test_threads_get_separate_connections(tmp_path):
+    """Each thread owns its own connection."""
+    db = Database(str(tmp_path / "test.db"))
+    seen = []
+
+    def worker():
+        with db._get_connection() as conn:
+            seen.append(conn)
+
+    with db._get_connection() as main_conn:
+        pass
+    thread = threading.Thread(target=worker)
+    thread.start()
+    thread.join()
+
+    assert seen[0] is not main_conn
+
+
+def test_reader_not_blocked_by_open_write(tmp_path):
+    """A UI-thread read proceeds while another thread holds a write transaction."""
+    db = Database(str(tmp_path / "test.db"))
+    db.insert_event(_event())
+    write_started = threading.Event()
+    read_done = threading.Event()
+
+    def writer():
+        with db._get_connection() as conn:
+            conn.execute(
+                "INSERT INTO events (timestamp, app, title) VALUES (?, ?, ?)",
+                ("2025-12-17T11:00:00", "chrome.exe", "CanLII")
+            )
+            write_started.set()
+            read_done.wait(timeout=5)
+
+    thread = threading.Thread(target=writer)
+    thread.start()
+    write_started.wait(timeout=5)
+
+    events = db.get_events()
+    read_done.set()
+    thread.join()
+
+    assert len(events) == 1
+    assert len(db.get_events()) == 2
+
+
+def test_nested_blocks_share_outer_transaction(tmp_path):
+    """An exception in the outer block rolls back work done by inner blocks."""
+    db = Database(str(tmp_path / "test.db"))
+
+    with pytest.raises(RuntimeError):
+        with db._get_connection():
+            db.insert_event(_event())
+            raise RuntimeError("abort")
+
+    assert db.get_events() == []
+
+
+def test_row_factory_restored_between_calls(tmp_path):
+    """A custom row factory set by one caller does not leak into the next."""
+    db = Database(str(tmp_path / "test.db"))
+    db.insert_event(_event())
+
+    with db._get_connection() as conn:
+        conn.row_factory = lambda cursor, row: tuple(row)
+
+    assert db.get_events()[0]['app'] == "WINWORD.EXE"
+
+
+def test_close_reopens_on_next_use(tmp_path):
+    """close() drops connections; the next call transparently reconnects."""
+    db = Database(str(tmp_path / "test.db"))
+    with db._get_connection() as before:
+        pass
+
+    db.close()
+
+    with db._get_connection() as after:
+        assert after is not before
+    db.insert_event(_event())
+    assert len(db.get_events()) == 1
+
+
+def test_close_leaves_other_threads_transaction_alone(tmp_path):
+    """close() on one thread does not close a worker's open transaction."""
+    db = Database(str(tmp_path / "test.db"))
+    write_started = threading.Event()
+    closed = threading.Event()
+    errors = []
+
+    def writer():
+        try:
+            with db._get_connection() as conn:
+                conn.execute(
+                    "INSERT INTO events (timestamp, app, title) VALUES (?, ?, ?)",
+                    ("2025-12-17T11:00:00", "chrome.exe", "CanLII")
+                )
+                write_started.set()
+                closed.wait(timeout=5)
+        except Exception as e:
+            errors.append(e)
+
+    thread = threading.Thread(target=writer)
+    thread.start()
+    write_started.wait(timeout=5)
+    db.close()
+    closed.set()
+    thread.join()
+
+    assert errors == []
+    assert len(db.get_events()) == 1
+
+
+def test_close_refuses_inside_open_transaction(tmp_path):
+    """Closing the calling thread's connection mid-transaction is an error."""
+    db = Database(str(tmp_path / "test.db"))
+
+    with db._get_connection():
+        with pytest.raises(RuntimeError):
+            db.close()
+
+
+def test_per_call_mode_keeps_rollback_journal(tmp_path):
+    """persistent_connections=False preserves the legacy per-call behaviour."""
+    db = Database(str(tmp_path / "test.db"), persistent_connections=False)
+
+    with db._get_connection() as first:
+        assert first.execute("PRAGMA journal_mode").fetchone()[0] == "delete"
+    with db._get_connection() as second:
+        pass
+
+    assert first is not second
+
+
+def test_connection_benchmark_reports_all_operations():
+    """The benchmark produces latencies for both connection modes."""
+    results = benchmark_connection_modes(iterations=5)
+
+    for mode in ('per_call', 'persistent'):
+        assert set(results[mode]) == {'insert_event', 'get_events', 'insert_screenshot'}
+        assert all(latency > 0 for latency in results[mode].values())
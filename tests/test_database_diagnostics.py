@@ -0,0 +1,85 @@
+"""Tests for the storage profiler and maintenance advisor."""
+import pytest
+
+from syncopaid.database import Database
+from syncopaid.tracker_state import ActivityEvent
+
+
+@pytest.fixture
+def db(tmp_path):
+    db = Database(str(tmp_path / "test.db"))
+    db.insert_events_batch([
+        ActivityEvent(
+            timestamp=f"2025-12-09T{9 + i // 60:02d}:{i % 60:02d}:00+00:00",
+            duration_seconds=60.0,
+            app="WINWORD.EXE",
+            title=f"Doc {i} " + "x" * 300,
+            is_idle=False
+        )
+        for i in range(600)
+    ])
+    return db
+
+
+def test_storage_report_profiles_tables(db):
+    report = db.get_storage_report()
+
+    assert report['page_count'] > 0
+    assert report['file_bytes'] == report['page_size'] * report['page_count']
+    events = report['row_sizes']['events']
+    assert events['rows'] == 600
+    assert 'screenshots' in report['row_sizes']
+    if report['dbstat_available']:
+        names = {item['name'] for item in report['objects']}
+        assert 'event_rows' in names
+        assert events['min_bytes'] <= events['p50_bytes'] <= events['max_bytes']
+
+
+def test_advice_and_maintenance(db):
+    advice = [item['action'] for item in db.get_maintenance_advice()]
+    assert 'analyze' in advice
+
+    assert db.run_maintenance(['analyze']) == ['analyze']
+    report = db.get_storage_report()
+    assert report['stats_analyzed']
+    assert report['row_sizes']['events']['analyzed_rows'] == 600
+    assert 'analyze' not in [item['action'] for item in db.get_maintenance_advice(report)]
+
+    with pytest.raises(ValueError):
+        db.run_maintenance(['defragment'])
+
+
+def test_vacuum_reclaims_free_pages(db):
+    db.delete_events("2025-12-09", "2025-12-09")
+    report = db.get_storage_report()
+    assert report['freelist_count'] > 0
+    assert 'vacuum' in [item['action'] for item in db.get_maintenance_advice(report)]
+
+    # Full VACUUM only runs when explicitly allowed
+    assert db.run_maintenance(['vacuum']) == []
+    assert db.run_maintenance(['vacuum'], allow_vacuum=True) == ['vacuum']
+
+    report = db.get_storage_report()
+    assert report['freelist_count'] == 0
+    assert report['auto_vacuum'] == 'incremental'
+
+
+def test_incremental_vacuum_requires_incremental_auto_vacuum(db):
+    db.delete_events("2025-12-09", "2025-12-09")
+    assert db.get_storage_report()['auto_vacuum'] == 'none'
+
+    # Without auto_vacuum=incremental the pragma frees nothing; it must not loop
+    assert db.run_maintenance(['incremental_vacuum']) == []
+    assert db.get_storage_report()['freelist_count'] > 0
+
+    db.run_maintenance(['vacuum'], allow_vacuum=True)
+    db.insert_events_batch([
+        ActivityEvent(timestamp="2025-12-10T09:00:00+00:00", duration_seconds=60.0,
+                      app="WINWORD.EXE", title="y" * 300, is_idle=False)
+        for _ in range(300)
+    ])
+    db.delete_events("2025-12-10", "2025-12-10")
+    assert db.get_storage_report()['freelist_count'] > 0
+
+    assert db.run_maintenance(['incremental_vacuum'], vacuum_step_pages=4) == ['incremental_vacuum']
+    assert db.get_storage_report()['freelist_count'] == 0
@@ -0,0 +1,167 @@
+"""Tests for epoch-millisecond time columns and range indices."""
+import sqlite3
+
+import pytest
+
+from syncopaid.database import Database
+from syncopaid.database_time import to_epoch_ms, date_range_to_ms
+from syncopaid.tracker_state import ActivityEvent
+
+
+def _event(timestamp, end_time=None, title="Smith-Contract.docx - Word"):
+    return ActivityEvent(
+        timestamp=timestamp,
+        duration_seconds=60.0,
+        app="WINWORD.EXE",
+        title=title,
+        end_time=end_time,
+        is_idle=False
+    )
+
+
+def _plans(db, call):
+    """Run a Database call and return EXPLAIN QUERY PLAN details for its SELECT/DELETE."""
+    statements = []
+    with db._get_connection() as conn:
+        conn.set_trace_callback(statements.append)
+        try:
+            call()
+        finally:
+            conn.set_trace_callback(None)
+
+        plans = []
+        for sql in statements:
+            if sql.lstrip().upper().startswith(("SELECT", "DELETE")) and "sqlite_master" not in sql:
+                rows = conn.execute("EXPLAIN QUERY PLAN " + sql).fetchall()
+                plans.append(" | ".join(row[3] for row in rows))
+        return plans
+
+
+def test_to_epoch_ms_normalizes_offsets():
+    """The same instant gives the same value regardless of offset."""
+    assert to_epoch_ms("2025-12-17T10:30:00+00:00") == to_epoch_ms("2025-12-17T02:30:00-08:00")
+    assert to_epoch_ms("2025-12-17T10:30:00") == to_epoch_ms("2025-12-17T10:30:00+00:00")
+    assert to_epoch_ms("2025-12-17T10:30:00.250+00:00") % 1000 == 250
+    assert to_epoch_ms(None) is None
+    assert to_epoch_ms("not a timestamp") is None
+
+
+def test_date_range_end_is_exclusive_midnight():
+    """end_date covers the whole day, up to but excluding the next midnight."""
+    start_ms, end_ms = date_range_to_ms("2025-12-17", "2025-12-17")
+    assert end_ms - start_ms == 24 * 3600 * 1000
+
+
+def test_insert_populates_epoch_columns(tmp_path):
+    """insert_event and insert_screenshot write start_ms/end_ms/captured_ms."""
+    db = Database(str(tmp_path / "test.db"))
+    db.insert_event(_event("2025-12-17T10:30:00+00:00", "2025-12-17T10:31:00+00:00"))
+    db.insert_screenshot(captured_at="2025-12-17T02:30:00-08:00", file_path="a.jpg")
+
+    with db._get_connection() as conn:
+        row = conn.execute("SELECT start_ms, end_ms FROM events").fetchone()
+        captured_ms = conn.execute("SELECT captured_ms FROM screenshots").fetchone()[0]
+
+    assert row['start_ms'] == to_epoch_ms("2025-12-17T10:30:00+00:00")
+    assert row['end_ms'] - row['start_ms'] == 60_000
+    assert captured_ms == row['start_ms']
+
+
+def test_trigger_fills_epoch_columns_for_raw_inserts(tmp_path):
+    """Rows inserted without start_ms still get it via the fallback trigger."""
+    db = Database(str(tmp_path / "test.db"))
+    with db._get_connection() as conn:
+        conn.execute("INSERT INTO events (timestamp, app) VALUES ('2025-12-17T10:30:00+00:00', 'x.exe')")
+        conn.execute("INSERT INTO screenshots (captured_at, file_path) VALUES ('2025-12-17T10:30:00+00:00', 'a.jpg')")
+        start_ms = conn.execute("SELECT start_ms FROM events").fetchone()[0]
+        captured_ms = conn.execute("SELECT captured_ms FROM screenshots").fetchone()[0]
+
+    assert start_ms == captured_ms == to_epoch_ms("2025-12-17T10:30:00+00:00")
+
+
+def test_migration_backfills_existing_rows(tmp_path):
+    """Opening a pre-epoch database adds and backfills the new columns."""
+    db_path = tmp_path / "legacy.db"
+    conn = sqlite3.connect(db_path)
+    conn.execute("""
+        CREATE TABLE events (
+            id INTEGER PRIMARY KEY AUTOINCREMENT, timestamp TEXT NOT NULL,
+            duration_seconds REAL, end_time TEXT, app TEXT, title TEXT, url TEXT,
+            is_idle INTEGER DEFAULT 0
+        )
+    """)
+    conn.execute("""
+        CREATE TABLE screenshots (
+            id INTEGER PRIMARY KEY AUTOINCREMENT, captured_at TEXT NOT NULL,
+            file_path TEXT NOT NULL, window_app TEXT, window_title TEXT, dhash TEXT
+        )
+    """)
+    conn.execute(
+        "INSERT INTO events (timestamp, end_time, app) VALUES (?, ?, ?)",
+        ("2025-12-17T10:30:00+00:00", "2025-12-17T10:31:00+00:00", "WINWORD.EXE")
+    )
+    conn.execute(
+        "INSERT INTO screenshots (captured_at, file_path) VALUES (?, ?)",
+        ("2025-12-17T02:30:00.500000-08:00", "a.jpg")
+    )
+    conn.commit()
+    conn.close()
+
+    db = Database(str(db_path))
+
+    with db._get_connection() as conn:
+        row = conn.execute("SELECT start_ms, end_ms FROM events").fetchone()
+        captured_ms = conn.execute("SELECT captured_ms FROM screenshots").fetchone()[0]
+
+    assert row['start_ms'] == to_epoch_ms("2025-12-17T10:30:00+00:00")
+    assert row['end_ms'] == to_epoch_ms("2025-12-17T10:31:00+00:00")
+    assert captured_ms == to_epoch_ms("2025-12-17T10:30:00.500+00:00")
+
+
+def test_screenshot_range_correct_across_offsets(tmp_path):
+    """A local-offset screenshot is bucketed by its UTC instant, not its text."""
+    db = Database(str(tmp_path / "test.db"))
+    # 2025-12-17 20:00 in UTC-8 is 2025-12-18 04:00 UTC
+    db.insert_screenshot(captured_at="2025-12-17T20:00:00-08:00", file_path="late.jpg")
+
+    assert db.get_screenshots(start_date="2025-12-17", end_date="2025-12-17") == []
+    assert len(db.get_screenshots(start_date="2025-12-18", end_date="2025-12-18")) == 1
+
+
+def test_get_events_orders_by_instant(tmp_path):
+    """Events with different offsets are ordered by actual time."""
+    db = Database(str(tmp_path / "test.db"))
+    db.insert_event(_event("2025-12-17T09:00:00-08:00", title="later"))    # 17:00 UTC
+    db.insert_event(_event("2025-12-17T12:00:00+00:00", title="earlier"))
+
+    titles = [e['title'] for e in db.get_events(start_date="2025-12-17", end_date="2025-12-17")]
+    assert titles == ["earlier", "later"]
+
+
+@pytest.mark.parametrize("call, index", [
+    (lambda db: db.get_events(start_date="2025-12-17", end_date="2025-12-18"), "idx_events_start_state"),
+    (lambda db: db.get_events(start_date="2025-12-17", include_idle=False), "idx_events_start_state"),
+    (lambda db: db.get_screenshots(start_date="2025-12-17", end_date="2025-12-18"), "idx_screenshots_captured_ms"),
+    (lambda db: db.delete_events(start_date="2025-12-17", end_date="2025-12-18"), "idx_events_start_state"),
+])
+def test_range_queries_use_epoch_indices(tmp_path, call, index):
+    """Range queries search the composite epoch-ms indices, not a full scan."""
+    db = Database(str(tmp_path / "test.db"))
+
+    plans = _plans(db, lambda: call(db))
+
+    assert plans, "expected at least one query"
+    assert any(f"USING INDEX {index}" in plan or f"USING COVERING INDEX {index}" in plan for plan in plans), plans
+
+
+def test_matter_range_query_uses_matter_index(tmp_path):
+    """Matter-scoped range queries use the (matter_id, start_ms) index."""
+    db = Database(str(tmp_path / "test.db"))
+
+    with db._get_connection() as conn:
+        plan = " | ".join(row[3] for row in conn.execute(
+            "EXPLAIN QUERY PLAN SELECT * FROM events WHERE matter_id = ? AND start_ms >= ? AND start_ms < ?",
+            (1, 0, 1)
+        ))
+
+    assert "idx_events_matter_start" in plan
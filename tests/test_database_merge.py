@@ -0,0 +1,125 @@
+"""Tests for merging another machine's database."""
+import pytest
+
+from syncopaid.database import Database
+from syncopaid.tracker_state import ActivityEvent
+
+
+def _event(minute, title="Smith-Contract.docx - Word"):
+    return ActivityEvent(
+        timestamp=f"2025-11-03T09:{minute:02d}:00+00:00",
+        duration_seconds=60.0,
+        app="WINWORD.EXE",
+        title=title,
+        is_idle=False
+    )
+
+
+def _add_matter(db, client, matter, folder):
+    with db._get_connection() as conn:
+        conn.execute("INSERT OR IGNORE INTO clients (display_name, folder_path) VALUES (?, ?)",
+                     (client, folder))
+        client_id = conn.execute("SELECT id FROM clients WHERE display_name = ?", (client,)).fetchone()[0]
+        return conn.execute(
+            "INSERT INTO matters (client_id, display_name, folder_path) VALUES (?, ?, ?)",
+            (client_id, matter, f"{folder}/{matter}")
+        ).lastrowid
+
+
+@pytest.fixture
+def laptop(tmp_path):
+    db = Database(str(tmp_path / "laptop.db"))
+    _add_matter(db, "Jones", "Estate", "D:/Clients/Jones")  # shifts matter ids vs. desktop
+    matter_id = _add_matter(db, "Smith", "Contract", "D:/Clients/Smith")
+    db.insert_events_batch(
+        [_event(m) for m in range(10)],
+        categorizations=[(matter_id, 90, False)] * 10
+    )
+    db.insert_screenshot("2025-11-03T09:00:30+00:00", "shots/a.jpg", "WINWORD.EXE", "Smith", "ff00")
+    with db._get_connection() as conn:
+        conn.execute(
+            "INSERT INTO categorization_patterns (matter_id, app_pattern) VALUES (?, 'WINWORD.EXE')",
+            (matter_id,)
+        )
+    return db
+
+
+@pytest.fixture
+def desktop(tmp_path):
+    db = Database(str(tmp_path / "desktop.db"))
+    _add_matter(db, "Smith", "Contract", "C:/Clients/Smith")
+    db.insert_events_batch([_event(m, title="Desktop only") for m in range(3)])
+    return db
+
+
+def test_merge_remaps_and_dedups(desktop, laptop):
+    result = desktop.merge_database(laptop.db_path, machine="laptop")
+
+    assert result['events'] == {'source': 10, 'imported': 10, 'duplicates': 0}
+    assert result['clients']['imported'] == 1      # Jones; Smith already exists
+    assert result['matters']['imported'] == 1      # Jones / Estate
+    assert result['patterns']['imported'] == 1
+    assert result['screenshots']['imported'] == 1
+    assert any(c['table'] == 'clients' and c['key'] == 'Smith' for c in result['conflicts'])
+
+    with desktop._get_connection() as conn:
+        smith_contract = conn.execute("""
+            SELECT m.id FROM matters m JOIN clients c ON c.id = m.client_id
+            WHERE c.display_name = 'Smith' AND m.display_name = 'Contract'
+        """).fetchone()[0]
+        rows = conn.execute(
+            "SELECT matter_id, source_machine FROM events WHERE title LIKE 'Smith%'"
+        ).fetchall()
+        assert {tuple(row) for row in rows} == {(smith_contract, 'laptop')}
+        assert conn.execute(
+            "SELECT COUNT(*) FROM events WHERE source_machine IS NULL"
+        ).fetchone()[0] == 3
+
+        shot_event = conn.execute(
+            "SELECT e.start_ms FROM screenshots s JOIN events e ON e.id = s.event_id"
+        ).fetchone()[0]
+        assert shot_event == 1762160400000  # 2025-11-03T09:00:00Z
+
+    # Merging the same source again adds nothing
+    again = desktop.merge_database(laptop.db_path, machine="laptop")
+    assert again['events']['imported'] == 0
+    assert again['events']['duplicates'] == 10
+    assert again['screenshots']['imported'] == 0
+    assert again['patterns']['imported'] == 0
+
+
+def test_merge_dedups_against_archived_months(desktop, laptop):
+    desktop.merge_database(laptop.db_path, machine="laptop")
+    desktop.archive_month("2025-11")
+
+    again = desktop.merge_database(laptop.db_path, machine="laptop")
+    assert again['events']['imported'] == 0
+    assert again['screenshots']['imported'] == 0
+
+
+def test_merge_rejects_invalid_sources(desktop, tmp_path):
+    with pytest.raises(FileNotFoundError):
+        desktop.merge_database(tmp_path / "missing.db")
+    with pytest.raises(ValueError):
+        desktop.merge_database(desktop.db_path)
+
+
+def test_merge_refuses_inside_open_transaction(desktop, laptop):
+    with pytest.raises(RuntimeError):
+        with desktop._get_connection():
+            desktop.merge_database(laptop.db_path, machine="laptop")
+
+    assert len(desktop.get_events()) == 3
+
+
+def test_merged_events_do_not_claim_local_screenshots(desktop, laptop):
+    """The laptop's events cover the laptop's screen, not the desktop's."""
+    desktop.insert_screenshot("2025-11-03T09:05:30+00:00", "shots/desktop.jpg")
+
+    desktop.merge_database(laptop.db_path, machine="laptop")
+    desktop.insert_screenshot("2025-11-03T09:06:30+00:00", "shots/later.jpg")
+
+    links = {s['file_path']: s['event_id'] for s in desktop.get_screenshots()}
+    assert links['shots/desktop.jpg'] is None
+    assert links['shots/later.jpg'] is None
+    assert links['shots/a.jpg'] is not None
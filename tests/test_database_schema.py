@@ -7,6 +7,7 @@ import sqlite3
 
 sys.path.insert(0, str(Path(__file__).parent.parent / 'src'))
 from syncopaid.database import Database
+from syncopaid.database_schema import MIGRATIONS, SCHEMA_VERSION
 
 
 @pytest.fixture
@@ -100,7 +101,8 @@ def test_migrate_screenshots_analysis_columns(db_path, temp_db):
         columns = [row[1] for row in cursor.fetchall()]
 
     # Run migration
-    temp_db._migrate_screenshots_table()
+    with temp_db._get_connection() as conn:
+        temp_db._migrate_screenshots_table(conn.cursor())
 
     # Verify columns now exist
     with sqlite3.connect(db_path) as conn:
@@ -128,3 +130,72 @@ def test_schema_init_runs_migrations(tmp_path):
 
     assert 'analysis_data' in columns
     assert 'analysis_status' in columns
+
+
+def _schema_snapshot(db_path):
+    """Return every schema object's SQL, for comparing databases."""
+    with sqlite3.connect(db_path) as conn:
+        return sorted(conn.execute(
+            "SELECT type, name, sql FROM sqlite_master WHERE name NOT LIKE 'sqlite_%'"
+        ).fetchall(), key=lambda row: (row[0], row[1]))
+
+
+def test_new_database_records_schema_version(temp_db, db_path):
+    """A fresh database is stamped with the latest migration version."""
+    assert [version for version, _, _ in MIGRATIONS] == list(range(1, SCHEMA_VERSION + 1))
+    with sqlite3.connect(db_path) as conn:
+        assert conn.execute("PRAGMA user_version").fetchone()[0] == SCHEMA_VERSION
+
+
+def test_up_to_date_database_skips_migrations(temp_db, db_path, monkeypatch):
+    """Reopening a current database only reads user_version."""
+    def fail():
+        raise AssertionError("migrations should not run")
+
+    monkeypatch.setattr(Database, '_run_migrations', lambda self: fail())
+    Database(str(db_path))
+
+
+@pytest.mark.parametrize("version, _description, method", MIGRATIONS)
+def test_migrations_are_idempotent(tmp_path, monkeypatch, version, _description, method):
+    """Re-running a migration step on a database at its version changes nothing."""
+    import syncopaid.database_schema as database_schema
+    monkeypatch.setattr(database_schema, 'MIGRATIONS', MIGRATIONS[:version])
+    monkeypatch.setattr(database_schema, 'SCHEMA_VERSION', version)
+    db_path = tmp_path / "test.db"
+    db = Database(str(db_path))
+
+    before = _schema_snapshot(db_path)
+    with db._get_connection() as conn:
+        getattr(db, method)(conn.cursor())
+    assert _schema_snapshot(db_path) == before
+
+
+def test_legacy_database_is_migrated(tmp_path):
+    """A pre-registry database (user_version 0) is upgraded in place."""
+    db_path = tmp_path / "legacy.db"
+    with sqlite3.connect(db_path) as conn:
+        conn.execute("""
+            CREATE TABLE events (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                timestamp TEXT NOT NULL,
+                duration_seconds REAL,
+                app TEXT,
+                title TEXT,
+                url TEXT,
+                is_idle INTEGER DEFAULT 0
+            )
+        """)
+        conn.execute("""
+            INSERT INTO events (timestamp, duration_seconds, app, title, is_idle)
+            VALUES ('2025-12-09T09:00:00+00:00', 60.0, 'WINWORD.EXE', 'Smith.docx', 0)
+        """)
+
+    db = Database(str(db_path))
+
+    with sqlite3.connect(db_path) as conn:
+        assert conn.execute("PRAGMA user_version").fetchone()[0] == SCHEMA_VERSION
+        columns = {row[1] for row in conn.execute("PRAGMA table_info(events)")}
+    assert {'end_time', 'state', 'matter_id', 'start_ms'} <= columns
+    assert db.get_statistics()['total_events'] == 1
+    assert db.get_events()[0]['state'] == 'Active'
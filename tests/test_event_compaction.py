@@ -0,0 +1,125 @@
+"""Tests for post-hoc compaction of adjacent identical events."""
+import pytest
+
+from syncopaid.database import Database
+from syncopaid.tracker_state import ActivityEvent
+
+
+def _event(timestamp, duration, title="Smith-Contract.docx - Word", is_idle=False,
+           end_time=None):
+    return ActivityEvent(
+        timestamp=timestamp,
+        duration_seconds=duration,
+        app="WINWORD.EXE",
+        title=title,
+        end_time=end_time,
+        is_idle=is_idle
+    )
+
+
+@pytest.fixture
+def db(tmp_path):
+    return Database(str(tmp_path / "test.db"))
+
+
+def _rows(db):
+    return [(e['timestamp'][11:19], e['duration_seconds'], e['title'])
+            for e in db.get_events(start_date="2025-12-09", end_date="2025-12-09")]
+
+
+def test_merges_runs_within_gap_tolerance(db):
+    db.insert_events_batch([
+        _event("2025-12-09T09:00:00+00:00", 60, end_time="2025-12-09T09:01:00+00:00"),
+        _event("2025-12-09T09:01:03+00:00", 60, end_time="2025-12-09T09:02:03+00:00"),
+        _event("2025-12-09T09:02:05+00:00", 30, end_time="2025-12-09T09:02:35+00:00"),
+        # Gap of 25s: starts a new run
+        _event("2025-12-09T09:03:00+00:00", 60, end_time="2025-12-09T09:04:00+00:00"),
+        _event("2025-12-09T09:04:00+00:00", 20, title="Inbox - Outlook"),
+        _event("2025-12-09T09:04:20+00:00", 40, is_idle=True),
+        _event("2025-12-09T09:05:00+00:00", 40, is_idle=True),
+    ])
+
+    result = db.compact_events("2025-12-09", "2025-12-09", gap_tolerance_seconds=5)
+
+    assert result == {'rows_before': 7, 'rows_after': 4, 'runs_merged': 2}
+    assert _rows(db) == [
+        ("09:00:00", 150.0, "Smith-Contract.docx - Word"),
+        ("09:03:00", 60.0, "Smith-Contract.docx - Word"),
+        ("09:04:00", 20.0, "Inbox - Outlook"),
+        ("09:04:20", 80.0, "Smith-Contract.docx - Word"),
+    ]
+    first = db.get_events(start_date="2025-12-09", end_date="2025-12-09")[0]
+    assert first['end_time'] == "2025-12-09T09:02:35+00:00"
+
+
+def test_preserves_matter_assignments_and_totals(db):
+    db.insert_events_batch([
+        _event(f"2025-12-09T09:0{i}:00+00:00", 60) for i in range(4)
+    ])
+    ids = [e['id'] for e in db.get_events()]
+    db.update_event_categorization(ids[2], matter_id=7, confidence=80)
+    db.update_event_categorization(ids[3], matter_id=7, confidence=80)
+    before = db.get_statistics()
+
+    result = db.compact_events(gap_tolerance_seconds=0)
+
+    assert result['rows_after'] == 2
+    events = db.get_events()
+    assert [(e['duration_seconds'], e['matter_id']) for e in events] == [(120.0, None), (120.0, 7)]
+    after = db.get_statistics()
+    assert after['total_duration_seconds'] == before['total_duration_seconds']
+    assert after['total_events'] == 2
+
+
+def test_only_touches_requested_range(db):
+    db.insert_events_batch([
+        _event("2025-12-09T23:59:00+00:00", 60),
+        _event("2025-12-10T00:00:00+00:00", 60),
+        _event("2025-12-10T00:01:00+00:00", 60),
+    ])
+
+    result = db.compact_events("2025-12-09", "2025-12-09")
+
+    assert result == {'rows_before': 1, 'rows_after': 1, 'runs_merged': 0}
+    assert len(db.get_events()) == 3
+
+
+def _flickered_day(db):
+    db.insert_events_batch([
+        _event("2025-12-09T09:00:00+00:00", 600),
+        ActivityEvent(timestamp="2025-12-09T09:10:00+00:00", duration_seconds=1,
+                      app="explorer.exe", title="Program Manager", is_idle=False),
+        _event("2025-12-09T09:10:01+00:00", 599),
+        _event("2025-12-09T09:20:00+00:00", 3, is_idle=True),
+        _event("2025-12-09T09:20:03+00:00", 597),
+    ])
+
+
+def test_absorbs_flickers_and_idle_blips_inside_runs(db):
+    _flickered_day(db)
+
+    result = db.compact_events("2025-12-09", "2025-12-09", gap_tolerance_seconds=30)
+
+    assert result == {'rows_before': 5, 'rows_after': 1, 'runs_merged': 1}
+    assert _rows(db) == [("09:00:00", 1800.0, "Smith-Contract.docx - Word")]
+
+
+def test_keeps_flickers_with_another_matter(db):
+    _flickered_day(db)
+    explorer = [e['id'] for e in db.get_events() if e['app'] == "explorer.exe"]
+    db.update_event_categorization(explorer[0], matter_id=7)
+
+    result = db.compact_events("2025-12-09", "2025-12-09", gap_tolerance_seconds=30)
+
+    assert result == {'rows_before': 5, 'rows_after': 3, 'runs_merged': 1}
+    assert [(row[0], row[1]) for row in _rows(db)] == [
+        ("09:00:00", 600.0), ("09:10:00", 1.0), ("09:10:01", 1199.0)
+    ]
+
+
+def test_flicker_threshold_zero_only_merges_identical_rows(db):
+    _flickered_day(db)
+
+    result = db.compact_events("2025-12-09", "2025-12-09", gap_tolerance_seconds=30, flicker_seconds=0)
+
+    assert result == {'rows_before': 5, 'rows_after': 5, 'runs_merged': 0}
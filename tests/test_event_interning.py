@@ -0,0 +1,184 @@
+"""Tests for dictionary-encoded app, title and cmdline storage."""
+import sqlite3
+
+import pytest
+
+from syncopaid.database import Database
+from syncopaid.database_schema import SCHEMA_VERSION
+from syncopaid.tracker_state import ActivityEvent
+
+
+def _event(timestamp, app="WINWORD.EXE", title="Smith-Contract.docx - Word", cmdline=None):
+    return ActivityEvent(
+        timestamp=timestamp,
+        duration_seconds=60.0,
+        app=app,
+        title=title,
+        cmdline=cmdline,
+        is_idle=False
+    )
+
+
+def _count(db, table):
+    with db._get_connection() as conn:
+        return conn.execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0]
+
+
+@pytest.fixture
+def db(tmp_path):
+    db = Database(str(tmp_path / "test.db"))
+    db.insert_events_batch([
+        _event(f"2025-12-09T09:{i:02d}:00+00:00", cmdline=["WINWORD.EXE", "/n"]) for i in range(10)
+    ] + [
+        _event("2025-12-09T10:00:00+00:00", app="chrome.exe", title="CanLII - Google Chrome"),
+    ])
+    return db
+
+
+def test_repeated_values_are_stored_once(db):
+    assert _count(db, 'event_rows') == 11
+    assert _count(db, 'apps') == 2
+    assert _count(db, 'titles') == 2
+    assert _count(db, 'cmdlines') == 1
+
+    events = db.get_events()
+    assert events[0]['app'] == "WINWORD.EXE"
+    assert events[0]['title'] == "Smith-Contract.docx - Word"
+    assert events[0]['cmdline'] == '["WINWORD.EXE", "/n"]'
+    assert events[-1]['cmdline'] is None
+
+
+def test_insert_event_returns_row_id(db):
+    event_id = db.insert_event(_event("2025-12-09T11:00:00+00:00", app="OUTLOOK.EXE"))
+    with db._get_connection() as conn:
+        row = conn.execute("SELECT app FROM events WHERE id = ?", (event_id,)).fetchone()
+    assert row['app'] == "OUTLOOK.EXE"
+
+
+def test_view_accepts_raw_writes(db):
+    """INSERT/UPDATE/DELETE against the events view reach event_rows."""
+    with db._get_connection() as conn:
+        conn.execute("INSERT INTO events (timestamp, app, title) VALUES ('2025-12-09T12:00:00+00:00', 'x.exe', 'New')")
+        conn.execute("UPDATE events SET title = 'Renamed', client = 'Smith' WHERE app = 'x.exe'")
+        row = conn.execute("SELECT * FROM events WHERE app = 'x.exe'").fetchone()
+
+    assert (row['title'], row['client'], row['state'], row['is_idle']) == ('Renamed', 'Smith', 'Active', 0)
+    assert row['start_ms'] is not None
+    assert [r['id'] for r in db.search("renamed")] == [row['id']]
+    assert db.get_app_durations()['x.exe'] == 0.0
+
+    with db._get_connection() as conn:
+        conn.execute("DELETE FROM events WHERE id = ?", (row['id'],))
+    assert _count(db, 'event_rows') == 11
+
+
+def test_delete_prunes_unused_values(db):
+    db.delete_events_by_ids([event['id'] for event in db.get_events() if event['app'] == "chrome.exe"])
+    assert _count(db, 'apps') == 1
+    assert _count(db, 'titles') == 1
+
+    db.delete_events(start_date="2025-12-09", end_date="2025-12-09")
+    assert _count(db, 'apps') == _count(db, 'titles') == _count(db, 'cmdlines') == 0
+
+
+def test_delete_prunes_only_values_of_deleted_rows(db):
+    """Pruning checks the deleted rows' dictionary ids, not the whole dictionary."""
+    with db._get_connection() as conn:
+        conn.execute("INSERT INTO titles (value) VALUES ('Unreferenced')")
+
+    db.delete_events_by_ids([event['id'] for event in db.get_events() if event['app'] == "chrome.exe"])
+
+    with db._get_connection() as conn:
+        titles = {row[0] for row in conn.execute("SELECT value FROM titles")}
+    assert titles == {"Smith-Contract.docx - Word", "Unreferenced"}
+
+
+def test_update_event_assignment(db):
+    event_id = db.get_events()[0]['id']
+
+    db.update_event_assignment(event_id, client="Smith", matter="Contract Review")
+
+    with db._get_connection() as conn:
+        row = conn.execute("SELECT client, matter FROM events WHERE id = ?", (event_id,)).fetchone()
+    assert (row['client'], row['matter']) == ("Smith", "Contract Review")
+
+
+def test_rollups_follow_interned_app_changes(db):
+    with db._get_connection() as conn:
+        conn.execute("UPDATE events SET app = 'EXCEL.EXE' WHERE app = 'chrome.exe'")
+    assert db.get_app_durations() == {"WINWORD.EXE": 600.0, "EXCEL.EXE": 60.0}
+
+
+def test_plain_events_table_is_converted(tmp_path):
+    """A database at version 4 keeps its ids, totals and search index."""
+    db_path = tmp_path / "legacy.db"
+    db = Database(str(db_path))
+    db.insert_events_batch([_event("2025-12-09T09:00:00+00:00"), _event("2025-12-09T09:01:00+00:00")])
+    db.close()
+
+    # Rebuild the pre-interning layout: a plain events table with the same rows
+    conn = sqlite3.connect(db_path)
+    conn.executescript("""
+        CREATE TABLE events_plain AS SELECT * FROM events;
+        DROP VIEW events;
+        DROP TABLE event_rows;
+        DROP TABLE apps;
+        DROP TABLE titles;
+        DROP TABLE cmdlines;
+        ALTER TABLE events_plain RENAME TO events;
+        PRAGMA user_version = 4;
+    """)
+    conn.close()
+
+    db = Database(str(db_path))
+
+    with sqlite3.connect(db_path) as conn:
+        assert conn.execute("PRAGMA user_version").fetchone()[0] == SCHEMA_VERSION
+        assert conn.execute("SELECT type FROM sqlite_master WHERE name = 'events'").fetchone()[0] == 'view'
+    assert [e['id'] for e in db.get_events()] == [1, 2]
+    assert db.get_statistics()['total_events'] == 2
+    assert len(db.search("smith")) == 2
+
+    new_id = db.insert_event(_event("2025-12-09T09:02:00+00:00"))
+    assert new_id == 3
+    assert db.get_app_durations() == {"WINWORD.EXE": 180.0}
+
+
+def test_timestamp_text_is_rebuilt_from_epoch_ms(tmp_path, monkeypatch):
+    """Migration 14 drops the ISO text from event_rows; the view rebuilds it."""
+    from syncopaid import database_schema
+
+    db_path = tmp_path / "v13.db"
+    monkeypatch.setattr(database_schema, 'MIGRATIONS', database_schema.MIGRATIONS[:13])
+    monkeypatch.setattr(database_schema, 'SCHEMA_VERSION', 13)
+    db = Database(str(db_path))
+    with db._get_connection() as conn:
+        conn.executemany(
+            "INSERT INTO events (timestamp, end_time, duration_seconds, app, title) VALUES (?, ?, 60, 'x.exe', 'Smith')",
+            [
+                ("2025-12-09T09:00:00.250000+00:00", "2025-12-09T09:01:00.250000+00:00"),
+                ("2025-12-09T23:30:00-05:00", None),
+                ("2025-12-09T11:00:00", "2025-12-09T11:01:00"),
+            ]
+        )
+        conn.execute("DELETE FROM events WHERE id = 3")
+    texts = [(e['timestamp'], e['end_time']) for e in db.get_events()]
+    db.close()
+    monkeypatch.undo()
+
+    db = Database(str(db_path))
+
+    with db._get_connection() as conn:
+        columns = {row[1] for row in conn.execute("PRAGMA table_info(event_rows)")}
+        assert 'timestamp' not in columns and 'end_time' not in columns
+        offsets = [row[0] for row in conn.execute("SELECT utc_offset_minutes FROM event_rows ORDER BY id")]
+    assert offsets == [0, -300]
+    assert [(e['timestamp'], e['end_time']) for e in db.get_events()] == texts
+    assert db.get_statistics()['total_events'] == 2
+    assert len(db.search("smith")) == 2
+
+    assert db.insert_event(_event("2025-12-10T09:00:00")) == 4
+    with db._get_connection() as conn:
+        conn.execute("UPDATE events SET timestamp = '2025-12-10T10:00:00+01:00' WHERE id = 4")
+        row = conn.execute("SELECT timestamp, start_ms FROM events WHERE id = 4").fetchone()
+    assert tuple(row) == ('2025-12-10T10:00:00+01:00', 1765357200000)
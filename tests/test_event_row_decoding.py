@@ -0,0 +1,101 @@
+"""Tests for schema-aware event row decoding and EventRecord."""
+import sqlite3
+
+import pytest
+
+from syncopaid.database import Database
+from syncopaid.database_benchmark import benchmark_row_decoding
+from syncopaid.database_operations_events_conversion import EventRecord, EVENT_FIELDS
+from syncopaid.tracker_state import ActivityEvent
+
+
+@pytest.fixture
+def db(tmp_path):
+    db = Database(str(tmp_path / "test.db"))
+    db.insert_events_batch(
+        [
+            ActivityEvent(
+                timestamp="2025-12-09T09:00:00+00:00",
+                duration_seconds=60.0,
+                app="WINWORD.EXE",
+                title="Smith-Contract.docx - Word",
+                cmdline=["WINWORD.EXE", "Smith-Contract.docx"],
+                metadata={"ui_element": "Document"}
+            ),
+            ActivityEvent(
+                timestamp="2025-12-09T09:01:00+00:00",
+                duration_seconds=30.0,
+                app="chrome.exe",
+                title="Inbox",
+                is_idle=True
+            ),
+        ],
+        [(4, 85, True), (None, 0, False)]
+    )
+    return db
+
+
+def test_decoded_dicts_keep_shape(db):
+    """Dictionaries carry every field, with decoded metadata and booleans."""
+    first, second = db.get_events()
+
+    assert tuple(first) == EVENT_FIELDS
+    assert first['metadata'] == {"ui_element": "Document"}
+    assert first['matter_id'] == 4
+    assert first['flagged_for_review'] is True
+    assert second['is_idle'] is True
+    assert second['interaction_level'] == 'passive'
+
+
+def test_records_equal_dicts(db):
+    """EventRecord compares equal to the dictionary form of the same row."""
+    records = db.get_events(as_records=True)
+
+    assert all(isinstance(r, EventRecord) for r in records)
+    assert records == db.get_events()
+    assert list(db.iter_events(as_records=True, batch_size=1)) == records
+
+
+def test_record_decodes_json_lazily(db):
+    """metadata and cmdline_args are parsed on first access only."""
+    record = db.get_events(as_records=True)[0]
+
+    assert record._metadata is EventRecord._UNDECODED
+    assert record.metadata == {"ui_element": "Document"}
+    assert record.cmdline_args == ["WINWORD.EXE", "Smith-Contract.docx"]
+    assert record['app'] == "WINWORD.EXE"
+    assert record.get('missing', 'default') == 'default'
+    with pytest.raises(KeyError):
+        record['missing']
+
+
+def test_legacy_schema_rows_decode(tmp_path):
+    """Rows from schemas without the newer columns get the old defaults."""
+    conn = sqlite3.connect(tmp_path / "legacy.db")
+    conn.row_factory = sqlite3.Row
+    conn.execute("""
+        CREATE TABLE events (
+            id INTEGER PRIMARY KEY, timestamp TEXT, duration_seconds REAL,
+            app TEXT, title TEXT, url TEXT, is_idle INTEGER
+        )
+    """)
+    conn.execute("INSERT INTO events VALUES (1, '2025-12-09T09:00:00', 5.0, 'a.exe', 't', NULL, 1)")
+    rows = conn.execute("SELECT * FROM events").fetchall()
+    conn.close()
+
+    db = Database(str(tmp_path / "test.db"))
+    event = db._rows_to_dicts(rows)[0]
+    record = db._rows_to_dicts(rows, as_records=True)[0]
+
+    assert event['state'] == 'Inactive'
+    assert event['end_time'] is None
+    assert event['cmdline'] is None
+    assert event['confidence'] == 0
+    assert event['flagged_for_review'] is False
+    assert record == event
+
+
+def test_row_decoding_benchmark_runs():
+    """Benchmark reports a timing for each decoder."""
+    results = benchmark_row_decoding(row_count=200)
+    assert set(results) == {'legacy_dicts', 'decoder_dicts', 'event_records'}
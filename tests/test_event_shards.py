@@ -0,0 +1,181 @@
+"""Tests for per-month shard files."""
+import pytest
+
+from syncopaid.database import Database
+from syncopaid.database_shards import month_bounds_ms, month_of_ms
+from syncopaid.tracker_state import ActivityEvent
+
+
+def _event(timestamp, title="Smith-Contract.docx - Word", app="WINWORD.EXE", is_idle=False):
+    return ActivityEvent(
+        timestamp=timestamp,
+        duration_seconds=60.0,
+        app=app,
+        title=title,
+        is_idle=is_idle
+    )
+
+
+# 2025-12-15 in epoch ms; December is the open month
+NOW_MS = month_bounds_ms("2025-12")[0] + 14 * 86400000
+
+
+@pytest.fixture
+def db(tmp_path):
+    db = Database(str(tmp_path / "test.db"))
+    db.insert_events_batch([
+        _event("2025-10-20T09:00:00+00:00", "Jones Estate Memo.docx - Word"),
+        _event("2025-11-03T09:00:00+00:00"),
+        _event("2025-11-03T10:00:00+00:00", "Inbox - Outlook", app="OUTLOOK.EXE", is_idle=True),
+        _event("2025-12-09T09:00:00+00:00"),
+    ])
+    return db
+
+
+def _ids(events):
+    return [event['id'] for event in events]
+
+
+def test_month_bounds():
+    start, end = month_bounds_ms("2025-12")
+    assert month_of_ms(start) == "2025-12"
+    assert month_of_ms(end) == "2026-01"
+    assert month_of_ms(end - 1) == "2025-12"
+
+
+def test_archive_moves_closed_months(db):
+    before = db.get_events()
+    stats = db.get_statistics()
+    durations = db.get_app_durations()
+
+    archived = db.archive_closed_months(now_ms=NOW_MS)
+
+    assert archived == {
+        "2025-10": {'events': 1, 'screenshots': 0},
+        "2025-11": {'events': 2, 'screenshots': 0},
+    }
+    assert db.list_shards() == ["2025-10", "2025-11"]
+    assert db.shard_path("2025-11").exists()
+    with db._get_connection() as conn:
+        assert conn.execute("SELECT COUNT(*) FROM events").fetchone()[0] == 1
+
+    assert db.get_events() == before
+    assert db.get_statistics() == stats
+    assert db.get_app_durations() == durations
+    assert db.archive_closed_months(now_ms=NOW_MS) == {}
+
+
+def test_queries_span_shards(db):
+    db.archive_closed_months(now_ms=NOW_MS)
+    all_ids = _ids(db.get_events())
+
+    assert _ids(db.get_events(start_date="2025-11-01", end_date="2025-11-30")) == all_ids[1:3]
+    assert _ids(db.get_events(include_idle=False)) == [all_ids[0], all_ids[1], all_ids[3]]
+    assert _ids(db.get_events(limit=2)) == all_ids[:2]
+    assert [e['id'] for e in db.iter_events(columns=['id'], batch_size=1)] == all_ids
+
+    assert db.count_events()['total_events'] == 4
+    assert db.count_events(app="OUTLOOK.EXE")['total_events'] == 1
+
+
+@pytest.mark.parametrize("descending", [False, True])
+def test_keyset_pages_cross_shards(db, descending):
+    db.archive_closed_months(now_ms=NOW_MS)
+    expected = _ids(db.get_events())
+    if descending:
+        expected.reverse()
+
+    seen, key = [], None
+    while True:
+        page, key = db.page_events(after_key=key, limit=3, descending=descending)
+        seen += _ids(page)
+        if key is None:
+            break
+    assert seen == expected
+
+
+def test_search_and_flags_reach_shards(db):
+    with db._get_connection() as conn:
+        conn.execute("UPDATE events SET flagged_for_review = 1 WHERE app = 'OUTLOOK.EXE'")
+    db.archive_closed_months(now_ms=NOW_MS)
+
+    assert [e['app'] for e in db.get_flagged_events()] == ["OUTLOOK.EXE"]
+
+    assert {r['title'] for r in db.search("memo")} == {"Jones Estate Memo.docx - Word"}
+    assert len(db.search("smith")) == 2
+    assert len(db.search("smith", limit=1)) == 1
+    assert [r['timestamp'][:10] for r in db.search("smith", start_date="2025-12-01")] == ["2025-12-09"]
+
+
+def test_new_rows_for_archived_month_are_merged(db):
+    db.archive_closed_months(now_ms=NOW_MS)
+    db.insert_events_batch([_event("2025-11-20T09:00:00+00:00", "Late arrival")])
+
+    november = db.get_events(start_date="2025-11-01", end_date="2025-11-30")
+    assert [e['title'] for e in november][-1] == "Late arrival"
+
+    db.archive_month("2025-11")
+    assert db.get_events(start_date="2025-11-01", end_date="2025-11-30") == november
+    assert db.get_statistics()['total_events'] == 5
+
+
+def test_pending_screenshots_stay_in_main(db):
+    pending = db.insert_screenshot("2025-11-03T09:00:30+00:00", "/tmp/a.jpg", "WINWORD.EXE", "Doc")
+    done = db.insert_screenshot("2025-11-03T09:00:40+00:00", "/tmp/b.jpg", "WINWORD.EXE", "Doc")
+    db.update_screenshot_analysis(done, '{"summary": "drafting Henderson agreement"}')
+
+    moved = db.archive_month("2025-11")
+
+    assert moved['screenshots'] == 1
+    assert [s['id'] for s in db.get_screenshots()] == [done, pending]
+    assert [r['id'] for r in db.search("henderson")] == [done]
+
+    assert db.delete_screenshots_securely([done, pending]) == 2
+    assert db.get_screenshots() == []
+
+
+def test_delete_range_drops_covered_shard(db):
+    db.archive_closed_months(now_ms=NOW_MS)
+
+    assert db.delete_events(start_date="2025-11-01", end_date="2025-11-30") == 2
+    assert db.list_shards() == ["2025-10"]
+    assert not db.shard_path("2025-11").exists()
+    assert db.get_statistics()['total_events'] == 2
+
+    assert db.delete_events(start_date="2025-10-20", end_date="2025-10-20") == 1
+    assert db.list_shards() == ["2025-10"]
+    assert db.get_statistics()['total_events'] == 1
+
+
+def test_delete_by_id_and_rebuild(db):
+    db.archive_closed_months(now_ms=NOW_MS)
+    memo_id = db.search("memo")[0]['id']
+
+    assert db.delete_events_by_ids([memo_id]) == 1
+    assert db.search("memo") == []
+    assert db.get_statistics()['total_events'] == 3
+
+    db.rebuild_daily_rollups()
+    assert db.get_statistics()['total_events'] == 3
+
+
+def test_shards_found_on_reopen(db, tmp_path):
+    db.archive_closed_months(now_ms=NOW_MS)
+    expected = db.get_events()
+    db.close()
+
+    reopened = Database(str(tmp_path / "test.db"))
+    assert reopened.list_shards() == ["2025-10", "2025-11"]
+    assert reopened.get_events() == expected
+
+
+def test_shard_read_refuses_to_commit_outer_transaction(db):
+    """A range read needing a shard does not commit the caller's pending writes."""
+    db.archive_closed_months(now_ms=NOW_MS)
+
+    with pytest.raises(RuntimeError):
+        with db._get_connection():
+            db.insert_event(_event("2025-12-10T09:00:00+00:00", "Uncommitted"))
+            db.get_events()
+
+    assert "Uncommitted" not in [event['title'] for event in db.get_events()]
@@ -0,0 +1,151 @@
+"""Tests for the write-behind event writer."""
+import time
+
+import pytest
+
+from syncopaid.database import Database
+from syncopaid.event_writer import EventWriter
+from syncopaid.tracker_state import ActivityEvent
+
+
+def _event(i=0):
+    return ActivityEvent(
+        timestamp=f"2025-12-17T10:{i:02d}:00",
+        duration_seconds=60.0,
+        app="WINWORD.EXE",
+        title=f"Smith-Contract-v{i}.docx - Word",
+        is_idle=False
+    )
+
+
+@pytest.fixture
+def db(tmp_path):
+    return Database(str(tmp_path / "test.db"))
+
+
+def test_insert_events_batch_stores_categorization(db):
+    """Batch inserts keep matter_id, confidence and flagged_for_review."""
+    db.insert_events_batch(
+        [_event(0), _event(1)],
+        [(7, 90, False), (None, 0, True)]
+    )
+
+    events = db.get_events()
+    assert (events[0]['matter_id'], events[0]['confidence'], events[0]['flagged_for_review']) == (7, 90, False)
+    assert (events[1]['matter_id'], events[1]['confidence'], events[1]['flagged_for_review']) == (None, 0, True)
+
+
+def test_insert_events_batch_rejects_mismatched_categorizations(db):
+    """Categorizations must line up with events."""
+    with pytest.raises(ValueError):
+        db.insert_events_batch([_event(0)], [])
+
+
+def test_events_buffered_until_flush(db):
+    """Submitted events are held until the flush window or an explicit flush."""
+    writer = EventWriter(db, flush_interval=60.0, batch_size=100)
+    writer.start()
+
+    writer.submit(_event(0), matter_id=3, confidence=100)
+    writer.submit(_event(1))
+    assert db.get_events() == []
+
+    assert writer.flush()
+    events = db.get_events()
+    assert len(events) == 2
+    assert events[0]['matter_id'] == 3
+    writer.stop()
+
+
+def test_batch_size_triggers_single_transaction(db):
+    """Reaching batch_size writes the batch as one flush."""
+    writer = EventWriter(db, flush_interval=60.0, batch_size=5)
+    writer.start()
+
+    for i in range(5):
+        writer.submit(_event(i))
+
+    deadline = time.monotonic() + 5
+    while writer.get_statistics()['events_written'] < 5 and time.monotonic() < deadline:
+        time.sleep(0.01)
+
+    stats = writer.get_statistics()
+    assert stats['events_written'] == 5
+    assert stats['flush_count'] == 1
+    writer.stop()
+
+
+def test_flush_interval_writes_partial_batch(db):
+    """A partial batch is written once the flush window elapses."""
+    writer = EventWriter(db, flush_interval=0.05, batch_size=100)
+    writer.start()
+
+    writer.submit(_event(0))
+
+    deadline = time.monotonic() + 5
+    while not db.get_events() and time.monotonic() < deadline:
+        time.sleep(0.01)
+
+    assert len(db.get_events()) == 1
+    writer.stop()
+
+
+def test_stop_flushes_pending_events(db):
+    """Shutdown writes everything still buffered."""
+    writer = EventWriter(db, flush_interval=60.0, batch_size=100)
+    writer.start()
+    for i in range(3):
+        writer.submit(_event(i))
+
+    writer.stop()
+
+    assert len(db.get_events()) == 3
+
+
+def test_full_queue_falls_back_to_direct_write(db):
+    """When the queue is full the event is written synchronously, not dropped."""
+    writer = EventWriter(db, flush_interval=60.0, batch_size=100, max_queue_size=1)
+    writer._running = True  # Simulate a stalled writer thread
+    writer.submit(_event(0))
+
+    writer.submit(_event(1))
+
+    assert writer.get_statistics()['direct_writes'] == 1
+    assert len(db.get_events()) == 1
+
+
+def test_failed_batch_falls_back_to_single_inserts(db, monkeypatch):
+    """A batch whose transaction fails is retried event by event, not dropped."""
+    def broken_batch(events, categorizations):
+        raise RuntimeError("disk I/O error")
+
+    monkeypatch.setattr(db, 'insert_events_batch', broken_batch)
+    writer = EventWriter(db, flush_interval=60.0, batch_size=100)
+    writer.start()
+    writer.submit(_event(0))
+    writer.submit(_event(1), matter_id=None, confidence=80)
+    writer.flush()
+
+    stats = writer.get_statistics()
+    assert stats['events_written'] == 2
+    assert stats['events_failed'] == 0
+    assert len(db.get_events()) == 2
+    writer.stop()
+
+
+def test_statistics_report_queue_and_flush_latency(db):
+    """Counters expose queue depth and flush latency."""
+    writer = EventWriter(db, flush_interval=60.0, batch_size=100)
+    writer.start()
+    writer.submit(_event(0))
+    writer.submit(_event(1))
+    writer.flush()
+
+    stats = writer.get_statistics()
+    assert stats['queue_depth'] == 0
+    assert stats['max_queue_depth'] >= 1
+    assert stats['events_submitted'] == 2
+    assert stats['flush_count'] == 1
+    assert stats['last_flush_ms'] > 0
+    assert stats['avg_flush_ms'] == stats['last_flush_ms']
+    writer.stop()
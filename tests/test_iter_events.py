@@ -0,0 +1,150 @@
+"""Tests for the streaming event iterator and its callers."""
+import json
+
+import pytest
+
+from syncopaid.database import Database
+from syncopaid.exporter import Exporter
+from syncopaid.timeline_view_models import get_timeline_blocks
+from syncopaid.tracker_state import ActivityEvent
+
+
+@pytest.fixture
+def db(tmp_path):
+    db = Database(str(tmp_path / "test.db"))
+    events = [
+        ActivityEvent(
+            timestamp=f"2025-12-09T09:{i:02d}:00+00:00",
+            duration_seconds=60.0,
+            end_time=f"2025-12-09T09:{i:02d}:59+00:00",
+            app="WINWORD.EXE" if i % 2 else "chrome.exe",
+            title=f"Document {i}",
+            is_idle=(i % 5 == 0),
+            metadata={"n": str(i)} if i == 3 else None
+        )
+        for i in range(12)
+    ]
+    db.insert_events_batch(events)
+    return db
+
+
+def test_iter_events_matches_get_events(db):
+    """Full-row iteration yields the same dictionaries as get_events()."""
+    assert list(db.iter_events(batch_size=5)) == db.get_events()
+
+
+def test_iter_events_is_lazy_generator(db):
+    """Rows are produced on demand rather than materialized up front."""
+    iterator = db.iter_events(batch_size=2)
+    first = next(iterator)
+    assert first['title'] == "Document 0"
+    iterator.close()
+
+
+def test_iter_events_holds_no_transaction_between_batches(db):
+    """Writes made while the generator is suspended commit immediately."""
+    iterator = db.iter_events(batch_size=2)
+    next(iterator)
+
+    db.insert_event(ActivityEvent(
+        timestamp="2025-12-09T10:00:00+00:00",
+        duration_seconds=60.0,
+        app="EXCEL.EXE",
+        title="Written mid-iteration",
+        is_idle=False
+    ))
+
+    other = Database(db.db_path)
+    titles = [event['title'] for event in other.get_events()]
+    assert "Written mid-iteration" in titles
+    assert len(list(iterator)) == 12
+
+
+def test_iter_events_keyset_handles_equal_start_times(tmp_path):
+    """Rows sharing a start time are neither skipped nor repeated across batches."""
+    db = Database(str(tmp_path / "ties.db"))
+    db.insert_events_batch([
+        ActivityEvent(
+            timestamp="2025-12-09T09:00:00+00:00",
+            duration_seconds=1.0,
+            app="chrome.exe",
+            title=f"Tab {i}",
+            is_idle=False
+        )
+        for i in range(7)
+    ])
+
+    titles = [event['title'] for event in db.iter_events(columns=('title',), batch_size=3)]
+    assert titles == [f"Tab {i}" for i in range(7)]
+
+
+def test_iter_events_selected_columns(db):
+    """Requesting columns yields only those columns, with is_idle as bool."""
+    rows = list(db.iter_events(columns=('app', 'is_idle')))
+
+    assert len(rows) == 12
+    assert set(rows[0]) == {'app', 'is_idle'}
+    assert rows[0]['is_idle'] is True
+
+
+def test_iter_events_filters(db):
+    """Date range and include_idle filters match get_events()."""
+    active = list(db.iter_events(start_date="2025-12-09", end_date="2025-12-09", include_idle=False))
+    assert len(active) == 9
+    assert list(db.iter_events(start_date="2025-12-10")) == []
+
+
+def test_iter_events_rejects_unknown_columns(db):
+    """Column names are validated before being placed in SQL."""
+    with pytest.raises(ValueError):
+        list(db.iter_events(columns=('app; DROP TABLE events',)))
+
+
+def test_daily_summary_totals(db):
+    """Daily summary is aggregated without loading events."""
+    summary = db.get_daily_summary("2025-12-09")
+
+    assert summary['total_events'] == 12
+    assert summary['total_duration_seconds'] == 720.0
+    assert summary['idle_duration_seconds'] == 180.0
+    assert summary['active_duration_seconds'] == 540.0
+    assert summary['unique_applications'] == 2
+
+
+def test_export_to_json_streams_same_document(db, tmp_path):
+    """Streamed export produces valid JSON with the expected header and events."""
+    output = tmp_path / "export.json"
+    result = Exporter(db).export_to_json(str(output), start_date="2025-12-09", end_date="2025-12-09")
+
+    data = json.loads(output.read_text())
+    assert result['events_exported'] == 12
+    assert data['total_events'] == 12
+    assert data['active_duration_seconds'] == 540.0
+    assert len(data['events']) == 12
+    assert data['events'][0] == {
+        "timestamp": "2025-12-09T09:00:00+00:00",
+        "duration_seconds": 60.0,
+        "end_time": "2025-12-09T09:00:59+00:00",
+        "app": "chrome.exe",
+        "title": "Document 0",
+        "url": None,
+        "is_idle": True,
+        "state": "Active",
+    }
+
+
+def test_export_to_json_empty_range(db, tmp_path):
+    """An empty range still writes a valid document."""
+    output = tmp_path / "empty.json"
+    for pretty in (True, False):
+        Exporter(db).export_to_json(str(output), start_date="2030-01-01", pretty_print=pretty)
+        assert json.loads(output.read_text())['events'] == []
+
+
+def test_timeline_blocks_from_stream(db):
+    """Timeline blocks are built from streamed rows."""
+    blocks = get_timeline_blocks(db, "2025-12-09", app_filter="WINWORD.EXE")
+
+    assert len(blocks) == 6
+    assert all(block.app == "WINWORD.EXE" for block in blocks)
+    assert blocks[0].duration_seconds == 59.0
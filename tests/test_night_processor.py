@@ -61,3 +61,18 @@ def test_trigger_manual():
 
     assert result == 10
     mock_process.assert_called_once_with(50)
+
+
+def test_maintenance_runs_once_per_night():
+    maintenance = MagicMock()
+    processor = NightProcessor(start_hour=18, end_hour=8, run_maintenance=maintenance)
+    with patch('syncopaid.night_processor.datetime') as mock_dt:
+        mock_dt.now.return_value = datetime(2024, 1, 1, 23, 0)
+        processor._run_maintenance_once()
+        mock_dt.now.return_value = datetime(2024, 1, 2, 3, 0)  # Same night
+        processor._run_maintenance_once()
+        assert maintenance.call_count == 1
+
+        mock_dt.now.return_value = datetime(2024, 1, 2, 22, 0)  # Next night
+        processor._run_maintenance_once()
+        assert maintenance.call_count == 2
@@ -0,0 +1,119 @@
+"""Tests for keyset-paginated event browsing."""
+import pytest
+
+from syncopaid.database import Database
+from syncopaid.database_time import to_epoch_ms
+from syncopaid.main_ui_event_pager import EventTreeLoader, MAIN_WINDOW_COLUMNS
+from syncopaid.tracker_state import ActivityEvent
+
+
+@pytest.fixture
+def db(tmp_path):
+    db = Database(str(tmp_path / "test.db"))
+    events = [
+        ActivityEvent(
+            timestamp=f"2025-12-09T09:{i // 2:02d}:00+00:00",  # pairs share a timestamp
+            duration_seconds=60.0,
+            app="WINWORD.EXE" if i % 3 else "chrome.exe",
+            title=f"Document {i}",
+            is_idle=(i == 4)
+        )
+        for i in range(25)
+    ]
+    db.insert_events_batch(events)
+    return db
+
+
+def _all_pages(db, **kwargs):
+    ids, key = [], None
+    while True:
+        page, key = db.page_events(after_key=key, **kwargs)
+        ids.extend(e['id'] for e in page)
+        if key is None:
+            return ids
+
+
+@pytest.mark.parametrize("descending", [False, True])
+def test_pages_cover_range_without_gaps(db, descending):
+    """Walking every page returns each event once, including timestamp ties."""
+    expected = [e['id'] for e in db.get_events()]
+    if descending:
+        expected.reverse()
+
+    assert _all_pages(db, limit=4, descending=descending) == expected
+
+
+def test_page_filters(db):
+    """Idle, app and ms range filters apply to pages and counts alike."""
+    start_ms = to_epoch_ms("2025-12-09T09:05:00+00:00")
+    kwargs = dict(start_ms=start_ms, include_idle=False, app="WINWORD.EXE")
+
+    ids = _all_pages(db, limit=3, **kwargs)
+    totals = db.count_events(**kwargs)
+
+    assert ids == [e['id'] for e in db.get_events()
+                   if e['app'] == "WINWORD.EXE" and not e['is_idle']
+                   and e['timestamp'] >= "2025-12-09T09:05:00+00:00"]
+    assert totals == {'total_events': len(ids), 'total_duration_seconds': 60.0 * len(ids)}
+
+
+def test_page_selected_columns_include_key(db):
+    """Selected-column pages still carry the key columns."""
+    page, key = db.page_events(limit=2, columns=('title',))
+
+    assert set(page[0]) == {'title', 'id', 'start_ms'}
+    assert key == (page[-1]['start_ms'], page[-1]['id'])
+    with pytest.raises(ValueError):
+        db.page_events(columns=('title; DROP TABLE events',))
+
+
+def test_page_query_uses_start_index(db):
+    """Continuation pages seek the start_ms index instead of sorting the range."""
+    statements = []
+    with db._get_connection() as conn:
+        conn.set_trace_callback(statements.append)
+        db.page_events(after_key=(0, 0), limit=5, include_idle=False, descending=True)
+        conn.set_trace_callback(None)
+        plan = " | ".join(row[3] for row in conn.execute("EXPLAIN QUERY PLAN " + statements[-1]))
+
+    assert "idx_events_start_state" in plan
+    # Only ties on start_ms may need sorting ("RIGHT PART OF ORDER BY")
+    assert "USE TEMP B-TREE FOR ORDER BY" not in plan
+
+
+class _FakeTree:
+    """Minimal stand-in for ttk.Treeview."""
+
+    def __init__(self):
+        self.rows = []
+        self.idle_callbacks = []
+
+    def insert(self, parent, index, values):
+        self.rows.append(values)
+
+    def after_idle(self, callback):
+        self.idle_callbacks.append(callback)
+
+
+def test_tree_loader_fetches_pages_on_scroll(db):
+    """The loader adds a page when the view nears the bottom, until exhausted."""
+    tree = _FakeTree()
+    loader = EventTreeLoader(tree, db, page_size=10)
+
+    assert loader.load_next_page() == 10
+    assert tree.rows[0][5] == "Document 24"  # newest first
+
+    loader.on_scroll(0.0, 0.3)
+    assert tree.idle_callbacks == []
+
+    loader.on_scroll(0.5, 0.9)
+    loader.on_scroll(0.5, 0.95)  # no duplicate request while one is pending
+    assert len(tree.idle_callbacks) == 1
+    tree.idle_callbacks.pop()()
+
+    while loader.has_more:
+        loader.load_next_page()
+
+    assert len(tree.rows) == 24
+    assert loader.get_totals() == (24 * 60.0, 24)
+    assert len(MAIN_WINDOW_COLUMNS) == len(tree.rows[0])
@@ -0,0 +1,72 @@
+"""Tests for the PID-keyed process metadata cache."""
+from syncopaid.tracker_windows_process import ProcessInfoCache
+
+
+class FakeProcess:
+    """Stand-in for psutil.Process backed by a pid -> process table."""
+
+    table = {}
+    reads = 0
+
+    def __init__(self, pid):
+        if pid not in self.table:
+            raise ValueError(f"no process {pid}")
+        self.pid = pid
+
+    def create_time(self):
+        return self.table[self.pid][0]
+
+    def name(self):
+        FakeProcess.reads += 1
+        return self.table[self.pid][1]
+
+    def cmdline(self):
+        return list(self.table[self.pid][2])
+
+
+def make_cache(max_entries=64):
+    FakeProcess.table = {
+        100: (1000.0, 'WINWORD.EXE', ['WINWORD.EXE', 'C:\\Users\\jane\\Smith.docx']),
+        200: (1001.0, 'chrome.exe', ['chrome.exe', '--profile-directory=Default']),
+        300: (1002.0, 'OUTLOOK.EXE', []),
+    }
+    FakeProcess.reads = 0
+    return ProcessInfoCache(max_entries=max_entries, process_factory=FakeProcess)
+
+
+def test_repeated_lookups_hit_cache_with_redacted_cmdline():
+    cache = make_cache()
+    for _ in range(5):
+        name, cmdline = cache.lookup(100)
+    assert name == 'WINWORD.EXE'
+    assert cmdline == ['WINWORD.EXE', '[REDACTED_PATH]\\Smith.docx']
+    assert cache.lookup(300) == ('OUTLOOK.EXE', None)
+    assert FakeProcess.reads == 2
+    assert cache.stats() == {'entries': 2, 'hits': 4, 'misses': 2, 'evictions': 0}
+
+    # Callers get their own list
+    cmdline.append('mutated')
+    assert cache.lookup(100)[1] == ['WINWORD.EXE', '[REDACTED_PATH]\\Smith.docx']
+
+
+def test_reused_pid_is_not_served_stale_metadata():
+    cache = make_cache()
+    assert cache.lookup(100)[0] == 'WINWORD.EXE'
+    FakeProcess.table[100] = (2000.0, 'notepad.exe', ['notepad.exe'])
+    assert cache.lookup(100) == ('notepad.exe', ['notepad.exe'])
+    del FakeProcess.table[100]
+    assert cache.lookup(100) == (None, None)
+
+
+def test_least_recently_used_entry_is_evicted():
+    cache = make_cache(max_entries=2)
+    cache.lookup(100)
+    cache.lookup(200)
+    cache.lookup(100)
+    cache.lookup(300)  # evicts 200
+    reads = FakeProcess.reads
+    cache.lookup(100)
+    assert FakeProcess.reads == reads
+    cache.lookup(200)
+    assert FakeProcess.reads == reads + 1
+    assert cache.evictions == 2
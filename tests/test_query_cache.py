@@ -0,0 +1,86 @@
+"""Tests for the read-through query cache."""
+import sqlite3
+
+import pytest
+
+from syncopaid.database import Database
+from syncopaid.tracker_state import ActivityEvent
+
+
+def _event(timestamp):
+    return ActivityEvent(
+        timestamp=timestamp,
+        duration_seconds=60.0,
+        app="WINWORD.EXE",
+        title="Smith-Contract.docx - Word",
+        is_idle=False
+    )
+
+
+@pytest.fixture
+def db(tmp_path):
+    db = Database(str(tmp_path / "test.db"), query_cache_size=8)
+    db.insert_client("Smith")
+    return db
+
+
+def _stats(db):
+    stats = db.get_query_cache_stats()
+    return stats['hits'], stats['misses']
+
+
+def test_disabled_by_default(tmp_path):
+    db = Database(str(tmp_path / "test.db"))
+    db.get_clients()
+    db.get_clients()
+    assert db.get_query_cache_stats() == {
+        'enabled': False, 'entries': 0, 'max_entries': 0, 'hits': 0, 'misses': 0
+    }
+
+
+def test_repeated_reads_hit(db):
+    first = db.get_clients()
+    first[0]['display_name'] = "mutated by caller"
+
+    assert [c['display_name'] for c in db.get_clients()] == ["Smith"]
+    assert _stats(db) == (1, 1)
+
+
+def test_declared_writes_invalidate_only_their_tables(db):
+    db.get_clients()
+    db.get_statistics()
+
+    db.insert_events_batch([_event("2025-12-09T09:00:00+00:00")])
+    assert db.get_statistics()['total_events'] == 1
+    db.get_clients()
+    assert _stats(db) == (1, 3)
+
+    db.update_client(1, "Smith & Co")
+    assert [c['display_name'] for c in db.get_clients()] == ["Smith & Co"]
+
+
+def test_undeclared_write_invalidates_everything(db):
+    db.get_clients()
+    with db._get_connection() as conn:
+        conn.execute("UPDATE clients SET display_name = 'Raw'")
+    assert [c['display_name'] for c in db.get_clients()] == ["Raw"]
+
+
+def test_external_commit_detected(db):
+    db.get_clients()
+    with sqlite3.connect(db.db_path) as other:
+        other.execute("UPDATE clients SET display_name = 'External'")
+    assert [c['display_name'] for c in db.get_clients()] == ["External"]
+
+
+def test_lru_eviction(tmp_path):
+    db = Database(str(tmp_path / "test.db"), query_cache_size=2)
+    db.get_matter_keywords(1)
+    db.get_matter_keywords(2)
+    db.get_matter_keywords(1)
+    db.get_matter_keywords(3)  # evicts matter 2
+
+    db.get_matter_keywords(1)
+    db.get_matter_keywords(2)
+    assert db.get_query_cache_stats()['entries'] == 2
+    assert _stats(db) == (2, 4)
@@ -0,0 +1,130 @@
+"""Tests for the screenshots.event_id link to events."""
+import pytest
+
+from syncopaid.database import Database
+from syncopaid.tracker_state import ActivityEvent
+
+
+def _event(timestamp, duration=60.0):
+    return ActivityEvent(
+        timestamp=timestamp,
+        duration_seconds=duration,
+        app="WINWORD.EXE",
+        title="Smith-Contract.docx - Word",
+        is_idle=False
+    )
+
+
+@pytest.fixture
+def db(tmp_path):
+    return Database(str(tmp_path / "test.db"))
+
+
+def _links(db):
+    return {s['captured_at'][11:19]: s['event_id'] for s in db.get_screenshots()}
+
+
+def test_screenshot_links_to_stored_event(db):
+    event_id = db.insert_event(_event("2025-12-09T09:00:00+00:00"))
+    db.insert_screenshot("2025-12-09T09:00:30+00:00", "a.jpg")
+    db.insert_screenshot("2025-12-09T09:01:30+00:00", "b.jpg")
+    db.insert_screenshot("2025-12-09T09:00:40+00:00", "c.jpg", event_id=999)
+
+    assert _links(db) == {"09:00:30": event_id, "09:01:30": None, "09:00:40": 999}
+
+
+def test_event_claims_earlier_screenshots(db):
+    db.insert_screenshot("2025-12-09T09:00:30+00:00", "a.jpg")
+    db.insert_screenshot("2025-12-09T09:01:30+00:00", "b.jpg")
+    first, second = (db.insert_event(_event(f"2025-12-09T09:0{i}:00+00:00")) for i in range(2))
+
+    assert _links(db) == {"09:00:30": first, "09:01:30": second}
+    shots = db.get_screenshots_for_events([second, first])
+    assert [(s['file_path'], s['event_id']) for s in shots] == [("a.jpg", first), ("b.jpg", second)]
+    assert db.get_screenshots_for_events([]) == []
+
+
+def _backfill(db, batch_size):
+    linked, calls, more = 0, 0, True
+    while more:
+        count, more = db.link_screenshots_to_events(batch_size)
+        linked += count
+        calls += 1
+    return linked, calls
+
+
+def _forget_links(db):
+    """Simulate screenshots stored before the link existed."""
+    with db._get_connection() as conn:
+        conn.execute("UPDATE screenshots SET event_id = NULL")
+        conn.execute("DELETE FROM screenshot_link_state")
+        conn.execute("INSERT INTO screenshot_link_state (target_id) SELECT MAX(id) FROM screenshots")
+
+
+def test_backfill_sweep_links_history(db):
+    db.insert_events_batch([
+        _event("2025-12-09T09:00:00+00:00"),
+        _event("2025-12-09T09:01:00+00:00", duration=30.0),
+        _event("2025-12-09T09:05:00+00:00"),
+    ])
+    for stamp in ("09:00:10", "09:00:50", "09:01:10", "09:01:45", "09:05:05", "09:09:00"):
+        db.insert_screenshot(f"2025-12-09T{stamp}+00:00", f"{stamp}.jpg")
+    _forget_links(db)
+
+    ids = [e['id'] for e in db.get_events()]
+    assert _backfill(db, batch_size=2) == (4, 4)
+    assert _links(db) == {
+        "09:00:10": ids[0], "09:00:50": ids[0], "09:01:10": ids[1],
+        "09:01:45": None, "09:05:05": ids[2], "09:09:00": None,
+    }
+
+    # Unlinkable screenshots are not rescanned once the sweep has finished
+    assert db.link_screenshots_to_events(2) == (0, False)
+
+
+def test_backfill_resumes_within_equal_capture_times(db):
+    """A batch ending inside a run of equal timestamps does not skip the rest."""
+    event_id = db.insert_event(_event("2025-12-09T09:00:00+00:00"))
+    for name in "abc":
+        db.insert_screenshot("2025-12-09T09:00:30+00:00", f"{name}.jpg")
+    _forget_links(db)
+
+    assert _backfill(db, batch_size=2) == (3, 2)
+    assert {s['event_id'] for s in db.get_screenshots()} == {event_id}
+
+
+def test_compaction_moves_links_to_kept_event(db):
+    first, second = (
+        db.insert_event(_event(f"2025-12-09T09:0{i}:00+00:00")) for i in range(2)
+    )
+    db.insert_screenshot("2025-12-09T09:01:30+00:00", "b.jpg")
+
+    db.compact_events(start_date="2025-12-09", end_date="2025-12-09")
+
+    assert _links(db) == {"09:01:30": first}
+
+
+def test_deleting_events_clears_links(db):
+    first, second = (
+        db.insert_event(_event(f"2025-12-09T09:0{i}:00+00:00")) for i in range(2)
+    )
+    db.insert_screenshot("2025-12-09T09:00:30+00:00", "a.jpg")
+    db.insert_screenshot("2025-12-09T09:01:30+00:00", "b.jpg")
+
+    db.delete_events_by_ids([first])
+    assert _links(db) == {"09:00:30": None, "09:01:30": second}
+
+    db.delete_events(start_date="2025-12-09", end_date="2025-12-09")
+    assert _links(db) == {"09:00:30": None, "09:01:30": None}
+
+
+def test_secure_deletion_removes_linked_screenshots(db, tmp_path):
+    """Screenshots follow their event even when captured after the range."""
+    db.insert_event(_event("2025-12-09T23:59:00+00:00", duration=120.0))
+    late = tmp_path / "late.jpg"
+    late.write_bytes(b"x" * 10)
+    db.insert_screenshot("2025-12-10T00:00:30+00:00", str(late))
+
+    assert db.delete_events_securely(start_date="2025-12-09", end_date="2025-12-09") == 1
+    assert db.get_screenshots() == []
+    assert not late.exists()
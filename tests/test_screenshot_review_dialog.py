@@ -95,6 +95,48 @@ def test_delete_selected_calls_secure_delete():
         root.destroy()
 
 
+def test_delete_selected_uses_deletion_engine():
+    """With an engine, files are shredded in the background and progress is shown."""
+    from syncopaid.screenshot_review_dialog import ScreenshotReviewDialog
+
+    mock_db = MagicMock()
+    mock_db.get_screenshots.return_value = [
+        {'id': 1, 'captured_at': '2025-12-23T10:00:00', 'file_path': '/path/1.jpg', 'window_title': 'Test1'},
+    ]
+    mock_db.get_deletion_job.return_value = {'screenshots_deleted': 1}
+    engine = MagicMock()
+    engine.submit_screenshots.return_value = 7
+    engine.get_job_progress.return_value = {
+        'status': 'shredding', 'files_shredded': 0, 'files_queued': 1, 'bytes_per_second': 0.0
+    }
+
+    try:
+        root = tk.Tk()
+        root.withdraw()
+    except tk.TclError:
+        pytest.skip("tkinter not available in headless environment")
+
+    dialog = None
+    try:
+        dialog = ScreenshotReviewDialog(root, mock_db, deletion_engine=engine)
+        dialog.show()
+        dialog.listbox.curselection = MagicMock(return_value=(0,))
+        dialog.status_var = MagicMock()
+
+        with patch('tkinter.messagebox.askyesno', return_value=True), \
+             patch('tkinter.messagebox.showinfo'):
+            dialog._delete_selected()
+
+        engine.submit_screenshots.assert_called_once_with([1])
+        engine.get_job_progress.assert_called_with(7)
+        mock_db.delete_screenshots_securely.assert_not_called()
+        dialog.status_var.set.assert_called_with("Shredding files: 0/1 (0.0 MB/s)")
+    finally:
+        if dialog and dialog.window:
+            dialog.window.destroy()
+        root.destroy()
+
+
 def test_show_screenshot_review_dialog_function():
     """Test the convenience function for showing the dialog."""
     from syncopaid.screenshot_review_dialog import show_screenshot_review_dialog
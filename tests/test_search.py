@@ -0,0 +1,107 @@
+"""Tests for the FTS5 full-text search index."""
+import sqlite3
+
+import pytest
+
+from syncopaid.database import Database
+from syncopaid.database_search import build_fts_query
+from syncopaid.tracker_state import ActivityEvent
+
+
+def _event(timestamp, title, app="WINWORD.EXE", url=None):
+    return ActivityEvent(
+        timestamp=timestamp,
+        duration_seconds=60.0,
+        app=app,
+        title=title,
+        url=url,
+        is_idle=False
+    )
+
+
+@pytest.fixture
+def db(tmp_path):
+    db = Database(str(tmp_path / "test.db"))
+    db.insert_events_batch([
+        _event("2025-12-09T09:00:00+00:00", "Smith-Contract-v2.docx - Word"),
+        _event("2025-12-09T09:05:00+00:00", "CanLII - 2024 BCSC 1234 - Google Chrome",
+               app="chrome.exe", url="https://www.canlii.org/en/bc/bcsc/"),
+        _event("2025-12-10T09:00:00+00:00", "Jones Estate Memo.docx - Word"),
+        _event("2025-12-11T09:00:00+00:00", "Smith v. Jones - Statement of Claim.pdf"),
+    ])
+    return db
+
+
+def test_build_fts_query_quotes_words():
+    assert build_fts_query('smith contr*') == '"smith" "contr"*'
+    assert build_fts_query('C:\\Users "x"') == '"C:\\Users" """x"""'
+    assert build_fts_query(' - * ') == ''
+
+
+def test_search_matches_title_and_url(db):
+    titles = {r['title'] for r in db.search("smith")}
+    assert titles == {"Smith-Contract-v2.docx - Word", "Smith v. Jones - Statement of Claim.pdf"}
+
+    results = db.search("canlii.org")
+    assert [r['app'] for r in results] == ["chrome.exe"]
+    assert results[0]['source'] == 'event'
+
+
+def test_search_respects_date_range_and_limit(db):
+    results = db.search("smith", start_date="2025-12-10", end_date="2025-12-11")
+    assert [r['title'] for r in results] == ["Smith v. Jones - Statement of Claim.pdf"]
+    assert len(db.search("docx", limit=1)) == 1
+    assert db.search("   ") == []
+
+
+def test_search_tracks_updates_and_deletes(db):
+    event_id = db.search("Memo")[0]['id']
+    with db._get_connection() as conn:
+        conn.execute("UPDATE events SET title = 'Renamed Brief' WHERE id = ?", (event_id,))
+    assert db.search("Memo") == []
+    assert [r['id'] for r in db.search("brief")] == [event_id]
+
+    db.delete_events_by_ids([event_id])
+    assert db.search("brief") == []
+
+
+def test_search_screenshot_analysis(db):
+    screenshot_id = db.insert_screenshot(
+        "2025-12-09T10:00:00+00:00", "/tmp/shot.jpg", "AcroRd32.exe", "Brief.pdf"
+    )
+    db.update_screenshot_analysis(screenshot_id, '{"summary": "reviewing Henderson affidavit"}')
+
+    results = db.search("henderson")
+    assert [(r['source'], r['id']) for r in results] == [('screenshot', screenshot_id)]
+    assert '[henderson]' in results[0]['snippet'].lower()
+
+
+def test_backfill_indexes_existing_database(tmp_path):
+    path = str(tmp_path / "legacy.db")
+    db = Database(path)
+    db.insert_events_batch([
+        _event(f"2025-12-09T09:{i:02d}:00+00:00", f"Smith file note {i}") for i in range(5)
+    ])
+    db.close()
+
+    # Simulate a database created before the search index existed
+    conn = sqlite3.connect(path)
+    conn.executescript("""
+        DROP TABLE events_fts;
+        DROP TABLE screenshots_fts;
+        DROP TABLE search_index_state;
+        PRAGMA user_version = 3;
+    """)
+    conn.close()
+
+    db = Database(path, persistent_connections=False)
+    assert db.search("smith") == []
+
+    assert db.backfill_search_index(batch_size=2) == 3
+    db.insert_events_batch([_event("2025-12-09T10:00:00+00:00", "Smith new")])
+    assert len(db.search("smith")) == 3
+
+    while db.backfill_search_index(batch_size=2):
+        pass
+    assert len(db.search("smith")) == 6
+    assert db.backfill_search_index() == 0
@@ -0,0 +1,204 @@
+"""Tests for chunked secure deletion jobs and the background engine."""
+import time
+
+import pytest
+
+from syncopaid.database import Database
+from syncopaid.deletion_engine import RateLimiter, SecureDeletionEngine
+from syncopaid.tracker_state import ActivityEvent
+
+
+def _event(timestamp):
+    return ActivityEvent(
+        timestamp=timestamp,
+        duration_seconds=60.0,
+        app="WINWORD.EXE",
+        title="Smith-Contract.docx - Word",
+        is_idle=False
+    )
+
+
+@pytest.fixture
+def db(tmp_path):
+    db = Database(str(tmp_path / "test.db"))
+    db.insert_events_batch([_event(f"2025-12-09T09:{i:02d}:00+00:00") for i in range(7)])
+    db.insert_events_batch([_event("2025-12-10T09:00:00+00:00")])
+    for i in range(3):
+        path = tmp_path / f"shot{i}.jpg"
+        path.write_bytes(b"\xff" * 1000)
+        db.insert_screenshot(f"2025-12-09T09:0{i}:30+00:00", str(path), "WINWORD.EXE", "Doc")
+    return db
+
+
+def _job_counts(job):
+    return (job['status'], job['events_deleted'], job['screenshots_deleted'],
+            job['files_queued'], job['files_shredded'])
+
+
+def test_range_job_runs_in_chunks(db, tmp_path):
+    job_id = db.create_deletion_job("2025-12-09", "2025-12-09")
+
+    chunks = []
+    while True:
+        deleted = db.delete_next_chunk(job_id, chunk_size=2)
+        if not deleted:
+            break
+        chunks.append(deleted)
+
+    # Each event chunk takes its linked screenshots along
+    assert chunks == [4, 3, 2, 1]
+    assert _job_counts(db.get_deletion_job(job_id)) == ('shredding', 7, 3, 3, 0)
+    assert len(db.get_queued_files(job_id)) == 3
+    assert (tmp_path / "shot0.jpg").exists()
+
+    assert db.shred_job_files(job_id, batch_size=2) == 3
+    job = db.get_deletion_job(job_id)
+    assert _job_counts(job) == ('completed', 7, 3, 3, 3)
+    assert job['bytes_shredded'] == 3000
+    assert not (tmp_path / "shot0.jpg").exists()
+    assert len(db.get_events()) == 1
+
+
+def test_job_resumes_after_interruption(db, tmp_path):
+    job_id = db.create_deletion_job("2025-12-09", "2025-12-09")
+    db.delete_next_chunk(job_id, chunk_size=2)
+    db.close()
+
+    # A new process picks the job up from the persisted state
+    reopened = Database(str(tmp_path / "test.db"))
+    assert [job['id'] for job in reopened.get_deletion_jobs(active_only=True)] == [job_id]
+    while reopened.delete_next_chunk(job_id, chunk_size=2):
+        pass
+    reopened.shred_job_files(job_id)
+
+    assert _job_counts(reopened.get_deletion_job(job_id)) == ('completed', 7, 3, 3, 3)
+    assert not any(tmp_path.glob("shot*.jpg"))
+
+
+def test_synchronous_wrappers(db, tmp_path):
+    shots = db.get_screenshots()
+    assert db.delete_screenshots_securely([shots[0]['id'], 9999]) == 1
+    assert len(list(tmp_path.glob("shot*.jpg"))) == 2
+
+    assert db.delete_events_securely(start_date="2025-12-09", end_date="2025-12-09") == 7
+    assert db.get_screenshots() == []
+    assert not any(tmp_path.glob("shot*.jpg"))
+    assert db.get_deletion_jobs(active_only=True) == []
+
+
+def test_rate_limiter_throttles():
+    limiter = RateLimiter(bytes_per_second=10000)
+    started = time.monotonic()
+    for _ in range(3):
+        limiter.consume(10000)
+    assert time.monotonic() - started >= 1.5
+
+
+def test_engine_processes_jobs_in_background(db, tmp_path):
+    engine = SecureDeletionEngine(db, workers=2, max_bytes_per_second=0, chunk_size=2,
+                                  chunk_pause_seconds=0)
+    job_id = engine.submit_range("2025-12-09", "2025-12-09")
+    engine.start()
+    try:
+        deadline = time.monotonic() + 10
+        while db.get_deletion_job(job_id)['status'] != 'completed':
+            assert time.monotonic() < deadline
+            time.sleep(0.05)
+    finally:
+        engine.stop()
+
+    progress = engine.get_progress(active_only=False)
+    assert _job_counts(progress[0]) == ('completed', 7, 3, 3, 3)
+    assert progress[0]['rows_per_second'] > 0
+    assert not any(tmp_path.glob("shot*.jpg"))
+
+
+def test_archived_rows_are_deleted_in_chunks(tmp_path):
+    from syncopaid.database_shards import month_bounds_ms
+
+    db = Database(str(tmp_path / "shards.db"))
+    db.insert_events_batch([_event(f"2025-11-03T09:{i:02d}:00+00:00") for i in range(5)])
+    db.archive_closed_months(now_ms=month_bounds_ms("2025-12")[0])
+    job_id = db.create_deletion_job("2025-11-03", "2025-11-03")
+
+    chunks = []
+    while True:
+        deleted = db.delete_next_chunk(job_id, chunk_size=2)
+        if not deleted:
+            break
+        chunks.append(deleted)
+
+    assert chunks == [2, 2, 1]
+    assert db.get_events() == []
+
+
+def test_engine_reports_single_job_progress(db):
+    engine = SecureDeletionEngine(db, max_bytes_per_second=0)
+    job_id = engine.submit_screenshots([shot['id'] for shot in db.get_screenshots()])
+
+    progress = engine.get_job_progress(job_id)
+    assert _job_counts(progress) == ('shredding', 0, 3, 3, 0)
+    assert progress['bytes_per_second'] == 0.0
+    assert engine.get_job_progress(9999) is None
+
+
+def test_unshreddable_file_stays_queued(db, tmp_path):
+    """A file that cannot be deleted is retried, not reported as shredded."""
+    locked = tmp_path / "locked.jpg"
+    locked.mkdir()  # opening a directory for writing fails, like a file held open
+    db.insert_screenshot("2025-12-09T09:05:30+00:00", str(locked), "WINWORD.EXE", "Doc")
+    job_id = db.queue_screenshot_deletion([shot['id'] for shot in db.get_screenshots()])
+
+    assert db.shred_job_files(job_id) == 3
+    job = db.get_deletion_job(job_id)
+    assert _job_counts(job) == ('shredding', 0, 4, 4, 3)
+    assert job['bytes_shredded'] == 3000
+    assert db.get_queued_files(job_id) == [(db.get_queued_files(job_id)[0][0], str(locked))]
+
+    # Once the file is released the retry completes the job
+    locked.rmdir()
+    locked.write_bytes(b"\xff" * 500)
+    assert db.shred_job_files(job_id) == 1
+    job = db.get_deletion_job(job_id)
+    assert _job_counts(job) == ('completed', 0, 4, 4, 4)
+    assert job['bytes_shredded'] == 3500
+    assert not locked.exists()
+
+
+def test_repeated_shred_failures_fail_the_job(db, tmp_path):
+    locked = tmp_path / "locked.jpg"
+    locked.mkdir()
+    db.insert_screenshot("2025-12-09T09:05:30+00:00", str(locked), "WINWORD.EXE", "Doc")
+    job_id = db.queue_screenshot_deletion([db.get_screenshots()[0]['id']])
+    queue_id = db.get_queued_files(job_id)[0][0]
+
+    for _ in range(2):
+        db.fail_queued_files(job_id, [queue_id], max_attempts=2)
+
+    job = db.get_deletion_job(job_id)
+    assert job['status'] == 'failed'
+    assert job['files_pending'] == 1
+
+
+def test_engine_retries_unshreddable_files(db, tmp_path):
+    locked = tmp_path / "locked.jpg"
+    locked.mkdir()
+    db.insert_screenshot("2025-12-09T09:05:30+00:00", str(locked), "WINWORD.EXE", "Doc")
+    engine = SecureDeletionEngine(db, max_bytes_per_second=0, retry_seconds=0.1)
+    job_id = engine.submit_screenshots([shot['id'] for shot in db.get_screenshots()])
+    engine.start()
+    try:
+        deadline = time.monotonic() + 10
+        while db.get_deletion_job(job_id)['files_shredded'] < 3:
+            assert time.monotonic() < deadline
+            time.sleep(0.05)
+        assert db.get_deletion_job(job_id)['status'] == 'shredding'
+
+        locked.rmdir()
+        while db.get_deletion_job(job_id)['status'] != 'completed':
+            assert time.monotonic() < deadline
+            time.sleep(0.05)
+    finally:
+        engine.stop()
+
+    assert db.get_deletion_job(job_id)['bytes_shredded'] == 3000
@@ -0,0 +1,71 @@
+"""Tests for per-tick stage profiling of the tracking loop."""
+import time
+from datetime import datetime, timezone
+
+from syncopaid.tracker_loop import TrackerLoop
+from syncopaid.tracker_loop_clock import VirtualClock
+from syncopaid.tracker_loop_profiler import PROFILE_STAGES, LatencyHistogram
+from syncopaid.tracker_replay import TraceWindowSource, generate_synthetic_trace, replay_trace
+
+START = datetime(2025, 12, 9, 9, 0, tzinfo=timezone.utc)
+
+
+def test_histogram_percentiles_stay_bounded():
+    histogram = LatencyHistogram()
+    for i in range(1, 10001):
+        histogram.record(i * 1e-6)  # 1 us .. 10 ms, uniform
+
+    buckets = len(histogram.counts)
+    histogram.record(0.5)
+    assert len(histogram.counts) == buckets
+    assert histogram.count == 10001
+    assert histogram.max == 0.5
+
+    # Log buckets: within one bucket (~19%) of the true value
+    assert 0.005 <= histogram.percentile(0.50) <= 0.005 * 1.2
+    assert 0.0095 <= histogram.percentile(0.95) <= 0.0095 * 1.2
+    assert histogram.percentile(1.0) == 0.5
+    assert LatencyHistogram().summary()['p99_ms'] == 0.0
+
+
+def test_replay_profile_covers_every_stage():
+    start, samples = generate_synthetic_trace(days=1, seed=3, start=START)
+    result = replay_trace(start, samples, profile=True, profile_log_interval=0)
+
+    profile = result.profile
+    assert profile['ticks'] == result.ticks
+    assert set(profile['stages']) == set(PROFILE_STAGES)
+    for stage in PROFILE_STAGES:
+        assert profile['stages'][stage]['count'] == result.ticks
+    tick = profile['stages']['tick']
+    assert 0 < tick['p50_ms'] <= tick['p95_ms'] <= tick['p99_ms'] <= tick['max_ms']
+
+
+class SlowWindowSource(TraceWindowSource):
+    """Trace source whose window lookup takes real time."""
+
+    def get_active_window(self):
+        time.sleep(0.005)
+        return super().get_active_window()
+
+
+def test_overrunning_ticks_are_flagged():
+    clock = VirtualClock(START)
+    source = SlowWindowSource([{'t': 0, 'app': 'WINWORD.EXE', 'title': 'Brief.docx - Word'}], clock)
+    tracker = TrackerLoop(poll_interval=0.001, clock=clock, window_source=source,
+                          profile=True, profile_log_interval=0)
+    clock.deadline = clock.time() + 0.01
+    clock.on_deadline = tracker.stop
+    list(tracker.start())
+
+    stats = tracker.get_profile_stats()
+    assert stats['ticks'] >= 5
+    assert stats['overruns'] == stats['ticks']
+    assert stats['last_overrun']['window'] >= 5.0
+    assert stats['stages']['window']['p50_ms'] >= 5.0
+
+
+def test_profiling_off_by_default():
+    tracker = TrackerLoop(clock=VirtualClock(START))
+    assert tracker.profiler is None
+    assert tracker.get_profile_stats() is None
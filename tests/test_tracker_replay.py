@@ -0,0 +1,89 @@
+"""Tests for the virtual clock, trace replay and synthetic traces."""
+from datetime import datetime, timezone
+
+from syncopaid.tracker_loop_clock import VirtualClock
+from syncopaid.tracker_replay import (
+    TraceWindowSource,
+    generate_synthetic_trace,
+    read_trace,
+    replay_trace,
+    write_trace,
+)
+
+START = datetime(2025, 12, 9, 9, 0, tzinfo=timezone.utc)
+
+TRACE = [
+    {'t': 0, 'app': 'WINWORD.EXE', 'title': 'Smith-Contract.docx - Word', 'idle': 0},
+    {'t': 120, 'app': 'chrome.exe', 'title': 'Westlaw - Google Chrome', 'url': 'https://westlaw.example.com'},
+    {'t': 121, 'app': 'WINWORD.EXE', 'title': 'Smith-Contract.docx - Word', 'url': None, 'idle': 0},
+    {'t': 300, 'idle': 0},
+    # No input from t=300: idle after idle_threshold, resumption at t=800
+    {'t': 800, 'idle': 0, 'keyboard': True},
+    {'t': 900, 'app': 'OUTLOOK.EXE', 'title': 'RE: Smith - Outlook', 'keyboard': False},
+]
+
+
+def test_virtual_clock_advances_only_when_sleeping():
+    clock = VirtualClock(START)
+    assert clock.now() == START
+    clock.sleep(1.5)
+    clock.sleep(1.5)
+    assert clock.sleeps == 2
+    assert clock.time() == START.timestamp() + 3.0
+
+    fired = []
+    clock.deadline = clock.time() + 2
+    clock.on_deadline = lambda: fired.append(clock.elapsed)
+    clock.sleep(1)
+    clock.sleep(1)
+    clock.sleep(1)
+    assert fired == [5.0]
+
+
+def test_trace_source_carries_values_and_grows_idle():
+    clock = VirtualClock(START)
+    source = TraceWindowSource(TRACE, clock)
+    clock.advance(400)
+    assert source.get_active_window()['app'] == 'WINWORD.EXE'
+    assert source.get_idle_seconds() == 100.0
+    assert not source.get_keyboard_activity()
+
+
+def test_replay_drives_full_loop():
+    result = replay_trace(START, TRACE, idle_threshold=180.0, minimum_idle_duration=180.0,
+                          merge_threshold=2.0, screenshot_interval=60.0)
+
+    summary = [(e.timestamp, e.app, e.state, e.duration_seconds) for e in result.events]
+    assert summary == [
+        ('2025-12-09T09:00:00+00:00', 'WINWORD.EXE', 'Active', 120.0),
+        ('2025-12-09T09:02:00+00:00', 'chrome.exe', 'Active', 2.0),
+        ('2025-12-09T09:02:02+00:00', 'WINWORD.EXE', 'Active', 358.0),
+        ('2025-12-09T09:08:00+00:00', 'WINWORD.EXE', 'Inactive', 320.0),
+        ('2025-12-09T09:13:20+00:00', 'WINWORD.EXE', 'Active', 100.0),
+        ('2025-12-09T09:15:00+00:00', 'OUTLOOK.EXE', 'Active', 1.0),
+    ]
+    assert len(result.resumptions) == 1
+    assert result.resumptions[0].idle_duration >= 180.0
+    assert result.ticks == 901
+    assert result.screenshots_scheduled == 16
+
+    # Same trace, same events
+    again = replay_trace(START, TRACE, idle_threshold=180.0, minimum_idle_duration=180.0,
+                         merge_threshold=2.0, screenshot_interval=60.0)
+    assert [e.to_dict() for e in again.events] == [e.to_dict() for e in result.events]
+
+
+def test_synthetic_trace_roundtrip_and_replay(tmp_path):
+    start, samples = generate_synthetic_trace(days=1, seed=7)
+    assert generate_synthetic_trace(days=1, seed=7)[1] == samples
+
+    path = tmp_path / "day.jsonl"
+    write_trace(path, start, samples)
+    read_start, read_samples = read_trace(path)
+    assert read_start == start
+    assert read_samples == samples
+
+    result = replay_trace(read_start, read_samples, poll_interval=5.0)
+    assert result.events_per_day > 50
+    assert result.ticks == int(result.simulated_seconds / 5.0)
+    assert result.tick_overhead_us > 0